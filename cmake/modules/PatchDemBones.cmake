@@ -0,0 +1,63 @@
+# Copy the DemBones headers and add a public setter for the weight smoothing solver
+#
+# DemBones keeps the Laplacian used for weight smoothing and its LU factorization
+# private and only rebuilds them in init() when the Laplacian does not match the
+# number of vertices. The patched DemBones.h holds the factorization through a
+# shared pointer and adds setSmoothSolver(), so that the bindings can install a
+# Laplacian and a factorization that were cached by an earlier solve of the same
+# mesh and share them between instances.
+#
+# Usage from CMake:
+#   include(PatchDemBones)
+#   patch_dem_bones_headers(<source include dir> <output include dir>)
+#
+# Usage as a script:
+#   cmake -DSOURCE_DIR=<source include dir> -DOUTPUT_DIR=<output include dir> -P PatchDemBones.cmake
+
+function(_patch_dem_bones_replace content_var old new)
+    string(FIND "${${content_var}}" "${old}" position)
+    if(position EQUAL -1)
+        message(FATAL_ERROR "Cannot patch DemBones.h: '${old}' not found, the DemBones version is not supported")
+    endif()
+    string(REPLACE "${old}" "${new}" patched "${${content_var}}")
+    set(${content_var} "${patched}" PARENT_SCOPE)
+endfunction()
+
+function(patch_dem_bones_headers source_dir output_dir)
+    file(GLOB headers RELATIVE "${source_dir}/DemBones" "${source_dir}/DemBones/*.h")
+    foreach(header ${headers})
+        if(NOT header STREQUAL "DemBones.h")
+            configure_file("${source_dir}/DemBones/${header}" "${output_dir}/DemBones/${header}" COPYONLY)
+        endif()
+    endforeach()
+
+    file(READ "${source_dir}/DemBones/DemBones.h" content)
+    _patch_dem_bones_replace(content "#include <set>\n" "#include <set>\n#include <memory>\n")
+    _patch_dem_bones_replace(content
+        "\tEigen::SparseLU<SparseMatrix> smoothSolver;"
+        "\tstd::shared_ptr<const Eigen::SparseLU<SparseMatrix>> smoothSolver;")
+    _patch_dem_bones_replace(content
+        "\t\tsmoothSolver.compute(laplacian);"
+        "\t\tstd::shared_ptr<Eigen::SparseLU<SparseMatrix>> solver=std::make_shared<Eigen::SparseLU<SparseMatrix>>();\n\t\tsolver->compute(laplacian);\n\t\tsmoothSolver=solver;")
+    _patch_dem_bones_replace(content "smoothSolver.solve(" "smoothSolver->solve(")
+    _patch_dem_bones_replace(content
+        "\nprivate:\n\tint _iter,"
+        "\n\t/** Sets the weight smoothing Laplacian and its LU factorization, which init() then keeps\n\t\t@param _laplacian is the [#nV, #nV] smoothing operator\n\t\t@param _smoothSolver is the factorization of @p _laplacian, it may be shared with other instances\n\t*/\n\tvoid setSmoothSolver(const SparseMatrix& _laplacian, std::shared_ptr<const Eigen::SparseLU<SparseMatrix>> _smoothSolver) {\n\t\tlaplacian=_laplacian;\n\t\tsmoothSolver=std::move(_smoothSolver);\n\t}\n\nprivate:\n\tint _iter,")
+
+    # Only touch the output when it changes, so that the bindings are not rebuilt needlessly
+    set(existing "")
+    if(EXISTS "${output_dir}/DemBones/DemBones.h")
+        file(READ "${output_dir}/DemBones/DemBones.h" existing)
+    endif()
+    if(NOT existing STREQUAL content)
+        file(WRITE "${output_dir}/DemBones/DemBones.h" "${content}")
+    endif()
+    set_property(DIRECTORY APPEND PROPERTY CMAKE_CONFIGURE_DEPENDS "${source_dir}/DemBones/DemBones.h")
+endfunction()
+
+if(CMAKE_SCRIPT_MODE_FILE STREQUAL CMAKE_CURRENT_LIST_FILE)
+    if(NOT SOURCE_DIR OR NOT OUTPUT_DIR)
+        message(FATAL_ERROR "Usage: cmake -DSOURCE_DIR=<dir> -DOUTPUT_DIR=<dir> -P PatchDemBones.cmake")
+    endif()
+    patch_dem_bones_headers("${SOURCE_DIR}" "${OUTPUT_DIR}")
+endif()
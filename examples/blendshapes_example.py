@@ -10,7 +10,8 @@ The example:
 1. Creates a simple face mesh
 2. Defines several blendshapes (smile, frown, surprise)
 3. Uses py-dem-bones to extract a skinning decomposition
-4. Demonstrates how to use the resulting bones and weights to recreate the blendshapes
+4. Compresses what the bones cannot follow into corrective shapes
+5. Recreates the blendshapes from the bones, weights and correctives
 """
 
 import numpy as np
@@ -67,6 +68,15 @@ def create_blendshapes():
     return np.vstack([base, smile, frown, surprise])
 
 
+def create_face_faces():
+    """Create the quads of the face mesh.
+
+    Returns:
+        list: Four quads as lists of vertex indices.
+    """
+    return [[1, 2, 0, 4], [2, 3, 5, 0], [4, 0, 7, 6], [0, 5, 8, 7]]
+
+
 def main():
     """Run the blendshapes to skinning conversion example.
     
@@ -74,69 +84,61 @@ def main():
     1. Create blendshapes
     2. Configure the DemBones algorithm
     3. Compute the skinning decomposition
-    4. Retrieve and use the resulting bones and weights
+    4. Extract corrective shapes from the skinning residual
+    5. Evaluate skinning plus correctives for a blend of two shapes
     """
-    # Create DemBones instance
-    dem_bones = pdb.DemBones()
-
-    # Set parameters
-    dem_bones.nIters = 20
-    dem_bones.nInitIters = 10
-    dem_bones.nTransformIters = 5
-    dem_bones.nWeightsIters = 3
-    dem_bones.maxNonZerosPerVertex = 4
-    dem_bones.weightsSmoothness = 1e-4
-
     # Create blendshapes
     blendshapes = create_blendshapes()
     num_vertices = 9
     num_frames = 4  # Base + 3 blendshapes
+    poses = blendshapes.reshape(num_frames, num_vertices, 3).transpose(0, 2, 1)
 
-    # Set rest pose (first frame)
-    dem_bones.setRestPose(blendshapes[:num_vertices])
-
-    # Set animated poses (all frames including rest pose)
-    dem_bones.setAnimatedPoses(blendshapes.reshape(num_frames, num_vertices, 3))
+    # Create and configure the wrapper
+    dem_bones = pdb.DemBonesWrapper()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 20
+    dem_bones.num_init_iterations = 10
+    dem_bones.max_influences = 4
+    dem_bones.weight_smoothness = 1e-4
 
-    # Set number of bones
-    dem_bones.nBones = 3
+    # The base mesh is the rest pose; every blendshape is one frame
+    dem_bones.set_rest_pose(poses[0])
+    dem_bones.set_animated_poses(poses)
+    dem_bones.set_faces(create_face_faces())
 
     # Compute skinning decomposition
     dem_bones.compute()
 
     # Get results
-    weights = dem_bones.getWeights()
-    transforms = dem_bones.getTransforms()
+    weights = dem_bones.get_weights()
+    transforms = dem_bones.get_bone_transformations()
 
     print("Skinning weights:")
     print(weights)
-    print("\nBone transforms (first frame):")
-    print(transforms[0])
+    print("\nBone transforms (smile):")
+    print(transforms[1])
+
+    # Keep what the bones cannot follow as corrective shapes
+    correctives = dem_bones.extract_correctives(num_shapes=2)
+    skinned = dem_bones.get_skinned_poses()
+    corrected = dem_bones.get_corrected_poses(correctives)
+    print(f"\nSkinning error: {np.sqrt(np.mean(np.sum((skinned - poses) ** 2, axis=1))):.4f}")
+    print(f"Error with {correctives.num_shapes} correctives: {correctives.rms_error:.4f}")
 
-    # Example: Deform the mesh using the extracted skinning weights and transforms
-    # Here we use 50% of the smile transform (index 1)
+    # Example: Deform the mesh with 50% of the smile (frame 1)
     blend_factor = 0.5
-    interpolated_transforms = transforms[0].copy()  # Start with rest pose transforms
-    
-    # Blend with smile transforms (index 1)
-    for i in range(len(interpolated_transforms)):
-        interpolated_transforms[i] = (1 - blend_factor) * transforms[0][i] + blend_factor * transforms[1][i]
-    
-    # Apply skinning
-    deformed_vertices = np.zeros((num_vertices, 3))
-    for v in range(num_vertices):
-        for b in range(dem_bones.nBones):
-            if weights[v, b] > 0:
-                # Apply bone transformation weighted by skinning weight
-                bone_transform = interpolated_transforms[b]
-                vertex = blendshapes[v].copy()  # Rest pose vertex
-                
-                # Apply transformation (simplified for this example)
-                transformed = vertex + bone_transform[:3]  # Just apply translation part
-                deformed_vertices[v] += weights[v, b] * transformed
+    rest = np.vstack([poses[0], np.ones(num_vertices)])
+    blended_transforms = (1 - blend_factor) * transforms[0] + blend_factor * transforms[1]
+    deformed_vertices = np.einsum("bv,bij,jv->iv", weights, blended_transforms[:, :3], rest)
+
+    # Blend the corrective coefficients the same way
+    coefficients = (1 - blend_factor) * correctives.coefficients[0] + blend_factor * correctives.coefficients[1]
+    deformed_vertices += np.tensordot(coefficients, correctives.shapes, axes=1)
 
     print("\nDeformed vertices with 50% smile:")
-    print(deformed_vertices)
+    print(deformed_vertices.T)
+    print("\nCorrected smile:")
+    print(corrected[1].T)
 
 
 if __name__ == "__main__":
@@ -172,8 +172,8 @@ class MaxDCCInterface(DCCInterface):
                 print(f"Error: Objects not found: {mesh_node} or one of the bones")
                 return False
             
-            # Get computed weights
-            weights = self.dem_bones.get_weights()
+            # Get computed weights as a table of the strongest influences per vertex
+            influences = self.dem_bones.get_influences(self.dem_bones.nnz)
             
             if apply_weights:
                 # Create or get Skin modifier
@@ -206,7 +206,7 @@ class MaxDCCInterface(DCCInterface):
                     rt.skinOps.addBone(skin_mod, bone, 0)
                 
                 # Apply weights to Skin modifier
-                self._apply_weights_to_skin_modifier(skin_mod, mesh, bones, weights)
+                self._apply_weights_to_skin_modifier(skin_mod, mesh, bones, influences)
                 
                 print(f"Successfully applied weights to {mesh_node}")
             
@@ -274,7 +274,7 @@ class MaxDCCInterface(DCCInterface):
         
         return parent_indices
     
-    def _apply_weights_to_skin_modifier(self, skin_mod, mesh, bones, weights):
+    def _apply_weights_to_skin_modifier(self, skin_mod, mesh, bones, influences):
         """
         Apply weights to a 3ds Max Skin modifier.
         
@@ -282,29 +282,23 @@ class MaxDCCInterface(DCCInterface):
             skin_mod: 3ds Max Skin modifier
             mesh: 3ds Max mesh node
             bones: List of 3ds Max bone nodes
-            weights: Weights matrix from DemBones
+            influences: ([num_vertices, k] bone indices, [num_vertices, k] weights) from
+                DemBones, sorted by decreasing weight
         """
         import pymxs
         rt = pymxs.runtime
         
-        num_verts = rt.getNumVerts(mesh)
+        indices, weights = influences
         
         # For each vertex
-        for v_idx in range(num_verts):
-            # Get non-zero weights for this vertex
-            v_weights = []
-            for b_idx in range(len(bones)):
-                weight = weights[v_idx * len(bones) + b_idx]
-                if weight > 0.0001:  # Threshold to avoid very small weights
-                    v_weights.append((b_idx, weight))
-            
-            # Sort by weight (descending)
-            v_weights.sort(key=lambda x: x[1], reverse=True)
+        for v_idx in range(indices.shape[0]):
+            # Unused influence slots have zero weight
+            used = weights[v_idx] > 0.0
             
-            # Apply weights to vertex
+            # Apply weights to vertex (3ds Max indices are 1-based)
             rt.skinOps.ReplaceVertexWeights(skin_mod, v_idx + 1, 
-                                           rt.point3Array([bone_idx + 1 for bone_idx, _ in v_weights]), 
-                                           rt.point3Array([weight for _, weight in v_weights]))
+                                           [int(bone_idx) + 1 for bone_idx in indices[v_idx][used]], 
+                                           [float(weight) for weight in weights[v_idx][used]])
 
 
 def example_usage():
@@ -156,8 +156,8 @@ class MayaDCCInterface(DCCInterface):
                 print("Error: Missing Maya data. Call from_dcc_data() first.")
                 return False
             
-            # Get computed weights
-            weights = self.dem_bones.get_weights()
+            # Get computed weights as a table of the strongest influences per vertex
+            influences = self.dem_bones.get_influences(self.dem_bones.nnz)
             
             if apply_weights:
                 # Create or get skin cluster
@@ -189,7 +189,7 @@ class MayaDCCInterface(DCCInterface):
                         return False
                 
                 # Apply weights to skin cluster
-                self._apply_weights_to_skin_cluster(skin_cluster, mesh_name, joint_names, weights)
+                self._apply_weights_to_skin_cluster(skin_cluster, mesh_name, joint_names, influences)
                 
                 print(f"Successfully applied weights to {mesh_name}")
             
@@ -298,30 +298,24 @@ class MayaDCCInterface(DCCInterface):
             
         return parent_indices
     
-    def _apply_weights_to_skin_cluster(self, skin_cluster, mesh_name, joint_names, weights):
+    def _apply_weights_to_skin_cluster(self, skin_cluster, mesh_name, joint_names, influences):
         """Apply computed weights to a Maya skin cluster."""
         import maya.cmds as cmds
         
-        # Get number of vertices
-        num_vertices = cmds.polyEvaluate(mesh_name, vertex=True)
+        # [num_vertices, k] bone indices and weights, sorted and normalized per vertex
+        indices, weights = influences
         
         # For each vertex
-        for vertex_idx in range(num_vertices):
-            # Get weights for this vertex
-            vertex_weights = {}
-            
-            # For each joint
-            for joint_idx, joint_name in enumerate(joint_names):
-                weight = weights[joint_idx, vertex_idx]
-                if weight > 0.0001:  # Skip very small weights
-                    vertex_weights[joint_name] = weight
+        for vertex_idx in range(indices.shape[0]):
+            # Convert to format expected by Maya: [(joint1, weight1), (joint2, weight2), ...]
+            weight_list = [
+                (joint_names[joint_idx], float(weight))
+                for joint_idx, weight in zip(indices[vertex_idx], weights[vertex_idx])
+                if weight > 0.0
+            ]
             
-            # Set weights for this vertex
-            if vertex_weights:
-                # Convert to format expected by Maya: [(joint1, weight1), (joint2, weight2), ...]
-                weight_list = [(joint, weight) for joint, weight in vertex_weights.items()]
-                
-                # Apply weights
+            # Apply weights
+            if weight_list:
                 cmds.skinPercent(
                     skin_cluster,
                     f"{mesh_name}.vtx[{vertex_idx}]",
@@ -0,0 +1,981 @@
+#pragma once
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+
+#include <Eigen/Dense>
+#include <Eigen/Sparse>
+
+#include <DemBones/DemBones.h>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <cstring>
+#include <limits>
+#include <memory>
+#include <stdexcept>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+namespace py = pybind11;
+
+// Helpers shared by the DemBones and DemBonesExt bindings.
+namespace py_dem_bones {
+
+// Limit the OpenMP threads of the native calls made by the current thread for the
+// lifetime of the object, restoring the previous limit afterwards. Other threads
+// keep their own limit, so concurrent solves can be given separate thread budgets.
+// A thread count <= 0 keeps the current limit.
+class ThreadLimit {
+public:
+    explicit ThreadLimit(int num_threads) {
+#ifdef _OPENMP
+        if (num_threads > 0) {
+            previous_ = omp_get_max_threads();
+            omp_set_num_threads(num_threads);
+        }
+#else
+        (void)num_threads;
+#endif
+    }
+
+    ~ThreadLimit() {
+#ifdef _OPENMP
+        if (previous_ > 0) omp_set_num_threads(previous_);
+#endif
+    }
+
+    ThreadLimit(const ThreadLimit&) = delete;
+    ThreadLimit& operator=(const ThreadLimit&) = delete;
+
+private:
+    int previous_ = 0;
+};
+
+// Faces around every vertex in CSR form: the faces of vertex i are
+// faces[offsets[i]:offsets[i + 1]], in increasing order.
+inline void build_vertex_faces(const std::vector<std::vector<int>>& fv, int nV, std::vector<int64_t>& offsets,
+                               std::vector<int>& faces) {
+    offsets.assign(static_cast<size_t>(nV) + 1, 0);
+    for (const auto& face : fv) {
+        for (int i : face) ++offsets[i + 1];
+    }
+    for (int i = 0; i < nV; ++i) offsets[i + 1] += offsets[i];
+    faces.resize(static_cast<size_t>(offsets[nV]));
+    std::vector<int64_t> next(offsets.begin(), offsets.end() - 1);
+    for (size_t f = 0; f < fv.size(); ++f) {
+        for (int i : fv[f]) faces[next[i]++] = static_cast<int>(f);
+    }
+}
+
+// Vertices of a selection grown by face-adjacency rings, seeds first and then ring
+// by ring. level holds 0 for the seeds and r for the r-th ring of neighbours, and
+// local maps a mesh vertex to its position in vertices.
+struct RingSelection {
+    std::vector<int> vertices;
+    std::vector<int> level;
+    std::unordered_map<int, int> local;
+};
+
+// Grow a vertex selection by a number of face-adjacency rings with a breadth-first
+// search over the faces around each vertex, so the cost depends on the size of the
+// grown selection and not on the size of the mesh.
+inline RingSelection vertex_rings(const std::vector<std::vector<int>>& fv, const int64_t* vertexFaceOffsets,
+                                  const int* vertexFaces, const std::vector<int>& seeds, int rings) {
+    RingSelection selection;
+    auto add = [&selection](int i, int r) {
+        if (!selection.local.emplace(i, static_cast<int>(selection.vertices.size())).second) return false;
+        selection.vertices.push_back(i);
+        selection.level.push_back(r);
+        return true;
+    };
+    for (int i : seeds) add(i, 0);
+
+    std::unordered_set<int> visited;
+    size_t begin = 0;
+    for (int r = 1; r <= rings; ++r) {
+        const size_t end = selection.vertices.size();
+        for (size_t c = begin; c < end; ++c) {
+            const int i = selection.vertices[c];
+            for (int64_t k = vertexFaceOffsets[i]; k < vertexFaceOffsets[i + 1]; ++k) {
+                if (!visited.insert(vertexFaces[k]).second) continue;
+                for (int j : fv[vertexFaces[k]]) add(j, r);
+            }
+        }
+        if (selection.vertices.size() == end) break;
+        begin = end;
+    }
+    return selection;
+}
+
+// Number of vertices every bone influences with a non-zero weight
+template <typename SparseMatrix>
+Eigen::VectorXi bone_vertex_counts(const SparseMatrix& w) {
+    Eigen::VectorXi counts = Eigen::VectorXi::Zero(w.rows());
+    const auto* outer = w.outerIndexPtr();
+    const auto* nonZeros = w.innerNonZeroPtr();
+    const auto* inner = w.innerIndexPtr();
+    const auto* value = w.valuePtr();
+    for (Eigen::Index i = 0; i < w.outerSize(); ++i) {
+        const auto end = nonZeros ? outer[i] + nonZeros[i] : outer[i + 1];
+        for (auto k = outer[i]; k < end; ++k) {
+            if (value[k] != 0) ++counts(inner[k]);
+        }
+    }
+    return counts;
+}
+
+// Replace the weights of some vertices in place. Columns keep their storage unless a
+// vertex gains influences beyond it; the matrix then grows once to room for nnz
+// influences per vertex, so that later updates stay in place.
+template <typename SparseMatrix>
+void set_weight_columns(SparseMatrix& w, const std::vector<int>& columns, const SparseMatrix& source,
+                        const std::vector<int>& sourceColumns, int nnz) {
+    using StorageIndex = typename SparseMatrix::StorageIndex;
+
+    auto stored = [&w](Eigen::Index i) {
+        return w.isCompressed() ? w.outerIndexPtr()[i + 1] - w.outerIndexPtr()[i] : w.innerNonZeroPtr()[i];
+    };
+    auto capacity = [&w](Eigen::Index i) { return w.outerIndexPtr()[i + 1] - w.outerIndexPtr()[i]; };
+
+    std::vector<StorageIndex> counts(columns.size(), 0);
+    bool grow = false;
+    for (size_t c = 0; c < columns.size(); ++c) {
+        for (typename SparseMatrix::InnerIterator it(source, sourceColumns[c]); it; ++it) {
+            if (it.value() != 0) ++counts[c];
+        }
+        grow = grow || counts[c] > capacity(columns[c]);
+    }
+    if (grow) {
+        Eigen::VectorXi reserve(w.outerSize());
+        for (Eigen::Index i = 0; i < w.outerSize(); ++i) reserve(i) = std::max<int>(nnz - stored(i), 0);
+        for (size_t c = 0; c < columns.size(); ++c) {
+            reserve(columns[c]) = std::max<int>(reserve(columns[c]), counts[c] - stored(columns[c]));
+        }
+        w.reserve(reserve);
+    }
+    if (w.isCompressed()) w.uncompress();
+
+    for (size_t c = 0; c < columns.size(); ++c) {
+        StorageIndex k = w.outerIndexPtr()[columns[c]];
+        for (typename SparseMatrix::InnerIterator it(source, sourceColumns[c]); it; ++it) {
+            if (it.value() == 0) continue;
+            w.innerIndexPtr()[k] = static_cast<StorageIndex>(it.row());
+            w.valuePtr()[k] = it.value();
+            ++k;
+        }
+        w.innerNonZeroPtr()[columns[c]] = counts[c];
+    }
+}
+
+// Copy the solver parameters from one instance to another
+template <typename Class>
+void copy_solver_parameters(const Class& src, Class& dst) {
+    dst.nIters = src.nIters;
+    dst.nInitIters = src.nInitIters;
+    dst.nTransIters = src.nTransIters;
+    dst.transAffine = src.transAffine;
+    dst.transAffineNorm = src.transAffineNorm;
+    dst.nWeightsIters = src.nWeightsIters;
+    dst.nnz = src.nnz;
+    dst.weightsSmooth = src.weightsSmooth;
+    dst.weightsSmoothStep = src.weightsSmoothStep;
+    dst.weightEps = src.weightEps;
+}
+
+// Re-solve the weights of a vertex region while the rest of the mesh stays fixed.
+//
+// The sub-problem holds the region plus `rings` rings of neighbours. Neighbour
+// vertices are fully weight-locked so they only anchor the Laplacian smoothing,
+// and every bone that influences a vertex outside the region keeps its
+// transformations. The rings are grown over the faces around each vertex, given
+// in CSR form (build_vertex_faces) or built here when vertexFaceOffsets is empty,
+// and only the region columns of w are rewritten, so apart from counting the
+// vertices of every bone the cost depends on the region size, not on the size of
+// the mesh.
+template <typename Class, typename Scalar>
+py::dict resolve_region(Class& self, const std::vector<int>& vertices, int rings, int nIters,
+                        const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& vertexFaceOffsets,
+                        const py::array_t<int, py::array::c_style | py::array::forcecast>& vertexFaces) {
+    using VectorX = Eigen::Matrix<Scalar, Eigen::Dynamic, 1>;
+    using SparseMatrix = Eigen::SparseMatrix<Scalar>;
+    using Triplet = Eigen::Triplet<Scalar>;
+
+    const int nV = self.nV;
+    const int nB = self.nB;
+
+    if (self.w.rows() != nB || self.w.cols() != nV || self.m.rows() != self.nF * 4 || self.m.cols() != nB * 4) {
+        throw std::runtime_error("resolve_region requires solved weights and transformations");
+    }
+    for (int i : vertices) {
+        if (i < 0 || i >= nV) {
+            throw py::index_error("Vertex index " + std::to_string(i) + " out of range (0-" + std::to_string(nV - 1) + ")");
+        }
+    }
+
+    std::vector<int64_t> builtOffsets;
+    std::vector<int> builtFaces;
+    const int64_t* faceOffsets = nullptr;
+    const int* faces = nullptr;
+    if (vertexFaceOffsets.size() == 0) {
+        build_vertex_faces(self.fv, nV, builtOffsets, builtFaces);
+        faceOffsets = builtOffsets.data();
+        faces = builtFaces.data();
+    } else {
+        if (vertexFaceOffsets.ndim() != 1 || vertexFaceOffsets.size() != static_cast<py::ssize_t>(nV) + 1 ||
+            vertexFaceOffsets.data()[nV] != vertexFaces.size()) {
+            throw std::invalid_argument("Vertex faces must be CSR offsets [nV + 1] and face indices");
+        }
+        faceOffsets = vertexFaceOffsets.data();
+        faces = vertexFaces.data();
+        const int nFaces = static_cast<int>(self.fv.size());
+        for (py::ssize_t k = 0; k < vertexFaces.size(); ++k) {
+            if (faces[k] < 0 || faces[k] >= nFaces) throw std::invalid_argument("Vertex faces do not match the faces");
+        }
+    }
+
+    RingSelection selection = vertex_rings(self.fv, faceOffsets, faces, vertices, std::max(rings, 0));
+    const std::vector<int>& subset = selection.vertices;
+    const int nSub = static_cast<int>(subset.size());
+    const int nCore = static_cast<int>(std::count(selection.level.begin(), selection.level.end(), 0));
+
+    Class sub;
+    copy_solver_parameters(self, sub);
+    if (nIters >= 0) sub.nIters = nIters;
+
+    sub.nV = nSub;
+    sub.nB = nB;
+    sub.nS = self.nS;
+    sub.nF = self.nF;
+    sub.fStart = self.fStart;
+    sub.subjectID = self.subjectID;
+
+    sub.u.resize(self.u.rows(), nSub);
+    sub.v.resize(self.v.rows(), nSub);
+    for (int c = 0; c < nSub; ++c) {
+        sub.u.col(c) = self.u.col(subset[c]);
+        sub.v.col(c) = self.v.col(subset[c]);
+    }
+
+    // Faces that lie entirely inside the sub-problem drive its smoothing. Every such
+    // face is found once, from its first corner, and they keep their mesh order.
+    std::vector<int> inside;
+    for (int i : subset) {
+        for (int64_t k = faceOffsets[i]; k < faceOffsets[i + 1]; ++k) {
+            const auto& face = self.fv[faces[k]];
+            if (face.front() != i) continue;
+            if (std::all_of(face.begin(), face.end(), [&](int j) { return selection.local.count(j) > 0; })) {
+                inside.push_back(faces[k]);
+            }
+        }
+    }
+    std::sort(inside.begin(), inside.end());
+    inside.erase(std::unique(inside.begin(), inside.end()), inside.end());
+    sub.fv.reserve(inside.size());
+    for (int f : inside) {
+        std::vector<int> remapped;
+        remapped.reserve(self.fv[f].size());
+        for (int i : self.fv[f]) remapped.push_back(selection.local.at(i));
+        sub.fv.push_back(std::move(remapped));
+    }
+
+    // Current weights; neighbour vertices are fully locked. Bones that reach outside
+    // the region keep their transformations.
+    const bool hasLocks = self.lockW.size() == nV;
+    Eigen::VectorXi lockM = Eigen::VectorXi::Zero(nB);
+    if (self.lockM.size() == nB) lockM = self.lockM;
+    Eigen::VectorXi regionCounts = Eigen::VectorXi::Zero(nB);
+    std::vector<Triplet> trip;
+    sub.lockW = VectorX::Ones(nSub);
+    for (int c = 0; c < nSub; ++c) {
+        const int i = subset[c];
+        const bool core = selection.level[c] == 0;
+        for (typename SparseMatrix::InnerIterator it(self.w, i); it; ++it) {
+            trip.push_back(Triplet(static_cast<int>(it.row()), c, it.value()));
+            if (it.value() == 0) continue;
+            if (core) {
+                ++regionCounts(it.row());
+            } else {
+                lockM(it.row()) = 1;
+            }
+        }
+        if (core) sub.lockW(c) = hasLocks ? self.lockW(i) : Scalar(0);
+    }
+    sub.w.resize(nB, nSub);
+    sub.w.setFromTriplets(trip.begin(), trip.end());
+
+    const Eigen::VectorXi counts = bone_vertex_counts(self.w);
+    for (int b = 0; b < nB; ++b) {
+        if (counts(b) > regionCounts(b)) lockM(b) = 1;
+    }
+    sub.lockM = lockM;
+
+    // The sub-problem works on the transformations of the instance itself, which
+    // are handed back after the solve; locked bones come back unchanged
+    Scalar rmse = 0;
+    sub.m.swap(self.m);
+    try {
+        py::gil_scoped_release release;
+        sub.compute();
+        rmse = sub.rmse();
+    } catch (...) {
+        self.m.swap(sub.m);
+        throw;
+    }
+    self.m.swap(sub.m);
+
+    // Write the new region weights back
+    std::vector<int> regionColumns;
+    std::vector<int> subColumns;
+    regionColumns.reserve(nCore);
+    subColumns.reserve(nCore);
+    for (int c = 0; c < nSub; ++c) {
+        if (selection.level[c] != 0) continue;
+        regionColumns.push_back(subset[c]);
+        subColumns.push_back(c);
+    }
+    set_weight_columns(self.w, regionColumns, sub.w, subColumns, self.nnz);
+
+    py::dict report;
+    report["region_vertices"] = nCore;
+    report["neighbour_vertices"] = nSub - nCore;
+    report["free_bones"] = nB - lockM.sum();
+    report["rmse"] = rmse;
+    return report;
+}
+
+// Overwrite the animated poses of selected frames in place
+template <typename Class, typename Scalar, typename AniMeshScalar>
+void set_animated_frames(Class& self, const std::vector<int>& frames,
+                         const Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic>& poses) {
+    if (poses.rows() != 3 * static_cast<Eigen::Index>(frames.size()) || poses.cols() != self.v.cols()) {
+        throw std::invalid_argument("Poses must have shape [3 * len(frames), nV]");
+    }
+    for (size_t f = 0; f < frames.size(); ++f) {
+        const int k = frames[f];
+        if (k < 0 || 3 * k + 3 > self.v.rows()) {
+            throw py::index_error("Frame index " + std::to_string(k) + " out of range");
+        }
+        self.v.middleRows(3 * k, 3) = poses.middleRows(3 * f, 3).template cast<AniMeshScalar>();
+    }
+}
+
+// Re-solve the transformations of selected frames with the current weights.
+//
+// Frames are independent given the weights, so only the selected frames are
+// handed to the solver; the transformations of all other frames are kept.
+template <typename Class>
+void compute_frame_transformations(Class& self, const std::vector<int>& frames) {
+    const int nB = self.nB;
+    if (self.w.rows() != nB || self.w.cols() != self.nV || self.m.rows() != self.nF * 4 || self.m.cols() != nB * 4) {
+        throw std::runtime_error("compute_frame_transformations requires solved weights and transformations");
+    }
+
+    std::vector<int> sorted(frames);
+    std::sort(sorted.begin(), sorted.end());
+    sorted.erase(std::unique(sorted.begin(), sorted.end()), sorted.end());
+    if (sorted.empty()) return;
+    if (sorted.front() < 0 || sorted.back() >= self.nF) {
+        throw py::index_error("Frame index out of range (0-" + std::to_string(self.nF - 1) + ")");
+    }
+    const int nSubF = static_cast<int>(sorted.size());
+
+    Class sub;
+    copy_solver_parameters(self, sub);
+    sub.nV = self.nV;
+    sub.nB = nB;
+    sub.nS = self.nS;
+    sub.nF = nSubF;
+    sub.u = self.u;
+    sub.w = self.w;
+    sub.lockW = self.lockW;
+    sub.lockM = self.lockM;
+
+    // Frames keep their subject; fStart is rebuilt for the selected frames
+    sub.subjectID.resize(nSubF);
+    sub.fStart = Eigen::VectorXi::Zero(self.nS + 1);
+    sub.v.resize(3 * nSubF, self.nV);
+    sub.m.resize(4 * nSubF, 4 * nB);
+    for (int f = 0; f < nSubF; ++f) {
+        const int k = sorted[f];
+        sub.subjectID(f) = self.subjectID(k);
+        sub.fStart(self.subjectID(k) + 1)++;
+        sub.v.middleRows(3 * f, 3) = self.v.middleRows(3 * k, 3);
+        sub.m.middleRows(4 * f, 4) = self.m.middleRows(4 * k, 4);
+    }
+    for (int s = 0; s < self.nS; ++s) sub.fStart(s + 1) += sub.fStart(s);
+
+    // No topology: the smoothing operator is not used by the transformation update
+    {
+        py::gil_scoped_release release;
+        sub.computeTranformations();
+    }
+
+    for (int f = 0; f < nSubF; ++f) {
+        self.m.middleRows(4 * sorted[f], 4) = sub.m.middleRows(4 * f, 4);
+    }
+}
+
+// Read a value stored at an arbitrary address, reversing its bytes if requested
+template <typename T, bool Swap>
+inline T read_value(const char* p) {
+    T value;
+    if (Swap) {
+        char bytes[sizeof(T)];
+        std::reverse_copy(p, p + sizeof(T), bytes);
+        std::memcpy(&value, bytes, sizeof(T));
+    } else {
+        std::memcpy(&value, p, sizeof(T));
+    }
+    return value;
+}
+
+// Copy a strided [n, 3, cols] float buffer into a [3n, cols] solver matrix,
+// converting and byte-swapping on the fly.
+//
+// Strides are in bytes. The copy walks the destination in tiles so that both
+// vertex-major and frame-major sources are read with good locality, and tiles of
+// columns are spread over threads.
+template <typename T, bool Swap, typename Matrix>
+void copy_strided(Matrix& dst, const char* src, Eigen::Index n, Eigen::Index cols,
+                  Eigen::Index frameStride, Eigen::Index coordStride, Eigen::Index colStride) {
+    using DstScalar = typename Matrix::Scalar;
+    const int tile = 64;
+    const int nTiles = static_cast<int>((cols + tile - 1) / tile);
+
+    #pragma omp parallel for
+    for (int t = 0; t < nTiles; ++t) {
+        const Eigen::Index c0 = static_cast<Eigen::Index>(t) * tile;
+        const Eigen::Index c1 = std::min<Eigen::Index>(c0 + tile, cols);
+        for (Eigen::Index f0 = 0; f0 < n; f0 += tile / 3) {
+            const Eigen::Index f1 = std::min<Eigen::Index>(f0 + tile / 3, n);
+            for (Eigen::Index c = c0; c < c1; ++c) {
+                const char* column = src + c * colStride;
+                for (Eigen::Index f = f0; f < f1; ++f) {
+                    for (int k = 0; k < 3; ++k) {
+                        dst(3 * f + k, c) = static_cast<DstScalar>(
+                            read_value<T, Swap>(column + f * frameStride + k * coordStride));
+                    }
+                }
+            }
+        }
+    }
+}
+
+// Load a [3n, nV] or [n, 3, nV] float array into a solver matrix with a single copy.
+//
+// float32 and float64 buffers of either byte order, including numpy memory maps
+// and transposed views such as [n, nV, 3] point caches, are read in place with
+// their own strides, so no converted temporary is created on either side of the
+// binding. Other dtypes are converted to float64 first.
+template <typename Matrix>
+void load_matrix(Matrix& dst, py::array src) {
+    if (src.dtype().kind() != 'f' || (src.itemsize() != 4 && src.itemsize() != 8)) {
+        src = py::array_t<double, py::array::forcecast>::ensure(src);
+        if (!src) throw std::invalid_argument("Array must hold floating point values");
+    }
+
+    Eigen::Index n, frameStride, coordStride;
+    if (src.ndim() == 3 && src.shape(1) == 3) {
+        n = src.shape(0);
+        frameStride = src.strides(0);
+        coordStride = src.strides(1);
+    } else if (src.ndim() == 2 && src.shape(0) % 3 == 0) {
+        n = src.shape(0) / 3;
+        frameStride = 3 * src.strides(0);
+        coordStride = src.strides(0);
+    } else {
+        throw std::invalid_argument("Array must have shape [3 * n, nV] or [n, 3, nV]");
+    }
+    const Eigen::Index cols = src.shape(src.ndim() - 1);
+    const Eigen::Index colStride = src.strides(src.ndim() - 1);
+
+    dst.resize(3 * n, cols);
+    const bool single = src.itemsize() == 4;
+    const bool swap = !src.dtype().attr("isnative").cast<bool>();
+    const char* data = static_cast<const char*>(src.data());
+
+    py::gil_scoped_release release;
+    if (single && swap) {
+        copy_strided<float, true>(dst, data, n, cols, frameStride, coordStride, colStride);
+    } else if (single) {
+        copy_strided<float, false>(dst, data, n, cols, frameStride, coordStride, colStride);
+    } else if (swap) {
+        copy_strided<double, true>(dst, data, n, cols, frameStride, coordStride, colStride);
+    } else {
+        copy_strided<double, false>(dst, data, n, cols, frameStride, coordStride, colStride);
+    }
+}
+
+// Reconstruct the animated poses of selected frames by linear blend skinning.
+//
+// Returns a [3 * len(frames), nV] matrix; an empty selection reconstructs every frame.
+template <typename Class, typename Scalar>
+Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic> skinned_poses(const Class& self, std::vector<int> frames) {
+    using MatrixX = Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic>;
+    using SparseMatrix = Eigen::SparseMatrix<Scalar>;
+
+    const int nV = self.nV;
+    const int nB = self.nB;
+    if (self.w.rows() != nB || self.w.cols() != nV || self.m.rows() != self.nF * 4 || self.m.cols() != nB * 4) {
+        throw std::runtime_error("compute_skinned_poses requires solved weights and transformations");
+    }
+    if (self.subjectID.size() != self.nF || self.u.cols() != nV) {
+        throw std::runtime_error("compute_skinned_poses requires the rest pose and the frame layout");
+    }
+    if (frames.empty()) {
+        frames.resize(self.nF);
+        for (int k = 0; k < self.nF; ++k) frames[k] = k;
+    }
+    for (int k : frames) {
+        if (k < 0 || k >= self.nF) {
+            throw py::index_error("Frame index " + std::to_string(k) + " out of range (0-" + std::to_string(self.nF - 1) + ")");
+        }
+    }
+    const int n = static_cast<int>(frames.size());
+
+    MatrixX result = MatrixX::Zero(3 * n, nV);
+    {
+        py::gil_scoped_release release;
+        #pragma omp parallel for
+        for (int i = 0; i < nV; ++i) {
+            for (typename SparseMatrix::InnerIterator it(self.w, i); it; ++it) {
+                const int j = static_cast<int>(it.row());
+                for (int f = 0; f < n; ++f) {
+                    const int k = frames[f];
+                    const auto rest = self.u.col(i).template segment<3>(3 * self.subjectID(k));
+                    result.col(i).template segment<3>(3 * f) += it.value() *
+                        (self.m.template block<3, 3>(4 * k, 4 * j) * rest + self.m.template block<3, 1>(4 * k, 4 * j + 3));
+                }
+            }
+        }
+    }
+    return result;
+}
+
+// Gather the positive weights of vertex i and move its k largest to the front,
+// ordered by decreasing weight and then by bone index. Returns the number kept.
+template <typename Scalar, typename SparseMatrix>
+int collect_influences(const SparseMatrix& w, int i, int k, std::vector<std::pair<Scalar, int>>& entries) {
+    entries.clear();
+    for (typename SparseMatrix::InnerIterator it(w, i); it; ++it) {
+        if (it.value() > 0) entries.emplace_back(it.value(), static_cast<int>(it.row()));
+    }
+    const int n = std::min(k, static_cast<int>(entries.size()));
+    std::partial_sort(entries.begin(), entries.begin() + n, entries.end(),
+                      [](const std::pair<Scalar, int>& a, const std::pair<Scalar, int>& b) {
+                          return a.first > b.first || (a.first == b.first && a.second < b.second);
+                      });
+    return n;
+}
+
+// Export the k largest weights of every vertex as a dense influence table.
+//
+// Returns ([nV, k] bone indices, [nV, k] weights) with the influences of each vertex
+// sorted by decreasing weight and renormalised to sum to one. Unused slots hold bone 0
+// with weight 0.
+template <typename Class, typename Scalar>
+py::tuple top_influences(const Class& self, int k) {
+    if (k <= 0) throw std::invalid_argument("Number of influences must be positive");
+    const int nV = self.nV;
+    if (nV <= 0 || self.w.rows() != self.nB || self.w.cols() != nV) {
+        throw std::runtime_error("Influence export requires solved weights");
+    }
+
+    py::array_t<int> indices({static_cast<py::ssize_t>(nV), static_cast<py::ssize_t>(k)});
+    py::array_t<Scalar> weights({static_cast<py::ssize_t>(nV), static_cast<py::ssize_t>(k)});
+    int* indexData = indices.mutable_data();
+    Scalar* weightData = weights.mutable_data();
+    {
+        py::gil_scoped_release release;
+        #pragma omp parallel
+        {
+            std::vector<std::pair<Scalar, int>> entries;
+            #pragma omp for
+            for (int i = 0; i < nV; ++i) {
+                const int n = collect_influences<Scalar>(self.w, i, k, entries);
+                Scalar sum = 0;
+                for (int j = 0; j < n; ++j) sum += entries[j].first;
+                int* index = indexData + static_cast<size_t>(i) * k;
+                Scalar* weight = weightData + static_cast<size_t>(i) * k;
+                for (int j = 0; j < k; ++j) {
+                    index[j] = j < n ? entries[j].second : 0;
+                    weight[j] = j < n ? entries[j].first / sum : Scalar(0);
+                }
+            }
+        }
+    }
+    return py::make_tuple(indices, weights);
+}
+
+// Check that skinning can be evaluated on the given frames
+template <typename Class>
+void check_skinning_frames(const Class& self, const std::vector<int>& frames, const char* name) {
+    if (self.m.rows() != self.nF * 4 || self.m.cols() != self.nB * 4) {
+        throw std::runtime_error(std::string(name) + " requires solved transformations");
+    }
+    if (self.subjectID.size() != self.nF || self.u.cols() != self.nV) {
+        throw std::runtime_error(std::string(name) + " requires the rest pose and the frame layout");
+    }
+    for (int k : frames) {
+        if (k < 0 || k >= self.nF) {
+            throw py::index_error("Frame index " + std::to_string(k) + " out of range (0-" + std::to_string(self.nF - 1) + ")");
+        }
+    }
+}
+
+// Quantise the k largest weights of every vertex to unsigned fixed point.
+//
+// The renormalised weights are scaled to the largest value of Unorm and rounded with
+// the largest remainder method, so the quantised weights of every weighted vertex sum
+// to exactly that value. For the given frames the skinned position of every vertex is
+// compared with the one of the full precision weights; the largest distance per vertex
+// is returned, or None without frames.
+//
+// Returns ([nV, k] bone indices, [nV, k] quantised weights, [nV] errors or None).
+template <typename Class, typename Scalar, typename Unorm>
+py::tuple quantized_influences(const Class& self, int k, const std::vector<int>& frames) {
+    using Vector3 = Eigen::Matrix<Scalar, 3, 1>;
+    using SparseMatrix = Eigen::SparseMatrix<Scalar>;
+
+    if (k <= 0) throw std::invalid_argument("Number of influences must be positive");
+    const int nV = self.nV;
+    if (nV <= 0 || self.w.rows() != self.nB || self.w.cols() != nV) {
+        throw std::runtime_error("Weight quantisation requires solved weights");
+    }
+    const bool report = !frames.empty();
+    if (report) check_skinning_frames(self, frames, "The quantisation error report");
+
+    const int scale = std::numeric_limits<Unorm>::max();
+    py::array_t<int> indices({static_cast<py::ssize_t>(nV), static_cast<py::ssize_t>(k)});
+    py::array_t<Unorm> weights({static_cast<py::ssize_t>(nV), static_cast<py::ssize_t>(k)});
+    py::array_t<Scalar> errors(report ? nV : 0);
+    int* indexData = indices.mutable_data();
+    Unorm* weightData = weights.mutable_data();
+    Scalar* errorData = errors.mutable_data();
+    {
+        py::gil_scoped_release release;
+        #pragma omp parallel
+        {
+            std::vector<std::pair<Scalar, int>> entries;
+            std::vector<std::pair<Scalar, int>> remainders;
+            std::vector<int> units(k);
+            #pragma omp for
+            for (int i = 0; i < nV; ++i) {
+                const int n = collect_influences<Scalar>(self.w, i, k, entries);
+                Scalar sum = 0;
+                for (int j = 0; j < n; ++j) sum += entries[j].first;
+
+                // Round down, then hand the units lost to the largest remainders; earlier slots win ties
+                int total = 0;
+                remainders.clear();
+                for (int j = 0; j < n; ++j) {
+                    const Scalar exact = entries[j].first / sum * scale;
+                    units[j] = static_cast<int>(std::floor(exact));
+                    total += units[j];
+                    remainders.emplace_back(exact - units[j], j);
+                }
+                const int missing = n > 0 ? std::min(std::max(scale - total, 0), n) : 0;
+                std::partial_sort(remainders.begin(), remainders.begin() + missing, remainders.end(),
+                                  [](const std::pair<Scalar, int>& a, const std::pair<Scalar, int>& b) {
+                                      return a.first > b.first || (a.first == b.first && a.second < b.second);
+                                  });
+                for (int r = 0; r < missing; ++r) ++units[remainders[r].second];
+
+                int* index = indexData + static_cast<size_t>(i) * k;
+                Unorm* weight = weightData + static_cast<size_t>(i) * k;
+                for (int j = 0; j < k; ++j) {
+                    index[j] = j < n ? entries[j].second : 0;
+                    weight[j] = static_cast<Unorm>(j < n ? units[j] : 0);
+                }
+                if (!report) continue;
+
+                Scalar worst = 0;
+                for (int f : frames) {
+                    const auto rest = self.u.col(i).template segment<3>(3 * self.subjectID(f));
+                    Vector3 difference = Vector3::Zero();
+                    for (typename SparseMatrix::InnerIterator it(self.w, i); it; ++it) {
+                        const int j = static_cast<int>(it.row());
+                        difference += it.value() *
+                            (self.m.template block<3, 3>(4 * f, 4 * j) * rest + self.m.template block<3, 1>(4 * f, 4 * j + 3));
+                    }
+                    for (int j = 0; j < n; ++j) {
+                        const int b = entries[j].second;
+                        difference -= (Scalar(units[j]) / scale) *
+                            (self.m.template block<3, 3>(4 * f, 4 * b) * rest + self.m.template block<3, 1>(4 * f, 4 * b + 3));
+                    }
+                    worst = std::max(worst, difference.norm());
+                }
+                errorData[i] = worst;
+            }
+        }
+    }
+    return py::make_tuple(indices, weights, report ? py::object(errors) : py::object(py::none()));
+}
+
+// Reconstruct the animated poses of selected frames by dual quaternion skinning.
+//
+// The rigid transformations of all bones and frames are converted to unit dual
+// quaternions first. Every vertex then blends the dual quaternions of its k largest
+// weights (all weights for k <= 0), flipped into the hemisphere of its strongest
+// influence, normalises the blend and applies it to its rest position. Scale and shear
+// are not represented, as the solved transformations are rigid.
+//
+// Returns a [3 * len(frames), nV] matrix; an empty selection reconstructs every frame.
+template <typename Class, typename Scalar>
+Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic> dual_quaternion_poses(const Class& self, std::vector<int> frames, int k) {
+    using MatrixX = Eigen::Matrix<Scalar, Eigen::Dynamic, Eigen::Dynamic>;
+    using Matrix3 = Eigen::Matrix<Scalar, 3, 3>;
+    using Vector3 = Eigen::Matrix<Scalar, 3, 1>;
+    using Vector4 = Eigen::Matrix<Scalar, 4, 1>;
+    using Quaternion = Eigen::Quaternion<Scalar>;
+
+    const int nV = self.nV;
+    const int nB = self.nB;
+    if (self.w.rows() != nB || self.w.cols() != nV) {
+        throw std::runtime_error("compute_dual_quaternion_poses requires solved weights");
+    }
+    check_skinning_frames(self, frames, "compute_dual_quaternion_poses");
+    if (frames.empty()) {
+        frames.resize(self.nF);
+        for (int f = 0; f < self.nF; ++f) frames[f] = f;
+    }
+    const int n = static_cast<int>(frames.size());
+    if (k <= 0) k = nB;
+
+    MatrixX result = MatrixX::Zero(3 * n, nV);
+    {
+        py::gil_scoped_release release;
+
+        // Real parts (x, y, z, w) and dual parts of every frame and bone
+        std::vector<Vector4> real(static_cast<size_t>(n) * nB);
+        std::vector<Vector4> dual(static_cast<size_t>(n) * nB);
+        #pragma omp parallel for
+        for (int c = 0; c < n * nB; ++c) {
+            const int f = frames[c / nB];
+            const int j = c % nB;
+            const Matrix3 rotation = self.m.template block<3, 3>(4 * f, 4 * j);
+            const Vector3 translation = self.m.template block<3, 1>(4 * f, 4 * j + 3);
+            const Quaternion q = Quaternion(rotation).normalized();
+            const Quaternion t(Scalar(0), translation.x(), translation.y(), translation.z());
+            real[c] = q.coeffs();
+            dual[c] = Scalar(0.5) * (t * q).coeffs();
+        }
+
+        #pragma omp parallel
+        {
+            std::vector<std::pair<Scalar, int>> entries;
+            #pragma omp for
+            for (int i = 0; i < nV; ++i) {
+                const int count = collect_influences<Scalar>(self.w, i, k, entries);
+                if (count == 0) continue;
+                for (int f = 0; f < n; ++f) {
+                    const Vector4* frameReal = real.data() + static_cast<size_t>(f) * nB;
+                    const Vector4* frameDual = dual.data() + static_cast<size_t>(f) * nB;
+                    const Vector4& pivot = frameReal[entries[0].second];
+                    Vector4 blendReal = Vector4::Zero();
+                    Vector4 blendDual = Vector4::Zero();
+                    for (int e = 0; e < count; ++e) {
+                        const int j = entries[e].second;
+                        const Scalar weight = frameReal[j].dot(pivot) < 0 ? -entries[e].first : entries[e].first;
+                        blendReal += weight * frameReal[j];
+                        blendDual += weight * frameDual[j];
+                    }
+                    const Scalar norm = blendReal.norm();
+                    const Quaternion q(blendReal / norm);
+                    const Quaternion d(blendDual / norm);
+                    const Vector3 translation = Scalar(2) * (d * q.conjugate()).vec();
+                    const Vector3 rest = self.u.col(i).template segment<3>(3 * self.subjectID(frames[f]));
+                    result.col(i).template segment<3>(3 * f) = q * rest + translation;
+                }
+            }
+        }
+    }
+    return result;
+}
+
+// Check that face vertex indices lie in [0, nV); nV <= 0 only checks the sign
+inline void check_face_indices(const int* indices, size_t count, int nV) {
+    for (size_t i = 0; i < count; ++i) {
+        if (indices[i] < 0 || (nV > 0 && indices[i] >= nV)) {
+            throw py::index_error("Face vertex index " + std::to_string(indices[i]) + " out of range");
+        }
+    }
+}
+
+// Fill the face list from a [nFaces, k] vertex index array in one pass
+template <typename Class>
+void set_faces(Class& self, const py::array_t<int, py::array::c_style | py::array::forcecast>& faces) {
+    if (faces.ndim() != 2 || faces.shape(1) < 3) {
+        throw std::invalid_argument("Faces must have shape [num_faces, k] with k >= 3");
+    }
+    const size_t nFaces = static_cast<size_t>(faces.shape(0));
+    const size_t k = static_cast<size_t>(faces.shape(1));
+    const int* data = faces.data();
+
+    std::vector<std::vector<int>> fv;
+    {
+        py::gil_scoped_release release;
+        check_face_indices(data, nFaces * k, self.nV);
+        fv.resize(nFaces);
+        for (size_t f = 0; f < nFaces; ++f) fv[f].assign(data + f * k, data + (f + 1) * k);
+    }
+    self.fv.swap(fv);
+}
+
+// Fill the face list from polygons of mixed size given as CSR offsets and indices
+template <typename Class>
+void set_faces_csr(Class& self, const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& offsets,
+                   const py::array_t<int, py::array::c_style | py::array::forcecast>& indices) {
+    if (offsets.ndim() != 1 || offsets.size() < 1 || indices.ndim() != 1) {
+        throw std::invalid_argument("Offsets and indices must be 1D arrays");
+    }
+    const size_t nFaces = static_cast<size_t>(offsets.size() - 1);
+    const int64_t* offset = offsets.data();
+    const int* data = indices.data();
+    if (offset[0] != 0 || offset[nFaces] != indices.size()) {
+        throw std::invalid_argument("Offsets must start at 0 and end at the number of indices");
+    }
+
+    std::vector<std::vector<int>> fv;
+    {
+        py::gil_scoped_release release;
+        for (size_t f = 0; f < nFaces; ++f) {
+            if (offset[f + 1] - offset[f] < 3) {
+                throw std::invalid_argument("Face " + std::to_string(f) + " has fewer than 3 vertices");
+            }
+        }
+        check_face_indices(data, static_cast<size_t>(indices.size()), self.nV);
+        fv.resize(nFaces);
+        for (size_t f = 0; f < nFaces; ++f) fv[f].assign(data + offset[f], data + offset[f + 1]);
+    }
+    self.fv.swap(fv);
+}
+
+// Get the face list as CSR offsets and indices
+template <typename Class>
+py::tuple get_faces(const Class& self) {
+    py::array_t<int64_t> offsets(static_cast<py::ssize_t>(self.fv.size() + 1));
+    int64_t* offset = offsets.mutable_data();
+    offset[0] = 0;
+    for (size_t f = 0; f < self.fv.size(); ++f) offset[f + 1] = offset[f] + static_cast<int64_t>(self.fv[f].size());
+
+    py::array_t<int> indices(static_cast<py::ssize_t>(offset[self.fv.size()]));
+    int* data = indices.mutable_data();
+    for (size_t f = 0; f < self.fv.size(); ++f) std::copy(self.fv[f].begin(), self.fv[f].end(), data + offset[f]);
+    return py::make_tuple(offsets, indices);
+}
+
+// Weight smoothing Laplacian and its LU factorization. Native instances of the same
+// mesh and animation share one factorization (bound in py_dem_bones_smoothing.cpp).
+template <typename Scalar>
+struct SmoothingSolver {
+    using SparseMatrix = Eigen::SparseMatrix<Scalar>;
+
+    SparseMatrix laplacian;
+    std::shared_ptr<const Eigen::SparseLU<SparseMatrix>> solver;
+};
+
+// Build the weight smoothing solver from precomputed mesh topology.
+//
+// Produces the same operator as DemBones::computeSmoothSolver from the unique mesh
+// edges [nE, 2], the edge lengths of every subject's rest pose [nS, nE] and the
+// summed length of all face edges. The edge weights still depend on the animated
+// poses and are computed in parallel, but the edges are not deduplicated under a
+// lock and the rows are normalized while the matrix is assembled instead of by
+// scaling rows of a column-major matrix.
+template <typename Class, typename Scalar>
+std::shared_ptr<SmoothingSolver<Scalar>> build_smoothing_solver(
+    const Class& self, const py::array_t<int, py::array::c_style | py::array::forcecast>& edges,
+    const py::array_t<double, py::array::c_style | py::array::forcecast>& rest_lengths, double edge_length_sum) {
+    using SparseMatrix = Eigen::SparseMatrix<Scalar>;
+    using Triplet = Eigen::Triplet<Scalar>;
+    using VectorX = Eigen::Matrix<Scalar, Eigen::Dynamic, 1>;
+
+    if (edges.ndim() != 2 || edges.shape(1) != 2) {
+        throw std::invalid_argument("Edges must have shape [num_edges, 2]");
+    }
+    const int nE = static_cast<int>(edges.shape(0));
+    const int nV = self.nV;
+    const int nS = self.nS;
+    if (rest_lengths.ndim() != 2 || rest_lengths.shape(0) != nS || rest_lengths.shape(1) != nE) {
+        throw std::invalid_argument("Rest edge lengths must have shape [num_subjects, num_edges]");
+    }
+    if (self.v.rows() != 3 * self.nF || self.v.cols() != nV || self.fStart.size() != nS + 1) {
+        throw std::runtime_error("build_smoothing_solver requires the animated poses and the frame layout");
+    }
+    const int* edge = edges.data();
+    const double* du = rest_lengths.data();
+    check_face_indices(edge, static_cast<size_t>(2 * nE), nV);
+
+    auto smoothing = std::make_shared<SmoothingSolver<Scalar>>();
+    {
+        py::gil_scoped_release release;
+        const Scalar epsDis = static_cast<Scalar>(edge_length_sum) * self.weightEps / static_cast<Scalar>(nS);
+
+        std::vector<double> val(nE);
+        #pragma omp parallel for
+        for (int e = 0; e < nE; ++e) {
+            const int i = edge[2 * e];
+            const int j = edge[2 * e + 1];
+            double sum = 0;
+            for (int s = 0; s < nS; ++s) {
+                for (int k = self.fStart(s); k < self.fStart(s + 1); ++k) {
+                    sum += std::pow((self.v.col(i).template segment<3>(3 * k).template cast<Scalar>() -
+                                     self.v.col(j).template segment<3>(3 * k).template cast<Scalar>()).norm() -
+                                    du[s * nE + e], 2);
+                }
+            }
+            val[e] = 1 / (std::sqrt(sum / self.nF) + epsDis);
+        }
+
+        VectorX d = VectorX::Zero(nV);
+        for (int e = 0; e < nE; ++e) {
+            d(edge[2 * e]) += val[e];
+            d(edge[2 * e + 1]) += val[e];
+        }
+
+        const Scalar step = self.weightsSmoothStep;
+        std::vector<Triplet> triplets;
+        triplets.reserve(2 * static_cast<size_t>(nE) + nV);
+        for (int e = 0; e < nE; ++e) {
+            const int i = edge[2 * e];
+            const int j = edge[2 * e + 1];
+            triplets.emplace_back(i, j, static_cast<Scalar>(-val[e]) / d(i) * step);
+            triplets.emplace_back(j, i, static_cast<Scalar>(-val[e]) / d(j) * step);
+        }
+        for (int i = 0; i < nV; ++i) {
+            triplets.emplace_back(i, i, (d(i) != 0 ? d(i) / d(i) : Scalar(0)) * step + 1);
+        }
+        smoothing->laplacian.resize(nV, nV);
+        smoothing->laplacian.setFromTriplets(triplets.begin(), triplets.end());
+
+        auto solver = std::make_shared<Eigen::SparseLU<SparseMatrix>>();
+        solver->compute(smoothing->laplacian);
+        if (solver->info() != Eigen::Success) {
+            throw std::runtime_error("Failed to factorize the weight smoothing Laplacian");
+        }
+        smoothing->solver = std::move(solver);
+    }
+    return smoothing;
+}
+
+// Install a weight smoothing solver, which init() then keeps instead of building its own
+template <typename Class, typename Scalar>
+void set_smoothing_solver(Class& self, const SmoothingSolver<Scalar>& smoothing) {
+    if (smoothing.laplacian.cols() != self.nV) {
+        throw std::invalid_argument("Smoothing solver has " + std::to_string(smoothing.laplacian.cols()) +
+                                    " vertices, expected " + std::to_string(self.nV));
+    }
+    self.setSmoothSolver(smoothing.laplacian, smoothing.solver);
+}
+
+}  // namespace py_dem_bones
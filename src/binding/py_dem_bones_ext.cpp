@@ -5,6 +5,8 @@
 
 #include <DemBones/DemBonesExt.h>
 
+#include "py_dem_bones_common.h"
+
 // Define ssize_t for Windows compatibility
 #ifdef _WIN32
     #include <BaseTsd.h>
@@ -127,12 +129,75 @@ void bind_dem_bones_ext(py::module& m, const std::string& type_suffix) {
             })
 
         // Methods - direct call to C++ methods
-        .def("compute", &Class::compute)
-        .def("computeWeights", &Class::computeWeights)
-        .def("computeTranformations", &Class::computeTranformations)
-        .def("init", &Class::init)
-        .def("rmse", &Class::rmse)
+        // Methods taking num_threads limit the OpenMP threads of the call; 0 keeps the current limit.
+        // The solve methods release the GIL, so an instance must not be modified while they run.
+        .def("compute", [](Class& self, int num_threads) {
+            py::gil_scoped_release release;
+            py_dem_bones::ThreadLimit limit(num_threads);
+            self.compute();
+        }, py::arg("num_threads") = 0)
+        .def("computeWeights", [](Class& self, int num_threads) {
+            py::gil_scoped_release release;
+            py_dem_bones::ThreadLimit limit(num_threads);
+            self.computeWeights();
+        }, py::arg("num_threads") = 0)
+        .def("computeTranformations", [](Class& self, int num_threads) {
+            py::gil_scoped_release release;
+            py_dem_bones::ThreadLimit limit(num_threads);
+            self.computeTranformations();
+        }, py::arg("num_threads") = 0)
+        .def("init", [](Class& self, int num_threads) {
+            py::gil_scoped_release release;
+            py_dem_bones::ThreadLimit limit(num_threads);
+            self.init();
+        }, py::arg("num_threads") = 0)
+        .def("rmse", [](Class& self, int num_threads) {
+            py::gil_scoped_release release;
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return self.rmse();
+        }, py::arg("num_threads") = 0)
         .def("clear", &Class::clear)
+        .def("resolve_region", [](Class& self, const std::vector<int>& vertices, int rings, int nIters,
+                                  const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& vertex_face_offsets,
+                                  const py::array_t<int, py::array::c_style | py::array::forcecast>& vertex_faces,
+                                  int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return py_dem_bones::resolve_region<Class, Scalar>(self, vertices, rings, nIters, vertex_face_offsets,
+                                                               vertex_faces);
+        }, py::arg("vertices"), py::arg("rings") = 1, py::arg("nIters") = -1,
+           py::arg("vertex_face_offsets") = py::array_t<int64_t>(0), py::arg("vertex_faces") = py::array_t<int>(0),
+           py::arg("num_threads") = 0)
+        .def("compute_frame_transformations", [](Class& self, const std::vector<int>& frames, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            py_dem_bones::compute_frame_transformations(self, frames);
+        }, py::arg("frames"), py::arg("num_threads") = 0)
+        .def("compute_skinned_poses", [](const Class& self, const std::vector<int>& frames, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return py_dem_bones::skinned_poses<Class, Scalar>(self, frames);
+        }, py::arg("frames") = std::vector<int>(), py::arg("num_threads") = 0)
+        .def("compute_dual_quaternion_poses", [](const Class& self, const std::vector<int>& frames, int k, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return py_dem_bones::dual_quaternion_poses<Class, Scalar>(self, frames, k);
+        }, py::arg("frames") = std::vector<int>(), py::arg("k") = 0, py::arg("num_threads") = 0)
+        .def("get_influences", [](const Class& self, int k, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return py_dem_bones::top_influences<Class, Scalar>(self, k);
+        }, py::arg("k"), py::arg("num_threads") = 0)
+        .def("quantize_influences", [](const Class& self, int k, int bits, const std::vector<int>& frames, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            if (bits == 8) return py_dem_bones::quantized_influences<Class, Scalar, uint8_t>(self, k, frames);
+            if (bits == 16) return py_dem_bones::quantized_influences<Class, Scalar, uint16_t>(self, k, frames);
+            throw std::invalid_argument("Quantised weights must have 8 or 16 bits");
+        }, py::arg("k"), py::arg("bits") = 8, py::arg("frames") = std::vector<int>(), py::arg("num_threads") = 0)
+        .def("build_smoothing_solver", [](const Class& self, const py::array_t<int, py::array::c_style | py::array::forcecast>& edges,
+                                          const py::array_t<double, py::array::c_style | py::array::forcecast>& rest_lengths,
+                                          double edge_length_sum, int num_threads) {
+            py_dem_bones::ThreadLimit limit(num_threads);
+            return py_dem_bones::build_smoothing_solver<Class, Scalar>(self, edges, rest_lengths, edge_length_sum);
+        }, py::arg("edges"), py::arg("rest_lengths"), py::arg("edge_length_sum"), py::arg("num_threads") = 0)
+        .def("set_smoothing_solver", [](Class& self, const py_dem_bones::SmoothingSolver<Scalar>& solver) {
+            py_dem_bones::set_smoothing_solver<Class, Scalar>(self, solver);
+        }, py::arg("solver"))
         .def("computeRTB", [](Class& self, int s, bool degreeRot) {
             // Initialize missing attributes if needed
             if (self.bind.size() == 0) {
@@ -272,12 +337,31 @@ void bind_dem_bones_ext(py::module& m, const std::string& type_suffix) {
         .def("set_rest_pose", [](Class& self, const MatrixX& rest_pose) {
             self.u = rest_pose;
         })
+        .def("load_rest_pose", [](Class& self, py::array rest_pose) {
+            py_dem_bones::load_matrix(self.u, rest_pose);
+        }, py::arg("rest_pose"))
         .def("get_animated_poses", [](const Class& self) {
             return self.v;
         })
         .def("set_animated_poses", [](Class& self, const MatrixX& animated_poses) {
             self.v = animated_poses;
         })
+        .def("load_animated_poses", [](Class& self, py::array animated_poses) {
+            py_dem_bones::load_matrix(self.v, animated_poses);
+        }, py::arg("animated_poses"))
+        .def("set_animated_frames", [](Class& self, const std::vector<int>& frames, const MatrixX& poses) {
+            py_dem_bones::set_animated_frames<Class, Scalar, AniMeshScalar>(self, frames, poses);
+        }, py::arg("frames"), py::arg("poses"))
+        .def("get_faces", [](const Class& self) {
+            return py_dem_bones::get_faces(self);
+        })
+        .def("set_faces", [](Class& self, const py::array_t<int, py::array::c_style | py::array::forcecast>& faces) {
+            py_dem_bones::set_faces(self, faces);
+        }, py::arg("faces"))
+        .def("set_faces", [](Class& self, const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& offsets,
+                             const py::array_t<int, py::array::c_style | py::array::forcecast>& indices) {
+            py_dem_bones::set_faces_csr(self, offsets, indices);
+        }, py::arg("offsets"), py::arg("indices"))
         .def("get_bone_names", [](const Class& self) {
             return self.boneName;
         })
@@ -0,0 +1,115 @@
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+
+#include <cstdlib>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+namespace py = pybind11;
+
+namespace {
+
+inline bool is_blank(char c) {
+    return c == ' ' || c == '\t' || c == '\r';
+}
+
+// Vertex positions and polygon faces of a Wavefront OBJ file.
+struct ObjMesh {
+    std::vector<double> vertices;
+    std::vector<int> faceSizes;
+    std::vector<int> faceIndices;
+};
+
+// Parse the `v` and `f` records of an OBJ file held in a NUL-terminated buffer.
+//
+// Texture and normal references of face corners are skipped, and negative
+// (relative) indices are resolved against the vertices read so far. All other
+// records are ignored.
+ObjMesh parse_obj_buffer(const char* data, size_t size) {
+    ObjMesh mesh;
+    const char* p = data;
+    const char* end = data + size;
+    int line = 1;
+
+    while (p < end) {
+        while (p < end && is_blank(*p)) ++p;
+
+        if (p + 1 < end && p[0] == 'v' && is_blank(p[1])) {
+            p += 2;
+            for (int k = 0; k < 3; ++k) {
+                while (p < end && is_blank(*p)) ++p;
+                char* next = nullptr;
+                const double value = (p < end && *p != '\n') ? std::strtod(p, &next) : 0.0;
+                if (next == nullptr || next == p) {
+                    throw std::invalid_argument("Invalid vertex on line " + std::to_string(line));
+                }
+                mesh.vertices.push_back(value);
+                p = next;
+            }
+        } else if (p + 1 < end && p[0] == 'f' && is_blank(p[1])) {
+            p += 2;
+            const int numVertices = static_cast<int>(mesh.vertices.size() / 3);
+            int count = 0;
+            while (true) {
+                while (p < end && is_blank(*p)) ++p;
+                if (p >= end || *p == '\n' || *p == '#') break;
+
+                char* next = nullptr;
+                const long index = std::strtol(p, &next, 10);
+                if (next == p || index == 0) {
+                    throw std::invalid_argument("Invalid face on line " + std::to_string(line));
+                }
+                mesh.faceIndices.push_back(static_cast<int>(index < 0 ? numVertices + index : index - 1));
+                ++count;
+
+                // Skip the texture and normal references of the corner
+                p = next;
+                while (p < end && !is_blank(*p) && *p != '\n') ++p;
+            }
+            if (count < 3) {
+                throw std::invalid_argument("Face with fewer than 3 vertices on line " + std::to_string(line));
+            }
+            mesh.faceSizes.push_back(count);
+        }
+
+        while (p < end && *p != '\n') ++p;
+        ++p;
+        ++line;
+    }
+
+    return mesh;
+}
+
+template <typename T>
+py::array_t<T> to_array(std::vector<T>&& values) {
+    auto* owner = new std::vector<T>(std::move(values));
+    py::capsule release(owner, [](void* ptr) { delete static_cast<std::vector<T>*>(ptr); });
+    return py::array_t<T>(owner->size(), owner->data(), release);
+}
+
+}  // namespace
+
+void init_io(py::module& m) {
+    m.def("parse_obj", [](const py::bytes& data) {
+        char* buffer = nullptr;
+        Py_ssize_t size = 0;
+        if (PyBytes_AsStringAndSize(data.ptr(), &buffer, &size) != 0) throw py::error_already_set();
+
+        ObjMesh mesh;
+        {
+            py::gil_scoped_release release;
+            mesh = parse_obj_buffer(buffer, static_cast<size_t>(size));
+        }
+
+        const py::ssize_t numVertices = static_cast<py::ssize_t>(mesh.vertices.size() / 3);
+        py::array_t<double> vertices = to_array(std::move(mesh.vertices));
+        return py::make_tuple(
+            vertices.reshape({numVertices, py::ssize_t(3)}),
+            to_array(std::move(mesh.faceSizes)),
+            to_array(std::move(mesh.faceIndices)));
+    }, py::arg("data"),
+    "Parse the vertex positions and faces of an OBJ file.\n\n"
+    "Returns a tuple (vertices [nV, 3], face_sizes [nFaces], face_indices [sum(face_sizes)]) "
+    "with zero-based vertex indices. The GIL is released while parsing.");
+}
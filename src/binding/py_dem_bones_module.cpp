@@ -1,18 +1,69 @@
 #include <pybind11/pybind11.h>
 
+#include <Eigen/Core>
+
+#include <string>
+
+#ifdef _OPENMP
+#include <omp.h>
+#endif
+
 namespace py = pybind11;
 
 // Forward declarations
 void init_dem_bones(py::module& m);
 void init_dem_bones_ext(py::module& m);
+void init_io(py::module& m);
+void init_smoothing(py::module& m);
 
+// The module keeps no global state and the solver methods release the GIL, so it can
+// run without the GIL on free-threaded Python builds (pybind11 >= 2.13)
+#if PYBIND11_VERSION_HEX >= 0x020D0000
+PYBIND11_MODULE(_py_dem_bones, m, py::mod_gil_not_used()) {
+#else
 PYBIND11_MODULE(_py_dem_bones, m) {
+#endif
     m.doc() = "Python bindings for the Dem Bones library";
 
     // Add version information
     m.attr("__dem_bones_version__") = "1.2.1";
 
+    m.def("build_info", []() {
+        py::dict info;
+#ifdef _OPENMP
+        info["openmp"] = true;
+        info["openmp_version"] = _OPENMP;
+        info["max_threads"] = omp_get_max_threads();
+#else
+        info["openmp"] = false;
+        info["openmp_version"] = py::none();
+        info["max_threads"] = 1;
+#endif
+        info["simd"] = std::string(Eigen::SimdInstructionSetsInUse());
+        info["eigen_version"] = std::to_string(EIGEN_WORLD_VERSION) + "." + std::to_string(EIGEN_MAJOR_VERSION) + "." +
+                                std::to_string(EIGEN_MINOR_VERSION);
+#if defined(EIGEN_USE_MKL_ALL) || defined(EIGEN_USE_MKL_VML)
+        info["blas"] = "mkl";
+#elif defined(EIGEN_USE_BLAS)
+        info["blas"] = "blas";
+#else
+        info["blas"] = "eigen";
+#endif
+#ifdef EIGEN_USE_LAPACKE
+        info["lapack"] = "lapacke";
+#else
+        info["lapack"] = "eigen";
+#endif
+        return info;
+    },
+    "Get the features the native module was built with.\n\n"
+    "Returns a dict with whether OpenMP is enabled, the OpenMP version and default maximum "
+    "number of threads, the SIMD instruction sets used by Eigen, the Eigen version and the "
+    "BLAS and LAPACK backends (\"eigen\" for Eigen's built-in kernels).");
+
     // Initialize submodules
+    init_smoothing(m);
     init_dem_bones(m);
     init_dem_bones_ext(m);
+    init_io(m);
 }
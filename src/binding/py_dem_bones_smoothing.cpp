@@ -0,0 +1,25 @@
+#include <pybind11/pybind11.h>
+
+#include "py_dem_bones_common.h"
+
+namespace py = pybind11;
+
+namespace {
+
+template <typename Scalar>
+void bind_smoothing_solver(py::module& m, const std::string& suffix) {
+    using Smoothing = py_dem_bones::SmoothingSolver<Scalar>;
+
+    py::class_<Smoothing, std::shared_ptr<Smoothing>>(m, ("SmoothingSolver" + suffix).c_str())
+        .def_property_readonly("num_vertices", [](const Smoothing& self) { return self.laplacian.cols(); })
+        .def_property_readonly("num_nonzeros", [](const Smoothing& self) { return self.laplacian.nonZeros(); })
+        .doc() = "Weight smoothing Laplacian and its LU factorization, shared by the native instances it is set on.\n\n"
+                 "Created by build_smoothing_solver() and installed with set_smoothing_solver().";
+}
+
+}  // namespace
+
+void init_smoothing(py::module& m) {
+    bind_smoothing_solver<double>(m, "");
+    bind_smoothing_solver<float>(m, "F");
+}
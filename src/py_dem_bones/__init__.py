@@ -7,7 +7,12 @@ with bone transformations from a set of example meshes.
 
 # Import local modules
 from py_dem_bones.__version__ import __version__
-from py_dem_bones._py_dem_bones import DemBones as _DemBones, DemBonesExt as _DemBonesExt, __dem_bones_version__
+from py_dem_bones._py_dem_bones import (
+    DemBones as _DemBones,
+    DemBonesExt as _DemBonesExt,
+    __dem_bones_version__,
+    build_info,
+)
 from py_dem_bones.base import DemBonesExtWrapper, DemBonesWrapper
 from py_dem_bones.exceptions import (
     ComputationError,
@@ -37,6 +42,7 @@ __all__ = [
     "DemBonesWrapper",
     "DemBonesExtWrapper",
     # Utility functions
+    "build_info",
     "numpy_to_eigen",
     "eigen_to_numpy",
     # Exception classes
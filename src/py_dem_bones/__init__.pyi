@@ -11,6 +11,7 @@ from py_dem_bones._py_dem_bones import DemBones
 from py_dem_bones._py_dem_bones import DemBones as _DemBones
 from py_dem_bones._py_dem_bones import DemBonesExt as _DemBonesExt
 from py_dem_bones._py_dem_bones import DemBonesExt
+from py_dem_bones._py_dem_bones import build_info
 from py_dem_bones.base import DemBonesExtWrapper
 from py_dem_bones.base import DemBonesWrapper
 from py_dem_bones.exceptions import ComputationError
@@ -25,9 +26,19 @@ from py_dem_bones.interfaces.dcc import DCCInterface
 from py_dem_bones.utils import eigen_to_numpy
 from py_dem_bones.utils import numpy_to_eigen
 from . import _py_dem_bones
+from . import animation
 from . import base
+from . import cache
+from . import codec
+from . import corrective
 from . import exceptions
 from . import interfaces
+from . import io
+from . import multires
+from . import preprocess
+from . import runtime
+from . import storage
+from . import topology
 from . import utils
 
 __all__: list = [
@@ -37,6 +48,7 @@ __all__: list = [
     "_DemBonesExt",
     "DemBonesWrapper",
     "DemBonesExtWrapper",
+    "build_info",
     "numpy_to_eigen",
     "eigen_to_numpy",
     "DemBonesError",
@@ -4,8 +4,9 @@ Python bindings for the Dem Bones library
 
 from __future__ import annotations
 import numpy
+import typing
 
-__all__ = ["DemBones", "DemBonesExt", "DemBonesExtF", "DemBonesF"]
+__all__ = ["DemBones", "DemBonesExt", "DemBonesExtF", "DemBonesF", "SmoothingSolver", "SmoothingSolverF", "build_info", "parse_obj"]
 
 class DemBones:
     """
@@ -35,18 +36,34 @@ class DemBones:
     weightsSmooth: float
     weightsSmoothStep: float
     def __init__(self) -> None: ...
+    def build_smoothing_solver(self, edges: numpy.ndarray[numpy.int32], rest_lengths: numpy.ndarray[numpy.float64], edge_length_sum: float, num_threads: int = 0) -> SmoothingSolver: ...
     def clear(self) -> None: ...
-    def compute(self) -> None: ...
-    def computeTranformations(self) -> None: ...
-    def computeWeights(self) -> None: ...
+    def compute(self, num_threads: int = 0) -> None: ...
+    def compute_dual_quaternion_poses(self, frames: list[int] = [], k: int = 0, num_threads: int = 0) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def compute_frame_transformations(self, frames: list[int], num_threads: int = 0) -> None: ...
+    def compute_skinned_poses(self, frames: list[int] = [], num_threads: int = 0) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def computeTranformations(self, num_threads: int = 0) -> None: ...
+    def computeWeights(self, num_threads: int = 0) -> None: ...
     def get_animated_poses(self) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def get_faces(self) -> tuple[numpy.ndarray[numpy.int64], numpy.ndarray[numpy.int32]]: ...
+    def get_influences(self, k: int, num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray[numpy.float64]]: ...
     def get_rest_pose(self) -> numpy.ndarray[numpy.float64[m, n]]: ...
     def get_transformations(self) -> numpy.ndarray[numpy.float64]: ...
     def get_weights(self) -> numpy.ndarray[numpy.float64]: ...
-    def init(self) -> None: ...
-    def rmse(self) -> float: ...
+    def init(self, num_threads: int = 0) -> None: ...
+    def load_animated_poses(self, animated_poses: numpy.ndarray) -> None: ...
+    def load_rest_pose(self, rest_pose: numpy.ndarray) -> None: ...
+    def quantize_influences(self, k: int, bits: int = 8, frames: list[int] = [], num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray, numpy.ndarray | None]: ...
+    def resolve_region(self, vertices: list[int], rings: int = 1, nIters: int = -1, vertex_face_offsets: numpy.ndarray[numpy.int64] = ..., vertex_faces: numpy.ndarray[numpy.int32] = ..., num_threads: int = 0) -> dict: ...
+    def rmse(self, num_threads: int = 0) -> float: ...
+    def set_animated_frames(self, frames: list[int], poses: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     def set_animated_poses(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
+    @typing.overload
+    def set_faces(self, faces: numpy.ndarray[numpy.int32]) -> None: ...
+    @typing.overload
+    def set_faces(self, offsets: numpy.ndarray[numpy.int64], indices: numpy.ndarray[numpy.int32]) -> None: ...
     def set_rest_pose(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
+    def set_smoothing_solver(self, solver: SmoothingSolver) -> None: ...
     def set_transformations(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     def set_weights(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     @property
@@ -89,21 +106,37 @@ class DemBonesExt:
     weightsSmooth: float
     weightsSmoothStep: float
     def __init__(self) -> None: ...
+    def build_smoothing_solver(self, edges: numpy.ndarray[numpy.int32], rest_lengths: numpy.ndarray[numpy.float64], edge_length_sum: float, num_threads: int = 0) -> SmoothingSolver: ...
     def clear(self) -> None: ...
-    def compute(self) -> None: ...
+    def compute(self, num_threads: int = 0) -> None: ...
     def computeRTB(self) -> None: ...
-    def computeTranformations(self) -> None: ...
-    def computeWeights(self) -> None: ...
+    def compute_dual_quaternion_poses(self, frames: list[int] = [], k: int = 0, num_threads: int = 0) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def compute_frame_transformations(self, frames: list[int], num_threads: int = 0) -> None: ...
+    def compute_skinned_poses(self, frames: list[int] = [], num_threads: int = 0) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def computeTranformations(self, num_threads: int = 0) -> None: ...
+    def computeWeights(self, num_threads: int = 0) -> None: ...
     def get_animated_poses(self) -> numpy.ndarray[numpy.float64[m, n]]: ...
+    def get_faces(self) -> tuple[numpy.ndarray[numpy.int64], numpy.ndarray[numpy.int32]]: ...
+    def get_influences(self, k: int, num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray[numpy.float64]]: ...
     def get_bone_names(self) -> list[str]: ...
     def get_rest_pose(self) -> numpy.ndarray[numpy.float64[m, n]]: ...
     def get_transformations(self) -> numpy.ndarray[numpy.float64]: ...
     def get_weights(self) -> numpy.ndarray[numpy.float64]: ...
-    def init(self) -> None: ...
-    def rmse(self) -> float: ...
+    def init(self, num_threads: int = 0) -> None: ...
+    def load_animated_poses(self, animated_poses: numpy.ndarray) -> None: ...
+    def load_rest_pose(self, rest_pose: numpy.ndarray) -> None: ...
+    def quantize_influences(self, k: int, bits: int = 8, frames: list[int] = [], num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray, numpy.ndarray | None]: ...
+    def resolve_region(self, vertices: list[int], rings: int = 1, nIters: int = -1, vertex_face_offsets: numpy.ndarray[numpy.int64] = ..., vertex_faces: numpy.ndarray[numpy.int32] = ..., num_threads: int = 0) -> dict: ...
+    def rmse(self, num_threads: int = 0) -> float: ...
+    def set_animated_frames(self, frames: list[int], poses: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     def set_animated_poses(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     def set_bone_names(self, arg0: list[str]) -> None: ...
+    @typing.overload
+    def set_faces(self, faces: numpy.ndarray[numpy.int32]) -> None: ...
+    @typing.overload
+    def set_faces(self, offsets: numpy.ndarray[numpy.int64], indices: numpy.ndarray[numpy.int32]) -> None: ...
     def set_rest_pose(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
+    def set_smoothing_solver(self, solver: SmoothingSolver) -> None: ...
     def set_transformations(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     def set_weights(self, arg0: numpy.ndarray[numpy.float64[m, n]]) -> None: ...
     @property
@@ -146,21 +179,37 @@ class DemBonesExtF:
     weightsSmooth: float
     weightsSmoothStep: float
     def __init__(self) -> None: ...
+    def build_smoothing_solver(self, edges: numpy.ndarray[numpy.int32], rest_lengths: numpy.ndarray[numpy.float64], edge_length_sum: float, num_threads: int = 0) -> SmoothingSolverF: ...
     def clear(self) -> None: ...
-    def compute(self) -> None: ...
+    def compute(self, num_threads: int = 0) -> None: ...
     def computeRTB(self) -> None: ...
-    def computeTranformations(self) -> None: ...
-    def computeWeights(self) -> None: ...
+    def compute_dual_quaternion_poses(self, frames: list[int] = [], k: int = 0, num_threads: int = 0) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def compute_frame_transformations(self, frames: list[int], num_threads: int = 0) -> None: ...
+    def compute_skinned_poses(self, frames: list[int] = [], num_threads: int = 0) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def computeTranformations(self, num_threads: int = 0) -> None: ...
+    def computeWeights(self, num_threads: int = 0) -> None: ...
     def get_animated_poses(self) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def get_faces(self) -> tuple[numpy.ndarray[numpy.int64], numpy.ndarray[numpy.int32]]: ...
+    def get_influences(self, k: int, num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray[numpy.float32]]: ...
     def get_bone_names(self) -> list[str]: ...
     def get_rest_pose(self) -> numpy.ndarray[numpy.float32[m, n]]: ...
     def get_transformations(self) -> numpy.ndarray[numpy.float32]: ...
     def get_weights(self) -> numpy.ndarray[numpy.float32]: ...
-    def init(self) -> None: ...
-    def rmse(self) -> float: ...
+    def init(self, num_threads: int = 0) -> None: ...
+    def load_animated_poses(self, animated_poses: numpy.ndarray) -> None: ...
+    def load_rest_pose(self, rest_pose: numpy.ndarray) -> None: ...
+    def quantize_influences(self, k: int, bits: int = 8, frames: list[int] = [], num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray, numpy.ndarray | None]: ...
+    def resolve_region(self, vertices: list[int], rings: int = 1, nIters: int = -1, vertex_face_offsets: numpy.ndarray[numpy.int64] = ..., vertex_faces: numpy.ndarray[numpy.int32] = ..., num_threads: int = 0) -> dict: ...
+    def rmse(self, num_threads: int = 0) -> float: ...
+    def set_animated_frames(self, frames: list[int], poses: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     def set_animated_poses(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     def set_bone_names(self, arg0: list[str]) -> None: ...
+    @typing.overload
+    def set_faces(self, faces: numpy.ndarray[numpy.int32]) -> None: ...
+    @typing.overload
+    def set_faces(self, offsets: numpy.ndarray[numpy.int64], indices: numpy.ndarray[numpy.int32]) -> None: ...
     def set_rest_pose(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
+    def set_smoothing_solver(self, solver: SmoothingSolverF) -> None: ...
     def set_transformations(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     def set_weights(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     @property
@@ -198,18 +247,34 @@ class DemBonesF:
     weightsSmooth: float
     weightsSmoothStep: float
     def __init__(self) -> None: ...
+    def build_smoothing_solver(self, edges: numpy.ndarray[numpy.int32], rest_lengths: numpy.ndarray[numpy.float64], edge_length_sum: float, num_threads: int = 0) -> SmoothingSolverF: ...
     def clear(self) -> None: ...
-    def compute(self) -> None: ...
-    def computeTranformations(self) -> None: ...
-    def computeWeights(self) -> None: ...
+    def compute(self, num_threads: int = 0) -> None: ...
+    def compute_dual_quaternion_poses(self, frames: list[int] = [], k: int = 0, num_threads: int = 0) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def compute_frame_transformations(self, frames: list[int], num_threads: int = 0) -> None: ...
+    def compute_skinned_poses(self, frames: list[int] = [], num_threads: int = 0) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def computeTranformations(self, num_threads: int = 0) -> None: ...
+    def computeWeights(self, num_threads: int = 0) -> None: ...
     def get_animated_poses(self) -> numpy.ndarray[numpy.float32[m, n]]: ...
+    def get_faces(self) -> tuple[numpy.ndarray[numpy.int64], numpy.ndarray[numpy.int32]]: ...
+    def get_influences(self, k: int, num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray[numpy.float32]]: ...
     def get_rest_pose(self) -> numpy.ndarray[numpy.float32[m, n]]: ...
     def get_transformations(self) -> numpy.ndarray[numpy.float32]: ...
     def get_weights(self) -> numpy.ndarray[numpy.float32]: ...
-    def init(self) -> None: ...
-    def rmse(self) -> float: ...
+    def init(self, num_threads: int = 0) -> None: ...
+    def load_animated_poses(self, animated_poses: numpy.ndarray) -> None: ...
+    def load_rest_pose(self, rest_pose: numpy.ndarray) -> None: ...
+    def quantize_influences(self, k: int, bits: int = 8, frames: list[int] = [], num_threads: int = 0) -> tuple[numpy.ndarray[numpy.int32], numpy.ndarray, numpy.ndarray | None]: ...
+    def resolve_region(self, vertices: list[int], rings: int = 1, nIters: int = -1, vertex_face_offsets: numpy.ndarray[numpy.int64] = ..., vertex_faces: numpy.ndarray[numpy.int32] = ..., num_threads: int = 0) -> dict: ...
+    def rmse(self, num_threads: int = 0) -> float: ...
+    def set_animated_frames(self, frames: list[int], poses: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     def set_animated_poses(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
+    @typing.overload
+    def set_faces(self, faces: numpy.ndarray[numpy.int32]) -> None: ...
+    @typing.overload
+    def set_faces(self, offsets: numpy.ndarray[numpy.int64], indices: numpy.ndarray[numpy.int32]) -> None: ...
     def set_rest_pose(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
+    def set_smoothing_solver(self, solver: SmoothingSolverF) -> None: ...
     def set_transformations(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     def set_weights(self, arg0: numpy.ndarray[numpy.float32[m, n]]) -> None: ...
     @property
@@ -219,5 +284,43 @@ class DemBonesF:
     @property
     def iterWeights(self) -> int: ...
 
+class SmoothingSolver:
+    """
+    Weight smoothing Laplacian and its LU factorization, shared by the native instances it is set on.
+
+    Created by build_smoothing_solver() and installed with set_smoothing_solver().
+    """
+
+    @property
+    def num_nonzeros(self) -> int: ...
+    @property
+    def num_vertices(self) -> int: ...
+
+class SmoothingSolverF:
+    """
+    Weight smoothing Laplacian and its LU factorization, shared by the native instances it is set on.
+
+    Created by build_smoothing_solver() and installed with set_smoothing_solver().
+    """
+
+    @property
+    def num_nonzeros(self) -> int: ...
+    @property
+    def num_vertices(self) -> int: ...
+
+def build_info() -> dict:
+    """
+    Get the features the native module was built with.
+
+    Returns a dict with whether OpenMP is enabled, the OpenMP version and default maximum number of threads, the SIMD instruction sets used by Eigen, the Eigen version and the BLAS and LAPACK backends ("eigen" for Eigen's built-in kernels).
+    """
+
+def parse_obj(data: bytes) -> tuple:
+    """
+    Parse the vertex positions and faces of an OBJ file.
+
+    Returns a tuple (vertices [nV, 3], face_sizes [nFaces], face_indices [sum(face_sizes)]) with zero-based vertex indices. The GIL is released while parsing.
+    """
+
 __dem_bones_version__: str = "v1.2.1-2-g09b899b"
 __version__: str = "0.1.0"
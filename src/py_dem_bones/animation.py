@@ -0,0 +1,310 @@
+"""
+Keyframe reduction for solved bone transformations.
+
+DemBones solves one transformation per bone and frame. Runtimes store animation as
+sparse rotation, translation and scale curves instead, interpolated linearly (spherically
+for rotations) between keys. reduce_keyframes() decomposes the transformations of every
+bone into such curves and keeps only the keys needed to bound the error of the skinned
+vertices, rather than the error of the transformations themselves: a bone that only
+moves a few vertices close to its pivot keeps far fewer keys than one that drives a
+long limb.
+"""
+
+# Import standard library modules
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import List, Optional, Tuple
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import ParameterError
+from py_dem_bones.io import decompose_transformations
+
+# Largest number of vertex-frame pairs whose errors are evaluated at once
+_ERROR_BLOCK = 1 << 20
+
+# Coordinate pairs of the quadratic monomials and their multiplicity in a symmetric form
+_ROWS = np.array([0, 1, 2, 0, 0, 1])
+_COLUMNS = np.array([0, 1, 2, 1, 2, 2])
+_MULTIPLICITY = np.array([1, 1, 1, 2, 2, 2])
+
+
+class BoneCurves:
+    """
+    Keyframes of the rotation, translation and scale of one bone.
+
+    The curves describe the transformation that maps the rest pose to the animated
+    pose, composed as translation * rotation * scale.
+
+    Attributes:
+        rotation_times (numpy.ndarray): Times of the rotation keys
+        rotations (numpy.ndarray): Unit quaternions (x, y, z, w) with shape [num_keys, 4]
+        translation_times (numpy.ndarray): Times of the translation keys
+        translations (numpy.ndarray): Translations with shape [num_keys, 3]
+        scale_times (numpy.ndarray): Times of the scale keys
+        scales (numpy.ndarray): Scale factors along the rest axes with shape [num_keys, 3]
+    """
+
+    def __init__(self, rotation_times, rotations, translation_times, translations, scale_times, scales):
+        """
+        Create the curves of a bone.
+
+        Args:
+            rotation_times (numpy.ndarray): Increasing times of the rotation keys
+            rotations (numpy.ndarray): Unit quaternions (x, y, z, w) with shape [num_keys, 4]
+            translation_times (numpy.ndarray): Increasing times of the translation keys
+            translations (numpy.ndarray): Translations with shape [num_keys, 3]
+            scale_times (numpy.ndarray): Increasing times of the scale keys
+            scales (numpy.ndarray): Scale factors with shape [num_keys, 3]
+        """
+        self.rotation_times = rotation_times
+        self.rotations = rotations
+        self.translation_times = translation_times
+        self.translations = translations
+        self.scale_times = scale_times
+        self.scales = scales
+
+    @property
+    def num_keys(self) -> int:
+        """Get the total number of keys of the three curves."""
+        return self.rotation_times.size + self.translation_times.size + self.scale_times.size
+
+    def evaluate(self, times) -> np.ndarray:
+        """
+        Interpolate the curves.
+
+        Args:
+            times (array-like): Times to evaluate, clamped to the first and last keys
+
+        Returns:
+            numpy.ndarray: Transformations with shape [len(times), 4, 4]
+        """
+        times = np.asarray(times, dtype=np.float64).ravel()
+        matrices = np.zeros((times.size, 4, 4))
+        rotations = _quaternion_matrices(_slerp(self.rotation_times, self.rotations, times))
+        matrices[:, :3, :3] = rotations * _lerp(self.scale_times, self.scales, times)[:, np.newaxis, :]
+        matrices[:, :3, 3] = _lerp(self.translation_times, self.translations, times)
+        matrices[:, 3, 3] = 1
+        return matrices
+
+
+def reduce_keyframes(
+    transformations: np.ndarray,
+    rest_pose: np.ndarray,
+    weights: np.ndarray,
+    tolerance: float,
+    times=None,
+    workers: Optional[int] = None,
+) -> List[BoneCurves]:
+    """
+    Reduce the per-frame transformations of every bone to sparse keyframe curves.
+
+    The tolerance of every vertex is shared among its influences, in proportion to the
+    square root of their weights, so that the weighted errors of all bones add up to at
+    most the tolerance. The error a bone may cause at a vertex is split in turn between
+    its scale, rotation and translation curves, which are fitted one after the other,
+    each with the error left over by the previous ones. A curve starts with its first
+    and last keys and inserts the worst frame of every segment that exceeds the bound
+    until none does. Bones are reduced in parallel.
+
+    Shear in the transformations is not represented; the bound applies to the
+    decomposed transformations.
+
+    Args:
+        transformations (numpy.ndarray): Transformations with shape
+            [num_frames, num_bones, 4, 4] or [num_frames, num_bones, 3, 4]
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        weights (numpy.ndarray): Skinning weights with shape [num_bones, num_vertices]
+        tolerance (float): Largest distance of a skinned vertex from its position under
+            the original transformations, at every frame
+        times (array-like, optional): Strictly increasing time of every frame, defaults
+            to the frame indices
+        workers (int, optional): Number of threads, defaults to the number of CPUs
+
+    Returns:
+        list: BoneCurves of every bone
+
+    Raises:
+        ParameterError: If the shapes, the tolerance or the times are invalid
+    """
+    transformations = np.asarray(transformations, dtype=np.float64)
+    rest_pose = np.asarray(rest_pose, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    if transformations.ndim != 4 or transformations.shape[2:] not in ((3, 4), (4, 4)):
+        raise ParameterError(
+            f"Transformations must have shape [num_frames, num_bones, 4, 4], got {transformations.shape}"
+        )
+    num_frames, num_bones = transformations.shape[:2]
+    if rest_pose.ndim != 2 or rest_pose.shape[0] != 3:
+        raise ParameterError(f"Rest pose must have shape [3, num_vertices], got {rest_pose.shape}")
+    if weights.shape != (num_bones, rest_pose.shape[1]):
+        raise ParameterError(f"Expected weights with shape {(num_bones, rest_pose.shape[1])}, got {weights.shape}")
+    if not tolerance > 0:
+        raise ParameterError("Tolerance must be positive")
+    if times is None:
+        times = np.arange(num_frames)
+    times = np.asarray(times, dtype=np.float64).ravel()
+    if times.size != num_frames:
+        raise ParameterError(f"Expected {num_frames} frame times, got {times.size}")
+    if np.any(np.diff(times) <= 0):
+        raise ParameterError("Frame times must be strictly increasing")
+
+    translations, rotations, scales = decompose_transformations(transformations.transpose(1, 0, 2, 3))
+
+    # Allowed error of every bone at every vertex: sum_j w_j * budget_j = tolerance
+    roots = np.sqrt(np.maximum(weights, 0))
+    shares = roots * roots.sum(axis=0)
+    budgets = np.divide(tolerance, shares, out=np.zeros_like(shares), where=shares > 0)
+
+    def reduce_bone(bone):
+        influenced = np.flatnonzero(budgets[bone] > 0)
+        points = rest_pose[:, influenced].T
+        return _reduce_bone(times, translations[bone], rotations[bone], scales[bone], points, budgets[bone, influenced])
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        return list(executor.map(reduce_bone, range(num_bones)))
+
+
+def _reduce_bone(times, translations, rotations, scales, points, budgets) -> BoneCurves:
+    """Fit the scale, rotation and translation curves of one bone within per-point error budgets."""
+    num_frames = times.size
+    if points.shape[0] == 0:
+        # The bone moves no vertex, so only its range is kept
+        keys = np.unique([0, num_frames - 1])
+        return BoneCurves(times[keys], rotations[keys], times[keys], translations[keys], times[keys], scales[keys])
+
+    # Every channel returns the deviation linear @ point + offset it causes at the frames
+    def scale_deviation(keys, frames):
+        difference = _lerp(times[keys], scales[keys], times[frames]) - scales[frames]
+        return difference[:, :, np.newaxis] * np.eye(3), np.zeros((frames.size, 3))
+
+    def rotation_deviation(keys, frames):
+        difference = _quaternion_matrices(_slerp(times[keys], rotations[keys], times[frames]))
+        difference -= _quaternion_matrices(rotations[frames])
+        return difference * scales[frames][:, np.newaxis, :], np.zeros((frames.size, 3))
+
+    def translation_deviation(keys, frames):
+        difference = _lerp(times[keys], translations[keys], times[frames]) - translations[frames]
+        return np.zeros((frames.size, 3, 3)), difference
+
+    basis = _quadratic_basis(points)
+    scale_keys, scale_errors = _fit_keys(num_frames, scale_deviation, basis, budgets / 3)
+    remaining = budgets - scale_errors
+    rotation_keys, rotation_errors = _fit_keys(num_frames, rotation_deviation, basis, remaining / 2)
+    remaining -= rotation_errors
+    translation_keys, _ = _fit_keys(num_frames, translation_deviation, basis, remaining)
+    return BoneCurves(
+        times[rotation_keys],
+        rotations[rotation_keys],
+        times[translation_keys],
+        translations[translation_keys],
+        times[scale_keys],
+        scales[scale_keys],
+    )
+
+
+def _quadratic_basis(points) -> np.ndarray:
+    """Get the [num_points, 10] monomials in which |linear @ point + offset|^2 is linear."""
+    return np.concatenate([points[:, _ROWS] * points[:, _COLUMNS], points, np.ones((points.shape[0], 1))], axis=1)
+
+
+def _quadratic_coefficients(linear, offset) -> np.ndarray:
+    """Get the [num_frames, 10] coefficients of |linear @ point + offset|^2 in the quadratic basis."""
+    gram = np.matmul(linear.transpose(0, 2, 1), linear)
+    cross = 2 * np.matmul(offset[:, np.newaxis, :], linear)[:, 0]
+    return np.concatenate(
+        [gram[:, _ROWS, _COLUMNS] * _MULTIPLICITY, cross, np.sum(np.square(offset), axis=-1, keepdims=True)], axis=1
+    )
+
+
+def _frame_blocks(frames, num_points):
+    """Split frames into blocks whose errors fit into _ERROR_BLOCK values."""
+    size = max(1, _ERROR_BLOCK // max(num_points, 1))
+    for start in range(0, frames.size, size):
+        yield frames[start : start + size]
+
+
+def _fit_keys(num_frames, deviation, basis, budgets) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select the keys of a curve by refinement.
+
+    deviation(keys, frames) returns the linear and offset parts of the deviation that
+    interpolating the keys causes at the frames. The worst frame of every segment that
+    exceeds the budget of a point becomes a key until no segment does; only the frames
+    of split segments are evaluated again.
+
+    Returns:
+        tuple: (keys, largest error of every point over all frames)
+    """
+    scaled = basis / np.square(budgets)[:, np.newaxis]
+    keys = np.unique([0, num_frames - 1])
+    ratios = np.zeros(num_frames)
+    stale = np.arange(num_frames)
+    while True:
+        for block in _frame_blocks(stale, budgets.size):
+            ratios[block] = (_quadratic_coefficients(*deviation(keys, block)) @ scaled.T).max(axis=1)
+
+        segments = np.clip(np.searchsorted(keys, np.arange(num_frames), side="right") - 1, 0, keys.size - 1)
+        over = np.flatnonzero(ratios > 1)
+        # The worst frame of every exceeding segment
+        order = np.lexsort((-ratios[over], segments[over]))
+        _, first = np.unique(segments[over][order], return_index=True)
+        inserted = np.setdiff1d(over[order][first], keys)
+        if inserted.size == 0:
+            break
+
+        split = segments[inserted]
+        stale = np.concatenate([np.arange(keys[s], keys[s + 1] + 1) for s in split])
+        keys = np.union1d(keys, inserted)
+
+    errors = np.zeros(budgets.size)
+    for block in _frame_blocks(np.arange(num_frames), budgets.size):
+        np.maximum(errors, (_quadratic_coefficients(*deviation(keys, block)) @ basis.T).max(axis=0), out=errors)
+    return keys, np.sqrt(np.maximum(errors, 0))
+
+
+def _segments(key_times, times):
+    """Get the segment and the interpolation parameter of every time."""
+    index = np.clip(np.searchsorted(key_times, times, side="right") - 1, 0, key_times.size - 2)
+    start, stop = key_times[index], key_times[index + 1]
+    return index, np.clip((times - start) / (stop - start), 0, 1)
+
+
+def _lerp(key_times, values, times) -> np.ndarray:
+    """Interpolate keyed values linearly."""
+    if key_times.size == 1:
+        return np.repeat(values, times.size, axis=0)
+    index, t = _segments(key_times, times)
+    return values[index] + t[:, np.newaxis] * (values[index + 1] - values[index])
+
+
+def _slerp(key_times, quaternions, times) -> np.ndarray:
+    """Interpolate keyed unit quaternions spherically along the shorter arc."""
+    if key_times.size == 1:
+        return np.repeat(quaternions, times.size, axis=0)
+    index, t = _segments(key_times, times)
+    start, stop = quaternions[index], quaternions[index + 1]
+    dot = np.sum(start * stop, axis=-1)
+    stop = np.where(dot[:, np.newaxis] < 0, -stop, stop)
+    angle = np.arccos(np.clip(np.abs(dot), 0, 1))
+    sine = np.sin(angle)
+    near = sine < 1e-6
+    a = np.where(near, 1 - t, np.sin((1 - t) * angle) / np.where(near, 1, sine))
+    b = np.where(near, t, np.sin(t * angle) / np.where(near, 1, sine))
+    result = a[:, np.newaxis] * start + b[:, np.newaxis] * stop
+    return result / np.linalg.norm(result, axis=-1, keepdims=True)
+
+
+def _quaternion_matrices(quaternions) -> np.ndarray:
+    """Convert [..., 4] unit quaternions (x, y, z, w) to [..., 3, 3] rotation matrices."""
+    x, y, z, w = np.moveaxis(quaternions, -1, 0)
+    return np.stack(
+        [
+            np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], axis=-1),
+            np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], axis=-1),
+            np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], axis=-1),
+        ],
+        axis=-2,
+    )
@@ -0,0 +1,109 @@
+"""
+Keyframe reduction for solved bone transformations.
+
+DemBones solves one transformation per bone and frame. Runtimes store animation as
+sparse rotation, translation and scale curves instead, interpolated linearly (spherically
+for rotations) between keys. reduce_keyframes() decomposes the transformations of every
+bone into such curves and keeps only the keys needed to bound the error of the skinned
+vertices, rather than the error of the transformations themselves: a bone that only
+moves a few vertices close to its pivot keeps far fewer keys than one that drives a
+long limb.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import List, Optional, Tuple
+import numpy as np
+from py_dem_bones.exceptions import ParameterError
+from py_dem_bones.io import decompose_transformations
+
+__all__ = [
+    "BoneCurves",
+    "reduce_keyframes",
+    "np",
+]
+
+class BoneCurves:
+    """
+    Keyframes of the rotation, translation and scale of one bone.
+
+    The curves describe the transformation that maps the rest pose to the animated
+    pose, composed as translation * rotation * scale.
+
+    Attributes:
+        rotation_times (numpy.ndarray): Times of the rotation keys
+        rotations (numpy.ndarray): Unit quaternions (x, y, z, w) with shape [num_keys, 4]
+        translation_times (numpy.ndarray): Times of the translation keys
+        translations (numpy.ndarray): Translations with shape [num_keys, 3]
+        scale_times (numpy.ndarray): Times of the scale keys
+        scales (numpy.ndarray): Scale factors along the rest axes with shape [num_keys, 3]
+    """
+
+    def __init__(self, rotation_times, rotations, translation_times, translations, scale_times, scales):
+        """
+        Create the curves of a bone.
+
+        Args:
+            rotation_times (numpy.ndarray): Increasing times of the rotation keys
+            rotations (numpy.ndarray): Unit quaternions (x, y, z, w) with shape [num_keys, 4]
+            translation_times (numpy.ndarray): Increasing times of the translation keys
+            translations (numpy.ndarray): Translations with shape [num_keys, 3]
+            scale_times (numpy.ndarray): Increasing times of the scale keys
+            scales (numpy.ndarray): Scale factors with shape [num_keys, 3]
+        """
+    @property
+    def num_keys(self) -> int:
+        """
+        Get the total number of keys of the three curves.
+        """
+    def evaluate(self, times) -> np.ndarray:
+        """
+        Interpolate the curves.
+
+        Args:
+            times (array-like): Times to evaluate, clamped to the first and last keys
+
+        Returns:
+            numpy.ndarray: Transformations with shape [len(times), 4, 4]
+        """
+
+def reduce_keyframes(
+    transformations: np.ndarray,
+    rest_pose: np.ndarray,
+    weights: np.ndarray,
+    tolerance: float,
+    times=None,
+    workers: Optional[int] = None,
+) -> List[BoneCurves]:
+    """
+    Reduce the per-frame transformations of every bone to sparse keyframe curves.
+
+    The tolerance of every vertex is shared among its influences, in proportion to the
+    square root of their weights, so that the weighted errors of all bones add up to at
+    most the tolerance. The error a bone may cause at a vertex is split in turn between
+    its scale, rotation and translation curves, which are fitted one after the other,
+    each with the error left over by the previous ones. A curve starts with its first
+    and last keys and inserts the worst frame of every segment that exceeds the bound
+    until none does. Bones are reduced in parallel.
+
+    Shear in the transformations is not represented; the bound applies to the
+    decomposed transformations.
+
+    Args:
+        transformations (numpy.ndarray): Transformations with shape
+            [num_frames, num_bones, 4, 4] or [num_frames, num_bones, 3, 4]
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        weights (numpy.ndarray): Skinning weights with shape [num_bones, num_vertices]
+        tolerance (float): Largest distance of a skinned vertex from its position under
+            the original transformations, at every frame
+        times (array-like, optional): Strictly increasing time of every frame, defaults
+            to the frame indices
+        workers (int, optional): Number of threads, defaults to the number of CPUs
+
+    Returns:
+        list: BoneCurves of every bone
+
+    Raises:
+        ParameterError: If the shapes, the tolerance or the times are invalid
+    """
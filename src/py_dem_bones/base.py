@@ -7,14 +7,69 @@ and convenience methods.
 """
 
 # Import standard library modules
+import functools
+import threading
+import time
 from typing import Callable, Optional, Union
 
 # Import third-party modules
 import numpy as np
 
 # Import local modules
-from py_dem_bones._py_dem_bones import DemBones as _DemBones, DemBonesExt as _DemBonesExt
+from py_dem_bones.__version__ import __version__
+from py_dem_bones._py_dem_bones import (
+    DemBones as _DemBones,
+    DemBonesExt as _DemBonesExt,
+    DemBonesExtF as _DemBonesExtF,
+    DemBonesF as _DemBonesF,
+    __dem_bones_version__,
+)
+from py_dem_bones.animation import reduce_keyframes
+from py_dem_bones.cache import ResultCache, ResultHasher
+from py_dem_bones.corrective import CorrectiveShapes, extract_correctives
 from py_dem_bones.exceptions import ComputationError, IndexError, NameError, ParameterError
+from py_dem_bones.io import create_point_cache, read_point_cache
+from py_dem_bones.multires import ProxyMesh
+from py_dem_bones.preprocess import (
+    find_duplicate_frames,
+    find_rigid_clusters,
+    pose_features,
+    select_keyframes,
+    select_streamed_keyframes,
+)
+from py_dem_bones.storage import load_array
+from py_dem_bones.topology import TopologyCache, default_cache, vertex_faces
+
+# Keyframes of the joint solve in out-of-core mode when max_keyframes is not set
+_OUT_OF_CORE_KEYFRAMES = 256
+
+# Frames sampled for the error report of quantize_influences() when none are given
+_QUANTIZATION_SAMPLE_FRAMES = 16
+
+# Solver settings copied to the native instances of reduced sub-problems
+_SOLVER_PARAMETERS = (
+    "nIters",
+    "nInitIters",
+    "nTransIters",
+    "transAffine",
+    "transAffineNorm",
+    "nWeightsIters",
+    "nnz",
+    "weightsSmooth",
+    "weightsSmoothStep",
+    "weightEps",
+)
+
+
+def _synchronized(method):
+    """Run a wrapper method while holding the lock of its instance."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class DemBonesWrapper:
@@ -23,6 +78,10 @@ class DemBonesWrapper:
 
     This class provides a more Pythonic interface to the C++ DemBones class,
     adding support for named bones, error handling, and convenience methods.
+
+    Solves release the GIL. Methods that run or modify the native solver hold a
+    per-instance lock, so a wrapper can be shared between threads, and separate
+    wrappers solve in parallel, also on free-threaded Python builds.
     """
 
     def __init__(self):
@@ -31,6 +90,87 @@ class DemBonesWrapper:
         self._bones = {}  # Mapping of bone names to indices
         self._targets = {}  # Mapping of target names to indices
         self._weights_computed = False  # Flag to track if weights have been computed
+        self._dirty_frames = set()  # Frames changed since the last solve
+        self._solved_shape = None  # (num_frames, num_vertices, num_bones) of the last solve
+        self._rigid_tolerance = None  # Rigid vertex pre-pass tolerance, None disables it
+        self._frame_tolerance = None  # Duplicate frame tolerance, None disables deduplication
+        self._max_keyframes = None  # Frame budget of the joint solve, None uses every frame
+        self._solve_report = {}  # Statistics of the last solve
+        self._frame_store = None  # Out-of-core source of the animated poses
+        self._topology_cache = default_cache()  # Source of the weight smoothing topology, None disables it
+        self._vertex_faces = None  # (num_vertices, offsets, faces) of the faces around each vertex
+        self._result_cache = None  # Cache of solve results, None disables it
+        self._num_threads = 0  # OpenMP threads of native calls, 0 keeps the default
+        self._lock = threading.RLock()  # Serializes the native calls of this instance
+
+    # Native solver class of each supported precision
+    _NATIVE_CLASSES = {np.dtype(np.float64): _DemBones, np.dtype(np.float32): _DemBonesF}
+
+    @classmethod
+    def from_files(cls, rest, frames, mmap=True, dtype=None, rest_key="rest", frames_key="frames"):
+        """
+        Create a wrapper with the rest pose and animated poses loaded from files.
+
+        Inputs are ``.npy`` files or ``.npz`` archives, and the frames may also be a
+        ``.pc2`` or ``.mdd`` point cache. With ``mmap`` they are memory-mapped and the
+        solver is filled straight from the mapped pages in a single converting copy,
+        so no in-memory copy of the sequence is made first. float32 sequences are
+        solved in single precision unless ``dtype`` says otherwise.
+
+        Args:
+            rest (str or numpy.ndarray): Rest pose file or array with shape [3, num_vertices]
+            frames (str or numpy.ndarray): Animated pose file or array with shape
+                [num_frames, 3, num_vertices] or [3 * num_frames, num_vertices]
+            mmap (bool): Memory-map the files instead of reading them
+            dtype: Solver precision, ``numpy.float32`` or ``numpy.float64``. Defaults to
+                the precision of the frames.
+            rest_key (str): Name of the rest pose in an archive holding several arrays
+            frames_key (str): Name of the animated poses in an archive holding several arrays
+
+        Returns:
+            DemBonesWrapper: A wrapper ready for the bone and solver settings
+
+        Raises:
+            IOError: If a file cannot be read
+            ParameterError: If the shapes or the precision are invalid
+        """
+        rest_pose = rest if isinstance(rest, np.ndarray) else load_array(rest, rest_key, mmap)
+        if isinstance(frames, np.ndarray):
+            animated_poses = frames
+        elif str(frames).lower().endswith((".pc2", ".mdd")):
+            animated_poses = read_point_cache(frames, mmap=mmap)[0]
+        else:
+            animated_poses = load_array(frames, frames_key, mmap)
+
+        if rest_pose.ndim != 2 or rest_pose.shape[0] != 3 or rest_pose.shape[1] == 0:
+            raise ParameterError(f"Rest pose must have shape [3, num_vertices], got {rest_pose.shape}")
+        num_vertices = rest_pose.shape[1]
+        if animated_poses.ndim == 3 and animated_poses.shape[1:] == (3, num_vertices):
+            num_frames = animated_poses.shape[0]
+        elif animated_poses.ndim == 2 and animated_poses.shape[0] % 3 == 0 and animated_poses.shape[1] == num_vertices:
+            num_frames = animated_poses.shape[0] // 3
+        else:
+            raise ParameterError(
+                f"Animated poses must have shape [num_frames, 3, {num_vertices}] or "
+                f"[3 * num_frames, {num_vertices}], got {animated_poses.shape}"
+            )
+        if num_frames == 0:
+            raise ParameterError("Animated poses must hold at least one frame")
+
+        if dtype is None:
+            single = animated_poses.dtype.kind == "f" and animated_poses.dtype.itemsize == 4
+            dtype = np.float32 if single else np.float64
+        native_class = cls._NATIVE_CLASSES.get(np.dtype(dtype))
+        if native_class is None:
+            raise ParameterError(f"Solver precision must be float32 or float64, got {np.dtype(dtype)}")
+
+        wrapper = cls()
+        wrapper._dem_bones = native_class()
+        wrapper._dem_bones.nV = num_vertices
+        wrapper._dem_bones.nF = num_frames
+        wrapper._dem_bones.load_rest_pose(rest_pose)
+        wrapper._dem_bones.load_animated_poses(animated_poses)
+        return wrapper
 
     # Basic properties (delegated to C++ object)
 
@@ -40,6 +180,7 @@ class DemBonesWrapper:
         return self._dem_bones.nB
 
     @num_bones.setter
+    @_synchronized
     def num_bones(self, value):
         """Set the number of bones."""
         if not isinstance(value, int) or value <= 0:
@@ -52,6 +193,7 @@ class DemBonesWrapper:
         return self._dem_bones.nV
 
     @num_vertices.setter
+    @_synchronized
     def num_vertices(self, value):
         """Set the number of vertices."""
         if not isinstance(value, int) or value <= 0:
@@ -63,10 +205,15 @@ class DemBonesWrapper:
         """Get the number of animation frames."""
         return self._dem_bones.nF
 
+    @property
+    def dirty_frames(self):
+        """Get the sorted indices of the frames changed since the last solve."""
+        return sorted(self._dirty_frames)
+
     @property
     def num_targets(self):
-        """Get the number of target poses."""
-        return self._dem_bones.nS
+        """Get the number of target poses (one animation frame per target)."""
+        return self._dem_bones.nF
 
     # Algorithm parameters
 
@@ -76,6 +223,7 @@ class DemBonesWrapper:
         return self._dem_bones.nIters
 
     @num_iterations.setter
+    @_synchronized
     def num_iterations(self, value):
         """Set the total number of iterations."""
         if not isinstance(value, int) or value < 0:
@@ -88,6 +236,7 @@ class DemBonesWrapper:
         return self._dem_bones.weightsSmooth
 
     @weight_smoothness.setter
+    @_synchronized
     def weight_smoothness(self, value):
         """Set the weight smoothness parameter."""
         if value < 0:
@@ -100,12 +249,133 @@ class DemBonesWrapper:
         return self._dem_bones.nnz
 
     @max_influences.setter
+    @_synchronized
     def max_influences(self, value):
         """Set the maximum number of non-zero weights per vertex."""
         if not isinstance(value, int) or value <= 0:
             raise ParameterError("Maximum influences must be a positive integer")
         self._dem_bones.nnz = value
 
+    @property
+    def rigid_tolerance(self):
+        """Get the tolerance of the static and rigid vertex pre-pass (None if disabled)."""
+        return self._rigid_tolerance
+
+    @rigid_tolerance.setter
+    @_synchronized
+    def rigid_tolerance(self, value):
+        """
+        Set the tolerance of the static and rigid vertex pre-pass.
+
+        Vertices that stay within this distance of a rigid motion in every frame are
+        bound to a single bone and removed from the solve. None disables the pre-pass.
+        """
+        if value is not None and (not isinstance(value, (int, float)) or value < 0):
+            raise ParameterError("Rigid tolerance must be a non-negative number or None")
+        self._rigid_tolerance = value
+
+    @property
+    def frame_tolerance(self):
+        """Get the tolerance of the duplicate frame elimination (None if disabled)."""
+        return self._frame_tolerance
+
+    @frame_tolerance.setter
+    @_synchronized
+    def frame_tolerance(self, value):
+        """
+        Set the tolerance of the duplicate frame elimination.
+
+        Frames whose vertices all stay within this distance of an earlier frame are left
+        out of the solve and take the transformations of that frame. None disables it.
+        """
+        if value is not None and (not isinstance(value, (int, float)) or value < 0):
+            raise ParameterError("Frame tolerance must be a non-negative number or None")
+        self._frame_tolerance = value
+
+    @property
+    def max_keyframes(self):
+        """Get the maximum number of frames used by the joint solve (None for all frames)."""
+        return self._max_keyframes
+
+    @max_keyframes.setter
+    @_synchronized
+    def max_keyframes(self, value):
+        """
+        Set the maximum number of frames used by the joint solve.
+
+        Longer sequences are solved on keyframes chosen by farthest point sampling in
+        pose space, and the transformations of the other frames are recovered with a
+        transformation-only pass. None solves every frame jointly.
+        """
+        if value is not None and (not isinstance(value, (int, np.integer)) or value <= 0):
+            raise ParameterError("Maximum keyframes must be a positive integer or None")
+        self._max_keyframes = value
+
+    @property
+    def result_cache(self):
+        """Get the cache of solve results (None if disabled)."""
+        return self._result_cache
+
+    @result_cache.setter
+    @_synchronized
+    def result_cache(self, value):
+        """
+        Set the cache of solve results.
+
+        Before a full solve, compute() hashes the rest pose, the animated poses, the
+        faces, the weight and transformation locks, the initial weights and
+        transformations, all solver settings and the library versions. When a result
+        with the same hash is cached it is loaded and the solve is skipped. Incremental
+        updates bypass the cache. None disables caching.
+        """
+        if value is not None and not isinstance(value, ResultCache):
+            raise ParameterError("Result cache must be a ResultCache or None")
+        self._result_cache = value
+
+    @property
+    def topology_cache(self):
+        """Get the cache of mesh topologies used to build the weight smoothing solver (None if disabled)."""
+        return self._topology_cache
+
+    @topology_cache.setter
+    @_synchronized
+    def topology_cache(self, value):
+        """
+        Set the cache of mesh topologies used to build the weight smoothing solver.
+
+        By default all wrappers share py_dem_bones.topology.default_cache(), which is
+        global to the process, so solving several clips of the same mesh computes its
+        edges only once and solving the same clip again reuses the factorized smoothing
+        solver. None leaves the smoothing solver to the native library.
+        """
+        if value is not None and not isinstance(value, TopologyCache):
+            raise ParameterError("Topology cache must be a TopologyCache or None")
+        self._topology_cache = value
+
+    @property
+    def num_threads(self):
+        """Get the number of OpenMP threads used by native calls (None for the default)."""
+        return self._num_threads or None
+
+    @num_threads.setter
+    @_synchronized
+    def num_threads(self, value):
+        """
+        Set the number of OpenMP threads used by native calls.
+
+        The limit applies to every native call of this wrapper and only for its
+        duration, so several solves sharing a machine can each be given a share of the
+        cores. None uses the OpenMP default, see py_dem_bones.build_info().
+        """
+        if value is not None and (not isinstance(value, (int, np.integer)) or value <= 0):
+            raise ParameterError("Number of threads must be a positive integer or None")
+        self._num_threads = value or 0
+
+    @property
+    def solve_report(self):
+        """Get the statistics of the last call to compute()."""
+        return dict(self._solve_report)
+
     # Bone name management
 
     @property
@@ -117,6 +387,7 @@ class DemBonesWrapper:
                 result[idx] = name
         return result
 
+    @_synchronized
     def get_bone_names(self):
         """
         Get all bone names as a list.
@@ -126,6 +397,7 @@ class DemBonesWrapper:
         """
         return list(self._bones.keys())
 
+    @_synchronized
     def get_bone_index(self, name):
         """
         Get the index for a bone name.
@@ -143,6 +415,7 @@ class DemBonesWrapper:
             raise NameError(f"Bone name '{name}' not found")
         return self._bones[name]
 
+    @_synchronized
     def set_bone_name(self, name, index=None):
         """
         Set a bone name to index mapping.
@@ -168,6 +441,7 @@ class DemBonesWrapper:
         self._bones[name] = index
         return index
 
+    @_synchronized
     def set_bone_names(self, *names):
         """
         Set multiple bone names at once.
@@ -194,6 +468,7 @@ class DemBonesWrapper:
                 result[idx] = name
         return result
 
+    @_synchronized
     def get_target_names(self):
         """
         Get all target names as a list.
@@ -203,6 +478,7 @@ class DemBonesWrapper:
         """
         return list(self._targets.keys())
 
+    @_synchronized
     def get_target_index(self, name):
         """
         Get the index for a target name.
@@ -220,6 +496,7 @@ class DemBonesWrapper:
             raise NameError(f"Target name '{name}' not found")
         return self._targets[name]
 
+    @_synchronized
     def set_target_name(self, name, index=None):
         """
         Set a target name to index mapping.
@@ -238,11 +515,11 @@ class DemBonesWrapper:
             else:
                 # Otherwise, use the next available index (max of existing indices + 1)
                 # This ensures we don't reuse indices that are already in use
-                index = self._dem_bones.nS if self._dem_bones.nS > 0 else 0
+                index = self._dem_bones.nF if self._dem_bones.nF > 0 else 0
 
-        # Update the number of shapes if needed
-        if index >= self._dem_bones.nS:
-            self._dem_bones.nS = index + 1
+        # Update the number of frames if needed
+        if index >= self._dem_bones.nF:
+            self._dem_bones.nF = index + 1
 
         # Remove any existing associations for this index
         for key in list(self._targets):
@@ -254,6 +531,7 @@ class DemBonesWrapper:
 
     # Matrix operations
 
+    @_synchronized
     def get_bind_matrix(self, bone):
         """
         Get the bind matrix for a bone.
@@ -284,6 +562,7 @@ class DemBonesWrapper:
 
         return self._bind_matrices[bone]
 
+    @_synchronized
     def set_bind_matrix(self, bone, matrix):
         """
         Set the bind matrix for a bone.
@@ -343,6 +622,7 @@ class DemBonesWrapper:
             # Update transformation matrix in DemBones
             self._dem_bones.set_transformations(flat_transforms)
 
+    @_synchronized
     def get_weights(self):
         """
         Get the weight matrix.
@@ -381,6 +661,99 @@ class DemBonesWrapper:
             print(f"Warning: Error getting weights: {e}")
             return np.zeros((self.num_bones, self.num_vertices), dtype=np.float64)
 
+    @_synchronized
+    def get_influences(self, max_influences=None, csr=False):
+        """
+        Export the weights as a compact influence table for skin writers.
+
+        The largest weights of every vertex are sorted by decreasing weight and
+        renormalised to sum to one, so DCC skin clusters and engine vertex streams can
+        be written in bulk instead of scanning the dense weight matrix.
+
+        Args:
+            max_influences (int, optional): Maximum number of influences per vertex.
+                Defaults to the max_influences of the solver.
+            csr (bool): Return the influences in CSR form instead of padded tables
+
+        Returns:
+            tuple: (indices, weights) with shape [num_vertices, max_influences], where
+                unused slots hold bone 0 with weight 0, or with ``csr`` (offsets, indices,
+                weights) where the influences of vertex ``i`` are
+                ``indices[offsets[i]:offsets[i + 1]]`` and exclude the unused slots
+
+        Raises:
+            ParameterError: If max_influences is invalid
+            ComputationError: If no weights have been computed or set
+        """
+        if max_influences is None:
+            max_influences = self.max_influences
+        if not isinstance(max_influences, (int, np.integer)) or max_influences <= 0:
+            raise ParameterError("Maximum influences must be a positive integer")
+
+        try:
+            indices, weights = self._dem_bones.get_influences(int(max_influences), num_threads=self._num_threads)
+        except RuntimeError as e:
+            raise ComputationError(f"Failed to export influences: {str(e)}")
+        if not csr:
+            return indices, weights
+
+        used = weights > 0
+        offsets = np.zeros(self.num_vertices + 1, dtype=np.int64)
+        np.cumsum(used.sum(axis=1), out=offsets[1:])
+        return offsets, indices[used], weights[used]
+
+    @_synchronized
+    def quantize_influences(self, max_influences=None, bits=8, frame_indices=None):
+        """
+        Quantise the weights to fixed-point influence tables for game runtimes.
+
+        The strongest influences of every vertex, as returned by get_influences(), are
+        scaled to unsigned normalized integers of ``bits`` bits. Largest remainder
+        rounding makes the quantised weights of every weighted vertex sum to exactly
+        ``2**bits - 1``. The skinned positions with the quantised influences are then
+        compared with the ones of the full precision weights on a set of frames.
+
+        Args:
+            max_influences (int, optional): Maximum number of influences per vertex.
+                Defaults to the max_influences of the solver.
+            bits (int): Bits per weight, 8 or 16
+            frame_indices (array-like, optional): Frames of the error report. Defaults to
+                at most 16 frames spread evenly over the sequence; an empty list skips
+                the report, so no transformations are needed.
+
+        Returns:
+            tuple: (indices, weights, errors) where ``indices`` and the uint8 or uint16
+                ``weights`` have shape [num_vertices, max_influences] with unused slots
+                holding bone 0 with weight 0, and ``errors`` holds the largest position
+                error of every vertex over the frames, or None without frames
+
+        Raises:
+            ParameterError: If max_influences or bits are invalid
+            IndexError: If a frame index is out of range
+            ComputationError: If the weights or transformations have not been computed
+        """
+        if max_influences is None:
+            max_influences = self.max_influences
+        if not isinstance(max_influences, (int, np.integer)) or max_influences <= 0:
+            raise ParameterError("Maximum influences must be a positive integer")
+        if bits not in (8, 16):
+            raise ParameterError(f"Quantised weights must have 8 or 16 bits, got {bits}")
+        if frame_indices is None:
+            num_samples = min(self.num_frames, _QUANTIZATION_SAMPLE_FRAMES)
+            frame_indices = np.unique(np.linspace(0, self.num_frames - 1, num_samples).round())
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+
+        self._sync_frame_layout()
+        try:
+            return self._dem_bones.quantize_influences(
+                int(max_influences), bits, frame_indices.tolist(), num_threads=self._num_threads
+            )
+        except RuntimeError as e:
+            raise ComputationError(f"Failed to quantise influences: {str(e)}")
+
+    @_synchronized
     def set_weights(self, weights):
         """
         Set the weight matrix.
@@ -421,9 +794,50 @@ class DemBonesWrapper:
         # Set flag indicating weights have been set
         self._weights_computed = True
 
+        # Transformations solved for other weights can no longer be updated incrementally
+        self._solved_shape = None
+
         # Update weights in C++ binding
         self._dem_bones.set_weights(weights)
 
+    @_synchronized
+    def get_weight_locks(self):
+        """
+        Get the per-vertex weight locks.
+
+        Returns:
+            numpy.ndarray: Lock amounts with shape [num_vertices], where 0 leaves the
+                weights of a vertex free and 1 keeps its current weights
+        """
+        locks = np.asarray(self._dem_bones.lockW)
+        if locks.shape != (self.num_vertices,):
+            return np.zeros(self.num_vertices, dtype=np.float64)
+        return locks
+
+    @_synchronized
+    def set_weight_locks(self, locks):
+        """
+        Set the per-vertex weight locks used by the weight solver.
+
+        Args:
+            locks (numpy.ndarray): Lock amounts with shape [num_vertices] in the range [0, 1],
+                where 0 leaves the weights of a vertex free and 1 keeps its current weights
+        """
+        try:
+            locks = np.asarray(locks, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise ParameterError(f"Failed to convert weight locks to numpy array: {str(e)}")
+
+        if locks.shape != (self.num_vertices,):
+            raise ParameterError(
+                f"Weight locks must have shape [num_vertices] = ({self.num_vertices},), got {locks.shape}"
+            )
+        if np.any(locks < 0) or np.any(locks > 1):
+            raise ParameterError("Weight locks must be in the range [0, 1]")
+
+        self._dem_bones.lockW = locks
+
+    @_synchronized
     def set_rest_pose(self, vertices):
         """
         Set the rest pose vertices.
@@ -452,6 +866,59 @@ class DemBonesWrapper:
 
         self._dem_bones.set_rest_pose(vertices)
 
+        # A new rest pose invalidates every solved frame
+        self._solved_shape = None
+
+    @_synchronized
+    def set_faces(self, faces, offsets=None):
+        """
+        Set the mesh faces that drive bone clustering and weight smoothing.
+
+        Integer arrays are handed to the native solver in one pass. Polygons of mixed
+        size are passed in CSR form as a flat index array with ``offsets``, where face
+        ``i`` holds ``faces[offsets[i]:offsets[i + 1]]``.
+
+        Args:
+            faces (array-like): Vertex indices with shape [num_faces, k] for k >= 3, the
+                flat vertex indices of all faces when ``offsets`` is given, or a list of
+                faces as lists of vertex indices
+            offsets (array-like, optional): Start of every face in ``faces`` followed by
+                the total number of indices
+
+        Raises:
+            ParameterError: If the faces are malformed
+            IndexError: If a vertex index is out of range
+        """
+        if offsets is None and not isinstance(faces, np.ndarray):
+            faces = list(faces)
+            sizes = [len(face) for face in faces]
+            if sizes and min(sizes) != max(sizes):
+                # Polygons of mixed size go through the CSR form
+                offsets = np.concatenate([[0], np.cumsum(sizes)])
+                faces = np.fromiter((i for face in faces for i in face), dtype=np.int32, count=offsets[-1])
+            else:
+                faces = np.asarray(faces, dtype=np.int32).reshape(len(faces), -1)
+
+        faces = np.asarray(faces)
+        if faces.size and faces.min() < 0:
+            raise IndexError(f"Negative face vertex index {faces.min()}")
+        # Faces may be set before the rest pose, when the vertex count is not known yet
+        if faces.size and self.num_vertices > 0 and faces.max() >= self.num_vertices:
+            raise IndexError(f"Face vertex index out of range (0-{self.num_vertices-1})")
+
+        try:
+            if offsets is None:
+                self._dem_bones.set_faces(faces)
+            else:
+                self._dem_bones.set_faces(offsets, faces)
+        except (TypeError, ValueError) as e:
+            raise ParameterError(f"Invalid faces: {str(e)}")
+
+        # The smoothing operator of the last solve no longer applies
+        self._solved_shape = None
+        self._vertex_faces = None
+
+    @_synchronized
     def set_target_vertices(self, target, vertices):
         """
         Set the vertices for a target pose.
@@ -465,8 +932,8 @@ class DemBonesWrapper:
         else:
             target_idx = target
             # Ensure the number of targets is updated when using index directly
-            if target_idx >= self._dem_bones.nS:
-                self._dem_bones.nS = target_idx + 1
+            if target_idx >= self._dem_bones.nF:
+                self._dem_bones.nF = target_idx + 1
 
         if not isinstance(vertices, np.ndarray):
             try:
@@ -488,43 +955,167 @@ class DemBonesWrapper:
             self.num_vertices = vertices.shape[1]
 
         # Get current animated poses
+        # DemBones stores the sequence as [3 * num_frames, num_vertices], one frame per target
         poses = self._dem_bones.get_animated_poses()
+        num_frames = max(self._dem_bones.nF, target_idx + 1)
+        num_vertices = vertices.shape[1]
 
-        # If no poses yet, create a new array
-        if poses.size == 0:
-            num_targets = max(self._dem_bones.nS, target_idx + 1)
-            num_vertices = vertices.shape[1]
-            poses = np.zeros((3, num_vertices, num_targets))
-
-        # Check if poses has the expected shape (3D array)
-        if len(poses.shape) < 3:
-            # If poses is not a 3D array, create a new one
-            num_targets = max(self._dem_bones.nS, target_idx + 1)
-            num_vertices = vertices.shape[1]
-            poses = np.zeros((3, num_vertices, num_targets))
+        # If no poses yet (or the vertex count changed), create a new array
+        if poses.size == 0 or poses.shape[1] != num_vertices:
+            poses = np.zeros((3 * num_frames, num_vertices))
 
         # Ensure poses array is large enough
-        if target_idx >= poses.shape[2]:
-            new_poses = np.zeros((3, poses.shape[1], target_idx + 1))
-            new_poses[:, :, : poses.shape[2]] = poses
+        if poses.shape[0] < 3 * num_frames:
+            new_poses = np.zeros((3 * num_frames, num_vertices))
+            new_poses[: poses.shape[0]] = poses
             poses = new_poses
 
         # Update the target pose
-        poses[:, :, target_idx] = vertices
+        poses[3 * target_idx : 3 * target_idx + 3] = vertices
+
+        # Update animated poses in DemBones
+        self._dem_bones.nF = num_frames
+        self._dem_bones.set_animated_poses(poses)
+        self._dirty_frames.add(target_idx)
 
-        # Convert 3D array to the format expected by C++ binding
-        # In C++, we expect a 2D matrix where rows are vertex coordinates and columns are vertex indices
-        # We need to reshape [3, num_vertices, num_targets] to [3, num_vertices * num_targets]
-        num_vertices = poses.shape[1]
-        num_targets = poses.shape[2]
-        flat_poses = np.zeros((3, num_vertices * num_targets))
+    @_synchronized
+    def set_animated_poses(self, poses):
+        """
+        Replace the whole animated sequence in one pass.
 
-        for t in range(num_targets):
-            flat_poses[:, t * num_vertices : (t + 1) * num_vertices] = poses[:, :, t]
+        The poses are copied into the native solver once, straight from their own
+        memory layout, so strided views such as ``frames.transpose(0, 2, 1)`` of a
+        [num_frames, num_vertices, 3] array and memory-mapped arrays are loaded
+        without an intermediate copy. float32 and float64 data are read as is.
 
-        # Update animated poses in DemBones
-        self._dem_bones.set_animated_poses(flat_poses)
+        Args:
+            poses (numpy.ndarray): Animated poses with shape [num_frames, 3, num_vertices]
+                or [3 * num_frames, num_vertices]
+
+        Raises:
+            ParameterError: If the poses have the wrong shape or type
+        """
+        poses = np.asarray(poses)
+        if poses.ndim == 3 and poses.shape[1] == 3:
+            num_frames = poses.shape[0]
+        elif poses.ndim == 2 and poses.shape[0] % 3 == 0:
+            num_frames = poses.shape[0] // 3
+        else:
+            raise ParameterError(
+                f"Animated poses must have shape [num_frames, 3, num_vertices] or "
+                f"[3 * num_frames, num_vertices], got {poses.shape}"
+            )
+        num_vertices = poses.shape[-1]
+        if num_frames == 0 or num_vertices == 0:
+            raise ParameterError("Animated poses must hold at least one frame and one vertex")
+        if self.num_vertices > 0 and self._dem_bones.get_rest_pose().size and num_vertices != self.num_vertices:
+            raise ParameterError(f"Animated poses have {num_vertices} vertices, rest pose has {self.num_vertices}")
+
+        try:
+            self._dem_bones.load_animated_poses(poses)
+        except ValueError as e:
+            raise ParameterError(f"Failed to load animated poses: {str(e)}")
+
+        self.num_vertices = num_vertices
+        self._dem_bones.nF = num_frames
+        # Every frame changed, so the next compute() starts from scratch
+        self._solved_shape = None
+
+    @property
+    def frame_store(self):
+        """Get the out-of-core frame store the animated poses are read from (None if in memory)."""
+        return self._frame_store
+
+    @_synchronized
+    def set_frame_store(self, store):
+        """
+        Read the animated poses from an out-of-core frame store.
+
+        In this mode compute() never holds the whole sequence in memory. Bones, weights
+        and keyframe transformations are solved jointly on at most max_keyframes frames
+        (256 if unset) chosen in one streamed pass (see select_streamed_keyframes), and
+        the transformations of the full timeline are then recovered chunk by chunk as
+        the store streams the frames. Apart from the solved transformations, memory use
+        is bounded by the keyframes and the chunk cache of the store. The prefetch
+        thread of the store is stopped when compute() returns. rigid_tolerance and
+        frame_tolerance need the whole sequence in memory and are not supported.
+
+        Args:
+            store (FrameStore or None): Frame store holding the sequence, or None to use
+                the in-memory animated poses again
+
+        Raises:
+            ParameterError: If the store does not match the rest pose
+        """
+        if store is None:
+            self._frame_store = None
+            return
+        if self.num_vertices > 0 and store.num_vertices != self.num_vertices:
+            raise ParameterError(
+                f"Frame store has {store.num_vertices} vertices, rest pose has {self.num_vertices}"
+            )
+        self._frame_store = store
+        self._dem_bones.nF = store.num_frames
+        self._solved_shape = None
+
+    @_synchronized
+    def replace_frames(self, frame_indices, poses):
+        """
+        Replace the vertices of existing frames.
+
+        The poses are written into the native frame storage without copying the rest
+        of the sequence, and the frames are marked dirty so the next compute() only
+        re-solves their transformations.
+
+        Args:
+            frame_indices (array-like): Indices of the frames to replace
+            poses (numpy.ndarray): New vertices with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            ParameterError: If the poses have the wrong shape
+            IndexError: If a frame index is out of range
+        """
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        try:
+            poses = np.asarray(poses, dtype=np.float64)
+        except (TypeError, ValueError) as e:
+            raise ParameterError(f"Failed to convert poses to numpy array: {str(e)}")
+
+        expected = (frame_indices.size, 3, self.num_vertices)
+        if poses.shape != expected:
+            raise ParameterError(f"Poses must have shape {expected}, got {poses.shape}")
+        if frame_indices.size == 0:
+            return
+        if frame_indices.min() < 0 or frame_indices.max() >= self.num_frames:
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+
+        try:
+            self._dem_bones.set_animated_frames(
+                frame_indices.tolist(), poses.reshape(3 * frame_indices.size, self.num_vertices)
+            )
+        except Exception as e:
+            raise ParameterError(f"Failed to replace frames: {str(e)}")
+
+        self._dirty_frames.update(frame_indices.tolist())
+
+    @_synchronized
+    def mark_frames_dirty(self, frame_indices=None):
+        """
+        Mark frames as changed so the next compute() re-solves them.
 
+        Use this after editing the animated poses directly through the native object.
+
+        Args:
+            frame_indices (array-like, optional): Frame indices to mark. Defaults to all frames.
+        """
+        if frame_indices is None:
+            frame_indices = range(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        self._dirty_frames.update(frame_indices.tolist())
+
+    @_synchronized
     def get_transformations(self):
         """
         Get the transformation matrices for all bones.
@@ -542,6 +1133,305 @@ class DemBonesWrapper:
         # C++ binding already returns array in [num_frames, 4, 4] format, return directly
         return transforms
 
+    @_synchronized
+    def get_rest_pose(self):
+        """
+        Get the rest pose vertices.
+
+        Returns:
+            numpy.ndarray: The rest pose vertices with shape [3, num_vertices]
+        """
+        return self._dem_bones.get_rest_pose()
+
+    @_synchronized
+    def get_bone_transformations(self):
+        """
+        Get the transformation of every bone in every frame.
+
+        Returns:
+            numpy.ndarray: Transformations with shape [num_frames, num_bones, 4, 4] that
+                map the rest pose to each frame
+
+        Raises:
+            ComputationError: If no transformations have been computed or set
+        """
+        transforms = self._dem_bones.m
+        if self.num_frames <= 0 or self.num_bones <= 0 or transforms.shape != (4 * self.num_frames, 4 * self.num_bones):
+            raise ComputationError("Bone transformations are not available: call compute() first")
+        return transforms.reshape(self.num_frames, 4, self.num_bones, 4).transpose(0, 2, 1, 3).copy()
+
+    @_synchronized
+    def get_skinned_poses(self, frame_indices=None):
+        """
+        Reconstruct animated poses from the rest pose, weights and transformations.
+
+        Args:
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ComputationError: If no solved decomposition is available
+        """
+        if frame_indices is None:
+            frame_indices = range(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        if not self._weights_computed:
+            raise ComputationError("Cannot reconstruct poses: call compute() first")
+        if frame_indices.size == 0:
+            return np.zeros((0, 3, self.num_vertices))
+
+        self._sync_frame_layout()
+        try:
+            poses = self._dem_bones.compute_skinned_poses(frame_indices.tolist(), num_threads=self._num_threads)
+        except RuntimeError as e:
+            raise ComputationError(f"Failed to reconstruct poses: {str(e)}")
+        return poses.reshape(frame_indices.size, 3, self.num_vertices)
+
+    @_synchronized
+    def get_dual_quaternion_poses(self, frame_indices=None, max_influences=None):
+        """
+        Reconstruct animated poses by dual quaternion skinning.
+
+        Runtimes that skin with dual quaternions blend the bone rotations instead of the
+        matrices, which keeps volume at twisting joints but changes the result of the
+        weights the solver fitted for linear blend skinning.
+
+        Args:
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+            max_influences (int, optional): Blend only the largest weights of every vertex,
+                defaults to all weights
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ParameterError: If max_influences is not a positive integer
+            ComputationError: If no solved decomposition is available
+        """
+        if frame_indices is None:
+            frame_indices = range(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        if max_influences is not None and (not isinstance(max_influences, (int, np.integer)) or max_influences <= 0):
+            raise ParameterError("Maximum influences must be a positive integer")
+        if not self._weights_computed:
+            raise ComputationError("Cannot reconstruct poses: call compute() first")
+        if frame_indices.size == 0:
+            return np.zeros((0, 3, self.num_vertices))
+
+        self._sync_frame_layout()
+        try:
+            poses = self._dem_bones.compute_dual_quaternion_poses(
+                frame_indices.tolist(), k=max_influences or 0, num_threads=self._num_threads
+            )
+        except RuntimeError as e:
+            raise ComputationError(f"Failed to reconstruct poses: {str(e)}")
+        return poses.reshape(frame_indices.size, 3, self.num_vertices)
+
+    @_synchronized
+    def compare_skinning(self, frame_indices=None, max_influences=None, chunk_frames=64):
+        """
+        Measure how closely linear blend and dual quaternion skinning follow the animation.
+
+        Both reconstructions are compared with the animated poses, from the frame store
+        when one is set, a chunk of frames at a time.
+
+        Args:
+            frame_indices (array-like, optional): Frames to compare, defaults to all frames
+            max_influences (int, optional): Influences per vertex for dual quaternion
+                skinning, defaults to all weights
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Returns:
+            dict: Per-vertex errors with shape [num_vertices] in ``lbs_rmse``, ``lbs_max``,
+                ``dqs_rmse`` and ``dqs_max`` (root mean square and largest distance over
+                the frames), the overall root mean square distances ``lbs_total_rmse`` and
+                ``dqs_total_rmse``, and ``dqs_better``, a boolean mask of the vertices
+                whose dual quaternion error is smaller
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ParameterError: If max_influences or chunk_frames are invalid
+            ComputationError: If no solved decomposition is available
+        """
+        if not isinstance(chunk_frames, (int, np.integer)) or chunk_frames <= 0:
+            raise ParameterError("Chunk size must be a positive integer")
+        if frame_indices is None:
+            frame_indices = range(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        if not self._weights_computed:
+            raise ComputationError("Cannot compare skinning methods: call compute() first")
+
+        report = {}
+        for method in ("lbs", "dqs"):
+            report[f"{method}_rmse"] = np.zeros(self.num_vertices)
+            report[f"{method}_max"] = np.zeros(self.num_vertices)
+        if self._frame_store is None:
+            animated_poses = self._dem_bones.get_animated_poses().reshape(self.num_frames, 3, self.num_vertices)
+        for start in range(0, frame_indices.size, chunk_frames):
+            chunk = frame_indices[start : start + chunk_frames]
+            if self._frame_store is None:
+                targets = animated_poses[chunk]
+            else:
+                targets = self._frame_store.get_frames(chunk)
+            for method, poses in (
+                ("lbs", self.get_skinned_poses(chunk)),
+                ("dqs", self.get_dual_quaternion_poses(chunk, max_influences)),
+            ):
+                distances = np.linalg.norm(poses - targets, axis=1)
+                report[f"{method}_rmse"] += np.square(distances).sum(axis=0)
+                np.maximum(report[f"{method}_max"], distances.max(axis=0), out=report[f"{method}_max"])
+
+        count = max(frame_indices.size, 1)
+        for method in ("lbs", "dqs"):
+            report[f"{method}_total_rmse"] = float(np.sqrt(report[f"{method}_rmse"].mean() / count))
+            report[f"{method}_rmse"] = np.sqrt(report[f"{method}_rmse"] / count)
+        report["dqs_better"] = report["dqs_rmse"] < report["lbs_rmse"]
+        return report
+
+    @_synchronized
+    def extract_correctives(self, num_shapes=8, target_error=None, chunk_frames=64):
+        """
+        Compress the residual of the skinned poses into corrective shapes.
+
+        See ``py_dem_bones.corrective.extract_correctives``. The residual of the animated
+        poses, from the frame store when one is set, is computed a chunk of frames at a
+        time in every pass, so it is never held in memory as a whole.
+
+        Args:
+            num_shapes (int): Maximum number of corrective shapes
+            target_error (float, optional): Root mean square error of the corrected poses
+                at which to stop adding shapes, defaults to using all num_shapes
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Returns:
+            CorrectiveShapes: The shapes, their per-frame coefficients and the remaining error
+
+        Raises:
+            ParameterError: If the settings are invalid
+            ComputationError: If no solved decomposition is available
+        """
+        if not isinstance(chunk_frames, (int, np.integer)) or chunk_frames <= 0:
+            raise ParameterError("Chunk size must be a positive integer")
+        if not self._weights_computed:
+            raise ComputationError("Cannot extract correctives: call compute() first")
+        if self._frame_store is None:
+            animated_poses = self._dem_bones.get_animated_poses().reshape(self.num_frames, 3, self.num_vertices)
+
+        def residuals():
+            for start in range(0, self.num_frames, chunk_frames):
+                chunk = np.arange(start, min(start + chunk_frames, self.num_frames))
+                if self._frame_store is None:
+                    targets = animated_poses[chunk]
+                else:
+                    targets = self._frame_store.get_frames(chunk)
+                yield start, targets - self.get_skinned_poses(chunk)
+
+        return extract_correctives(residuals, self.num_frames, num_shapes, target_error)
+
+    @_synchronized
+    def get_corrected_poses(self, correctives, frame_indices=None):
+        """
+        Reconstruct animated poses by skinning and corrective shapes.
+
+        Args:
+            correctives (CorrectiveShapes): Correctives of this decomposition, as returned
+                by extract_correctives()
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: Corrected poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            ParameterError: If the correctives do not match the decomposition
+            IndexError: If a frame index is out of range
+            ComputationError: If no solved decomposition is available
+        """
+        if not isinstance(correctives, CorrectiveShapes):
+            raise ParameterError("Correctives must be a CorrectiveShapes instance")
+        if (correctives.num_frames, correctives.num_vertices) != (self.num_frames, self.num_vertices):
+            raise ParameterError(
+                f"Correctives cover {correctives.num_frames} frames of {correctives.num_vertices} vertices, "
+                f"the decomposition {self.num_frames} frames of {self.num_vertices} vertices"
+            )
+        poses = self.get_skinned_poses(frame_indices)
+        poses += correctives.evaluate(frame_indices)
+        return poses
+
+    @_synchronized
+    def reduce_keyframes(self, tolerance, times=None):
+        """
+        Reduce the solved transformations to sparse rotation, translation and scale keys.
+
+        See ``py_dem_bones.animation.reduce_keyframes``; the skinned vertices under the
+        reduced curves stay within the tolerance of their solved positions.
+
+        Args:
+            tolerance (float): Largest distance of a skinned vertex from its solved position
+            times (array-like, optional): Strictly increasing time of every frame, defaults
+                to the frame times ``fTime`` of the native solver when it holds one per
+                frame, otherwise to the frame indices
+
+        Returns:
+            list: BoneCurves of every bone
+
+        Raises:
+            ParameterError: If the tolerance or the times are invalid
+            ComputationError: If no solved decomposition is available
+        """
+        if not self._weights_computed:
+            raise ComputationError("Cannot reduce keyframes: call compute() first")
+        transformations = self.get_bone_transformations()
+        if times is None:
+            frame_times = getattr(self._dem_bones, "fTime", None)
+            if frame_times is not None and np.size(frame_times) == self.num_frames:
+                times = frame_times
+        rest_pose = self._dem_bones.get_rest_pose()[:3]
+        return reduce_keyframes(
+            transformations, rest_pose, self.get_weights(), tolerance, times, workers=self._num_threads or None
+        )
+
+    @_synchronized
+    def export_point_cache(self, path, times=None, chunk_frames=64):
+        """
+        Bake the skinned reconstruction of every frame into a PC2 or MDD point cache.
+
+        Frames are reconstructed and written in chunks, so the cache can be compared
+        with the source animation in a DCC application without holding the whole
+        sequence in memory.
+
+        Args:
+            path (str): Path of the ``.pc2`` or ``.mdd`` file to write
+            times (array-like, optional): Time of every frame, see
+                ``py_dem_bones.io.create_point_cache``
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Raises:
+            IOError: If the file cannot be written
+            ParameterError: If the format or the times are invalid
+            ComputationError: If no solved decomposition is available
+        """
+        if not isinstance(chunk_frames, (int, np.integer)) or chunk_frames <= 0:
+            raise ParameterError("Chunk size must be a positive integer")
+        if not self._weights_computed:
+            raise ComputationError("Cannot export point cache: call compute() first")
+
+        cache = create_point_cache(path, self.num_frames, self.num_vertices, times)
+        for start in range(0, self.num_frames, chunk_frames):
+            stop = min(start + chunk_frames, self.num_frames)
+            cache[start:stop] = self.get_skinned_poses(range(start, stop))
+        cache.flush()
+
+    @_synchronized
     def set_transformations(self, transformations):
         """
         Set the transformation matrices for all bones.
@@ -577,12 +1467,21 @@ class DemBonesWrapper:
 
         self._dem_bones.set_transformations(flat_transforms)
 
-    def compute(self, callback: Optional[Callable[[float], None]] = None):
+    @_synchronized
+    def compute(self, callback: Optional[Callable[[float], None]] = None, incremental: bool = True):
         """
         Compute the skinning weights and transformations.
 
+        When a previous solve is available and only some frames changed since then
+        (see dirty_frames), the update is incremental: only the transformations of the
+        changed frames are re-solved, starting from their previous values, followed by
+        a single weight update over the whole sequence. The transformations of the
+        untouched frames are reused as they are. Frames appended after the last solve
+        are treated as changed and start from the transformations of the last frame.
+
         Args:
             callback (callable, optional): A function to call with progress updates (0.0 to 1.0)
+            incremental (bool): Allow the incremental update. If False, always run a full solve.
 
         Returns:
             bool: True if computation succeeded
@@ -598,6 +1497,8 @@ class DemBonesWrapper:
                 # Wrap ParameterError in ComputationError with 'compute' in the message
                 raise ComputationError(f"Cannot compute: {str(e)}")
 
+            self._sync_frame_layout()
+
             # If a callback is provided, we need to monitor progress
             if callback is not None:
                 # Get the total number of iterations
@@ -609,25 +1510,20 @@ class DemBonesWrapper:
                 callback(0.0)
 
                 # Start computation
-                result = self._dem_bones.compute()
+                result = self._run_cached_solver(incremental)
 
                 # Final progress
                 callback(1.0)
             else:
                 # No callback, just compute
-                result = self._dem_bones.compute()
+                result = self._run_cached_solver(incremental)
 
-            if not result:
+            # The native solver returns None; only an explicit False signals failure
+            if result is False:
                 raise ComputationError("DemBones.compute() returned failure")
 
-            # Clear any cached weights since we've computed new ones
-            if hasattr(self, "_cached_weights"):
-                delattr(self, "_cached_weights")
-
-            # Set flag indicating weights have been computed
-            self._weights_computed = True
-
-            return result
+            self._mark_solved()
+            return True
         except ComputationError:
             # Re-raise ComputationError as is
             raise
@@ -635,6 +1531,480 @@ class DemBonesWrapper:
             # Wrap any other exception in ComputationError
             raise ComputationError(f"Computation failed: {str(e)}")
 
+    @_synchronized
+    def compute_multiresolution(self, proxy_vertices, compare_direct=False):
+        """
+        Compute the decomposition coarse-to-fine on a decimated proxy of the mesh.
+
+        The rest pose is decimated by vertex clustering on a regular grid (see
+        py_dem_bones.multires.ProxyMesh), and every proxy vertex follows the centroid of
+        its cluster in the animated poses. Bones and transformations are solved on the
+        proxy. The proxy weights are then interpolated to the full mesh through the
+        clustering grid and refined with one weight-only pass at full resolution, which
+        the native solver runs in parallel over vertices.
+
+        Args:
+            proxy_vertices (int): Maximum number of vertices of the proxy
+            compare_direct (bool): Also run a direct solve at full resolution on a
+                separate solver and report its error and run time for comparison
+
+        Returns:
+            dict: Report with the proxy size, the RMSE of the proxy solve, of the
+                interpolated weights and of the refined result, the run times, and the
+                RMSE and run time of the direct solve when requested
+
+        Raises:
+            ParameterError: If the proxy size is invalid
+            ComputationError: If the computation fails
+        """
+        if not isinstance(proxy_vertices, (int, np.integer)) or proxy_vertices <= 0:
+            raise ParameterError("Number of proxy vertices must be a positive integer")
+        try:
+            self._validate_computation_inputs()
+        except ParameterError as e:
+            raise ComputationError(f"Cannot compute: {str(e)}")
+
+        try:
+            self._sync_frame_layout()
+            start = time.perf_counter()
+            rest_pose = self._dem_bones.get_rest_pose()
+            animated_poses = self._dem_bones.get_animated_poses()
+            offsets, indices = self._dem_bones.get_faces()
+            proxy = ProxyMesh(rest_pose, proxy_vertices, indices, offsets)
+
+            sub = self._create_subsolver(proxy.num_vertices, self.num_frames, self.num_bones)
+            sub.set_rest_pose(proxy.rest_pose)
+            sub.set_animated_poses(proxy.average(animated_poses))
+            sub.set_faces(proxy.face_offsets, proxy.face_indices)
+            self._prepare_smoothing(sub)
+            sub.compute(num_threads=self._num_threads)
+            proxy_time = time.perf_counter() - start
+
+            weights = proxy.interpolate(sub.get_weights(), rest_pose)
+            weights /= np.maximum(weights.sum(axis=0), 1e-12)
+            self._dem_bones.nB = sub.nB
+            self._dem_bones.set_weights(weights)
+            self._dem_bones.m = sub.m
+            interpolated_rmse = self._dem_bones.rmse(num_threads=self._num_threads)
+            self._prepare_smoothing(self._dem_bones)
+            self._dem_bones.computeWeights(num_threads=self._num_threads)
+            total_time = time.perf_counter() - start
+        except Exception as e:
+            raise ComputationError(f"Multiresolution computation failed: {str(e)}")
+
+        self._mark_solved()
+        report = {
+            "proxy_vertices": proxy.num_vertices,
+            "proxy_faces": proxy.num_faces,
+            "proxy_rmse": sub.rmse(num_threads=self._num_threads),
+            "interpolated_rmse": interpolated_rmse,
+            "rmse": self._dem_bones.rmse(num_threads=self._num_threads),
+            "proxy_time": proxy_time,
+            "time": total_time,
+        }
+
+        if compare_direct:
+            start = time.perf_counter()
+            direct = self._solve_subproblem(rest_pose, animated_poses, np.arange(self.num_vertices), self.num_bones)
+            report["direct_time"] = time.perf_counter() - start
+            report["direct_rmse"] = direct.rmse(num_threads=self._num_threads)
+
+        self._solve_report = dict(report)
+        return report
+
+    @_synchronized
+    def resolve_region(self, vertex_indices, rings=1, num_iterations=None):
+        """
+        Re-solve the weights of a vertex region while the rest of the mesh stays fixed.
+
+        Only the region plus ``rings`` rings of face neighbours are handed to the solver.
+        The neighbours are fully weight-locked so they anchor the smoothing at the region
+        border, and bones that influence any vertex outside the region keep their
+        transformations. Bones whose influence lies entirely inside the region are
+        re-solved together with the weights. The cost scales with the region size
+        rather than with the number of vertices.
+
+        Args:
+            vertex_indices (array-like): Indices of the vertices to re-solve
+            rings (int): Number of neighbour rings included as fixed context
+            num_iterations (int, optional): Number of solver iterations for the region.
+                Defaults to num_iterations.
+
+        Returns:
+            dict: Report with the number of region and neighbour vertices, the number of
+                bones whose transformations were updated and the RMSE of the region solve
+
+        Raises:
+            ParameterError: If the region or the parameters are invalid
+            IndexError: If a vertex index is out of range
+            ComputationError: If no solved decomposition is available or the solve fails
+        """
+        vertex_indices = np.unique(np.asarray(vertex_indices, dtype=np.int64).ravel())
+        if vertex_indices.size == 0:
+            raise ParameterError("Region must contain at least one vertex")
+        if vertex_indices[0] < 0 or vertex_indices[-1] >= self.num_vertices:
+            raise IndexError(f"Vertex index out of range (0-{self.num_vertices-1})")
+        if not isinstance(rings, (int, np.integer)) or rings < 0:
+            raise ParameterError("Rings must be a non-negative integer")
+        if num_iterations is None:
+            num_iterations = self.num_iterations
+        elif not isinstance(num_iterations, (int, np.integer)) or num_iterations < 0:
+            raise ParameterError("Number of iterations must be a non-negative integer")
+
+        if not self._weights_computed:
+            raise ComputationError("Cannot resolve region: call compute() before resolve_region()")
+
+        try:
+            self._sync_frame_layout()
+            if self._vertex_faces is None or self._vertex_faces[0] != self.num_vertices:
+                offsets, indices = self._dem_bones.get_faces()
+                self._vertex_faces = (self.num_vertices,) + vertex_faces(offsets, indices, self.num_vertices)
+            report = self._dem_bones.resolve_region(
+                vertex_indices.tolist(),
+                rings,
+                num_iterations,
+                self._vertex_faces[1],
+                self._vertex_faces[2],
+                num_threads=self._num_threads,
+            )
+        except Exception as e:
+            raise ComputationError(f"Region solve failed: {str(e)}")
+
+        # The region weights changed in the native solver
+        if hasattr(self, "_cached_weights"):
+            delattr(self, "_cached_weights")
+
+        return dict(report)
+
+    def _mark_solved(self):
+        """Record that the native solver holds a fresh solution for the current data."""
+        # Clear any cached weights since we've computed new ones
+        if hasattr(self, "_cached_weights"):
+            delattr(self, "_cached_weights")
+
+        # Set flag indicating weights have been computed
+        self._weights_computed = True
+        self._dirty_frames.clear()
+        if self._frame_store is None:
+            self._solved_shape = (self.num_frames, self.num_vertices, self.num_bones)
+        else:
+            # The native solver does not hold the sequence, so it cannot be updated incrementally
+            self._solved_shape = None
+
+    def _run_cached_solver(self, incremental):
+        """Load the result of a full solve from the result cache, or solve and cache it."""
+        if self._result_cache is None or (incremental and self._can_update_incrementally()):
+            return self._run_solver(incremental)
+
+        key = self._result_key()
+        cached = self._result_cache.load(key)
+        if cached is not None:
+            transformations = cached["transformations"]
+            self._dem_bones.nB = cached["num_bones"]
+            self._dem_bones.nF = transformations.shape[0] // 4
+            self._dem_bones.set_weights(cached["weights"])
+            self._dem_bones.m = transformations
+            self._solve_report = dict(cached["report"], cache_hit=True)
+            return None
+
+        result = self._run_solver(incremental)
+        if result is not False:
+            self._result_cache.store(key, self._dem_bones.get_weights(), self._dem_bones.m, self._solve_report)
+        self._solve_report["cache_hit"] = False
+        return result
+
+    def _result_key(self):
+        """Hash everything that determines the result of a full solve."""
+        native = self._dem_bones
+        hasher = ResultHasher()
+        hasher.update_value("solver", type(native).__name__)
+        hasher.update_value("version", __version__)
+        hasher.update_value("dem_bones_version", __dem_bones_version__)
+        for name in _SOLVER_PARAMETERS + ("nB",):
+            hasher.update_value(name, getattr(native, name))
+        hasher.update_value("rigid_tolerance", self._rigid_tolerance)
+        hasher.update_value("frame_tolerance", self._frame_tolerance)
+        hasher.update_value("max_keyframes", self._max_keyframes)
+
+        hasher.update_array("u", native.get_rest_pose())
+        if self._frame_store is None:
+            hasher.update_array("v", native.get_animated_poses())
+        else:
+            for _, chunk in self._frame_store.iter_chunks():
+                hasher.update_array("v", chunk)
+        offsets, indices = native.get_faces()
+        hasher.update_array("fv_offsets", offsets)
+        hasher.update_array("fv_indices", indices)
+        hasher.update_array("lockW", native.lockW)
+        hasher.update_array("lockM", native.lockM)
+
+        # The solve starts from the current weights and transformations when they are set
+        hasher.update_array("w", self.get_weights())
+        hasher.update_array("m", native.m)
+        return hasher.hexdigest()
+
+    def _run_solver(self, incremental):
+        """Run a full solve, or an incremental update of the dirty frames when possible."""
+        self._solve_report = {}
+        if self._frame_store is not None:
+            if self._rigid_tolerance is not None or self._frame_tolerance is not None:
+                raise ComputationError("Cannot compute: rigid_tolerance and frame_tolerance need in-memory poses")
+            return self._solve_out_of_core()
+        if incremental and self._can_update_incrementally():
+            return self._update_dirty_frames()
+        if self._rigid_tolerance is None and self._frame_tolerance is None and self._max_keyframes is None:
+            self._prepare_smoothing(self._dem_bones)
+            return self._dem_bones.compute(num_threads=self._num_threads)
+        return self._solve_reduced()
+
+    def _update_dirty_frames(self):
+        """Re-solve the transformations of the dirty frames, then refine the weights once."""
+        num_frames, num_vertices, num_bones = self._solved_shape
+        if self.num_frames > num_frames:
+            # Appended frames start from the last solved transformations
+            transforms = self._dem_bones.m
+            extra = np.tile(transforms[-4:], (self.num_frames - num_frames, 1))
+            self._dem_bones.m = np.vstack([transforms, extra])
+            self._dirty_frames.update(range(num_frames, self.num_frames))
+
+        self._dem_bones.compute_frame_transformations(sorted(self._dirty_frames), num_threads=self._num_threads)
+        return self._dem_bones.computeWeights(num_threads=self._num_threads)
+
+    def _solve_reduced(self):
+        """
+        Solve a reduced copy of the problem and expand the results to the full problem.
+
+        Duplicate frames are left out of the solve when frame_tolerance is set and take
+        the transformations of their representative frame. When more frames than
+        max_keyframes remain, only keyframes are solved jointly and the transformations
+        of the other frames are recovered afterwards with the weights fixed. Static and
+        rigidly moving vertices are bound to bones of their own when rigid_tolerance is
+        set, and only the remaining vertices are solved with the remaining bones. The
+        results are merged back into the native solver.
+        """
+        rest_pose = self._dem_bones.get_rest_pose()
+        animated_poses = self._dem_bones.get_animated_poses()
+        num_frames = self.num_frames
+        num_vertices = self.num_vertices
+
+        frames = np.arange(num_frames)
+        inverse = frames
+        if self._frame_tolerance is not None:
+            frames, inverse = find_duplicate_frames(animated_poses, self._frame_tolerance)
+            self._solve_report.update(
+                {
+                    "unique_frames": int(frames.size),
+                    "duplicate_frames": int(num_frames - frames.size),
+                }
+            )
+            if frames.size < num_frames:
+                animated_poses = animated_poses.reshape(num_frames, 3, num_vertices)[frames].reshape(-1, num_vertices)
+
+        keyframes = np.arange(frames.size)
+        nearest = keyframes
+        if self._max_keyframes is not None and frames.size > self._max_keyframes:
+            keyframes, nearest = select_keyframes(animated_poses, self._max_keyframes)
+            animated_poses = animated_poses.reshape(frames.size, 3, num_vertices)[keyframes].reshape(-1, num_vertices)
+            self._solve_report["keyframes"] = int(keyframes.size)
+
+        labels = np.full(num_vertices, -1, dtype=np.int64)
+        cluster_transforms = np.zeros((0, frames.size, 4, 4))
+        if self._rigid_tolerance is not None:
+            labels, cluster_transforms = self._find_rigid_clusters(rest_pose, animated_poses)
+        free = np.flatnonzero(labels < 0)
+
+        if keyframes.size == num_frames and free.size == num_vertices:
+            # Nothing to leave out, solve in place
+            self._prepare_smoothing(self._dem_bones)
+            return self._dem_bones.compute(num_threads=self._num_threads)
+
+        num_clusters = len(cluster_transforms)
+        # Without free vertices only the cluster bones are kept, the others would have no transformations
+        num_solved_bones = self.num_bones - num_clusters if free.size else 0
+        weights = np.zeros((self.num_bones, num_vertices))
+        transforms = np.zeros((4 * keyframes.size, 4 * self.num_bones))
+        if free.size:
+            sub = self._solve_subproblem(rest_pose, animated_poses, free, num_solved_bones)
+            num_solved_bones = sub.nB
+            weights[:num_solved_bones, free] = sub.get_weights()
+            transforms[:, : 4 * num_solved_bones] = sub.m
+
+        for index in range(num_clusters):
+            bone = num_solved_bones + index
+            weights[bone, labels == index] = 1.0
+            transforms[:, 4 * bone : 4 * bone + 4] = cluster_transforms[index].reshape(-1, 4)
+
+        # The sub-problem may have used fewer bones than it was given
+        num_bones = num_solved_bones + num_clusters
+        transforms = transforms[:, : 4 * num_bones].reshape(keyframes.size, 4, 4 * num_bones)
+        self._dem_bones.nB = num_bones
+        self._dem_bones.set_weights(weights[:num_bones])
+        self._dem_bones.m = transforms[nearest[inverse]].reshape(4 * num_frames, 4 * num_bones)
+
+        if keyframes.size < frames.size:
+            # Recover the other frames from their closest keyframe with the weights fixed
+            recovered = np.setdiff1d(frames, frames[keyframes])
+            self._dem_bones.compute_frame_transformations(recovered.tolist(), num_threads=self._num_threads)
+            if frames.size < num_frames:
+                transforms = self._dem_bones.m.reshape(num_frames, 4, 4 * num_bones)
+                self._dem_bones.m = transforms[frames[inverse]].reshape(4 * num_frames, 4 * num_bones)
+        return None
+
+    def _solve_out_of_core(self):
+        """Solve keyframes jointly, then recover all transformations chunk by chunk from the frame store."""
+        store = self._frame_store
+        try:
+            return self._solve_streamed(store)
+        finally:
+            store.stop_prefetch()
+
+    def _solve_streamed(self, store):
+        """Run the out-of-core solve on a frame store."""
+        num_frames = store.num_frames
+        num_vertices = self.num_vertices
+        rest_pose = self._dem_bones.get_rest_pose()
+
+        count = min(num_frames, self._max_keyframes or _OUT_OF_CORE_KEYFRAMES)
+        keyframes, key_features = select_streamed_keyframes(store.iter_chunks(), count)
+        key_norms = np.einsum("ij,ij->i", key_features, key_features)
+
+        key_poses = store.get_frames(keyframes).reshape(-1, num_vertices)
+        sub = self._solve_subproblem(rest_pose, key_poses, np.arange(num_vertices), self.num_bones)
+        del key_poses
+        num_bones = sub.nB
+        # sub.m is a view of the native buffer, which is reallocated by assigning sub.m below
+        key_transforms = sub.m.reshape(keyframes.size, 4, 4 * num_bones).copy()
+
+        # The keyframe solver keeps its weights and re-solves one chunk of frames at a time,
+        # starting from the transformations of the closest keyframe of every frame
+        transforms = np.empty((num_frames, 4, 4 * num_bones))
+        squared_error = 0.0
+        for start, chunk in store.iter_chunks():
+            size = chunk.shape[0]
+            nearest = np.argmin(key_norms - 2.0 * pose_features(chunk) @ key_features.T, axis=1)
+            sub.nF = size
+            sub.fStart = np.array([0, size], dtype=np.int32)
+            sub.subjectID = np.zeros(size, dtype=np.int32)
+            sub.set_animated_poses(chunk.reshape(-1, num_vertices))
+            sub.m = key_transforms[nearest].reshape(4 * size, 4 * num_bones)
+            sub.computeTranformations(num_threads=self._num_threads)
+            transforms[start : start + size] = sub.m.reshape(size, 4, 4 * num_bones)
+            squared_error += sub.rmse(num_threads=self._num_threads) ** 2 * size
+
+        self._dem_bones.nB = num_bones
+        self._dem_bones.nF = num_frames
+        self._dem_bones.set_weights(sub.get_weights())
+        self._dem_bones.m = transforms.reshape(4 * num_frames, 4 * num_bones)
+        self._solve_report.update(
+            {
+                "keyframes": int(keyframes.size),
+                "chunks": store.num_chunks,
+                "rmse": float(np.sqrt(squared_error / num_frames)),
+            }
+        )
+        return None
+
+    def _find_rigid_clusters(self, rest_pose, animated_poses):
+        """Find the rigid vertex clusters that get a bone of their own."""
+        num_bones = self.num_bones
+        num_vertices = self.num_vertices
+
+        # A rigid cluster is only worth a bone if it is a sizeable part of the mesh
+        min_size = max(4, num_vertices // (4 * num_bones))
+        labels, cluster_transforms = find_rigid_clusters(
+            rest_pose, animated_poses, self._rigid_tolerance, max_clusters=num_bones, min_size=min_size
+        )
+        if np.any(labels < 0) and len(cluster_transforms) == num_bones:
+            # Keep at least one bone for the vertices that are not rigid
+            labels[labels == num_bones - 1] = -1
+            cluster_transforms = cluster_transforms[:-1]
+
+        num_free = int(np.count_nonzero(labels < 0))
+        self._solve_report.update(
+            {
+                "rigid_clusters": len(cluster_transforms),
+                "rigid_vertices": num_vertices - num_free,
+                "solved_vertices": num_free,
+            }
+        )
+        return labels, cluster_transforms
+
+    def _solve_subproblem(self, rest_pose, animated_poses, vertices, num_bones):
+        """
+        Solve the decomposition of a vertex subset with a separate native instance.
+
+        The animated poses may hold a subset of the frames.
+
+        Args:
+            rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+            animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            vertices (numpy.ndarray): Indices of the vertices to solve
+            num_bones (int): Number of bones of the sub-problem
+
+        Returns:
+            The solved native instance
+        """
+        sub = self._create_subsolver(len(vertices), animated_poses.shape[0] // 3, num_bones)
+        sub.set_rest_pose(rest_pose[:, vertices])
+        sub.set_animated_poses(animated_poses[:, vertices])
+
+        # Faces that lie entirely inside the subset keep driving the bone clustering and smoothing
+        local = np.full(self.num_vertices, -1, dtype=np.int64)
+        local[vertices] = np.arange(len(vertices))
+        offsets, indices = self._dem_bones.get_faces()
+        if indices.size:
+            remapped = local[indices]
+            sizes = np.diff(offsets)
+            inside = np.minimum.reduceat(remapped, offsets[:-1]) >= 0
+            sub.set_faces(np.concatenate([[0], np.cumsum(sizes[inside])]), remapped[np.repeat(inside, sizes)])
+
+        locks = self.get_weight_locks()
+        if np.any(locks):
+            sub.lockW = locks[vertices]
+
+        self._prepare_smoothing(sub)
+        sub.compute(num_threads=self._num_threads)
+        return sub
+
+    def _prepare_smoothing(self, native):
+        """Build the weight smoothing solver of a native instance from the topology cache."""
+        if self._topology_cache is None:
+            return
+        solver = self._topology_cache.get_smoothing_solver(native, num_threads=self._num_threads)
+        if solver is not None:
+            native.set_smoothing_solver(solver)
+
+    def _create_subsolver(self, num_vertices, num_frames, num_bones):
+        """Create a native solver with the settings of this one for a single-subject problem."""
+        sub = type(self._dem_bones)()
+        for name in _SOLVER_PARAMETERS:
+            setattr(sub, name, getattr(self._dem_bones, name))
+
+        sub.nV = num_vertices
+        sub.nB = num_bones
+        sub.nF = num_frames
+        sub.nS = 1
+        sub.fStart = np.array([0, num_frames], dtype=np.int32)
+        sub.subjectID = np.zeros(num_frames, dtype=np.int32)
+        return sub
+
+    def _can_update_incrementally(self):
+        """Check whether the last solve can be reused for the dirty frames."""
+        if self._solved_shape is None or not self._weights_computed:
+            return False
+        num_frames, num_vertices, num_bones = self._solved_shape
+        if num_vertices != self.num_vertices or num_bones != self.num_bones or self.num_frames < num_frames:
+            return False
+        changed = len(self._dirty_frames.union(range(num_frames, self.num_frames)))
+        return 0 < changed < self.num_frames
+
+    def _sync_frame_layout(self):
+        """Describe the targets to DemBones as the frames of a single subject."""
+        num_frames = self._dem_bones.nF
+        self._dem_bones.nS = 1
+        self._dem_bones.fStart = np.array([0, num_frames], dtype=np.int32)
+        self._dem_bones.subjectID = np.zeros(num_frames, dtype=np.int32)
+
     def _validate_computation_inputs(self):
         """
         Validate that all required inputs are set before computation.
@@ -650,24 +2020,36 @@ class DemBonesWrapper:
         rest_pose = self._dem_bones.get_rest_pose()
         if rest_pose.size == 0:
             raise ParameterError("Rest pose must be set before computation")
-
-        # Check animated poses
-        animated_poses = self._dem_bones.get_animated_poses()
-        if animated_poses.size == 0:
+        if rest_pose.shape != (3, self.num_vertices):
             raise ParameterError(
-                "At least one target pose must be set before computation. "
-                "Use set_target_vertices() to add target poses."
+                f"Rest pose must have shape [3, num_vertices], got {rest_pose.shape}"
             )
 
+        # Check animated poses; out-of-core sequences are checked when the frame store is set
+        if self._frame_store is None:
+            animated_poses = self._dem_bones.get_animated_poses()
+            if animated_poses.size == 0:
+                raise ParameterError(
+                    "At least one target pose must be set before computation. "
+                    "Use set_target_vertices() to add target poses."
+                )
+            if animated_poses.shape != (3 * self.num_frames, self.num_vertices):
+                raise ParameterError(
+                    f"Animated poses must have shape [3 * num_frames, num_vertices] = "
+                    f"{(3 * self.num_frames, self.num_vertices)}, got {animated_poses.shape}"
+                )
+
         # Check number of bones
         if self.num_bones <= 0:
             raise ParameterError("Number of bones must be set and positive")
 
+    @_synchronized
     def clear(self):
         """Clear all data and reset the computation."""
         self._dem_bones.clear()
         self._bones = {}
         self._targets = {}
+        self._vertex_faces = None
 
         # Clear any cached data
         if hasattr(self, "_cached_weights"):
@@ -677,7 +2059,12 @@ class DemBonesWrapper:
 
         # Reset computation flags
         self._weights_computed = False
+        self._dirty_frames = set()
+        self._solved_shape = None
+        self._solve_report = {}
+        self._frame_store = None
 
+    @_synchronized
     def export_to_dict(self):
         """
         Export the current state to a dictionary for serialization.
@@ -717,6 +2104,7 @@ class DemBonesWrapper:
 
         return data
 
+    @_synchronized
     def import_from_dict(self, data):
         """
         Import state from a dictionary.
@@ -788,6 +2176,8 @@ class DemBonesExtWrapper(DemBonesWrapper):
         # Initialize parent-child relationships
         self._parent_map = {}  # Maps bone index to parent bone index
 
+    _NATIVE_CLASSES = {np.dtype(np.float64): _DemBonesExt, np.dtype(np.float32): _DemBonesExtF}
+
     # Additional properties and methods specific to DemBonesExt
 
     @property
@@ -796,6 +2186,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
         return self._dem_bones.bindUpdate
 
     @bind_update.setter
+    @_synchronized
     def bind_update(self, value):
         """Set the bind update parameter."""
         if not isinstance(value, int) or value < 0:
@@ -812,6 +2203,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
         """
         return self._parent_map.copy()
 
+    @_synchronized
     def set_parent_bone(self, bone: Union[str, int], parent: Union[str, int, None]):
         """
         Set the parent bone for a bone.
@@ -881,6 +2273,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
 
         return (bone_idx, parent_idx)
 
+    @_synchronized
     def get_bone_hierarchy(self):
         """
         Get the complete bone hierarchy as a tree structure.
@@ -918,6 +2311,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
 
         return [build_tree(root) for root in root_bones]
 
+    @_synchronized
     def set_bone_names_with_hierarchy(self, hierarchy):
         """
         Set bone names and hierarchy from a nested structure.
@@ -951,6 +2345,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
 
         return len(self._bones)
 
+    @_synchronized
     def export_to_dict(self):
         """
         Export the current state to a dictionary for serialization.
@@ -970,6 +2365,7 @@ class DemBonesExtWrapper(DemBonesWrapper):
 
         return data
 
+    @_synchronized
     def import_from_dict(self, data):
         """
         Import state from a dictionary.
@@ -59,6 +59,10 @@ class DemBonesWrapper:
     This class provides a more Pythonic interface to the C++ DemBones class,
     adding support for named bones, error handling, and convenience methods.
 
+    Solves release the GIL. Methods that run or modify the native solver hold a
+    per-instance lock, so a wrapper can be shared between threads, and separate
+    wrappers solve in parallel, also on free-threaded Python builds.
+
     """
 
     def __init__(self):
@@ -69,17 +73,150 @@ class DemBonesWrapper:
         """
         Clear all data and reset the computation.
         """
-    def compute(self):
+    def compare_skinning(self, frame_indices=None, max_influences=None, chunk_frames=64):
+        """
+
+        Measure how closely linear blend and dual quaternion skinning follow the animation.
+
+        Both reconstructions are compared with the animated poses, from the frame store
+        when one is set, a chunk of frames at a time.
+
+        Args:
+            frame_indices (array-like, optional): Frames to compare, defaults to all frames
+            max_influences (int, optional): Influences per vertex for dual quaternion
+                skinning, defaults to all weights
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Returns:
+            dict: Per-vertex errors with shape [num_vertices] in ``lbs_rmse``, ``lbs_max``,
+                ``dqs_rmse`` and ``dqs_max`` (root mean square and largest distance over
+                the frames), the overall root mean square distances ``lbs_total_rmse`` and
+                ``dqs_total_rmse``, and ``dqs_better``, a boolean mask of the vertices
+                whose dual quaternion error is smaller
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ParameterError: If max_influences or chunk_frames are invalid
+            ComputationError: If no solved decomposition is available
+
+        """
+    def compute(self, callback=None, incremental=True):
         """
 
         Compute the skinning weights and transformations.
 
+        When a previous solve is available and only some frames changed since then,
+        only the transformations of the changed frames are re-solved, followed by a
+        single weight update over the whole sequence.
+
+        Args:
+            callback (callable, optional): A function to call with progress updates (0.0 to 1.0)
+            incremental (bool): Allow the incremental update. If False, always run a full solve.
+
         Returns:
             bool: True if computation succeeded
 
         Raises:
             ComputationError: If the computation fails
 
+        """
+    def compute_multiresolution(self, proxy_vertices, compare_direct=False):
+        """
+
+        Compute the decomposition coarse-to-fine on a decimated proxy of the mesh.
+
+        Bones and transformations are solved on a proxy built by vertex clustering.
+        The proxy weights are interpolated to the full mesh and refined with one
+        weight-only pass at full resolution.
+
+        Args:
+            proxy_vertices (int): Maximum number of vertices of the proxy
+            compare_direct (bool): Also run a direct solve at full resolution on a
+                separate solver and report its error and run time for comparison
+
+        Returns:
+            dict: Report with the proxy size, the RMSE of the proxy solve, of the
+                interpolated weights and of the refined result, the run times, and the
+                RMSE and run time of the direct solve when requested
+
+        Raises:
+            ParameterError: If the proxy size is invalid
+            ComputationError: If the computation fails
+
+        """
+    def export_point_cache(self, path, times=None, chunk_frames=64):
+        """
+
+        Bake the skinned reconstruction of every frame into a PC2 or MDD point cache.
+
+        Frames are reconstructed and written in chunks, so the cache can be compared
+        with the source animation in a DCC application without holding the whole
+        sequence in memory.
+
+        Args:
+            path (str): Path of the ``.pc2`` or ``.mdd`` file to write
+            times (array-like, optional): Time of every frame, see
+                ``py_dem_bones.io.create_point_cache``
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Raises:
+            IOError: If the file cannot be written
+            ParameterError: If the format or the times are invalid
+            ComputationError: If no solved decomposition is available
+
+        """
+    def extract_correctives(self, num_shapes=8, target_error=None, chunk_frames=64):
+        """
+
+        Compress the residual of the skinned poses into corrective shapes.
+
+        See ``py_dem_bones.corrective.extract_correctives``. The residual of the animated
+        poses, from the frame store when one is set, is computed a chunk of frames at a
+        time in every pass, so it is never held in memory as a whole.
+
+        Args:
+            num_shapes (int): Maximum number of corrective shapes
+            target_error (float, optional): Root mean square error of the corrected poses
+                at which to stop adding shapes, defaults to using all num_shapes
+            chunk_frames (int): Number of frames reconstructed at once
+
+        Returns:
+            CorrectiveShapes: The shapes, their per-frame coefficients and the remaining error
+
+        Raises:
+            ParameterError: If the settings are invalid
+            ComputationError: If no solved decomposition is available
+
+        """
+    @classmethod
+    def from_files(cls, rest, frames, mmap=True, dtype=None, rest_key="rest", frames_key="frames"):
+        """
+
+        Create a wrapper with the rest pose and animated poses loaded from files.
+
+        Inputs are ``.npy`` files or ``.npz`` archives, and the frames may also be a
+        ``.pc2`` or ``.mdd`` point cache. With ``mmap`` they are memory-mapped and the
+        solver is filled straight from the mapped pages in a single converting copy,
+        so no in-memory copy of the sequence is made first. float32 sequences are
+        solved in single precision unless ``dtype`` says otherwise.
+
+        Args:
+            rest (str or numpy.ndarray): Rest pose file or array with shape [3, num_vertices]
+            frames (str or numpy.ndarray): Animated pose file or array with shape
+                [num_frames, 3, num_vertices] or [3 * num_frames, num_vertices]
+            mmap (bool): Memory-map the files instead of reading them
+            dtype: Solver precision, ``numpy.float32`` or ``numpy.float64``. Defaults to
+                the precision of the frames.
+            rest_key (str): Name of the rest pose in an archive holding several arrays
+            frames_key (str): Name of the animated poses in an archive holding several arrays
+
+        Returns:
+            DemBonesWrapper: A wrapper ready for the bone and solver settings
+
+        Raises:
+            IOError: If a file cannot be read
+            ParameterError: If the shapes or the precision are invalid
+
         """
     def get_bind_matrix(self, bone):
         """
@@ -116,6 +253,111 @@ class DemBonesWrapper:
         Returns:
             list: List of bone names
 
+        """
+    def get_bone_transformations(self):
+        """
+
+        Get the transformation of every bone in every frame.
+
+        Returns:
+            numpy.ndarray: Transformations with shape [num_frames, num_bones, 4, 4] that
+                map the rest pose to each frame
+
+        Raises:
+            ComputationError: If no transformations have been computed or set
+
+        """
+    def get_corrected_poses(self, correctives, frame_indices=None):
+        """
+
+        Reconstruct animated poses by skinning and corrective shapes.
+
+        Args:
+            correctives (CorrectiveShapes): Correctives of this decomposition, as returned
+                by extract_correctives()
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: Corrected poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            ParameterError: If the correctives do not match the decomposition
+            IndexError: If a frame index is out of range
+            ComputationError: If no solved decomposition is available
+
+        """
+    def get_dual_quaternion_poses(self, frame_indices=None, max_influences=None):
+        """
+
+        Reconstruct animated poses by dual quaternion skinning.
+
+        Runtimes that skin with dual quaternions blend the bone rotations instead of the
+        matrices, which keeps volume at twisting joints but changes the result of the
+        weights the solver fitted for linear blend skinning.
+
+        Args:
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+            max_influences (int, optional): Blend only the largest weights of every vertex,
+                defaults to all weights
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ParameterError: If max_influences is not a positive integer
+            ComputationError: If no solved decomposition is available
+
+        """
+    def get_influences(self, max_influences=None, csr=False):
+        """
+
+        Export the weights as a compact influence table for skin writers.
+
+        The largest weights of every vertex are sorted by decreasing weight and
+        renormalised to sum to one, so DCC skin clusters and engine vertex streams can
+        be written in bulk instead of scanning the dense weight matrix.
+
+        Args:
+            max_influences (int, optional): Maximum number of influences per vertex.
+                Defaults to the max_influences of the solver.
+            csr (bool): Return the influences in CSR form instead of padded tables
+
+        Returns:
+            tuple: (indices, weights) with shape [num_vertices, max_influences], where
+                unused slots hold bone 0 with weight 0, or with ``csr`` (offsets, indices,
+                weights) where the influences of vertex ``i`` are
+                ``indices[offsets[i]:offsets[i + 1]]`` and exclude the unused slots
+
+        Raises:
+            ParameterError: If max_influences is invalid
+            ComputationError: If no weights have been computed or set
+
+        """
+    def get_rest_pose(self):
+        """
+
+        Get the rest pose vertices.
+
+        Returns:
+            numpy.ndarray: The rest pose vertices with shape [3, num_vertices]
+
+        """
+    def get_skinned_poses(self, frame_indices=None):
+        """
+
+        Reconstruct animated poses from the rest pose, weights and transformations.
+
+        Args:
+            frame_indices (array-like, optional): Frames to reconstruct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+            ComputationError: If no solved decomposition is available
+
         """
     def get_target_index(self, name):
         """
@@ -149,6 +391,16 @@ class DemBonesWrapper:
         Returns:
             numpy.ndarray: Array of 4x4 transformation matrices with shape [num_frames, 4, 4]
 
+        """
+    def get_weight_locks(self):
+        """
+
+        Get the per-vertex weight locks.
+
+        Returns:
+            numpy.ndarray: Lock amounts with shape [num_vertices], where 0 leaves the
+                weights of a vertex free and 1 keeps its current weights
+
         """
     def get_weights(self):
         """
@@ -158,6 +410,116 @@ class DemBonesWrapper:
         Returns:
             numpy.ndarray: The weights matrix with shape [num_bones, num_vertices]
 
+        """
+    def mark_frames_dirty(self, frame_indices=None):
+        """
+
+        Mark frames as changed so the next compute() re-solves them.
+
+        Args:
+            frame_indices (array-like, optional): Frame indices to mark. Defaults to all frames.
+
+        """
+    def quantize_influences(self, max_influences=None, bits=8, frame_indices=None):
+        """
+
+        Quantise the weights to fixed-point influence tables for game runtimes.
+
+        The strongest influences of every vertex, as returned by get_influences(), are
+        scaled to unsigned normalized integers of ``bits`` bits. Largest remainder
+        rounding makes the quantised weights of every weighted vertex sum to exactly
+        ``2**bits - 1``. The skinned positions with the quantised influences are then
+        compared with the ones of the full precision weights on a set of frames.
+
+        Args:
+            max_influences (int, optional): Maximum number of influences per vertex.
+                Defaults to the max_influences of the solver.
+            bits (int): Bits per weight, 8 or 16
+            frame_indices (array-like, optional): Frames of the error report. Defaults to
+                at most 16 frames spread evenly over the sequence; an empty list skips
+                the report, so no transformations are needed.
+
+        Returns:
+            tuple: (indices, weights, errors) where ``indices`` and the uint8 or uint16
+                ``weights`` have shape [num_vertices, max_influences] with unused slots
+                holding bone 0 with weight 0, and ``errors`` holds the largest position
+                error of every vertex over the frames, or None without frames
+
+        Raises:
+            ParameterError: If max_influences or bits are invalid
+            IndexError: If a frame index is out of range
+            ComputationError: If the weights or transformations have not been computed
+
+        """
+    def reduce_keyframes(self, tolerance, times=None):
+        """
+
+        Reduce the solved transformations to sparse rotation, translation and scale keys.
+
+        See ``py_dem_bones.animation.reduce_keyframes``; the skinned vertices under the
+        reduced curves stay within the tolerance of their solved positions.
+
+        Args:
+            tolerance (float): Largest distance of a skinned vertex from its solved position
+            times (array-like, optional): Strictly increasing time of every frame, defaults
+                to the frame times ``fTime`` of the native solver when it holds one per
+                frame, otherwise to the frame indices
+
+        Returns:
+            list: BoneCurves of every bone
+
+        Raises:
+            ParameterError: If the tolerance or the times are invalid
+            ComputationError: If no solved decomposition is available
+
+        """
+    def replace_frames(self, frame_indices, poses):
+        """
+
+        Replace the vertices of existing frames.
+
+        Args:
+            frame_indices (array-like): Indices of the frames to replace
+            poses (numpy.ndarray): New vertices with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            ParameterError: If the poses have the wrong shape
+            IndexError: If a frame index is out of range
+
+        """
+    def resolve_region(self, vertex_indices, rings=1, num_iterations=None):
+        """
+
+        Re-solve the weights of a vertex region while the rest of the mesh stays fixed.
+
+        Args:
+            vertex_indices (array-like): Indices of the vertices to re-solve
+            rings (int): Number of neighbour rings included as fixed context
+            num_iterations (int, optional): Number of solver iterations for the region.
+                Defaults to num_iterations.
+
+        Returns:
+            dict: Report with the number of region and neighbour vertices, the number of
+                bones whose transformations were updated and the RMSE of the region solve
+
+        """
+    def set_animated_poses(self, poses):
+        """
+
+        Replace the whole animated sequence in one pass.
+
+        The poses are copied into the native solver once, straight from their own
+        memory layout, so strided views such as ``frames.transpose(0, 2, 1)`` of a
+        [num_frames, num_vertices, 3] array and memory-mapped arrays are loaded
+        without an intermediate copy. float32 and float64 data are read as is.
+
+        Args:
+            poses (numpy.ndarray): Animated poses with shape [num_frames, 3, num_vertices]
+                or [3 * num_frames, num_vertices]
+
+        Raises:
+            ParameterError: If the poses have the wrong shape or type
+
         """
     def set_bind_matrix(self, bone, matrix):
         """
@@ -193,6 +555,45 @@ class DemBonesWrapper:
         Returns:
             list: The assigned bone indices
 
+        """
+    def set_faces(self, faces, offsets=None):
+        """
+
+        Set the mesh faces that drive bone clustering and weight smoothing.
+
+        Integer arrays are handed to the native solver in one pass. Polygons of mixed
+        size are passed in CSR form as a flat index array with ``offsets``, where face
+        ``i`` holds ``faces[offsets[i]:offsets[i + 1]]``.
+
+        Args:
+            faces (array-like): Vertex indices with shape [num_faces, k] for k >= 3, the
+                flat vertex indices of all faces when ``offsets`` is given, or a list of
+                faces as lists of vertex indices
+            offsets (array-like, optional): Start of every face in ``faces`` followed by
+                the total number of indices
+
+        Raises:
+            ParameterError: If the faces are malformed
+            IndexError: If a vertex index is out of range
+
+        """
+    def set_frame_store(self, store):
+        """
+
+        Read the animated poses from an out-of-core frame store.
+
+        In this mode compute() never holds the whole sequence in memory. Bones, weights
+        and keyframe transformations are solved jointly on at most max_keyframes frames
+        (256 if unset), and the transformations of the full timeline are then recovered
+        chunk by chunk as the store streams the frames.
+
+        Args:
+            store (FrameStore or None): Frame store holding the sequence, or None to use
+                the in-memory animated poses again
+
+        Raises:
+            ParameterError: If the store does not match the rest pose
+
         """
     def set_rest_pose(self, vertices):
         """
@@ -234,6 +635,16 @@ class DemBonesWrapper:
         Args:
             transformations (numpy.ndarray): Array of 4x4 transformation matrices with shape [num_frames, 4, 4]
 
+        """
+    def set_weight_locks(self, locks):
+        """
+
+        Set the per-vertex weight locks used by the weight solver.
+
+        Args:
+            locks (numpy.ndarray): Lock amounts with shape [num_vertices] in the range [0, 1],
+                where 0 leaves the weights of a vertex free and 1 keeps its current weights
+
         """
     def set_weights(self, weights):
         """
@@ -250,6 +661,31 @@ class DemBonesWrapper:
         Get all bone names as a list, ordered by bone index.
         """
     @property
+    def dirty_frames(self):
+        """
+        Get the sorted indices of the frames changed since the last solve.
+        """
+    @property
+    def frame_store(self):
+        """
+        Get the out-of-core frame store the animated poses are read from (None if in memory).
+        """
+    @property
+    def frame_tolerance(self):
+        """
+        Get the tolerance of the duplicate frame elimination (None if disabled).
+        """
+    @frame_tolerance.setter
+    def frame_tolerance(self, value):
+        """
+
+        Set the tolerance of the duplicate frame elimination.
+
+        Frames whose vertices all stay within this distance of an earlier frame are left
+        out of the solve and take the transformations of that frame. None disables it.
+
+        """
+    @property
     def max_influences(self):
         """
         Get the maximum number of non-zero weights per vertex.
@@ -260,6 +696,22 @@ class DemBonesWrapper:
         Set the maximum number of non-zero weights per vertex.
         """
     @property
+    def max_keyframes(self):
+        """
+        Get the maximum number of frames used by the joint solve (None for all frames).
+        """
+    @max_keyframes.setter
+    def max_keyframes(self, value):
+        """
+
+        Set the maximum number of frames used by the joint solve.
+
+        Longer sequences are solved on keyframes chosen by farthest point sampling in
+        pose space, and the transformations of the other frames are recovered with a
+        transformation-only pass. None solves every frame jointly.
+
+        """
+    @property
     def num_bones(self):
         """
         Get the number of bones.
@@ -290,6 +742,77 @@ class DemBonesWrapper:
         Get the number of target poses.
         """
     @property
+    def rigid_tolerance(self):
+        """
+        Get the tolerance of the static and rigid vertex pre-pass (None if disabled).
+        """
+    @rigid_tolerance.setter
+    def rigid_tolerance(self, value):
+        """
+
+        Set the tolerance of the static and rigid vertex pre-pass.
+
+        Vertices that stay within this distance of a rigid motion in every frame are
+        bound to a single bone and removed from the solve. None disables the pre-pass.
+
+        """
+    @property
+    def solve_report(self):
+        """
+        Get the statistics of the last call to compute().
+        """
+    @property
+    def result_cache(self):
+        """
+        Get the cache of solve results (None if disabled).
+        """
+    @result_cache.setter
+    def result_cache(self, value):
+        """
+
+        Set the cache of solve results.
+
+        Before a full solve, compute() hashes the rest pose, the animated poses, the
+        faces, the weight and transformation locks, the initial weights and
+        transformations, all solver settings and the library versions. When a result
+        with the same hash is cached it is loaded and the solve is skipped. Incremental
+        updates bypass the cache. None disables caching.
+
+        """
+    @property
+    def topology_cache(self):
+        """
+        Get the cache of mesh topologies used to build the weight smoothing solver (None if disabled).
+        """
+    @topology_cache.setter
+    def topology_cache(self, value):
+        """
+
+        Set the cache of mesh topologies used to build the weight smoothing solver.
+
+        By default all wrappers share py_dem_bones.topology.default_cache(), which is
+        global to the process, so solving several clips of the same mesh computes its
+        edges only once and solving the same clip again reuses the factorized smoothing
+        solver. None leaves the smoothing solver to the native library.
+
+        """
+    @property
+    def num_threads(self):
+        """
+        Get the number of OpenMP threads used by native calls (None for the default).
+        """
+    @num_threads.setter
+    def num_threads(self, value):
+        """
+
+        Set the number of OpenMP threads used by native calls.
+
+        The limit applies to every native call of this wrapper and only for its
+        duration, so several solves sharing a machine can each be given a share of the
+        cores. None uses the OpenMP default, see py_dem_bones.build_info().
+
+        """
+    @property
     def num_vertices(self):
         """
         Get the number of vertices.
@@ -0,0 +1,236 @@
+"""
+Content-addressed on-disk cache of decomposition results.
+
+Identical solves, such as retried or re-queued jobs, produce identical results. The
+wrappers hash everything that determines a solve and look the hash up in a result
+cache before solving; on a hit the stored weights and transformations are loaded and
+the solve is skipped. Entries are ``.npz`` files named after their key in a cache
+directory, and the least recently used entries are evicted once the directory grows
+beyond a size limit.
+"""
+
+# Import standard library modules
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional, Union
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import IOError, ParameterError
+
+# Rows of a frame sequence hashed at once, so that memory-mapped inputs are streamed
+_HASH_ROWS = 3 * 64
+
+
+class ResultHasher:
+    """
+    Streaming hash of the inputs of a solve.
+
+    Arrays are hashed together with their shape and data type, row block by row block,
+    so that memory-mapped inputs are never copied as a whole.
+    """
+
+    def __init__(self):
+        """Start a new hash."""
+        self._digest = hashlib.blake2b(digest_size=20)
+
+    def update_array(self, name: str, array) -> "ResultHasher":
+        """
+        Add a named array to the hash.
+
+        Args:
+            name (str): Name of the input
+            array (array-like): Input data
+
+        Returns:
+            ResultHasher: This hasher
+        """
+        array = np.asarray(array)
+        self._digest.update(f"{name}:{array.dtype.str}:{array.shape};".encode())
+        if array.ndim == 0:
+            self._digest.update(array.tobytes())
+            return self
+        for start in range(0, array.shape[0], _HASH_ROWS):
+            self._digest.update(np.ascontiguousarray(array[start : start + _HASH_ROWS]).data)
+        return self
+
+    def update_value(self, name: str, value) -> "ResultHasher":
+        """
+        Add a named scalar or string value to the hash.
+
+        Args:
+            name (str): Name of the input
+            value: Value with a stable ``repr``
+
+        Returns:
+            ResultHasher: This hasher
+        """
+        self._digest.update(f"{name}={value!r};".encode())
+        return self
+
+    def hexdigest(self) -> str:
+        """
+        Get the cache key of the hashed inputs.
+
+        Returns:
+            str: Hexadecimal digest
+        """
+        return self._digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded least-recently-used cache of decomposition results in a directory.
+
+    Every entry holds the sparse skinning weights, the bone transformations and the
+    solve report of one solve. Reading an entry marks it as recently used. The cache
+    may be shared between threads and processes that use the same directory.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = 1 << 30):
+        """
+        Open a result cache, creating the directory if needed.
+
+        Args:
+            directory (str): Directory that holds the cached results
+            max_bytes (int): Maximum total size of the cached results in bytes
+
+        Raises:
+            ParameterError: If the size limit is invalid
+            IOError: If the directory cannot be created
+        """
+        if not isinstance(max_bytes, (int, np.integer)) or max_bytes <= 0:
+            raise ParameterError("Cache size must be a positive integer")
+
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            raise IOError(f"Failed to create cache directory {self.directory}: {str(e)}")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """Get the total size of the cached results in bytes."""
+        return sum(size for _, size, _ in self._entries())
+
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Load a cached result.
+
+        Args:
+            key (str): Cache key of the solve
+
+        Returns:
+            dict: The number of bones, the dense ``weights`` with shape
+                [num_bones, num_vertices], the ``transformations`` with shape
+                [4 * num_frames, 4 * num_bones] and the solve ``report``, or None if
+                the result is not cached or cannot be read
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                num_bones = int(data["num_bones"])
+                weights = np.zeros((num_bones, int(data["num_vertices"])))
+                weights[data["weight_bones"], data["weight_vertices"]] = data["weight_values"]
+                result = {
+                    "num_bones": num_bones,
+                    "weights": weights,
+                    "transformations": data["transformations"],
+                    "report": json.loads(str(data["report"])),
+                }
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def store(self, key: str, weights: np.ndarray, transformations: np.ndarray, report: Optional[dict] = None):
+        """
+        Store the result of a solve and evict the least recently used results beyond the size limit.
+
+        Args:
+            key (str): Cache key of the solve
+            weights (numpy.ndarray): Skinning weights with shape [num_bones, num_vertices]
+            transformations (numpy.ndarray): Bone transformations with shape
+                [4 * num_frames, 4 * num_bones]
+            report (dict, optional): Solve report with JSON-serializable values
+
+        Raises:
+            IOError: If the result cannot be written
+        """
+        weights = np.asarray(weights)
+        bones, vertices = np.nonzero(weights)
+        path = self._path(key)
+        handle, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                np.savez(
+                    f,
+                    num_bones=weights.shape[0],
+                    num_vertices=weights.shape[1],
+                    weight_bones=bones.astype(np.int32),
+                    weight_vertices=vertices.astype(np.int32),
+                    weight_values=weights[bones, vertices],
+                    transformations=np.asarray(transformations),
+                    report=json.dumps(report or {}),
+                )
+            os.replace(temporary, path)
+        except OSError as e:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise IOError(f"Failed to write cached result to {path}: {str(e)}")
+        self._evict(keep=path)
+
+    def clear(self):
+        """Remove all cached results."""
+        for path, _, _ in self._entries():
+            self._remove(path)
+
+    def _path(self, key: str) -> str:
+        """Get the file of a cache key."""
+        return os.path.join(self.directory, key + ".npz")
+
+    def _entries(self):
+        """List the cached results as (path, size, last use) tuples."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self, keep: str):
+        """Remove the least recently used results until the cache fits its size limit."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        """Remove a cached result that may already have been removed by another process."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,126 @@
+"""
+Content-addressed on-disk cache of decomposition results.
+
+Identical solves, such as retried or re-queued jobs, produce identical results. The
+wrappers hash everything that determines a solve and look the hash up in a result
+cache before solving; on a hit the stored weights and transformations are loaded and
+the solve is skipped. Entries are ``.npz`` files named after their key in a cache
+directory, and the least recently used entries are evicted once the directory grows
+beyond a size limit.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional, Union
+import numpy as np
+from py_dem_bones.exceptions import IOError, ParameterError
+
+__all__ = [
+    "ResultCache",
+    "ResultHasher",
+    "np",
+]
+
+class ResultCache:
+    """
+    Size-bounded least-recently-used cache of decomposition results in a directory.
+
+    Every entry holds the sparse skinning weights, the bone transformations and the
+    solve report of one solve. Reading an entry marks it as recently used. The cache
+    may be shared between threads and processes that use the same directory.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = 1 << 30):
+        """
+        Open a result cache, creating the directory if needed.
+
+        Args:
+            directory (str): Directory that holds the cached results
+            max_bytes (int): Maximum total size of the cached results in bytes
+
+        Raises:
+            ParameterError: If the size limit is invalid
+            IOError: If the directory cannot be created
+        """
+    @property
+    def size(self) -> int:
+        """
+        Get the total size of the cached results in bytes.
+        """
+    def load(self, key: str) -> Optional[dict]:
+        """
+        Load a cached result.
+
+        Args:
+            key (str): Cache key of the solve
+
+        Returns:
+            dict: The number of bones, the dense ``weights`` with shape
+                [num_bones, num_vertices], the ``transformations`` with shape
+                [4 * num_frames, 4 * num_bones] and the solve ``report``, or None if
+                the result is not cached or cannot be read
+        """
+    def store(self, key: str, weights: np.ndarray, transformations: np.ndarray, report: Optional[dict] = None):
+        """
+        Store the result of a solve and evict the least recently used results beyond the size limit.
+
+        Args:
+            key (str): Cache key of the solve
+            weights (numpy.ndarray): Skinning weights with shape [num_bones, num_vertices]
+            transformations (numpy.ndarray): Bone transformations with shape
+                [4 * num_frames, 4 * num_bones]
+            report (dict, optional): Solve report with JSON-serializable values
+
+        Raises:
+            IOError: If the result cannot be written
+        """
+    def clear(self):
+        """
+        Remove all cached results.
+        """
+
+class ResultHasher:
+    """
+    Streaming hash of the inputs of a solve.
+
+    Arrays are hashed together with their shape and data type, row block by row block,
+    so that memory-mapped inputs are never copied as a whole.
+    """
+
+    def __init__(self):
+        """
+        Start a new hash.
+        """
+    def update_array(self, name: str, array) -> "ResultHasher":
+        """
+        Add a named array to the hash.
+
+        Args:
+            name (str): Name of the input
+            array (array-like): Input data
+
+        Returns:
+            ResultHasher: This hasher
+        """
+    def update_value(self, name: str, value) -> "ResultHasher":
+        """
+        Add a named scalar or string value to the hash.
+
+        Args:
+            name (str): Name of the input
+            value: Value with a stable ``repr``
+
+        Returns:
+            ResultHasher: This hasher
+        """
+    def hexdigest(self) -> str:
+        """
+        Get the cache key of the hashed inputs.
+
+        Returns:
+            str: Hexadecimal digest
+        """
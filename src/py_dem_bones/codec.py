@@ -0,0 +1,414 @@
+"""
+Compression of mesh sequences by skinning decomposition.
+
+A vertex cache of a deforming mesh is encoded as a rest pose, a few quantised bone
+influences per vertex and the quantised bone transformations of every frame, plus an
+optional low-rank basis of the residual that linear blend skinning cannot represent.
+All of it is stored in one binary blob:
+
+- header: sizes, the RMS error of the encoding and the offsets of the sections
+- rest pose: [num_vertices, 3] float32
+- influence bone indices: [num_vertices, num_influences] uint8, uint16 or uint32
+- influence weights: [num_vertices, num_influences] uint16 unorm values
+- transformation ranges: [num_bones, 12] float32 minimum and step of every entry of
+  the upper [3, 4] rows of the bone matrices
+- transformations: [num_frames, num_bones, 12] uint16
+- residual coefficients: [num_frames, residual_rank] float32
+- residual basis: [residual_rank, num_vertices, 3] float16
+
+Sections are aligned to 64 bytes and all values are little-endian. Every frame is
+decoded from its own transformations and residual coefficients, so frame ranges are
+reconstructed without touching the rest of the sequence.
+"""
+
+# Import standard library modules
+from typing import Optional
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.corrective import _randomized_svd
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+from py_dem_bones.multires import _NEIGHBOUR_OFFSETS, ProxyMesh
+from py_dem_bones.runtime import RuntimeSkin, _index_type
+from py_dem_bones.storage import FrameStore
+
+# Header: signature, format version, sizes, encoding error and section offsets
+_HEADER = np.dtype([
+    ("signature", "S8"),
+    ("version", "<u4"),
+    ("num_vertices", "<u4"),
+    ("num_frames", "<u4"),
+    ("num_bones", "<u4"),
+    ("num_influences", "<u4"),
+    ("residual_rank", "<u4"),
+    ("rms_error", "<f8"),
+    ("offsets", "<u8", 8),
+    ("size", "<u8"),
+])
+_SIGNATURE = b"DBCODEC"
+_VERSION = 1
+
+# Sections start at multiples of this many bytes
+_ALIGNMENT = 64
+
+# Frames reconstructed at once while measuring the error of an encoding
+_CHUNK_FRAMES = 64
+
+# Nearest neighbours that connect a vertex when the sequence comes without faces
+_NEIGHBOURS = 6
+
+# Vertices whose neighbours are searched at once
+_NEIGHBOUR_BLOCK = 4096
+
+
+def encode(
+    frames: np.ndarray,
+    target_error: float = 1e-3,
+    max_bones: int = 32,
+    rest_pose: Optional[np.ndarray] = None,
+    faces=None,
+    max_influences: int = 4,
+    residual_rank: int = 16,
+    num_iterations: int = 30,
+) -> bytes:
+    """
+    Compress a mesh sequence.
+
+    Bone counts from 2 up to max_bones are solved in doubling steps. Each solve is
+    quantised and the residual of the sequence is compressed by a randomised truncated
+    SVD, streamed over chunks of frames, keeping the fewest residual components that
+    reach the target error. The smallest encoding that reaches the target is returned;
+    the search stops at the first bone count that reaches it without residuals. When
+    no encoding reaches the target, the most accurate one is returned.
+
+    The sequence is only read a chunk of frames at a time, so a memory-mapped cache is
+    never loaded as a whole: every bone count is solved out of core on at most 256
+    keyframes (see DemBonesWrapper.set_frame_store). Memory use still grows with the
+    number of frames by the transformations and residual coefficients of every frame.
+
+    Args:
+        frames (numpy.ndarray): Sequence with shape [num_frames, 3, num_vertices], such
+            as the memory-mapped poses of ``read_point_cache``
+        target_error (float): Root mean square distance of the decoded vertices from
+            the original ones over the whole sequence
+        max_bones (int): Largest number of bones to solve
+        rest_pose (numpy.ndarray, optional): Rest pose with shape [3, num_vertices],
+            defaults to the first frame
+        faces (array-like, optional): Faces of the mesh in any form accepted by
+            DemBonesWrapper.set_faces(). Bone clusters are grown and weights
+            smoothed over the faces; without them every vertex is connected to its
+            nearest neighbours in the rest pose.
+        max_influences (int): Maximum number of bone influences per vertex
+        residual_rank (int): Maximum number of residual components, 0 stores none
+        num_iterations (int): Solver iterations of every bone count
+
+    Returns:
+        bytes: The encoded sequence
+
+    Raises:
+        ParameterError: If the sequence or the settings are invalid
+        ComputationError: If the decomposition fails
+    """
+    # Import local modules
+    from py_dem_bones.base import DemBonesWrapper
+
+    frames = np.asarray(frames)
+    if frames.ndim != 3 or frames.shape[1] != 3 or frames.shape[0] == 0:
+        raise ParameterError(f"Frames must have shape [num_frames, 3, num_vertices], got {frames.shape}")
+    num_frames, _, num_vertices = frames.shape
+    if rest_pose is None:
+        rest_pose = frames[0]
+    rest_pose = np.asarray(rest_pose, dtype=np.float64)
+    if rest_pose.shape != (3, num_vertices):
+        raise ParameterError(f"Rest pose must have shape (3, {num_vertices}), got {rest_pose.shape}")
+    if not target_error > 0:
+        raise ParameterError("Target error must be positive")
+    if not isinstance(max_bones, (int, np.integer)) or max_bones < 1:
+        raise ParameterError("Maximum bones must be a positive integer")
+    if not isinstance(residual_rank, (int, np.integer)) or residual_rank < 0:
+        raise ParameterError("Residual rank must be a non-negative integer")
+    if faces is None:
+        faces = _neighbour_faces(rest_pose, _NEIGHBOURS)
+
+    bone_counts = [count for count in 2 ** np.arange(1, max_bones.bit_length()) if count < max_bones] + [max_bones]
+    best = None
+    with FrameStore(frames, chunk_frames=_CHUNK_FRAMES, cache_chunks=2) as store:
+        for num_bones in bone_counts:
+            wrapper = DemBonesWrapper()
+            wrapper.num_bones = int(num_bones)
+            wrapper.num_iterations = num_iterations
+            wrapper.set_rest_pose(rest_pose)
+            wrapper.set_frame_store(store)
+            wrapper.set_faces(faces)
+            wrapper.compute()
+
+            num_influences = min(max_influences, wrapper.num_bones)
+            indices, weights, _ = wrapper.quantize_influences(num_influences, bits=16, frame_indices=[])
+            minimum, step, transforms = _quantize_transformations(wrapper.get_bone_transformations())
+            skin = RuntimeSkin(rest_pose.T, indices, weights, _dequantize_transformations(minimum, step, transforms))
+            coefficients, basis, rms_error = _fit_residuals(frames, skin, target_error, residual_rank)
+            blob = _pack(rest_pose, indices, weights, minimum, step, transforms, coefficients, basis, rms_error)
+            candidate = (rms_error > target_error, len(blob) if rms_error <= target_error else rms_error, blob)
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+            if coefficients.shape[1] == 0 and rms_error <= target_error:
+                break
+    return best[2]
+
+
+def decode(blob, frames=None) -> np.ndarray:
+    """
+    Reconstruct frames of an encoded sequence.
+
+    Args:
+        blob (bytes-like): Encoded sequence, for example a memory-mapped file
+        frames (int, slice or array-like, optional): Frames to reconstruct, defaults to
+            all frames
+
+    Returns:
+        numpy.ndarray: float32 frames with shape [len(frames), 3, num_vertices]
+
+    Raises:
+        IOError: If the blob is not an encoded sequence
+        IndexError: If a frame index is out of range
+    """
+    header, sections = _unpack(blob)
+    num_frames = int(header["num_frames"])
+    if frames is None:
+        frames = np.arange(num_frames)
+    elif isinstance(frames, slice):
+        frames = np.arange(num_frames)[frames]
+    frames = np.asarray(frames, dtype=np.int64).ravel()
+    if frames.size and (frames.min() < 0 or frames.max() >= num_frames):
+        raise IndexError(f"Frame index out of range (0-{num_frames-1})")
+
+    rest_pose, indices, weights, minimum, step, transforms, coefficients, basis = sections
+    skin = RuntimeSkin(rest_pose, indices, weights, _dequantize_transformations(minimum, step, transforms[frames]))
+    poses = skin.evaluate()
+    if basis.shape[0]:
+        poses += (coefficients[frames] @ basis.reshape(basis.shape[0], -1).astype(np.float32)).reshape(poses.shape)
+    return poses.transpose(0, 2, 1)
+
+
+def describe(blob) -> dict:
+    """
+    Read the sizes of an encoded sequence.
+
+    Args:
+        blob (bytes-like): Encoded sequence
+
+    Returns:
+        dict: ``num_vertices``, ``num_frames``, ``num_bones``, ``num_influences``,
+            ``residual_rank``, ``rms_error`` and ``compression_ratio``, the size of the
+            sequence as float32 divided by the size of the blob
+
+    Raises:
+        IOError: If the blob is not an encoded sequence
+    """
+    header, _ = _unpack(blob)
+    info = {
+        name: int(header[name])
+        for name in ("num_vertices", "num_frames", "num_bones", "num_influences", "residual_rank")
+    }
+    info["rms_error"] = float(header["rms_error"])
+    info["compression_ratio"] = 12.0 * info["num_vertices"] * info["num_frames"] / int(header["size"])
+    return info
+
+
+def _neighbour_faces(rest_pose, num_neighbours):
+    """
+    Connect every vertex to its nearest neighbours in the rest pose.
+
+    Vertices are binned into a grid with about num_neighbours vertices per cell and
+    searched in their own and the adjacent cells, a block of vertices at a time.
+    Vertices in sparse regions that find too few candidates there are compared with
+    all vertices.
+
+    Returns:
+        numpy.ndarray: int32 triangles with shape [num_triangles, 3] joining every
+            vertex to consecutive pairs of its neighbours
+    """
+    num_vertices = rest_pose.shape[1]
+    num_neighbours = min(num_neighbours, num_vertices - 1)
+    if num_neighbours < 2:
+        return np.zeros((0, 3), dtype=np.int32)
+    proxy = ProxyMesh(rest_pose, max(num_vertices // num_neighbours, 1))
+    points = rest_pose.T
+    cells = np.floor((points - proxy.origin) / proxy.cell_size).astype(np.int64)
+    shape = cells.max(axis=0) + 1
+    order = np.argsort(np.ravel_multi_index(cells.T, shape), kind="stable")
+    sorted_keys = np.ravel_multi_index(cells[order].T, shape)
+
+    neighbours = np.empty((num_vertices, num_neighbours), dtype=np.int64)
+    unresolved = []
+    for block in np.array_split(np.arange(num_vertices), -(-num_vertices // _NEIGHBOUR_BLOCK)):
+        # Gather the vertices of the 27 cells around every vertex of the block
+        owners = []
+        candidates = []
+        for offset in _NEIGHBOUR_OFFSETS:
+            target = cells[block] + offset
+            inside = np.all((target >= 0) & (target < shape), axis=1)
+            keys = np.ravel_multi_index(target[inside].T, shape)
+            low = np.searchsorted(sorted_keys, keys, side="left")
+            counts = np.searchsorted(sorted_keys, keys, side="right") - low
+            owners.append(np.repeat(block[inside], counts))
+            candidates.append(order[np.repeat(low - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())])
+        owners = np.concatenate(owners)
+        candidates = np.concatenate(candidates)
+        distinct = owners != candidates
+        owners = owners[distinct]
+        candidates = candidates[distinct]
+
+        # Rank the candidates of every vertex by distance and keep the closest ones. One
+        # sort key holds the position of the vertex in the block and the scaled distance.
+        distances = np.sum(np.square(points[owners] - points[candidates]), axis=1)
+        scale = 0.5 / max(distances.max(initial=0.0), np.finfo(np.float64).tiny)
+        ranking = np.argsort(owners - block[0] + distances * scale)
+        candidates = candidates[ranking]
+        counts = np.bincount(owners - block[0], minlength=block.size)
+        starts = np.cumsum(counts) - counts
+        found = counts >= num_neighbours
+        neighbours[block[found]] = candidates[starts[found, None] + np.arange(num_neighbours)]
+        unresolved.append(block[~found])
+
+    unresolved = np.concatenate(unresolved)
+    rows = max(_NEIGHBOUR_BLOCK * 64 // num_vertices, 1)
+    for start in range(0, unresolved.size, rows):
+        block = unresolved[start : start + rows]
+        distances = np.sum(np.square(points[block, None] - points[None]), axis=2)
+        distances[np.arange(block.size), block] = np.inf
+        nearest = np.argpartition(distances, num_neighbours - 1, axis=1)[:, :num_neighbours]
+        ranks = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1, kind="stable")
+        neighbours[block] = np.take_along_axis(nearest, ranks, axis=1)
+
+    vertices = np.repeat(np.arange(num_vertices), num_neighbours - 1)
+    triangles = np.column_stack([vertices, neighbours[:, :-1].ravel(), neighbours[:, 1:].ravel()])
+    return triangles.astype(np.int32)
+
+
+def _quantize_transformations(transformations):
+    """Quantise the upper rows of [num_frames, num_bones, 4, 4] matrices to uint16 per bone and entry."""
+    values = transformations[:, :, :3, :].reshape(transformations.shape[0], transformations.shape[1], 12)
+    minimum = values.min(axis=0)
+    step = (values.max(axis=0) - minimum) / 65535
+    quantized = np.rint(np.divide(values - minimum, step, out=np.zeros_like(values), where=step > 0))
+    return minimum.astype("<f4"), step.astype("<f4"), quantized.astype("<u2")
+
+
+def _dequantize_transformations(minimum, step, quantized):
+    """Restore [num_frames, num_bones, 3, 4] float32 matrices."""
+    values = minimum + quantized.astype(np.float32) * step
+    return values.reshape(quantized.shape[0], quantized.shape[1], 3, 4)
+
+
+def _residual_chunks(frames, skin):
+    """Yield the residuals of the skinned sequence as (start, [chunk_size, 3 * num_vertices]) rows."""
+    for start in range(0, frames.shape[0], _CHUNK_FRAMES):
+        stop = min(start + _CHUNK_FRAMES, frames.shape[0])
+        target = np.asarray(frames[start:stop], dtype=np.float32).transpose(0, 2, 1)
+        yield start, (target - skin.evaluate(np.arange(start, stop))).reshape(stop - start, -1)
+
+
+def _fit_residuals(frames, skin, target_error, max_rank):
+    """
+    Compress the residual of a skinned sequence to the fewest components that reach the target error.
+
+    Returns:
+        tuple: ([num_frames, rank] float32 coefficients, [rank, num_vertices, 3] float16
+            basis, root mean square error of the decoded sequence)
+    """
+    num_frames, _, num_vertices = frames.shape
+    count = num_frames * num_vertices
+    energy = sum(np.sum(np.square(rows, dtype=np.float64)) for _, rows in _residual_chunks(frames, skin))
+    rank = min(max_rank, num_frames, 3 * num_vertices)
+    if energy <= target_error**2 * count or rank == 0:
+        coefficients = np.zeros((num_frames, 0), dtype="<f4")
+        return coefficients, np.zeros((0, num_vertices, 3), dtype="<f2"), np.sqrt(energy / count)
+
+    coefficients, basis, singular_values, _ = _randomized_svd(lambda: _residual_chunks(frames, skin), num_frames, rank)
+    remaining = energy - np.cumsum(np.square(singular_values))
+    rank = min(int(np.searchsorted(-remaining, -target_error**2 * count)) + 1, rank)
+    coefficients = coefficients[:, :rank].astype("<f4")
+    basis = basis[:rank].reshape(rank, num_vertices, 3).astype("<f2")
+
+    # Measure the error with the stored precision of the basis
+    flat_basis = basis.reshape(rank, -1).astype(np.float32)
+    squared_error = 0.0
+    for start, rows in _residual_chunks(frames, skin):
+        rows -= coefficients[start : start + rows.shape[0]] @ flat_basis
+        squared_error += np.sum(np.square(rows, dtype=np.float64))
+    return coefficients, basis, np.sqrt(squared_error / count)
+
+
+def _pack(rest_pose, indices, weights, minimum, step, transforms, coefficients, basis, rms_error) -> bytes:
+    """Write the sections of an encoding behind its header."""
+    num_bones = minimum.shape[0]
+    sections = [
+        np.ascontiguousarray(rest_pose.T, dtype="<f4"),
+        indices.astype(_index_type(num_bones)),
+        weights.astype("<u2"),
+        minimum,
+        step,
+        transforms,
+        coefficients,
+        basis,
+    ]
+    header = np.zeros(1, dtype=_HEADER)
+    header["signature"] = _SIGNATURE
+    header["version"] = _VERSION
+    header["num_vertices"] = rest_pose.shape[1]
+    header["num_frames"] = transforms.shape[0]
+    header["num_bones"] = num_bones
+    header["num_influences"] = indices.shape[1]
+    header["residual_rank"] = basis.shape[0]
+    header["rms_error"] = rms_error
+
+    parts = [b""]
+    offset = _HEADER.itemsize
+    for n, array in enumerate(sections):
+        padding = -offset % _ALIGNMENT
+        parts.append(b"\0" * padding)
+        header["offsets"][0, n] = offset + padding
+        parts.append(array.tobytes())
+        offset += padding + array.nbytes
+    header["size"] = offset
+    parts[0] = header.tobytes()
+    return b"".join(parts)
+
+
+def _unpack(blob):
+    """Get the header and zero-copy views of the sections of an encoding."""
+    data = np.frombuffer(blob, dtype=np.uint8)
+    if data.size < _HEADER.itemsize:
+        raise IOError("Not an encoded mesh sequence")
+    header = data[: _HEADER.itemsize].view(_HEADER)[0]
+    if header["signature"] != _SIGNATURE or header["version"] != _VERSION:
+        raise IOError(f"Not an encoded mesh sequence of version {_VERSION}")
+    if header["size"] > data.size:
+        raise IOError("Encoded mesh sequence is truncated")
+
+    num_vertices = int(header["num_vertices"])
+    num_frames = int(header["num_frames"])
+    num_bones = int(header["num_bones"])
+    num_influences = int(header["num_influences"])
+    rank = int(header["residual_rank"])
+    layout = [
+        ("<f4", (num_vertices, 3)),
+        (_index_type(num_bones), (num_vertices, num_influences)),
+        ("<u2", (num_vertices, num_influences)),
+        ("<f4", (num_bones, 12)),
+        ("<f4", (num_bones, 12)),
+        ("<u2", (num_frames, num_bones, 12)),
+        ("<f4", (num_frames, rank)),
+        ("<f2", (rank, num_vertices, 3)),
+    ]
+    sections = []
+    for offset, (dtype, shape) in zip(header["offsets"], layout):
+        dtype = np.dtype(dtype)
+        stop = int(offset) + int(np.prod(shape)) * dtype.itemsize
+        if stop > data.size:
+            raise IOError("Encoded mesh sequence is corrupt")
+        sections.append(data[int(offset) : stop].view(dtype).reshape(shape))
+    return header, sections
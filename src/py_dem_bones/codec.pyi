@@ -0,0 +1,120 @@
+"""
+Compression of mesh sequences by skinning decomposition.
+
+A vertex cache of a deforming mesh is encoded as a rest pose, a few quantised bone
+influences per vertex and the quantised bone transformations of every frame, plus an
+optional low-rank basis of the residual that linear blend skinning cannot represent.
+All of it is stored in one binary blob:
+
+- header: sizes, the RMS error of the encoding and the offsets of the sections
+- rest pose: [num_vertices, 3] float32
+- influence bone indices: [num_vertices, num_influences] uint8, uint16 or uint32
+- influence weights: [num_vertices, num_influences] uint16 unorm values
+- transformation ranges: [num_bones, 12] float32 minimum and step of every entry of
+  the upper [3, 4] rows of the bone matrices
+- transformations: [num_frames, num_bones, 12] uint16
+- residual coefficients: [num_frames, residual_rank] float32
+- residual basis: [residual_rank, num_vertices, 3] float16
+
+Sections are aligned to 64 bytes and all values are little-endian. Every frame is
+decoded from its own transformations and residual coefficients, so frame ranges are
+reconstructed without touching the rest of the sequence.
+"""
+
+from __future__ import annotations
+from typing import Optional
+import numpy as np
+from py_dem_bones.corrective import _randomized_svd
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+from py_dem_bones.multires import _NEIGHBOUR_OFFSETS, ProxyMesh
+from py_dem_bones.runtime import RuntimeSkin, _index_type
+from py_dem_bones.storage import FrameStore
+
+__all__ = [
+    "decode",
+    "describe",
+    "encode",
+    "np",
+]
+
+def decode(blob, frames=None) -> np.ndarray:
+    """
+    Reconstruct frames of an encoded sequence.
+
+    Args:
+        blob (bytes-like): Encoded sequence, for example a memory-mapped file
+        frames (int, slice or array-like, optional): Frames to reconstruct, defaults to
+            all frames
+
+    Returns:
+        numpy.ndarray: float32 frames with shape [len(frames), 3, num_vertices]
+
+    Raises:
+        IOError: If the blob is not an encoded sequence
+        IndexError: If a frame index is out of range
+    """
+
+def describe(blob) -> dict:
+    """
+    Read the sizes of an encoded sequence.
+
+    Args:
+        blob (bytes-like): Encoded sequence
+
+    Returns:
+        dict: ``num_vertices``, ``num_frames``, ``num_bones``, ``num_influences``,
+            ``residual_rank``, ``rms_error`` and ``compression_ratio``, the size of the
+            sequence as float32 divided by the size of the blob
+
+    Raises:
+        IOError: If the blob is not an encoded sequence
+    """
+
+def encode(
+    frames: np.ndarray,
+    target_error: float = 1e-3,
+    max_bones: int = 32,
+    rest_pose: Optional[np.ndarray] = None,
+    faces=None,
+    max_influences: int = 4,
+    residual_rank: int = 16,
+    num_iterations: int = 30,
+) -> bytes:
+    """
+    Compress a mesh sequence.
+
+    Bone counts from 2 up to max_bones are solved in doubling steps. Each solve is
+    quantised and the residual of the sequence is compressed by a randomised truncated
+    SVD, streamed over chunks of frames, keeping the fewest residual components that
+    reach the target error. The smallest encoding that reaches the target is returned;
+    the search stops at the first bone count that reaches it without residuals. When
+    no encoding reaches the target, the most accurate one is returned.
+
+    The sequence is only read a chunk of frames at a time, so a memory-mapped cache is
+    never loaded as a whole: every bone count is solved out of core on at most 256
+    keyframes (see DemBonesWrapper.set_frame_store). Memory use still grows with the
+    number of frames by the transformations and residual coefficients of every frame.
+
+    Args:
+        frames (numpy.ndarray): Sequence with shape [num_frames, 3, num_vertices], such
+            as the memory-mapped poses of ``read_point_cache``
+        target_error (float): Root mean square distance of the decoded vertices from
+            the original ones over the whole sequence
+        max_bones (int): Largest number of bones to solve
+        rest_pose (numpy.ndarray, optional): Rest pose with shape [3, num_vertices],
+            defaults to the first frame
+        faces (array-like, optional): Faces of the mesh in any form accepted by
+            DemBonesWrapper.set_faces(). Bone clusters are grown and weights
+            smoothed over the faces; without them every vertex is connected to its
+            nearest neighbours in the rest pose.
+        max_influences (int): Maximum number of bone influences per vertex
+        residual_rank (int): Maximum number of residual components, 0 stores none
+        num_iterations (int): Solver iterations of every bone count
+
+    Returns:
+        bytes: The encoded sequence
+
+    Raises:
+        ParameterError: If the sequence or the settings are invalid
+        ComputationError: If the decomposition fails
+    """
@@ -0,0 +1,222 @@
+"""
+Corrective shapes for the residual of a skinning decomposition.
+
+Linear blend skinning cannot follow deformations such as bulges, wrinkles or facial
+expressions that are not driven by rigid bones, and matching them with bones alone
+needs many more bones and a slower solve. extract_correctives() compresses what the
+skinning leaves, the difference between the animated and the skinned poses, into a
+few corrective shapes and one coefficient per shape and frame by a randomised
+truncated SVD. The residual is streamed a chunk of frames at a time, so it is never
+held in memory as a whole.
+"""
+
+# Import standard library modules
+from typing import Callable, Iterable, Optional, Tuple
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import IndexError, ParameterError
+
+# Columns of the random projection beyond the number of shapes
+_OVERSAMPLING = 8
+
+
+class CorrectiveShapes:
+    """
+    Corrective shapes and their per-frame coefficients.
+
+    The correction of a frame is the sum of the shapes scaled by the coefficients of the
+    frame, added to the skinned pose.
+
+    Attributes:
+        shapes (numpy.ndarray): Vertex offsets with shape [num_shapes, 3, num_vertices],
+            orthonormal when flattened
+        coefficients (numpy.ndarray): Weight of every shape in every frame with shape
+            [num_frames, num_shapes]
+        rms_error (float): Root mean square distance of the corrected poses from the
+            animated poses, or None when unknown
+    """
+
+    def __init__(self, shapes: np.ndarray, coefficients: np.ndarray, rms_error: Optional[float] = None):
+        """
+        Create corrective shapes.
+
+        Args:
+            shapes (numpy.ndarray): Vertex offsets with shape [num_shapes, 3, num_vertices]
+            coefficients (numpy.ndarray): Coefficients with shape [num_frames, num_shapes]
+            rms_error (float, optional): Remaining root mean square error
+
+        Raises:
+            ParameterError: If the shapes and coefficients do not match
+        """
+        shapes = np.asarray(shapes, dtype=np.float32)
+        coefficients = np.asarray(coefficients, dtype=np.float32)
+        if shapes.ndim != 3 or shapes.shape[1] != 3:
+            raise ParameterError(f"Shapes must have shape [num_shapes, 3, num_vertices], got {shapes.shape}")
+        if coefficients.ndim != 2 or coefficients.shape[1] != shapes.shape[0]:
+            raise ParameterError(
+                f"Coefficients must have shape [num_frames, {shapes.shape[0]}], got {coefficients.shape}"
+            )
+        self.shapes = shapes
+        self.coefficients = coefficients
+        self.rms_error = rms_error
+
+    @property
+    def num_shapes(self) -> int:
+        """Get the number of corrective shapes."""
+        return self.shapes.shape[0]
+
+    @property
+    def num_frames(self) -> int:
+        """Get the number of frames."""
+        return self.coefficients.shape[0]
+
+    @property
+    def num_vertices(self) -> int:
+        """Get the number of vertices."""
+        return self.shapes.shape[2]
+
+    def evaluate(self, frame_indices=None) -> np.ndarray:
+        """
+        Compute the corrections of frames.
+
+        Args:
+            frame_indices (array-like, optional): Frames to correct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: float32 vertex offsets with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+        """
+        if frame_indices is None:
+            frame_indices = range(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        offsets = self.coefficients[frame_indices] @ self.shapes.reshape(self.num_shapes, -1)
+        return offsets.reshape(frame_indices.size, 3, self.num_vertices)
+
+
+def extract_correctives(
+    residuals: Callable[[], Iterable[Tuple[int, np.ndarray]]],
+    num_frames: int,
+    num_shapes: int = 8,
+    target_error: Optional[float] = None,
+    power_iterations: int = 1,
+    seed: int = 0,
+) -> CorrectiveShapes:
+    """
+    Compress the residual of a skinned sequence into corrective shapes.
+
+    The shapes are the dominant principal directions of the residual, without centring,
+    so a sequence whose skinning is exact in most frames gets zero coefficients there.
+    The coefficients are the projections of the residual of every frame on the shapes,
+    which makes the reported error exact.
+
+    Args:
+        residuals (callable): Function returning an iterable of (start, residual) pairs,
+            where residual holds the animated minus the skinned poses of the frames
+            from ``start`` on with shape [chunk_size, 3, num_vertices]. The chunks must
+            cover all frames; the function is called once per pass over the sequence.
+        num_frames (int): Number of frames of the sequence
+        num_shapes (int): Maximum number of corrective shapes
+        target_error (float, optional): Root mean square error of the corrected poses at
+            which to stop adding shapes, defaults to using all num_shapes
+        power_iterations (int): Power iterations that refine the subspace of the shapes
+        seed (int): Seed of the random projection
+
+    Returns:
+        CorrectiveShapes: The shapes, their coefficients and the remaining error
+
+    Raises:
+        ParameterError: If the settings are invalid or the chunks do not cover the frames
+    """
+    if not isinstance(num_frames, (int, np.integer)) or num_frames <= 0:
+        raise ParameterError("Number of frames must be a positive integer")
+    if not isinstance(num_shapes, (int, np.integer)) or num_shapes <= 0:
+        raise ParameterError("Number of shapes must be a positive integer")
+    if target_error is not None and not target_error >= 0:
+        raise ParameterError("Target error must not be negative")
+    if not isinstance(power_iterations, (int, np.integer)) or power_iterations < 0:
+        raise ParameterError("Power iterations must be a non-negative integer")
+
+    num_vertices = None
+
+    def rows():
+        nonlocal num_vertices
+        covered = 0
+        for start, chunk in residuals():
+            chunk = np.asarray(chunk)
+            if chunk.ndim != 3 or chunk.shape[1] != 3 or start != covered:
+                raise ParameterError("Residual chunks must cover the frames in order with shape [n, 3, num_vertices]")
+            num_vertices = chunk.shape[2]
+            covered += chunk.shape[0]
+            yield start, chunk.reshape(chunk.shape[0], -1)
+        if covered != num_frames:
+            raise ParameterError(f"Residual chunks cover {covered} of {num_frames} frames")
+
+    _, basis, _, energy = _randomized_svd(rows, num_frames, num_shapes, power_iterations, seed)
+
+    # Project every frame on the shapes, in order of decreasing significance
+    coefficients = np.empty((num_frames, basis.shape[0]))
+    for start, chunk in rows():
+        coefficients[start : start + chunk.shape[0]] = chunk @ basis.T
+
+    # Squared error left after each number of shapes
+    explained = np.concatenate([[0.0], np.cumsum(np.sum(np.square(coefficients), axis=0))])
+    remaining = np.maximum(energy - explained, 0.0)
+    count = num_frames * num_vertices
+    used = basis.shape[0]
+    if target_error is not None:
+        used = min(int(np.searchsorted(-remaining, -target_error**2 * count)), used)
+    rms_error = np.sqrt(remaining[used] / count)
+    shapes = basis[:used].reshape(used, 3, num_vertices)
+    return CorrectiveShapes(shapes, coefficients[:, :used], float(rms_error))
+
+
+def _randomized_svd(chunks, num_rows, rank, power_iterations=1, seed=0):
+    """
+    Truncated SVD of a matrix whose rows are streamed in chunks.
+
+    chunks() yields (start, rows) blocks that together cover the [num_rows, num_columns]
+    matrix and is called once per pass. A random projection of the rows, refined by
+    power iterations, spans the dominant left singular vectors.
+
+    Returns:
+        tuple: ([num_rows, rank] left singular vectors scaled by the singular values,
+            [rank, num_columns] right singular vectors, [rank] singular values, sum of
+            the squares of all entries)
+    """
+    rng = np.random.default_rng(seed)
+    size = None
+    sketch = None
+    projection = None
+    energy = 0.0
+    for start, rows in chunks():
+        if projection is None:
+            size = min(rank + _OVERSAMPLING, num_rows, rows.shape[1])
+            projection = rng.standard_normal((rows.shape[1], size)).astype(rows.dtype)
+            sketch = np.empty((num_rows, size))
+        sketch[start : start + rows.shape[0]] = rows @ projection
+        energy += np.sum(np.square(rows, dtype=np.float64))
+
+    for _ in range(power_iterations):
+        basis, _ = np.linalg.qr(sketch)
+        columns = np.zeros((projection.shape[0], size))
+        for start, rows in chunks():
+            columns += rows.T @ basis[start : start + rows.shape[0]]
+        columns, _ = np.linalg.qr(columns)
+        for start, rows in chunks():
+            sketch[start : start + rows.shape[0]] = rows @ columns
+
+    basis, _ = np.linalg.qr(sketch)
+    reduced = np.zeros((size, projection.shape[0]))
+    for start, rows in chunks():
+        reduced += basis[start : start + rows.shape[0]].T @ rows
+    left, singular_values, right = np.linalg.svd(reduced, full_matrices=False)
+    rank = min(rank, size)
+    left = basis @ left[:, :rank]
+    return left * singular_values[:rank], right[:rank], singular_values[:rank], energy
@@ -0,0 +1,114 @@
+"""
+Corrective shapes for the residual of a skinning decomposition.
+
+Linear blend skinning cannot follow deformations such as bulges, wrinkles or facial
+expressions that are not driven by rigid bones, and matching them with bones alone
+needs many more bones and a slower solve. extract_correctives() compresses what the
+skinning leaves, the difference between the animated and the skinned poses, into a
+few corrective shapes and one coefficient per shape and frame by a randomised
+truncated SVD. The residual is streamed a chunk of frames at a time, so it is never
+held in memory as a whole.
+"""
+
+from __future__ import annotations
+from typing import Callable, Iterable, Optional, Tuple
+import numpy as np
+from py_dem_bones.exceptions import IndexError, ParameterError
+
+__all__ = [
+    "CorrectiveShapes",
+    "extract_correctives",
+    "np",
+]
+
+class CorrectiveShapes:
+    """
+    Corrective shapes and their per-frame coefficients.
+
+    The correction of a frame is the sum of the shapes scaled by the coefficients of the
+    frame, added to the skinned pose.
+
+    Attributes:
+        shapes (numpy.ndarray): Vertex offsets with shape [num_shapes, 3, num_vertices],
+            orthonormal when flattened
+        coefficients (numpy.ndarray): Weight of every shape in every frame with shape
+            [num_frames, num_shapes]
+        rms_error (float): Root mean square distance of the corrected poses from the
+            animated poses, or None when unknown
+    """
+
+    def __init__(self, shapes: np.ndarray, coefficients: np.ndarray, rms_error: Optional[float] = None):
+        """
+        Create corrective shapes.
+
+        Args:
+            shapes (numpy.ndarray): Vertex offsets with shape [num_shapes, 3, num_vertices]
+            coefficients (numpy.ndarray): Coefficients with shape [num_frames, num_shapes]
+            rms_error (float, optional): Remaining root mean square error
+
+        Raises:
+            ParameterError: If the shapes and coefficients do not match
+        """
+    @property
+    def num_shapes(self) -> int:
+        """
+        Get the number of corrective shapes.
+        """
+    @property
+    def num_frames(self) -> int:
+        """
+        Get the number of frames.
+        """
+    @property
+    def num_vertices(self) -> int:
+        """
+        Get the number of vertices.
+        """
+    def evaluate(self, frame_indices=None) -> np.ndarray:
+        """
+        Compute the corrections of frames.
+
+        Args:
+            frame_indices (array-like, optional): Frames to correct, defaults to all frames
+
+        Returns:
+            numpy.ndarray: float32 vertex offsets with shape [len(frame_indices), 3, num_vertices]
+
+        Raises:
+            IndexError: If a frame index is out of range
+        """
+
+def extract_correctives(
+    residuals: Callable[[], Iterable[Tuple[int, np.ndarray]]],
+    num_frames: int,
+    num_shapes: int = 8,
+    target_error: Optional[float] = None,
+    power_iterations: int = 1,
+    seed: int = 0,
+) -> CorrectiveShapes:
+    """
+    Compress the residual of a skinned sequence into corrective shapes.
+
+    The shapes are the dominant principal directions of the residual, without centring,
+    so a sequence whose skinning is exact in most frames gets zero coefficients there.
+    The coefficients are the projections of the residual of every frame on the shapes,
+    which makes the reported error exact.
+
+    Args:
+        residuals (callable): Function returning an iterable of (start, residual) pairs,
+            where residual holds the animated minus the skinned poses of the frames
+            from ``start`` on with shape [chunk_size, 3, num_vertices]. The chunks must
+            cover all frames; the function is called once per pass over the sequence.
+        num_frames (int): Number of frames of the sequence
+        num_shapes (int): Maximum number of corrective shapes
+        target_error (float, optional): Root mean square error of the corrected poses at
+            which to stop adding shapes, defaults to using all num_shapes
+        power_iterations (int): Power iterations that refine the subspace of the shapes
+        seed (int): Seed of the random projection
+
+    Returns:
+        CorrectiveShapes: The shapes, their coefficients and the remaining error
+
+    Raises:
+        ParameterError: If the settings are invalid or the chunks do not cover the frames
+    """
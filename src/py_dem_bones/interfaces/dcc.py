@@ -9,6 +9,7 @@ software such as Maya, Blender, or custom 3D applications.
 # Import standard library modules
 # Import built-in modules
 from abc import ABC, abstractmethod
+import inspect
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 # Import third-party modules
@@ -184,6 +185,8 @@ class BaseDCCInterface(DCCInterface):
         # Default coordinate system transformation matrix
         # Identity matrix (no transformation)
         self._coord_transform = np.eye(4)
+        self._coord_inverse = np.eye(4)  # Cached inverse, updated by set_coordinate_system
+        self._coord_identity = True
 
     def get_dcc_info(self) -> Dict[str, Any]:
         """
@@ -201,18 +204,33 @@ class BaseDCCInterface(DCCInterface):
     def from_dcc_data(
         self,
         rest_pose: np.ndarray,
-        target_poses: List[np.ndarray],
+        target_poses: Optional[Union[np.ndarray, List[np.ndarray]]] = None,
         bone_names: Optional[List[str]] = None,
+        faces: Optional[Union[np.ndarray, List[List[int]]]] = None,
+        face_offsets: Optional[np.ndarray] = None,
+        num_frames: Optional[int] = None,
         **kwargs,
     ) -> bool:
         """
         Import data from DCC software into DemBones.
 
+        The target poses are converted to the DemBones coordinate system in one batched
+        operation and loaded into the solver in a single copy. A [num_frames,
+        num_vertices, 3] array, which may be memory-mapped, is read without building
+        per-frame arrays. Without ``target_poses``, a buffer for ``num_frames`` poses
+        is allocated and filled by fill_target_poses().
+
         Args:
             rest_pose (numpy.ndarray): Rest pose vertices with shape [num_vertices, 3]
-            target_poses (list): List of target pose vertices, each with shape [num_vertices, 3]
+            target_poses (array-like, optional): Target pose vertices with shape
+                [num_frames, num_vertices, 3], or a list of poses with shape [num_vertices, 3]
             bone_names (list, optional): List of bone names
-            **kwargs: Additional parameters
+            faces (array-like, optional): Mesh faces as a [num_faces, k] index array, a
+                list of vertex index lists, or flat indices together with ``face_offsets``
+            face_offsets (numpy.ndarray, optional): CSR offsets of polygons of mixed size
+            num_frames (int, optional): Number of poses fill_target_poses() writes when
+                ``target_poses`` is not given
+            **kwargs: Additional parameters, passed on to fill_target_poses()
 
         Returns:
             bool: True if import was successful
@@ -222,11 +240,19 @@ class BaseDCCInterface(DCCInterface):
 
         try:
             # Convert coordinate system if needed
-            rest_pose = self.apply_coordinate_system_transform(rest_pose, from_dcc=True)
-            target_poses = [
-                self.apply_coordinate_system_transform(pose, from_dcc=True)
-                for pose in target_poses
-            ]
+            rest_pose = self.apply_coordinate_system_transform(np.asarray(rest_pose), from_dcc=True)
+            if target_poses is None:
+                if num_frames is None:
+                    raise ValueError("Either target_poses or num_frames must be given")
+                buffer = np.empty((num_frames, rest_pose.shape[0], 3))
+                self.fill_target_poses(buffer, **kwargs)
+                target_poses = self._transform_buffer(buffer)
+            elif isinstance(target_poses, np.ndarray):
+                # Arrays (and memory maps) are never written to
+                target_poses = self.apply_coordinate_system_transform(target_poses, from_dcc=True)
+            else:
+                buffer = np.asarray(target_poses, dtype=np.float64).reshape(-1, rest_pose.shape[0], 3)
+                target_poses = self._transform_buffer(buffer)
 
             # Set bone names if provided
             if bone_names:
@@ -235,20 +261,63 @@ class BaseDCCInterface(DCCInterface):
             # Set rest pose (transpose to match DemBones format [3, num_vertices])
             self._dem_bones.set_rest_pose(rest_pose.T)
 
-            # Set target poses
-            for i, pose in enumerate(target_poses):
-                self._dem_bones.set_target_vertices(i, pose.T)
+            # Set faces for bone clustering and weight smoothing
+            if faces is not None:
+                self._dem_bones.set_faces(faces, face_offsets)
+
+            # Set target poses, [num_frames, 3, num_vertices] views are loaded as they are
+            self._dem_bones.set_animated_poses(target_poses.transpose(0, 2, 1))
 
             return True
         except Exception as e:
             print(f"Error importing DCC data: {str(e)}")
             return False
 
+    def _transform_buffer(self, buffer: np.ndarray) -> np.ndarray:
+        """
+        Convert a pose buffer owned by the import from the DCC coordinate system.
+
+        The buffer is converted in place when apply_coordinate_system_transform() takes
+        an ``out`` argument. Overrides with the two-argument signature of DCCInterface
+        return their result instead.
+
+        Args:
+            buffer (numpy.ndarray): Poses with shape [num_frames, num_vertices, 3]
+
+        Returns:
+            numpy.ndarray: The converted poses
+        """
+        transform = self.apply_coordinate_system_transform
+        if "out" in inspect.signature(transform).parameters:
+            return transform(buffer, from_dcc=True, out=buffer)
+        return transform(buffer, from_dcc=True)
+
+    def fill_target_poses(self, out: np.ndarray, **kwargs) -> None:
+        """
+        Write the target poses of the DCC scene into a preallocated buffer.
+
+        DCC integrations override this hook to read the animated vertices straight into
+        ``out``, for example by sampling the deformed mesh frame by frame, instead of
+        building a list of pose arrays. It is called by from_dcc_data() when no
+        ``target_poses`` are given. The poses are written in the DCC coordinate system.
+
+        Args:
+            out (numpy.ndarray): Buffer with shape [num_frames, num_vertices, 3] to fill
+            **kwargs: DCC-specific parameters passed to from_dcc_data()
+
+        Raises:
+            NotImplementedError: If the integration does not provide target poses this way
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement fill_target_poses()")
+
     def to_dcc_data(self, **kwargs) -> Dict[str, Any]:
         """
         Export DemBones data to DCC software.
 
         Args:
+            max_influences (int, optional): Also export the weights as
+                ``influence_indices`` and ``influence_weights`` tables with shape
+                [num_vertices, max_influences], see DemBonesWrapper.get_influences()
             **kwargs: Additional parameters
 
         Returns:
@@ -266,72 +335,85 @@ class BaseDCCInterface(DCCInterface):
             transforms = self.convert_matrices(transforms, from_dcc=False)
 
             # Return the data
-            return {
+            result = {
                 "weights": weights,
                 "transformations": transforms,
                 "bone_names": self._dem_bones.bone_names,
                 "success": True,
             }
+            if kwargs.get("max_influences") is not None:
+                indices, influence_weights = self._dem_bones.get_influences(kwargs["max_influences"])
+                result["influence_indices"] = indices
+                result["influence_weights"] = influence_weights
+            return result
         except Exception as e:
             print(f"Error exporting DCC data: {str(e)}")
             return {"success": False, "error": str(e)}
 
     def convert_matrices(
-        self, matrices: np.ndarray, from_dcc: bool = True
+        self, matrices: np.ndarray, from_dcc: bool = True, out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Convert between DCC-specific and DemBones matrix formats.
 
+        Every matrix M is mapped to C @ M @ C^-1 from the DCC to DemBones and to
+        C^-1 @ M @ C back, where C is the coordinate system transform. Stacks of any
+        shape are converted in one batched operation.
+
         Args:
-            matrices (numpy.ndarray): The matrices to convert
+            matrices (numpy.ndarray): The matrices to convert with shape [..., 4, 4]
             from_dcc (bool): If True, convert from DCC format to DemBones format,
                             otherwise convert from DemBones format to DCC format
+            out (numpy.ndarray, optional): Buffer with the shape of ``matrices`` that
+                receives the result. It may be ``matrices`` itself.
 
         Returns:
-            numpy.ndarray: The converted matrices
+            numpy.ndarray: The converted matrices, ``out`` if it was given. Arrays that
+                are not stacks of 4x4 matrices are returned unchanged.
+        """
+        matrices = np.asarray(matrices)
+        if matrices.ndim < 2 or matrices.shape[-2:] != (4, 4):
+            # If we get here, the input format wasn't recognized
+            return matrices
+
+        forward, inverse = self._coordinate_transforms(from_dcc, matrices.dtype)
+        return np.matmul(np.matmul(forward, matrices), inverse, out=out)
+
+    def apply_coordinate_system_transform(
+        self, data: np.ndarray, from_dcc: bool = True, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Apply the coordinate system transform to points.
+
+        Points are mapped by the coordinate system transform from the DCC to DemBones
+        and by its inverse back. Stacks of any shape are transformed in one batched
+        operation.
+
+        Args:
+            data (numpy.ndarray): Points with shape [..., num_vertices, 3]
+            from_dcc (bool): If True, transform from DCC to DemBones coordinate system,
+                            otherwise transform from DemBones to DCC coordinate system
+            out (numpy.ndarray, optional): Buffer with the shape of ``data`` that
+                receives the result. It may be ``data`` itself.
+
+        Returns:
+            numpy.ndarray: The transformed points, ``out`` if it was given. Arrays whose
+                last axis does not hold 3 coordinates are returned unchanged.
         """
-        # Apply coordinate system transformation
-        if from_dcc:
-            # DCC to DemBones
-            if len(matrices.shape) == 2 and matrices.shape == (4, 4):
-                # Single matrix
-                return (
-                    self._coord_transform
-                    @ matrices
-                    @ np.linalg.inv(self._coord_transform)
-                )
-            elif len(matrices.shape) == 3 and matrices.shape[1:] == (4, 4):
-                # Array of matrices
-                result = np.zeros_like(matrices)
-                for i in range(matrices.shape[0]):
-                    result[i] = (
-                        self._coord_transform
-                        @ matrices[i]
-                        @ np.linalg.inv(self._coord_transform)
-                    )
-                return result
-        else:
-            # DemBones to DCC
-            if len(matrices.shape) == 2 and matrices.shape == (4, 4):
-                # Single matrix
-                return (
-                    np.linalg.inv(self._coord_transform)
-                    @ matrices
-                    @ self._coord_transform
-                )
-            elif len(matrices.shape) == 3 and matrices.shape[1:] == (4, 4):
-                # Array of matrices
-                result = np.zeros_like(matrices)
-                for i in range(matrices.shape[0]):
-                    result[i] = (
-                        np.linalg.inv(self._coord_transform)
-                        @ matrices[i]
-                        @ self._coord_transform
-                    )
-                return result
-
-        # If we get here, the input format wasn't recognized
-        return matrices
+        data = np.asarray(data)
+        if data.ndim < 1 or data.shape[-1] != 3:
+            return data
+        if self._coord_identity:
+            # Nothing to do, which also keeps memory-mapped inputs from being copied
+            if out is None or out is data:
+                return data
+            out[...] = data
+            return out
+
+        forward, _ = self._coordinate_transforms(from_dcc, data.dtype)
+        result = np.matmul(data, forward[:3, :3].T, out=out)
+        result += forward[:3, 3]
+        return result
 
     def set_coordinate_system(self, transform_matrix: np.ndarray):
         """
@@ -346,4 +428,16 @@ class BaseDCCInterface(DCCInterface):
         ):
             raise ValueError("Transform matrix must be a 4x4 numpy array")
 
+        # The inverse is computed once here instead of for every conversion
         self._coord_transform = transform_matrix.copy()
+        self._coord_inverse = np.linalg.inv(transform_matrix.astype(np.float64))
+        self._coord_identity = bool(np.array_equal(transform_matrix, np.eye(4)))
+
+    def _coordinate_transforms(self, from_dcc: bool, dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the (forward, inverse) transforms of a conversion direction in the precision of the data."""
+        forward, inverse = self._coord_transform, self._coord_inverse
+        if not from_dcc:
+            forward, inverse = inverse, forward
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        return forward.astype(dtype, copy=False), inverse.astype(dtype, copy=False)
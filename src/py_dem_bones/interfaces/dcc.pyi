@@ -170,45 +170,107 @@ class BaseDCCInterface(DCCInterface):
     def from_dcc_data(
         self,
         rest_pose: np.ndarray,
-        target_poses: List[np.ndarray],
+        target_poses: Optional[Union[np.ndarray, List[np.ndarray]]] = None,
         bone_names: Optional[List[str]] = None,
+        faces: Optional[Union[np.ndarray, List[List[int]]]] = None,
+        face_offsets: Optional[np.ndarray] = None,
+        num_frames: Optional[int] = None,
         **kwargs,
     ) -> bool:
         """
         Import data from DCC software into DemBones.
 
+        The target poses are converted to the DemBones coordinate system in one batched
+        operation and loaded into the solver in a single copy. A [num_frames,
+        num_vertices, 3] array, which may be memory-mapped, is read without building
+        per-frame arrays. Without ``target_poses``, a buffer for ``num_frames`` poses
+        is allocated and filled by fill_target_poses().
+
         Args:
             rest_pose (numpy.ndarray): Rest pose vertices with shape [num_vertices, 3]
-            target_poses (list): List of target pose vertices, each with shape [num_vertices, 3]
+            target_poses (array-like, optional): Target pose vertices with shape
+                [num_frames, num_vertices, 3], or a list of poses with shape [num_vertices, 3]
             bone_names (list, optional): List of bone names
-            **kwargs: Additional parameters
+            faces (array-like, optional): Mesh faces as a [num_faces, k] index array, a
+                list of vertex index lists, or flat indices together with ``face_offsets``
+            face_offsets (numpy.ndarray, optional): CSR offsets of polygons of mixed size
+            num_frames (int, optional): Number of poses fill_target_poses() writes when
+                ``target_poses`` is not given
+            **kwargs: Additional parameters, passed on to fill_target_poses()
 
         Returns:
             bool: True if import was successful
         """
+    def fill_target_poses(self, out: np.ndarray, **kwargs) -> None:
+        """
+        Write the target poses of the DCC scene into a preallocated buffer.
+
+        DCC integrations override this hook to read the animated vertices straight into
+        ``out``, for example by sampling the deformed mesh frame by frame, instead of
+        building a list of pose arrays. It is called by from_dcc_data() when no
+        ``target_poses`` are given. The poses are written in the DCC coordinate system.
+
+        Args:
+            out (numpy.ndarray): Buffer with shape [num_frames, num_vertices, 3] to fill
+            **kwargs: DCC-specific parameters passed to from_dcc_data()
+
+        Raises:
+            NotImplementedError: If the integration does not provide target poses this way
+        """
     def to_dcc_data(self, **kwargs) -> Dict[str, Any]:
         """
         Export DemBones data to DCC software.
 
         Args:
+            max_influences (int, optional): Also export the weights as
+                ``influence_indices`` and ``influence_weights`` tables with shape
+                [num_vertices, max_influences], see DemBonesWrapper.get_influences()
             **kwargs: Additional parameters
 
         Returns:
             dict: Dictionary containing exported data
         """
     def convert_matrices(
-        self, matrices: np.ndarray, from_dcc: bool = True
+        self, matrices: np.ndarray, from_dcc: bool = True, out: Optional[np.ndarray] = None
     ) -> np.ndarray:
         """
         Convert between DCC-specific and DemBones matrix formats.
 
+        Every matrix M is mapped to C @ M @ C^-1 from the DCC to DemBones and to
+        C^-1 @ M @ C back, where C is the coordinate system transform. Stacks of any
+        shape are converted in one batched operation.
+
         Args:
-            matrices (numpy.ndarray): The matrices to convert
+            matrices (numpy.ndarray): The matrices to convert with shape [..., 4, 4]
             from_dcc (bool): If True, convert from DCC format to DemBones format,
                             otherwise convert from DemBones format to DCC format
+            out (numpy.ndarray, optional): Buffer with the shape of ``matrices`` that
+                receives the result. It may be ``matrices`` itself.
 
         Returns:
-            numpy.ndarray: The converted matrices
+            numpy.ndarray: The converted matrices, ``out`` if it was given. Arrays that
+                are not stacks of 4x4 matrices are returned unchanged.
+        """
+    def apply_coordinate_system_transform(
+        self, data: np.ndarray, from_dcc: bool = True, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Apply the coordinate system transform to points.
+
+        Points are mapped by the coordinate system transform from the DCC to DemBones
+        and by its inverse back. Stacks of any shape are transformed in one batched
+        operation.
+
+        Args:
+            data (numpy.ndarray): Points with shape [..., num_vertices, 3]
+            from_dcc (bool): If True, transform from DCC to DemBones coordinate system,
+                            otherwise transform from DemBones to DCC coordinate system
+            out (numpy.ndarray, optional): Buffer with the shape of ``data`` that
+                receives the result. It may be ``data`` itself.
+
+        Returns:
+            numpy.ndarray: The transformed points, ``out`` if it was given. Arrays whose
+                last axis does not hold 3 coordinates are returned unchanged.
         """
     def set_coordinate_system(self, transform_matrix: np.ndarray) -> None:
         """
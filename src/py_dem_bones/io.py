@@ -0,0 +1,603 @@
+"""
+Readers and writers for mesh sequences exported from DCC applications.
+
+This module reads per-frame mesh exports into the array layout used by the
+solver. OBJ files are parsed by the native extension with the GIL released, so a
+sequence is read by several threads at once and written into a single
+preallocated buffer. PC2 and MDD point caches are memory-mapped and handed to
+the solver as strided views in their own byte order. Solved decompositions are
+exported to engines as binary glTF files.
+"""
+
+# Import standard library modules
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import os
+import re
+import struct
+from typing import List, Optional, Sequence, Tuple, Union
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones._py_dem_bones import parse_obj
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+
+# PC2 header: signature, file version, points, start frame, sample rate, samples
+_PC2_HEADER = np.dtype([
+    ("signature", "S12"),
+    ("version", "<i4"),
+    ("num_points", "<i4"),
+    ("start_frame", "<f4"),
+    ("sample_rate", "<f4"),
+    ("num_samples", "<i4"),
+])
+_PC2_SIGNATURE = b"POINTCACHE2"
+
+# Frame rate of the MDD times written when none are given
+_MDD_FPS = 24.0
+
+# glTF component types and buffer view targets
+_GLTF_COMPONENT_TYPES = {
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+_GLTF_ACCESSOR_TYPES = {1: "SCALAR", 3: "VEC3", 4: "VEC4", 16: "MAT4"}
+_GLTF_ARRAY_BUFFER = 34962
+_GLTF_ELEMENT_ARRAY_BUFFER = 34963
+
+# GLB container: magic, version and the types of the JSON and binary chunks
+_GLB_MAGIC = 0x46546C67
+_GLB_JSON_CHUNK = 0x4E4F534A
+_GLB_BIN_CHUNK = 0x004E4942
+
+
+def read_obj(path: Union[str, os.PathLike]) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Read the vertex positions and faces of an OBJ file.
+
+    Args:
+        path (str): Path of the OBJ file
+
+    Returns:
+        tuple: (vertices, faces) with vertices of shape [3, num_vertices] and faces as
+            lists of zero-based vertex indices, the format of ``DemBones.fv``
+
+    Raises:
+        IOError: If the file cannot be read or parsed
+    """
+    vertices, face_sizes, face_indices = _parse_obj_file(path)
+    return vertices.T.copy(), _faces_to_list(face_sizes, face_indices)
+
+
+def read_obj_sequence(
+    pattern: Union[str, Sequence[Union[str, os.PathLike]]],
+    workers: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Read a sequence of OBJ files with one frame per file.
+
+    The first file defines the topology and the size of the frame buffer; every
+    other file is parsed on a worker thread, checked against that topology and
+    written into its frame of the buffer. The buffer can be passed directly to
+    ``DemBonesWrapper.from_files`` or reshaped to [3 * num_frames, num_vertices].
+
+    Args:
+        pattern (str or list): Glob pattern of the files, which are ordered by name
+            with numbers compared by value, or an ordered list of paths
+        workers (int, optional): Number of reader threads, defaults to the number of CPUs
+        out (numpy.ndarray, optional): Buffer to fill, with shape [num_frames, 3,
+            num_vertices] or [3 * num_frames, num_vertices], such as a memory map
+            created with ``FrameStore.create``
+        dtype: Data type of the buffer allocated when ``out`` is not given
+
+    Returns:
+        tuple: (frames, faces) with frames of shape [num_frames, 3, num_vertices] and
+            the faces of the first file in the format of ``DemBones.fv``
+
+    Raises:
+        IOError: If no file matches or a file cannot be read or parsed
+        ParameterError: If the topology changes between files or ``out`` has the wrong shape
+    """
+    paths = _sequence_paths(pattern)
+    if workers is not None and (not isinstance(workers, (int, np.integer)) or workers <= 0):
+        raise ParameterError("Number of workers must be a positive integer")
+
+    vertices, face_sizes, face_indices = _parse_obj_file(paths[0])
+    num_vertices = vertices.shape[0]
+
+    if out is None:
+        frames = np.empty((len(paths), 3, num_vertices), dtype=dtype)
+    else:
+        if out.shape not in ((len(paths), 3, num_vertices), (3 * len(paths), num_vertices)):
+            raise ParameterError(
+                f"Output buffer must have shape [{len(paths)}, 3, {num_vertices}], got {out.shape}"
+            )
+        frames = out.reshape(len(paths), 3, num_vertices)
+        if not np.shares_memory(frames, out):
+            raise ParameterError("Output buffer must be contiguous to be filled in place")
+    frames[0] = vertices.T
+
+    def read_frame(index):
+        frame_vertices, frame_sizes, frame_indices = _parse_obj_file(paths[index])
+        same_faces = np.array_equal(frame_sizes, face_sizes) and np.array_equal(frame_indices, face_indices)
+        if frame_vertices.shape[0] != num_vertices or not same_faces:
+            raise ParameterError(f"{paths[index]} does not match the topology of {paths[0]}")
+        frames[index] = frame_vertices.T
+
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            # Consume the results to re-raise the first error
+            list(executor.map(read_frame, range(1, len(paths))))
+
+    return frames, _faces_to_list(face_sizes, face_indices)
+
+
+def read_point_cache(
+    path: Union[str, os.PathLike],
+    frame_range: Optional[Tuple[int, int]] = None,
+    mmap: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read a PC2 or MDD point cache.
+
+    The poses are a [num_frames, 3, num_vertices] view of the cached
+    [num_frames, num_vertices, 3] data in the byte order of the file (little-endian
+    for PC2, big-endian for MDD). The native loaders of the solver read such views
+    in place and swap bytes while copying, so passing them to
+    ``DemBonesWrapper.from_files`` or a ``FrameStore`` makes no intermediate copy.
+
+    Args:
+        path (str): Path of a ``.pc2`` or ``.mdd`` file
+        frame_range (tuple, optional): (start, stop) frame indices to read, defaults to all frames
+        mmap (bool): Memory-map the frames instead of reading them
+
+    Returns:
+        tuple: (poses, times) with poses of shape [num_frames, 3, num_vertices] and the
+            time of every frame, in frames for PC2 and in seconds for MDD
+
+    Raises:
+        IOError: If the file cannot be read or is not a valid point cache
+        IndexError: If the frame range is out of range
+        ParameterError: If the file extension is not supported
+    """
+    path = os.fspath(path)
+    dtype, offset, num_frames, num_points, times = _point_cache_layout(path)
+
+    start, stop = (0, num_frames) if frame_range is None else frame_range
+    if not 0 <= start < stop <= num_frames:
+        raise IndexError(f"Frame range ({start}, {stop}) out of range (0-{num_frames})")
+
+    offset += start * num_points * 3 * dtype.itemsize
+    shape = (stop - start, num_points, 3)
+    try:
+        if mmap:
+            data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        else:
+            data = np.fromfile(path, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+    except (OSError, ValueError) as e:
+        raise IOError(f"Failed to read point cache {path}: {str(e)}")
+    return data.transpose(0, 2, 1), times[start:stop]
+
+
+def create_point_cache(
+    path: Union[str, os.PathLike],
+    num_frames: int,
+    num_vertices: int,
+    times: Optional[np.ndarray] = None,
+) -> np.memmap:
+    """
+    Create a PC2 or MDD point cache on disk to be filled frame by frame.
+
+    Args:
+        path (str): Path of the ``.pc2`` or ``.mdd`` file to create
+        num_frames (int): Number of frames
+        num_vertices (int): Number of vertices per frame
+        times (array-like, optional): Time of every frame. PC2 files need evenly
+            spaced times. Defaults to frame numbers for PC2 and to seconds at 24
+            frames per second for MDD.
+
+    Returns:
+        numpy.memmap: Writable [num_frames, 3, num_vertices] view of the cached data
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the format, the sizes or the times are invalid
+    """
+    path = os.fspath(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".pc2", ".mdd"):
+        raise ParameterError(f"Unsupported point cache format: {path}")
+    if not isinstance(num_frames, (int, np.integer)) or num_frames <= 0:
+        raise ParameterError("Number of frames must be a positive integer")
+    if not isinstance(num_vertices, (int, np.integer)) or num_vertices <= 0:
+        raise ParameterError("Number of vertices must be a positive integer")
+
+    if times is None:
+        times = np.arange(num_frames, dtype=np.float64)
+        if extension == ".mdd":
+            times /= _MDD_FPS
+    times = np.asarray(times, dtype=np.float64).ravel()
+    if times.size != num_frames:
+        raise ParameterError(f"Expected {num_frames} frame times, got {times.size}")
+
+    if extension == ".pc2":
+        sample_rate = times[1] - times[0] if num_frames > 1 else 1.0
+        if not np.allclose(np.diff(times), sample_rate):
+            raise ParameterError("PC2 frame times must be evenly spaced")
+        header = np.array(
+            [(_PC2_SIGNATURE, 1, num_vertices, times[0], sample_rate, num_frames)], dtype=_PC2_HEADER
+        ).tobytes()
+        dtype = np.dtype("<f4")
+    else:
+        header = np.array([num_frames, num_vertices], dtype=">i4").tobytes() + times.astype(">f4").tobytes()
+        dtype = np.dtype(">f4")
+
+    try:
+        data = np.memmap(path, dtype=dtype, mode="w+", offset=len(header), shape=(num_frames, num_vertices, 3))
+        with open(path, "r+b") as f:
+            f.write(header)
+    except (OSError, ValueError) as e:
+        raise IOError(f"Failed to create point cache {path}: {str(e)}")
+    return data.transpose(0, 2, 1)
+
+
+def write_point_cache(
+    path: Union[str, os.PathLike],
+    poses: np.ndarray,
+    times: Optional[np.ndarray] = None,
+):
+    """
+    Write animated poses to a PC2 or MDD point cache.
+
+    Args:
+        path (str): Path of the ``.pc2`` or ``.mdd`` file to write
+        poses (numpy.ndarray): Poses with shape [num_frames, 3, num_vertices] or
+            [3 * num_frames, num_vertices]
+        times (array-like, optional): Time of every frame, see ``create_point_cache``
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the poses, the format or the times are invalid
+    """
+    poses = np.asarray(poses)
+    if poses.ndim == 2 and poses.shape[0] % 3 == 0:
+        poses = poses.reshape(-1, 3, poses.shape[1])
+    if poses.ndim != 3 or poses.shape[1] != 3:
+        raise ParameterError(f"Poses must have shape [num_frames, 3, num_vertices], got {poses.shape}")
+
+    cache = create_point_cache(path, poses.shape[0], poses.shape[2], times)
+    cache[:] = poses
+    cache.flush()
+
+
+def export_gltf(
+    path: Union[str, os.PathLike],
+    wrapper,
+    mesh_faces,
+    face_offsets: Optional[np.ndarray] = None,
+    max_influences: int = 4,
+    times: Optional[np.ndarray] = None,
+    fps: float = 24.0,
+):
+    """
+    Export a solved decomposition as a skinned, animated binary glTF 2.0 file.
+
+    The file holds the rest pose mesh, a skin with one joint per bone and the inverse
+    of the bind matrices, JOINTS_n/WEIGHTS_n attributes built from the influence table
+    of get_influences(), and per-bone translation, rotation and scale channels sampled
+    from the bone transformations at every frame. Polygons are triangulated as fans.
+    Bone parents of DemBonesExtWrapper become the joint hierarchy. All buffers are
+    packed with array operations, without Python loops over vertices or frames.
+
+    Args:
+        path (str): Path of the ``.glb`` file to write
+        wrapper (DemBonesWrapper): Wrapper holding solved weights and transformations
+        mesh_faces (array-like): Faces as a [num_faces, k] index array, a list of vertex
+            index lists, or flat indices together with ``face_offsets``
+        face_offsets (numpy.ndarray, optional): CSR offsets of polygons of mixed size
+        max_influences (int): Maximum number of influences per vertex, written as
+            ceil(max_influences / 4) JOINTS_n and WEIGHTS_n sets
+        times (array-like, optional): Time of every frame in seconds. Defaults to
+            frames at ``fps``.
+        fps (float): Frame rate of the default times
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the faces, the times or the influence count are invalid
+        ComputationError: If the decomposition has not been solved
+    """
+    if not isinstance(max_influences, (int, np.integer)) or max_influences <= 0:
+        raise ParameterError("Maximum influences must be a positive integer")
+
+    rest_pose = np.asarray(wrapper.get_rest_pose())[:3].T.astype(np.float32)
+    num_vertices = rest_pose.shape[0]
+    transforms = wrapper.get_bone_transformations()
+    num_frames, num_bones = transforms.shape[:2]
+    indices, weights = wrapper.get_influences(int(max_influences))
+    triangles = _triangulate(mesh_faces, face_offsets, num_vertices)
+
+    if times is None:
+        times = np.arange(num_frames) / float(fps)
+    times = np.asarray(times, dtype=np.float32).ravel()
+    if times.size != num_frames:
+        raise ParameterError(f"Expected {num_frames} frame times, got {times.size}")
+    if num_frames > 1 and np.any(np.diff(times) <= 0):
+        raise ParameterError("Frame times must be strictly increasing")
+
+    # Joints are placed at their bind matrices and follow the bone transformations
+    bind = np.stack([np.asarray(wrapper.get_bind_matrix(j), dtype=np.float64) for j in range(num_bones)])
+    parent_bones = getattr(wrapper, "parent_bones", {})
+    parents = np.array([parent_bones.get(j, -1) for j in range(num_bones)], dtype=np.int64)
+    parents[(parents < 0) | (parents >= num_bones)] = -1
+    has_parent = parents >= 0
+    global_pose = transforms @ bind
+    local_bind = bind.copy()
+    local_bind[has_parent] = np.linalg.inv(bind[parents[has_parent]]) @ bind[has_parent]
+    local_pose = global_pose.copy()
+    local_pose[:, has_parent] = np.linalg.inv(global_pose[:, parents[has_parent]]) @ global_pose[:, has_parent]
+    translation, rotation, scale = decompose_transformations(local_pose.transpose(1, 0, 2, 3))
+    bind_translation, bind_rotation, bind_scale = decompose_transformations(local_bind)
+
+    # Influence sets of four, unused slots are joint 0 with weight 0
+    num_sets = -(-int(max_influences) // 4)
+    joints = np.zeros((num_vertices, 4 * num_sets), dtype=np.uint8 if num_bones <= 256 else np.uint16)
+    joints[:, : indices.shape[1]] = indices
+    joint_weights = np.zeros((num_vertices, 4 * num_sets), dtype=np.float32)
+    joint_weights[:, : weights.shape[1]] = weights
+
+    builder = _GlbBuilder()
+    attributes = {"POSITION": builder.add_accessor(rest_pose, _GLTF_ARRAY_BUFFER, bounds=True)}
+    for n in range(num_sets):
+        attributes[f"JOINTS_{n}"] = builder.add_accessor(joints[:, 4 * n : 4 * n + 4], _GLTF_ARRAY_BUFFER)
+        attributes[f"WEIGHTS_{n}"] = builder.add_accessor(joint_weights[:, 4 * n : 4 * n + 4], _GLTF_ARRAY_BUFFER)
+    index_type = np.uint16 if num_vertices <= 0xFFFF else np.uint32
+    triangle_accessor = builder.add_accessor(triangles.astype(index_type).ravel(), _GLTF_ELEMENT_ARRAY_BUFFER)
+    inverse_bind = np.linalg.inv(bind).transpose(0, 2, 1).reshape(num_bones, 16)
+    inverse_bind_accessor = builder.add_accessor(inverse_bind.astype(np.float32))
+
+    # One input accessor and three output accessors per joint, packed into shared views
+    time_accessor = builder.add_accessor(times, bounds=True)
+    outputs = [
+        builder.add_accessor_stack(translation.astype(np.float32)),
+        builder.add_accessor_stack(rotation.astype(np.float32)),
+        builder.add_accessor_stack(scale.astype(np.float32)),
+    ]
+
+    joint_nodes = 2 + np.arange(num_bones)
+    names = list(getattr(wrapper, "bone_names", [])) + [""] * num_bones
+    nodes = [{"name": "mesh", "mesh": 0, "skin": 0}, {"name": "skeleton", "children": []}]
+    for j in range(num_bones):
+        node = {
+            "name": names[j] or f"bone{j}",
+            "translation": bind_translation[j].tolist(),
+            "rotation": bind_rotation[j].tolist(),
+            "scale": bind_scale[j].tolist(),
+        }
+        children = joint_nodes[parents == j].tolist()
+        if children:
+            node["children"] = children
+        nodes.append(node)
+    nodes[1]["children"] = joint_nodes[~has_parent].tolist()
+
+    channels, samplers = [], []
+    for j in range(num_bones):
+        for target, accessors in zip(("translation", "rotation", "scale"), outputs):
+            channels.append({"sampler": len(samplers), "target": {"node": int(joint_nodes[j]), "path": target}})
+            samplers.append({"input": time_accessor, "output": accessors[j], "interpolation": "LINEAR"})
+
+    document = {
+        "asset": {"version": "2.0", "generator": "py-dem-bones"},
+        "scene": 0,
+        "scenes": [{"nodes": [0, 1]}],
+        "nodes": nodes,
+        "meshes": [{"primitives": [{"attributes": attributes, "indices": triangle_accessor, "mode": 4}]}],
+        "skins": [{"joints": joint_nodes.tolist(), "skeleton": 1, "inverseBindMatrices": inverse_bind_accessor}],
+        "animations": [{"name": "dem_bones", "channels": channels, "samplers": samplers}],
+    }
+    builder.write(path, document)
+
+
+def decompose_transformations(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split transformation matrices into translations, rotations and scales.
+
+    Each matrix is decomposed as translation * rotation * scale; shear is dropped. The
+    quaternions along the second to last axis are made continuous, so interpolating the
+    frames of a [num_bones, num_frames, 4, 4] stack takes the shorter arc.
+
+    Args:
+        matrices (numpy.ndarray): Transformations with shape [..., 4, 4] or [..., 3, 4]
+
+    Returns:
+        tuple: (translations, rotations, scales) with shapes [..., 3], [..., 4] as unit
+            quaternions (x, y, z, w), and [..., 3] along the rest axes
+    """
+    translation = matrices[..., :3, 3]
+    linear = matrices[..., :3, :3]
+    scale = np.linalg.norm(linear, axis=-2)
+    scale[np.linalg.det(linear) < 0, 0] *= -1
+    r = linear / np.where(scale == 0, 1, scale)[..., np.newaxis, :]
+
+    # Shepperd's method: build the quaternion from the largest of its four components
+    m00, m11, m22 = r[..., 0, 0], r[..., 1, 1], r[..., 2, 2]
+    squares = np.stack([1 + m00 + m11 + m22, 1 + m00 - m11 - m22, 1 - m00 + m11 - m22, 1 - m00 - m11 + m22])
+    case = np.argmax(squares, axis=0)
+    s = 2 * np.sqrt(np.maximum(np.take_along_axis(squares, case[np.newaxis], axis=0)[0], 1e-12))
+    a, b, c = r[..., 2, 1] - r[..., 1, 2], r[..., 0, 2] - r[..., 2, 0], r[..., 1, 0] - r[..., 0, 1]
+    d, e, f = r[..., 0, 1] + r[..., 1, 0], r[..., 0, 2] + r[..., 2, 0], r[..., 1, 2] + r[..., 2, 1]
+    candidates = np.stack([
+        np.stack([a, b, c, s * s / 4], axis=-1),
+        np.stack([s * s / 4, d, e, a], axis=-1),
+        np.stack([d, s * s / 4, f, b], axis=-1),
+        np.stack([e, f, s * s / 4, c], axis=-1),
+    ])
+    rotation = np.take_along_axis(candidates, case[np.newaxis, ..., np.newaxis], axis=0)[0] / s[..., np.newaxis]
+    rotation /= np.linalg.norm(rotation, axis=-1, keepdims=True)
+
+    if rotation.ndim > 2 and rotation.shape[-2] > 1:
+        flips = np.sum(rotation[..., 1:, :] * rotation[..., :-1, :], axis=-1) < 0
+        signs = np.cumprod(np.where(flips, -1.0, 1.0), axis=-1)
+        rotation[..., 1:, :] *= signs[..., np.newaxis]
+    return translation, rotation, scale
+
+
+def _sequence_paths(pattern) -> List[str]:
+    """Expand a glob pattern into paths in natural order, or validate a list of paths."""
+    if isinstance(pattern, (str, os.PathLike)):
+        paths = glob.glob(os.fspath(pattern))
+        paths.sort(key=lambda path: [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path)])
+    else:
+        paths = [os.fspath(path) for path in pattern]
+    if not paths:
+        raise IOError(f"No files match {pattern}")
+    return paths
+
+
+def _parse_obj_file(path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read and parse an OBJ file, checking the face indices."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        vertices, face_sizes, face_indices = parse_obj(data)
+    except (OSError, ValueError) as e:
+        raise IOError(f"Failed to read OBJ file {path}: {str(e)}")
+
+    if face_indices.size and (face_indices.min() < 0 or face_indices.max() >= vertices.shape[0]):
+        raise IOError(f"Face index out of range in OBJ file {path}")
+    return vertices, face_sizes, face_indices
+
+
+def _faces_to_list(face_sizes: np.ndarray, face_indices: np.ndarray) -> List[List[int]]:
+    """Convert flat face arrays to lists of vertex indices."""
+    if face_sizes.size == 0:
+        return []
+    if np.all(face_sizes == face_sizes[0]):
+        return face_indices.reshape(-1, int(face_sizes[0])).tolist()
+    return [face.tolist() for face in np.split(face_indices, np.cumsum(face_sizes)[:-1])]
+
+
+def _point_cache_layout(path: str) -> Tuple[np.dtype, int, int, int, np.ndarray]:
+    """Read the header of a point cache: data type, data offset, frames, points and frame times."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".pc2", ".mdd"):
+        raise ParameterError(f"Unsupported point cache format: {path}")
+
+    try:
+        if extension == ".pc2":
+            header = np.fromfile(path, dtype=_PC2_HEADER, count=1)
+            if header.size != 1 or header["signature"][0] != _PC2_SIGNATURE:
+                raise ValueError("missing PC2 signature")
+            num_frames = int(header["num_samples"][0])
+            num_points = int(header["num_points"][0])
+            times = header["start_frame"][0] + header["sample_rate"][0] * np.arange(num_frames, dtype=np.float64)
+            dtype, offset = np.dtype("<f4"), _PC2_HEADER.itemsize
+        else:
+            header = np.fromfile(path, dtype=">i4", count=2)
+            if header.size != 2:
+                raise ValueError("missing MDD header")
+            num_frames, num_points = int(header[0]), int(header[1])
+            times = np.fromfile(path, dtype=">f4", count=num_frames, offset=8).astype(np.float64)
+            dtype, offset = np.dtype(">f4"), 8 + 4 * num_frames
+
+        if num_frames <= 0 or num_points <= 0:
+            raise ValueError("empty point cache")
+        if os.path.getsize(path) < offset + num_frames * num_points * 3 * dtype.itemsize:
+            raise ValueError("file is truncated")
+    except (OSError, ValueError) as e:
+        raise IOError(f"Failed to read point cache {path}: {str(e)}")
+    return dtype, offset, num_frames, num_points, times
+
+
+def _triangulate(faces, offsets: Optional[np.ndarray], num_vertices: int) -> np.ndarray:
+    """Split polygons given as an index array, lists or CSR arrays into [num_triangles, 3] fans."""
+    if offsets is None:
+        if isinstance(faces, np.ndarray) and faces.ndim == 2:
+            offsets = np.arange(faces.shape[0] + 1, dtype=np.int64) * faces.shape[1]
+        else:
+            faces = list(faces)
+            offsets = np.concatenate([[0], np.cumsum([len(face) for face in faces])]).astype(np.int64)
+            faces = np.fromiter((i for face in faces for i in face), dtype=np.int64, count=offsets[-1])
+    faces = np.asarray(faces, dtype=np.int64).ravel()
+    offsets = np.asarray(offsets, dtype=np.int64).ravel()
+    if offsets.size < 2 or offsets[0] != 0 or offsets[-1] != faces.size or np.any(np.diff(offsets) < 3):
+        raise ParameterError("Faces must have at least 3 vertices each")
+    if faces.min() < 0 or faces.max() >= num_vertices:
+        raise IndexError(f"Face vertex index out of range (0-{num_vertices-1})")
+
+    # Face f with n corners becomes the triangles (0, j, j + 1) for j = 1 .. n - 2
+    counts = np.diff(offsets) - 2
+    first = np.repeat(offsets[:-1], counts)
+    corner = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return np.stack([faces[first], faces[first + corner], faces[first + corner + 1]], axis=1)
+
+
+class _GlbBuilder:
+    """Collect the accessors of a glTF document in one binary buffer and write it as ``.glb``."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.views = []
+        self.accessors = []
+
+    def add_view(self, data: np.ndarray, target: Optional[int] = None) -> int:
+        """Append an array to the buffer at a 4 byte boundary and return its buffer view."""
+        data = np.ascontiguousarray(data)
+        view = {"buffer": 0, "byteOffset": self.size, "byteLength": data.nbytes}
+        if target is not None:
+            view["target"] = target
+        padding = -data.nbytes % 4
+        self.chunks.extend([data.tobytes(), b"\0" * padding])
+        self.size += data.nbytes + padding
+        self.views.append(view)
+        return len(self.views) - 1
+
+    def add_accessor(self, data: np.ndarray, target: Optional[int] = None, bounds: bool = False) -> int:
+        """Add an accessor of [count] or [count, components] data in its own buffer view."""
+        return self._accessor(self.add_view(data, target), 0, data, bounds)
+
+    def add_accessor_stack(self, data: np.ndarray) -> List[int]:
+        """Add one accessor per item of a [n, count, components] stack, all in one buffer view."""
+        view = self.add_view(data)
+        item_bytes = data[0].nbytes
+        return [self._accessor(view, k * item_bytes, data[k], False) for k in range(data.shape[0])]
+
+    def write(self, path: Union[str, os.PathLike], document: dict):
+        """Write the document and the buffer as a binary glTF file."""
+        document = dict(document, buffers=[{"byteLength": self.size}], bufferViews=self.views, accessors=self.accessors)
+        content = json.dumps(document, separators=(",", ":")).encode("utf-8")
+        content += b" " * (-len(content) % 4)
+        length = 12 + 8 + len(content) + 8 + self.size
+        try:
+            with open(path, "wb") as f:
+                f.write(struct.pack("<III", _GLB_MAGIC, 2, length))
+                f.write(struct.pack("<II", len(content), _GLB_JSON_CHUNK))
+                f.write(content)
+                f.write(struct.pack("<II", self.size, _GLB_BIN_CHUNK))
+                f.writelines(self.chunks)
+        except OSError as e:
+            raise IOError(f"Failed to write glTF file {path}: {str(e)}")
+
+    def _accessor(self, view: int, offset: int, data: np.ndarray, bounds: bool) -> int:
+        """Describe [count] or [count, components] data at an offset of a buffer view."""
+        components = 1 if data.ndim == 1 else data.shape[1]
+        accessor = {
+            "bufferView": view,
+            "byteOffset": offset,
+            "componentType": _GLTF_COMPONENT_TYPES[data.dtype],
+            "count": data.shape[0],
+            "type": _GLTF_ACCESSOR_TYPES[components],
+        }
+        if bounds:
+            flat = data.reshape(data.shape[0], components)
+            accessor["min"] = flat.min(axis=0).tolist()
+            accessor["max"] = flat.max(axis=0).tolist()
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
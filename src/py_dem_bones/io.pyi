@@ -0,0 +1,206 @@
+"""
+Readers and writers for mesh sequences exported from DCC applications.
+
+This module reads per-frame mesh exports into the array layout used by the
+solver. OBJ files are parsed by the native extension with the GIL released, so a
+sequence is read by several threads at once and written into a single
+preallocated buffer. PC2 and MDD point caches are memory-mapped and handed to
+the solver as strided views in their own byte order. Solved decompositions are
+exported to engines as binary glTF files.
+"""
+
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+import glob
+import json
+import os
+import re
+import struct
+from typing import List, Optional, Sequence, Tuple, Union
+import numpy as np
+from py_dem_bones._py_dem_bones import parse_obj
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+
+__all__ = [
+    "create_point_cache",
+    "decompose_transformations",
+    "export_gltf",
+    "read_obj",
+    "read_obj_sequence",
+    "read_point_cache",
+    "write_point_cache",
+    "np",
+]
+
+def create_point_cache(
+    path: Union[str, os.PathLike],
+    num_frames: int,
+    num_vertices: int,
+    times: Optional[np.ndarray] = None,
+) -> np.memmap:
+    """
+    Create a PC2 or MDD point cache on disk to be filled frame by frame.
+
+    Args:
+        path (str): Path of the ``.pc2`` or ``.mdd`` file to create
+        num_frames (int): Number of frames
+        num_vertices (int): Number of vertices per frame
+        times (array-like, optional): Time of every frame. PC2 files need evenly
+            spaced times. Defaults to frame numbers for PC2 and to seconds at 24
+            frames per second for MDD.
+
+    Returns:
+        numpy.memmap: Writable [num_frames, 3, num_vertices] view of the cached data
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the format, the sizes or the times are invalid
+    """
+
+def decompose_transformations(matrices: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split transformation matrices into translations, rotations and scales.
+
+    Each matrix is decomposed as translation * rotation * scale; shear is dropped. The
+    quaternions along the second to last axis are made continuous, so interpolating the
+    frames of a [num_bones, num_frames, 4, 4] stack takes the shorter arc.
+
+    Args:
+        matrices (numpy.ndarray): Transformations with shape [..., 4, 4] or [..., 3, 4]
+
+    Returns:
+        tuple: (translations, rotations, scales) with shapes [..., 3], [..., 4] as unit
+            quaternions (x, y, z, w), and [..., 3] along the rest axes
+    """
+
+def export_gltf(
+    path: Union[str, os.PathLike],
+    wrapper,
+    mesh_faces,
+    face_offsets: Optional[np.ndarray] = None,
+    max_influences: int = 4,
+    times: Optional[np.ndarray] = None,
+    fps: float = 24.0,
+):
+    """
+    Export a solved decomposition as a skinned, animated binary glTF 2.0 file.
+
+    The file holds the rest pose mesh, a skin with one joint per bone and the inverse
+    of the bind matrices, JOINTS_n/WEIGHTS_n attributes built from the influence table
+    of get_influences(), and per-bone translation, rotation and scale channels sampled
+    from the bone transformations at every frame. Polygons are triangulated as fans.
+    Bone parents of DemBonesExtWrapper become the joint hierarchy. All buffers are
+    packed with array operations, without Python loops over vertices or frames.
+
+    Args:
+        path (str): Path of the ``.glb`` file to write
+        wrapper (DemBonesWrapper): Wrapper holding solved weights and transformations
+        mesh_faces (array-like): Faces as a [num_faces, k] index array, a list of vertex
+            index lists, or flat indices together with ``face_offsets``
+        face_offsets (numpy.ndarray, optional): CSR offsets of polygons of mixed size
+        max_influences (int): Maximum number of influences per vertex, written as
+            ceil(max_influences / 4) JOINTS_n and WEIGHTS_n sets
+        times (array-like, optional): Time of every frame in seconds. Defaults to
+            frames at ``fps``.
+        fps (float): Frame rate of the default times
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the faces, the times or the influence count are invalid
+        ComputationError: If the decomposition has not been solved
+    """
+
+def read_obj(path: Union[str, os.PathLike]) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Read the vertex positions and faces of an OBJ file.
+
+    Args:
+        path (str): Path of the OBJ file
+
+    Returns:
+        tuple: (vertices, faces) with vertices of shape [3, num_vertices] and faces as
+            lists of zero-based vertex indices, the format of ``DemBones.fv``
+
+    Raises:
+        IOError: If the file cannot be read or parsed
+    """
+
+def read_obj_sequence(
+    pattern: Union[str, Sequence[Union[str, os.PathLike]]],
+    workers: Optional[int] = None,
+    out: Optional[np.ndarray] = None,
+    dtype=np.float64,
+) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Read a sequence of OBJ files with one frame per file.
+
+    The first file defines the topology and the size of the frame buffer; every
+    other file is parsed on a worker thread, checked against that topology and
+    written into its frame of the buffer. The buffer can be passed directly to
+    ``DemBonesWrapper.from_files`` or reshaped to [3 * num_frames, num_vertices].
+
+    Args:
+        pattern (str or list): Glob pattern of the files, which are ordered by name
+            with numbers compared by value, or an ordered list of paths
+        workers (int, optional): Number of reader threads, defaults to the number of CPUs
+        out (numpy.ndarray, optional): Buffer to fill, with shape [num_frames, 3,
+            num_vertices] or [3 * num_frames, num_vertices], such as a memory map
+            created with ``FrameStore.create``
+        dtype: Data type of the buffer allocated when ``out`` is not given
+
+    Returns:
+        tuple: (frames, faces) with frames of shape [num_frames, 3, num_vertices] and
+            the faces of the first file in the format of ``DemBones.fv``
+
+    Raises:
+        IOError: If no file matches or a file cannot be read or parsed
+        ParameterError: If the topology changes between files or ``out`` has the wrong shape
+    """
+
+def read_point_cache(
+    path: Union[str, os.PathLike],
+    frame_range: Optional[Tuple[int, int]] = None,
+    mmap: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read a PC2 or MDD point cache.
+
+    The poses are a [num_frames, 3, num_vertices] view of the cached
+    [num_frames, num_vertices, 3] data in the byte order of the file (little-endian
+    for PC2, big-endian for MDD). The native loaders of the solver read such views
+    in place and swap bytes while copying, so passing them to
+    ``DemBonesWrapper.from_files`` or a ``FrameStore`` makes no intermediate copy.
+
+    Args:
+        path (str): Path of a ``.pc2`` or ``.mdd`` file
+        frame_range (tuple, optional): (start, stop) frame indices to read, defaults to all frames
+        mmap (bool): Memory-map the frames instead of reading them
+
+    Returns:
+        tuple: (poses, times) with poses of shape [num_frames, 3, num_vertices] and the
+            time of every frame, in frames for PC2 and in seconds for MDD
+
+    Raises:
+        IOError: If the file cannot be read or is not a valid point cache
+        IndexError: If the frame range is out of range
+        ParameterError: If the file extension is not supported
+    """
+
+def write_point_cache(
+    path: Union[str, os.PathLike],
+    poses: np.ndarray,
+    times: Optional[np.ndarray] = None,
+):
+    """
+    Write animated poses to a PC2 or MDD point cache.
+
+    Args:
+        path (str): Path of the ``.pc2`` or ``.mdd`` file to write
+        poses (numpy.ndarray): Poses with shape [num_frames, 3, num_vertices] or
+            [3 * num_frames, num_vertices]
+        times (array-like, optional): Time of every frame, see ``create_point_cache``
+
+    Raises:
+        IOError: If the file cannot be written
+        ParameterError: If the poses, the format or the times are invalid
+    """
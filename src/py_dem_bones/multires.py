@@ -0,0 +1,230 @@
+"""
+Decimated proxy meshes for coarse-to-fine decompositions.
+
+This module builds a low resolution stand-in for a mesh by clustering its vertices
+on a regular grid. The proxy can average any per-vertex data of the full mesh and
+interpolate per-proxy data back to arbitrary points through the same grid, which
+serves as the spatial index.
+"""
+
+# Import standard library modules
+from typing import List, Tuple
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import ParameterError
+
+# Offsets of a grid cell and its 26 neighbours
+_NEIGHBOUR_OFFSETS = np.stack(
+    np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing="ij"), axis=-1
+).reshape(-1, 3)
+
+
+class ProxyMesh:
+    """
+    A decimated mesh built by vertex clustering on a regular grid.
+
+    All vertices of the full mesh that fall into the same grid cell collapse into one
+    proxy vertex placed at their centroid. The cell size is searched so that the proxy
+    has at most the requested number of vertices.
+    """
+
+    def __init__(
+        self,
+        rest_pose: np.ndarray,
+        num_vertices: int,
+        faces=None,
+        offsets=None,
+    ):
+        """
+        Build the proxy of a mesh.
+
+        Faces take the forms accepted by DemBonesWrapper.set_faces(): an integer array with
+        shape [num_faces, k], a flat index array in CSR form with ``offsets``, or
+        a list of faces as lists of vertex indices.
+
+        Args:
+            rest_pose (numpy.ndarray): Rest pose of the full mesh with shape [3, num_vertices]
+            num_vertices (int): Maximum number of proxy vertices
+            faces (array-like, optional): Faces of the full mesh
+            offsets (array-like, optional): Start of every face in ``faces`` followed by
+                the total number of indices
+
+        Raises:
+            ParameterError: If the rest pose or the vertex budget is invalid
+        """
+        rest_pose = np.asarray(rest_pose, dtype=np.float64)
+        if rest_pose.ndim != 2 or rest_pose.shape[0] != 3 or rest_pose.shape[1] == 0:
+            raise ParameterError(f"Rest pose must have shape [3, num_vertices], got {rest_pose.shape}")
+        if not isinstance(num_vertices, (int, np.integer)) or num_vertices <= 0:
+            raise ParameterError("Number of proxy vertices must be a positive integer")
+
+        self.origin = rest_pose.min(axis=1)
+        self.cell_size = self._search_cell_size(rest_pose, num_vertices)
+
+        cells = self._cells(rest_pose)
+        keys, self.labels = np.unique(self._keys(cells), return_inverse=True)
+        self.labels = self.labels.ravel()
+        self._keys_sorted = keys
+        self.counts = np.bincount(self.labels)
+        self._order = np.argsort(self.labels, kind="stable")
+        self._starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+
+        self.rest_pose = self.average(rest_pose)
+        self.face_offsets, self.face_indices = self._collapse_faces(*_csr_faces(faces, offsets))
+
+    @property
+    def num_vertices(self) -> int:
+        """Get the number of proxy vertices."""
+        return len(self.counts)
+
+    @property
+    def num_faces(self) -> int:
+        """Get the number of proxy faces."""
+        return len(self.face_offsets) - 1
+
+    @property
+    def faces(self) -> List[List[int]]:
+        """Get the proxy faces as lists of proxy vertex indices."""
+        bounds = self.face_offsets.tolist()
+        return [self.face_indices[start:stop].tolist() for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    def average(self, values: np.ndarray) -> np.ndarray:
+        """
+        Average per-vertex data of the full mesh over every proxy vertex.
+
+        Args:
+            values (numpy.ndarray): Data with shape [rows, num_full_vertices], such as a
+                rest pose or animated poses
+
+        Returns:
+            numpy.ndarray: Averaged data with shape [rows, num_proxy_vertices]
+        """
+        values = np.asarray(values)
+        if values.shape[-1] != len(self.labels):
+            raise ParameterError(
+                f"Values must have {len(self.labels)} columns, got shape {values.shape}"
+            )
+        sums = np.add.reduceat(values[:, self._order], self._starts, axis=1)
+        return sums / self.counts
+
+    def interpolate(self, values: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """
+        Interpolate per-proxy data at arbitrary points.
+
+        Every point blends the proxy vertices of its own grid cell and the 26
+        neighbouring cells with Gaussian weights of the distance in cell units.
+
+        Args:
+            values (numpy.ndarray): Data with shape [rows, num_proxy_vertices]
+            points (numpy.ndarray): Query points with shape [3, num_points]
+
+        Returns:
+            numpy.ndarray: Interpolated data with shape [rows, num_points]
+        """
+        values = np.asarray(values, dtype=np.float64)
+        points = np.asarray(points, dtype=np.float64)
+        cells = self._cells(points)
+
+        blend = np.zeros((values.shape[0], points.shape[1]))
+        total = np.zeros(points.shape[1])
+        for offset in _NEIGHBOUR_OFFSETS:
+            keys = self._keys(cells + offset[:, None])
+            index = np.minimum(np.searchsorted(self._keys_sorted, keys), len(self._keys_sorted) - 1)
+            found = self._keys_sorted[index] == keys
+            if not np.any(found):
+                continue
+            index = index[found]
+            distance = np.sum((points[:, found] - self.rest_pose[:, index]) ** 2, axis=0)
+            weight = np.exp(-distance / (self.cell_size * self.cell_size))
+            blend[:, found] += values[:, index] * weight
+            total[found] += weight
+
+        # Points far from every proxy vertex take the data of the nearest one
+        empty = total <= 0
+        if np.any(empty):
+            nearest = np.argmin(
+                np.sum((points[:, empty, None] - self.rest_pose[:, None, :]) ** 2, axis=0), axis=1
+            )
+            blend[:, empty] = values[:, nearest]
+            total[empty] = 1.0
+        return blend / total
+
+    def _search_cell_size(self, rest_pose: np.ndarray, num_vertices: int) -> float:
+        """Find the smallest grid spacing that keeps the proxy within the vertex budget."""
+        extent = float(np.max(rest_pose.max(axis=1) - self.origin))
+        if extent <= 0:
+            return 1.0
+
+        # Grid keys hold 21 bits per axis
+        finest = extent / (1 << 19)
+        if num_vertices >= rest_pose.shape[1]:
+            return finest
+
+        low, high = max(extent / rest_pose.shape[1], finest), extent * (1 + 1e-9)
+        for _ in range(24):
+            middle = np.sqrt(low * high)
+            self.cell_size = middle
+            count = len(np.unique(self._keys(self._cells(rest_pose))))
+            if count > num_vertices:
+                low = middle
+            else:
+                high = middle
+            if high / low < 1.01:
+                break
+        return high
+
+    def _cells(self, points: np.ndarray) -> np.ndarray:
+        """Get the integer grid cell of every point with shape [3, num_points]."""
+        return np.floor((points - self.origin[:, None]) / self.cell_size).astype(np.int64)
+
+    @staticmethod
+    def _keys(cells: np.ndarray) -> np.ndarray:
+        """Pack integer grid cells with shape [3, num_points] into one key per cell."""
+        shifted = cells + (1 << 20)
+        return (shifted[0] << 42) | (shifted[1] << 21) | shifted[2]
+
+    def _collapse_faces(self, offsets: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Map CSR faces to proxy vertices and drop the faces that collapsed or repeat."""
+        sizes = np.diff(offsets)
+        face_ids = np.repeat(np.arange(sizes.size), sizes)
+        labels = self.labels[indices]
+
+        # Keep the first corner of every face on each proxy vertex
+        order = np.lexsort((labels, face_ids))
+        repeated = (face_ids[order][1:] == face_ids[order][:-1]) & (labels[order][1:] == labels[order][:-1])
+        keep = np.ones(labels.size, dtype=bool)
+        keep[order[1:][repeated]] = False
+        sizes = np.bincount(face_ids[keep], minlength=sizes.size)
+
+        # Faces with the same proxy vertices are kept once, at their first occurrence
+        corners = order[keep[order]]
+        sorted_labels = labels[corners]
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+        unique = np.zeros(sizes.size, dtype=bool)
+        for size in np.unique(sizes[sizes >= 3]):
+            selected = np.flatnonzero(sizes == size)
+            rows = sorted_labels[starts[selected][:, None] + np.arange(size)]
+            _, first = np.unique(rows, axis=0, return_index=True)
+            unique[selected[first]] = True
+
+        keep &= unique[face_ids]
+        collapsed_offsets = np.concatenate([[0], np.cumsum(sizes[unique])]).astype(np.int64)
+        return collapsed_offsets, labels[keep].astype(np.int32)
+
+
+def _csr_faces(faces, offsets) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert faces in any form accepted by ProxyMesh to CSR offsets and indices."""
+    if faces is None:
+        return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    if offsets is None:
+        if isinstance(faces, np.ndarray):
+            faces = faces.reshape(len(faces), -1) if len(faces) else np.zeros((0, 3), dtype=np.int64)
+            offsets = np.arange(len(faces) + 1) * faces.shape[1]
+        else:
+            faces = list(faces)
+            offsets = np.concatenate([[0], np.cumsum([len(face) for face in faces], dtype=np.int64)])
+            faces = np.fromiter((i for face in faces for i in face), dtype=np.int64, count=int(offsets[-1]))
+    return np.asarray(offsets, dtype=np.int64), np.asarray(faces, dtype=np.int64).ravel()
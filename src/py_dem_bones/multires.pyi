@@ -0,0 +1,92 @@
+"""
+Decimated proxy meshes for coarse-to-fine decompositions.
+
+This module builds a low resolution stand-in for a mesh by clustering its vertices
+on a regular grid. The proxy can average any per-vertex data of the full mesh and
+interpolate per-proxy data back to arbitrary points through the same grid, which
+serves as the spatial index.
+"""
+
+from __future__ import annotations
+from typing import List, Tuple
+import numpy as np
+from py_dem_bones.exceptions import ParameterError
+
+__all__ = [
+    "ProxyMesh",
+    "np",
+]
+
+class ProxyMesh:
+    """
+    A decimated mesh built by vertex clustering on a regular grid.
+
+    All vertices of the full mesh that fall into the same grid cell collapse into one
+    proxy vertex placed at their centroid. The cell size is searched so that the proxy
+    has at most the requested number of vertices.
+    """
+
+    def __init__(
+        self,
+        rest_pose: np.ndarray,
+        num_vertices: int,
+        faces=None,
+        offsets=None,
+    ):
+        """
+        Build the proxy of a mesh.
+
+        Faces take the forms accepted by DemBonesWrapper.set_faces(): an integer array with
+        shape [num_faces, k], a flat index array in CSR form with ``offsets``, or
+        a list of faces as lists of vertex indices.
+
+        Args:
+            rest_pose (numpy.ndarray): Rest pose of the full mesh with shape [3, num_vertices]
+            num_vertices (int): Maximum number of proxy vertices
+            faces (array-like, optional): Faces of the full mesh
+            offsets (array-like, optional): Start of every face in ``faces`` followed by
+                the total number of indices
+
+        Raises:
+            ParameterError: If the rest pose or the vertex budget is invalid
+        """
+    @property
+    def num_vertices(self) -> int:
+        """
+        Get the number of proxy vertices.
+        """
+    @property
+    def num_faces(self) -> int:
+        """
+        Get the number of proxy faces.
+        """
+    @property
+    def faces(self) -> List[List[int]]:
+        """
+        Get the proxy faces as lists of proxy vertex indices.
+        """
+    def average(self, values: np.ndarray) -> np.ndarray:
+        """
+        Average per-vertex data of the full mesh over every proxy vertex.
+
+        Args:
+            values (numpy.ndarray): Data with shape [rows, num_full_vertices], such as a
+                rest pose or animated poses
+
+        Returns:
+            numpy.ndarray: Averaged data with shape [rows, num_proxy_vertices]
+        """
+    def interpolate(self, values: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """
+        Interpolate per-proxy data at arbitrary points.
+
+        Every point blends the proxy vertices of its own grid cell and the 26
+        neighbouring cells with Gaussian weights of the distance in cell units.
+
+        Args:
+            values (numpy.ndarray): Data with shape [rows, num_proxy_vertices]
+            points (numpy.ndarray): Query points with shape [3, num_points]
+
+        Returns:
+            numpy.ndarray: Interpolated data with shape [rows, num_points]
+        """
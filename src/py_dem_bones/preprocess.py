@@ -0,0 +1,482 @@
+"""
+Analysis passes that shrink a decomposition problem before it is solved.
+
+This module provides vectorised tests over the rest pose and the animated poses
+that detect parts of the problem the solver does not need to see, such as
+vertices that never move or that move rigidly as one piece, frames that repeat
+earlier frames, and a small set of keyframes that covers a long sequence.
+"""
+
+# Import standard library modules
+import hashlib
+import itertools
+from typing import Iterable, Optional, Tuple
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import ParameterError
+
+# Number of frames processed at once by the residual tests
+_FRAME_BLOCK = 256
+
+# Number of vertices used to compare whole poses
+_POSE_FEATURES = 2048
+
+# Number of vertex groups whose centroids pre-select near-duplicate frames
+_CENTROID_GROUPS = 8
+
+
+def _frames_view(rest_pose: np.ndarray, animated_poses: np.ndarray) -> np.ndarray:
+    """Return the animated poses as a [num_frames, 3, num_vertices] view."""
+    rest_pose = np.asarray(rest_pose)
+    animated_poses = np.asarray(animated_poses)
+    if rest_pose.ndim != 2 or rest_pose.shape[0] != 3:
+        raise ParameterError(f"Rest pose must have shape [3, num_vertices], got {rest_pose.shape}")
+    if animated_poses.ndim == 3:
+        frames = animated_poses
+    elif animated_poses.ndim == 2 and animated_poses.shape[0] % 3 == 0:
+        frames = animated_poses.reshape(-1, 3, animated_poses.shape[1])
+    else:
+        raise ParameterError(
+            f"Animated poses must have shape [3 * num_frames, num_vertices], got {animated_poses.shape}"
+        )
+    if frames.shape[1:] != rest_pose.shape:
+        raise ParameterError(
+            f"Animated poses have {frames.shape[2]} vertices, rest pose has {rest_pose.shape[1]}"
+        )
+    return frames
+
+
+def fit_rigid_transforms(
+    rest_pose: np.ndarray, animated_poses: np.ndarray, vertices: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fit the least-squares rigid transformation of a vertex set in every frame.
+
+    The rotations are solved for all frames at once with a batched SVD (Kabsch).
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        vertices (numpy.ndarray, optional): Indices of the vertices to fit. Defaults to all vertices.
+
+    Returns:
+        numpy.ndarray: Rigid transformations with shape [num_frames, 4, 4]
+    """
+    frames = _frames_view(rest_pose, animated_poses)
+    if vertices is None:
+        vertices = np.arange(frames.shape[2])
+    source = np.asarray(rest_pose, dtype=np.float64)[:, vertices]
+    target = frames[:, :, vertices].astype(np.float64)
+
+    source_center = source.mean(axis=1)
+    target_center = target.mean(axis=2)
+    covariance = np.einsum(
+        "in,fjn->fij", source - source_center[:, None], target - target_center[:, :, None]
+    )
+    u, _, vt = np.linalg.svd(covariance)
+    rotations = np.swapaxes(vt, 1, 2) @ np.swapaxes(u, 1, 2)
+
+    # Flip the weakest axis where the best orthogonal fit is a reflection
+    reflected = np.linalg.det(rotations) < 0
+    if np.any(reflected):
+        vt[reflected, 2] *= -1
+        rotations[reflected] = np.swapaxes(vt[reflected], 1, 2) @ np.swapaxes(u[reflected], 1, 2)
+
+    transforms = np.zeros((frames.shape[0], 4, 4))
+    transforms[:, :3, :3] = rotations
+    transforms[:, :3, 3] = target_center - rotations @ source_center
+    transforms[:, 3, 3] = 1.0
+    return transforms
+
+
+def rigid_residuals(
+    rest_pose: np.ndarray,
+    animated_poses: np.ndarray,
+    transforms: np.ndarray,
+    vertices: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Compute how far vertices deviate from a rigid motion.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        transforms (numpy.ndarray): Rigid transformations with shape [num_frames, 4, 4]
+        vertices (numpy.ndarray, optional): Indices of the vertices to test. Defaults to all vertices.
+
+    Returns:
+        numpy.ndarray: Largest distance over all frames between each vertex and its
+            rigidly transformed rest position
+    """
+    frames = _frames_view(rest_pose, animated_poses)
+    if vertices is None:
+        vertices = slice(None)
+    source = np.asarray(rest_pose, dtype=np.float64)[:, vertices]
+
+    residuals = np.zeros(source.shape[1])
+    for start in range(0, frames.shape[0], _FRAME_BLOCK):
+        block = transforms[start : start + _FRAME_BLOCK]
+        predicted = block[:, :3, :3] @ source + block[:, :3, 3:]
+        error = np.sum((frames[start : start + _FRAME_BLOCK][:, :, vertices] - predicted) ** 2, axis=1)
+        np.maximum(residuals, error.max(axis=0), out=residuals)
+    return np.sqrt(residuals)
+
+
+def find_static_vertices(rest_pose: np.ndarray, animated_poses: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Find the vertices that stay at their rest position in every frame.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        tolerance (float): Largest displacement from the rest pose that counts as static
+
+    Returns:
+        numpy.ndarray: Boolean mask with shape [num_vertices]
+    """
+    frames = _frames_view(rest_pose, animated_poses)
+    identity = np.broadcast_to(np.eye(4), (frames.shape[0], 4, 4))
+    return rigid_residuals(rest_pose, frames, identity) <= tolerance
+
+
+def find_rigid_clusters(
+    rest_pose: np.ndarray,
+    animated_poses: np.ndarray,
+    tolerance: float,
+    max_clusters: int,
+    min_size: int = 16,
+    max_seeds: int = 64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find groups of vertices that move rigidly together.
+
+    Static vertices are tested first and form a cluster with identity transformations.
+    Further clusters are grown from seed neighbourhoods spread over the rest pose by
+    farthest point sampling: the rigid motion of each seed neighbourhood is fitted in
+    every frame and all unassigned vertices that follow it within the tolerance join
+    the cluster. Clusters are returned largest first.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        tolerance (float): Largest distance from the fitted rigid motion for a vertex to join a cluster
+        max_clusters (int): Maximum number of clusters to return
+        min_size (int): Minimum number of vertices in a cluster
+        max_seeds (int): Maximum number of seed neighbourhoods to test
+
+    Returns:
+        tuple: (labels, transforms) where labels has shape [num_vertices] and holds the
+            cluster index of every vertex or -1 for vertices that are not rigid, and
+            transforms has shape [num_clusters, num_frames, 4, 4]
+    """
+    if tolerance < 0:
+        raise ParameterError("Rigid tolerance must be non-negative")
+    if min_size < 1:
+        raise ParameterError("Minimum cluster size must be a positive integer")
+
+    frames = _frames_view(rest_pose, animated_poses)
+    rest_pose = np.asarray(rest_pose, dtype=np.float64)
+    num_vertices = rest_pose.shape[1]
+
+    clusters = []
+    unassigned = np.ones(num_vertices, dtype=bool)
+
+    static = find_static_vertices(rest_pose, frames, tolerance)
+    if static.sum() >= min_size:
+        clusters.append((static, np.broadcast_to(np.eye(4), (frames.shape[0], 4, 4)).copy()))
+        unassigned &= ~static
+
+    candidates = unassigned.copy()
+    seed_distance = np.full(num_vertices, np.inf)
+    seed = int(np.argmin(np.sum((rest_pose - rest_pose.mean(axis=1, keepdims=True)) ** 2, axis=0)))
+    for _ in range(max_seeds):
+        if not candidates.any() or unassigned.sum() < min_size:
+            break
+        if not candidates[seed]:
+            seed = int(np.argmax(np.where(candidates, seed_distance, -1.0)))
+
+        distance = np.sum((rest_pose - rest_pose[:, seed : seed + 1]) ** 2, axis=0)
+        np.minimum(seed_distance, distance, out=seed_distance)
+        pool = np.flatnonzero(candidates)
+        neighbourhood = pool[np.argsort(distance[pool])[: max(min_size, 3)]]
+
+        transforms = fit_rigid_transforms(rest_pose, frames, neighbourhood)
+        members = np.flatnonzero(unassigned)
+        members = members[rigid_residuals(rest_pose, frames, transforms, members) <= tolerance]
+        if members.size >= min_size:
+            mask = np.zeros(num_vertices, dtype=bool)
+            mask[members] = True
+            clusters.append((mask, transforms))
+            unassigned[members] = False
+            candidates[members] = False
+        else:
+            candidates[neighbourhood] = False
+        candidates[seed] = False
+
+    clusters.sort(key=lambda cluster: -int(cluster[0].sum()))
+    clusters = clusters[:max_clusters]
+
+    labels = np.full(num_vertices, -1, dtype=np.int64)
+    for index, (mask, _) in enumerate(clusters):
+        labels[mask] = index
+    transforms = np.array([t for _, t in clusters]).reshape(len(clusters), frames.shape[0], 4, 4)
+    return labels, transforms
+
+
+def find_duplicate_frames(animated_poses: np.ndarray, tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find frames that repeat an earlier frame within a tolerance.
+
+    Every frame is compared with the earlier representative frames whose vertex group
+    centroids all lie within the tolerance of its own. A centroid moves at most as far
+    as the farthest vertex, so no near-duplicate is missed, and a grid over the three
+    centroid coordinates that vary most across the sequence finds the candidates
+    without comparing every pair of frames. Without a tolerance, frames are hashed by
+    their coordinates instead.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+        tolerance (float): Largest vertex distance between a frame and its representative
+
+    Returns:
+        tuple: (representatives, inverse) where representatives holds the ascending
+            indices of the unique frames and inverse has shape [num_frames] and maps
+            every frame to the position of its representative in representatives
+    """
+    if tolerance < 0:
+        raise ParameterError("Frame tolerance must be non-negative")
+    animated_poses = np.asarray(animated_poses)
+    if animated_poses.ndim == 2 and animated_poses.shape[0] % 3 == 0:
+        frames = animated_poses.reshape(-1, 3, animated_poses.shape[1])
+    elif animated_poses.ndim == 3 and animated_poses.shape[1] == 3:
+        frames = animated_poses
+    else:
+        raise ParameterError(
+            f"Animated poses must have shape [3 * num_frames, num_vertices], got {animated_poses.shape}"
+        )
+
+    if tolerance > 0:
+        centroids = _group_centroids(frames)
+        axes = np.argsort(-centroids.std(axis=0), kind="stable")[:3]
+        # Cells twice as wide as the tolerance keep every match within the neighbouring cells
+        cells = np.floor(centroids[:, axes] / (2 * tolerance)).astype(np.int64)
+        neighbours = np.array(list(itertools.product((-1, 0, 1), repeat=axes.size)), dtype=np.int64)
+        # Allow for the rounding of the centroids
+        limit = tolerance + 1e-8 * max(float(np.abs(centroids).max(initial=0.0)), tolerance)
+
+    representatives = []
+    inverse = np.empty(frames.shape[0], dtype=np.int64)
+    buckets = {}
+    for index, frame in enumerate(frames):
+        if tolerance > 0:
+            key = tuple(cells[index])
+            candidates = sorted(
+                candidate for cell in map(tuple, cells[index] + neighbours) for candidate in buckets.get(cell, ())
+            )
+        else:
+            key = hashlib.blake2b(np.ascontiguousarray(frame + 0.0).tobytes(), digest_size=16).digest()
+            candidates = list(buckets.get(key, ()))
+        if representatives and (not candidates or candidates[-1] != len(representatives) - 1):
+            candidates.append(len(representatives) - 1)
+        if tolerance > 0 and candidates:
+            offsets = np.abs(centroids[[representatives[c] for c in candidates]] - centroids[index])
+            candidates = [c for c, close in zip(candidates, offsets.max(axis=1) <= limit) if close]
+
+        for candidate in candidates:
+            distance = np.sum((frames[representatives[candidate]] - frame) ** 2, axis=0)
+            if distance.max() <= tolerance * tolerance:
+                inverse[index] = candidate
+                break
+        else:
+            inverse[index] = len(representatives)
+            buckets.setdefault(key, []).append(len(representatives))
+            representatives.append(index)
+
+    return np.array(representatives, dtype=np.int64), inverse
+
+
+def _group_centroids(frames: np.ndarray) -> np.ndarray:
+    """Centroids of contiguous vertex groups of [num_frames, 3, num_vertices] frames, as [num_frames, 3 * groups]."""
+    num_vertices = frames.shape[2]
+    num_groups = min(_CENTROID_GROUPS, num_vertices)
+    starts = np.arange(num_groups) * num_vertices // num_groups
+    sizes = np.diff(np.append(starts, num_vertices))
+    sums = np.add.reduceat(frames.astype(np.float64, copy=False), starts, axis=2)
+    return (sums / sizes).reshape(frames.shape[0], -1)
+
+
+def pose_features(animated_poses: np.ndarray) -> np.ndarray:
+    """
+    Reduce poses to feature vectors for comparing whole frames.
+
+    The features are the coordinates of an evenly strided subset of at most 2048
+    vertices. The stride only depends on the number of vertices, so features of
+    different chunks of one sequence can be compared with each other.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+
+    Returns:
+        numpy.ndarray: Features with shape [num_frames, num_features]
+    """
+    animated_poses = np.asarray(animated_poses)
+    if animated_poses.ndim == 2 and animated_poses.shape[0] % 3 == 0:
+        frames = animated_poses.reshape(-1, 3, animated_poses.shape[1])
+    elif animated_poses.ndim == 3 and animated_poses.shape[1] == 3:
+        frames = animated_poses
+    else:
+        raise ParameterError(
+            f"Animated poses must have shape [3 * num_frames, num_vertices], got {animated_poses.shape}"
+        )
+    stride = max(1, frames.shape[2] // _POSE_FEATURES)
+    return frames[:, :, ::stride].reshape(frames.shape[0], -1).astype(np.float64)
+
+
+def farthest_point_sampling(features: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select samples that cover a feature space by farthest point sampling.
+
+    Sampling starts from the sample closest to the mean, and every next sample is the
+    one farthest from the samples selected so far.
+
+    Args:
+        features (numpy.ndarray): Feature vectors with shape [num_samples, num_features]
+        count (int): Number of samples to select
+
+    Returns:
+        tuple: (selected, nearest) where selected holds the ascending indices of the
+            selected samples and nearest has shape [num_samples] and maps every sample
+            to the position of its closest selected sample in selected
+    """
+    if not isinstance(count, (int, np.integer)) or count <= 0:
+        raise ParameterError("Number of samples must be a positive integer")
+    features = np.asarray(features)
+    if not np.issubdtype(features.dtype, np.floating):
+        features = features.astype(np.float64)
+    num_samples = features.shape[0]
+    norms = np.einsum("ij,ij->i", features, features)
+
+    def distances_to(index):
+        return np.maximum(norms + norms[index] - 2.0 * features @ features[index], 0.0)
+
+    mean = features.mean(axis=0)
+    first = int(np.argmin(norms - 2.0 * features @ mean))
+    selected = [first]
+    closest = distances_to(first)
+    nearest = np.zeros(num_samples, dtype=np.int64)
+    for position in range(1, min(count, num_samples)):
+        candidate = int(np.argmax(closest))
+        if closest[candidate] == 0:
+            break
+        distance = distances_to(candidate)
+        better = distance < closest
+        nearest[better] = position
+        closest[better] = distance[better]
+        selected.append(candidate)
+
+    # Number the samples in ascending order
+    selected = np.array(selected, dtype=np.int64)
+    order = np.argsort(selected)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    return selected[order], rank[nearest]
+
+
+def select_keyframes(animated_poses: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select keyframes that cover the pose space of a sequence.
+
+    Keyframes are chosen by farthest point sampling of the pose features (see
+    pose_features), starting from the frame closest to the mean pose, so every next
+    keyframe is the frame that is worst represented by the keyframes selected so far.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+        count (int): Number of keyframes to select
+
+    Returns:
+        tuple: (keyframes, nearest) where keyframes holds the ascending indices of the
+            selected frames and nearest has shape [num_frames] and maps every frame to
+            the position of its closest keyframe in keyframes
+    """
+    if not isinstance(count, (int, np.integer)) or count <= 0:
+        raise ParameterError("Number of keyframes must be a positive integer")
+    return farthest_point_sampling(pose_features(animated_poses), count)
+
+
+def select_streamed_keyframes(
+    chunks: Iterable[Tuple[int, np.ndarray]], count: int, pool_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select keyframes of a sequence that is streamed chunk by chunk.
+
+    A single pass keeps a pool of candidate frames that covers every frame seen so far
+    within a radius: a frame joins the pool when its features are farther than twice
+    the radius from all candidates. Whenever the pool overflows after a chunk it is
+    thinned to count candidates by farthest point sampling, and the radius grows to
+    cover the dropped ones. The keyframes are then chosen from the pool by farthest point sampling. Only
+    the features of the pool are held, so memory use does not grow with the sequence.
+
+    Args:
+        chunks (iterable): (start, frames) pairs that cover the sequence in order, with
+            frames of shape [chunk_size, 3, num_vertices]
+        count (int): Number of keyframes to select
+        pool_size (int, optional): Maximum number of candidate frames kept between chunks,
+            defaults to twice count
+
+    Returns:
+        tuple: (keyframes, features) where keyframes holds the ascending indices of the
+            selected frames and features their pose features (see pose_features)
+            with shape [len(keyframes), num_features]
+    """
+    if not isinstance(count, (int, np.integer)) or count <= 0:
+        raise ParameterError("Number of keyframes must be a positive integer")
+    if pool_size is None:
+        pool_size = 2 * count
+    if not isinstance(pool_size, (int, np.integer)) or pool_size < count:
+        raise ParameterError("Pool size must be an integer of at least the number of keyframes")
+
+    indices = np.empty(0, dtype=np.int64)
+    features = None
+    norms = np.empty(0)
+    radius = 0.0
+    for start, frames in chunks:
+        block = pose_features(frames)
+        if features is None:
+            features = np.empty((0, block.shape[1]))
+        block_norms = np.einsum("ij,ij->i", block, block)
+        limit = 4.0 * radius * radius
+
+        # Frames of the chunk that the pool does not cover join it in order unless an
+        # earlier frame of the chunk that joins covers them
+        distance = block_norms[:, None] + norms - 2.0 * block @ features.T
+        candidates = np.flatnonzero(np.min(distance, axis=1, initial=np.inf) > limit)
+        block = block[candidates]
+        block_norms = block_norms[candidates]
+        distance = block_norms[:, None] + block_norms - 2.0 * block @ block.T
+        added = []
+        for candidate in range(candidates.size):
+            if not added or distance[candidate, added].min() > limit:
+                added.append(candidate)
+        indices = np.concatenate([indices, start + candidates[added]])
+        features = np.vstack([features, block[added]])
+        norms = np.concatenate([norms, block_norms[added]])
+
+        if indices.size > pool_size:
+            keep, _ = farthest_point_sampling(features, count)
+            distance = norms[:, None] + norms[keep] - 2.0 * features @ features[keep].T
+            radius = max(radius, 0.5 * float(np.sqrt(max(distance.min(axis=1).max(), 0.0))))
+            indices = indices[keep]
+            features = features[keep]
+            norms = norms[keep]
+
+    if features is None:
+        raise ParameterError("Cannot select keyframes of an empty sequence")
+    selected, _ = farthest_point_sampling(features, count)
+    return indices[selected], features[selected]
@@ -0,0 +1,209 @@
+"""
+Analysis passes that shrink a decomposition problem before it is solved.
+
+This module provides vectorised tests over the rest pose and the animated poses
+that detect parts of the problem the solver does not need to see, such as
+vertices that never move or that move rigidly as one piece, frames that repeat
+earlier frames, and a small set of keyframes that covers a long sequence.
+"""
+
+from __future__ import annotations
+import hashlib
+import itertools
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from py_dem_bones.exceptions import ParameterError
+
+__all__ = [
+    "farthest_point_sampling",
+    "find_duplicate_frames",
+    "find_rigid_clusters",
+    "find_static_vertices",
+    "fit_rigid_transforms",
+    "pose_features",
+    "rigid_residuals",
+    "select_keyframes",
+    "select_streamed_keyframes",
+    "np",
+]
+
+def farthest_point_sampling(features: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select samples that cover a feature space by farthest point sampling.
+
+    Sampling starts from the sample closest to the mean, and every next sample is the
+    one farthest from the samples selected so far.
+
+    Args:
+        features (numpy.ndarray): Feature vectors with shape [num_samples, num_features]
+        count (int): Number of samples to select
+
+    Returns:
+        tuple: (selected, nearest) where selected holds the ascending indices of the
+            selected samples and nearest has shape [num_samples] and maps every sample
+            to the position of its closest selected sample in selected
+    """
+
+def find_duplicate_frames(animated_poses: np.ndarray, tolerance: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find frames that repeat an earlier frame within a tolerance.
+
+    Every frame is compared with the earlier representative frames whose vertex group
+    centroids all lie within the tolerance of its own. A centroid moves at most as far
+    as the farthest vertex, so no near-duplicate is missed, and a grid over the three
+    centroid coordinates that vary most across the sequence finds the candidates
+    without comparing every pair of frames. Without a tolerance, frames are hashed by
+    their coordinates instead.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+        tolerance (float): Largest vertex distance between a frame and its representative
+
+    Returns:
+        tuple: (representatives, inverse) where representatives holds the ascending
+            indices of the unique frames and inverse has shape [num_frames] and maps
+            every frame to the position of its representative in representatives
+    """
+
+def find_rigid_clusters(
+    rest_pose: np.ndarray,
+    animated_poses: np.ndarray,
+    tolerance: float,
+    max_clusters: int,
+    min_size: int = 16,
+    max_seeds: int = 64,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find groups of vertices that move rigidly together.
+
+    Static vertices are tested first and form a cluster with identity transformations.
+    Further clusters are grown from seed neighbourhoods spread over the rest pose by
+    farthest point sampling: the rigid motion of each seed neighbourhood is fitted in
+    every frame and all unassigned vertices that follow it within the tolerance join
+    the cluster. Clusters are returned largest first.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        tolerance (float): Largest distance from the fitted rigid motion for a vertex to join a cluster
+        max_clusters (int): Maximum number of clusters to return
+        min_size (int): Minimum number of vertices in a cluster
+        max_seeds (int): Maximum number of seed neighbourhoods to test
+
+    Returns:
+        tuple: (labels, transforms) where labels has shape [num_vertices] and holds the
+            cluster index of every vertex or -1 for vertices that are not rigid, and
+            transforms has shape [num_clusters, num_frames, 4, 4]
+    """
+
+def find_static_vertices(rest_pose: np.ndarray, animated_poses: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Find the vertices that stay at their rest position in every frame.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        tolerance (float): Largest displacement from the rest pose that counts as static
+
+    Returns:
+        numpy.ndarray: Boolean mask with shape [num_vertices]
+    """
+
+def fit_rigid_transforms(
+    rest_pose: np.ndarray, animated_poses: np.ndarray, vertices: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Fit the least-squares rigid transformation of a vertex set in every frame.
+
+    The rotations are solved for all frames at once with a batched SVD (Kabsch).
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        vertices (numpy.ndarray, optional): Indices of the vertices to fit. Defaults to all vertices.
+
+    Returns:
+        numpy.ndarray: Rigid transformations with shape [num_frames, 4, 4]
+    """
+
+def pose_features(animated_poses: np.ndarray) -> np.ndarray:
+    """
+    Reduce poses to feature vectors for comparing whole frames.
+
+    The features are the coordinates of an evenly strided subset of at most 2048
+    vertices. The stride only depends on the number of vertices, so features of
+    different chunks of one sequence can be compared with each other.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+
+    Returns:
+        numpy.ndarray: Features with shape [num_frames, num_features]
+    """
+
+def rigid_residuals(
+    rest_pose: np.ndarray,
+    animated_poses: np.ndarray,
+    transforms: np.ndarray,
+    vertices: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Compute how far vertices deviate from a rigid motion.
+
+    Args:
+        rest_pose (numpy.ndarray): Rest pose with shape [3, num_vertices]
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+        transforms (numpy.ndarray): Rigid transformations with shape [num_frames, 4, 4]
+        vertices (numpy.ndarray, optional): Indices of the vertices to test. Defaults to all vertices.
+
+    Returns:
+        numpy.ndarray: Largest distance over all frames between each vertex and its
+            rigidly transformed rest position
+    """
+
+def select_keyframes(animated_poses: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select keyframes that cover the pose space of a sequence.
+
+    Keyframes are chosen by farthest point sampling of the pose features (see
+    pose_features), starting from the frame closest to the mean pose, so every next
+    keyframe is the frame that is worst represented by the keyframes selected so far.
+
+    Args:
+        animated_poses (numpy.ndarray): Animated poses with shape [3 * num_frames, num_vertices]
+            or [num_frames, 3, num_vertices]
+        count (int): Number of keyframes to select
+
+    Returns:
+        tuple: (keyframes, nearest) where keyframes holds the ascending indices of the
+            selected frames and nearest has shape [num_frames] and maps every frame to
+            the position of its closest keyframe in keyframes
+    """
+
+def select_streamed_keyframes(
+    chunks: Iterable[Tuple[int, np.ndarray]], count: int, pool_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Select keyframes of a sequence that is streamed chunk by chunk.
+
+    A single pass keeps a pool of candidate frames that covers every frame seen so far
+    within a radius: a frame joins the pool when its features are farther than twice
+    the radius from all candidates. Whenever the pool overflows after a chunk it is
+    thinned to count candidates by farthest point sampling, and the radius grows to
+    cover the dropped ones. The keyframes are then chosen from the pool by farthest point sampling. Only
+    the features of the pool are held, so memory use does not grow with the sequence.
+
+    Args:
+        chunks (iterable): (start, frames) pairs that cover the sequence in order, with
+            frames of shape [chunk_size, 3, num_vertices]
+        count (int): Number of keyframes to select
+        pool_size (int, optional): Maximum number of candidate frames kept between chunks,
+            defaults to twice count
+
+    Returns:
+        tuple: (keyframes, features) where keyframes holds the ascending indices of the
+            selected frames and features their pose features (see pose_features)
+            with shape [len(keyframes), num_features]
+    """
@@ -0,0 +1,319 @@
+"""
+Compact runtime format for solved skinning decompositions.
+
+Runtimes and review tools only need the rest pose, the strongest influences of every
+vertex and the bone transformations of every frame. This module stores exactly that
+in a single binary file that is loaded by memory-mapping it, so opening a result
+takes milliseconds regardless of its size. The file starts with a fixed header,
+followed by sections aligned to 64 bytes:
+
+- rest pose: [num_vertices, 3] float32
+- influence bone indices: [num_vertices, num_influences] uint8, uint16 or uint32
+- influence weights: [num_vertices, num_influences] float32, or uint8 / uint16 unorm
+  values from DemBonesWrapper.quantize_influences()
+- transformations: [num_frames, num_bones, 3, 4] float32, the upper rows of the bone
+  matrices that map the rest pose to each frame
+
+All values are little-endian. The arrays of a loaded skin are read-only views of the
+mapped file and are evaluated by linear blend skinning without copying them.
+"""
+
+# Import standard library modules
+import os
+from typing import Optional, Union
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import IOError, ParameterError
+
+# Header: signature, format version, sizes, element bits and section offsets
+_HEADER = np.dtype([
+    ("signature", "S8"),
+    ("version", "<u4"),
+    ("num_vertices", "<u4"),
+    ("num_bones", "<u4"),
+    ("num_frames", "<u4"),
+    ("num_influences", "<u4"),
+    ("index_bits", "<u4"),
+    ("weight_bits", "<u4"),
+    ("reserved", "<u4"),
+    ("rest_offset", "<u8"),
+    ("index_offset", "<u8"),
+    ("weight_offset", "<u8"),
+    ("transform_offset", "<u8"),
+    ("file_size", "<u8"),
+])
+_SIGNATURE = b"DBSKIN\0\0"
+_VERSION = 1
+
+# Sections start at multiples of this many bytes
+_ALIGNMENT = 64
+
+# Integer types of the bone indices and quantised weights by bit count
+_UNSIGNED = {8: np.dtype("<u1"), 16: np.dtype("<u2"), 32: np.dtype("<u4")}
+
+
+class RuntimeSkin:
+    """
+    Rest pose, top-k influences and bone transformations of a solved decomposition.
+
+    Attributes:
+        rest_pose (numpy.ndarray): Rest pose with shape [num_vertices, 3]
+        indices (numpy.ndarray): Bone indices with shape [num_vertices, num_influences],
+            unused slots hold bone 0 with weight 0
+        weights (numpy.ndarray): float32 weights, or uint8 / uint16 unorm weights, with
+            shape [num_vertices, num_influences]
+        transformations (numpy.ndarray): Bone transformations with shape
+            [num_frames, num_bones, 3, 4]
+    """
+
+    def __init__(self, rest_pose: np.ndarray, indices: np.ndarray, weights: np.ndarray, transformations: np.ndarray):
+        """
+        Create a skin from its arrays.
+
+        Arrays that already have the storage type are kept as they are, so the arrays
+        of a memory-mapped file are not copied.
+
+        Args:
+            rest_pose (numpy.ndarray): Rest pose with shape [num_vertices, 3]
+            indices (numpy.ndarray): Bone indices with shape [num_vertices, num_influences]
+            weights (numpy.ndarray): Weights with shape [num_vertices, num_influences],
+                floating point or uint8 / uint16 unorm values
+            transformations (numpy.ndarray): Bone transformations with shape
+                [num_frames, num_bones, 3, 4] or [num_frames, num_bones, 4, 4]
+
+        Raises:
+            ParameterError: If the shapes or types are inconsistent
+        """
+        rest_pose = np.asarray(rest_pose)
+        indices = np.asarray(indices)
+        weights = np.asarray(weights)
+        transformations = np.asarray(transformations)
+        if rest_pose.ndim != 2 or rest_pose.shape[1] != 3:
+            raise ParameterError(f"Rest pose must have shape [num_vertices, 3], got {rest_pose.shape}")
+        if transformations.ndim != 4 or transformations.shape[2:] not in ((3, 4), (4, 4)):
+            raise ParameterError(
+                f"Transformations must have shape [num_frames, num_bones, 3, 4], got {transformations.shape}"
+            )
+        if indices.ndim != 2 or indices.shape[0] != rest_pose.shape[0] or weights.shape != indices.shape:
+            raise ParameterError(
+                f"Influences must have shape [{rest_pose.shape[0]}, num_influences], "
+                f"got {indices.shape} and {weights.shape}"
+            )
+        if indices.dtype.kind not in "iu" or weights.dtype.kind not in "fu":
+            raise ParameterError("Influence indices must be integers and weights floating point or unsigned")
+        if weights.dtype.kind == "u" and weights.dtype.itemsize not in (1, 2):
+            raise ParameterError(f"Quantised weights must have 8 or 16 bits, got {weights.dtype}")
+        num_bones = transformations.shape[1]
+        if indices.size and (indices.min() < 0 or indices.max() >= num_bones):
+            raise ParameterError(f"Influence bone index out of range (0-{num_bones-1})")
+
+        self.rest_pose = rest_pose.astype("<f4", copy=False)
+        self.indices = indices.astype(_index_type(num_bones), copy=False)
+        if weights.dtype.kind == "f":
+            self.weights = weights.astype("<f4", copy=False)
+        else:
+            self.weights = weights.astype(weights.dtype.newbyteorder("<"), copy=False)
+        self.transformations = transformations[:, :, :3].astype("<f4", copy=False)
+        self._unit_weights = None
+
+    @classmethod
+    def from_wrapper(cls, wrapper, max_influences: int = 4, bits: Optional[int] = None) -> "RuntimeSkin":
+        """
+        Convert the solved state of a wrapper.
+
+        Args:
+            wrapper (DemBonesWrapper): Wrapper holding solved weights and transformations
+            max_influences (int): Maximum number of influences per vertex
+            bits (int, optional): Quantise the weights to 8 or 16 bit unorm values with
+                DemBonesWrapper.quantize_influences(); float32 weights by default
+
+        Returns:
+            RuntimeSkin: The skin of the wrapper
+
+        Raises:
+            ParameterError: If max_influences or bits are invalid
+            ComputationError: If the decomposition has not been solved
+        """
+        if bits is None:
+            indices, weights = wrapper.get_influences(max_influences)
+        else:
+            indices, weights, _ = wrapper.quantize_influences(max_influences, bits=bits, frame_indices=[])
+        transformations = wrapper.get_bone_transformations()
+        rest_pose = np.asarray(wrapper.get_rest_pose())[:3].T
+        return cls(rest_pose, indices, weights, transformations)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True) -> "RuntimeSkin":
+        """
+        Load a skin written by save().
+
+        Args:
+            path (str): Path of the file
+            mmap (bool): Memory-map the file and keep the arrays as read-only views of
+                it, instead of reading it into memory
+
+        Returns:
+            RuntimeSkin: The loaded skin
+
+        Raises:
+            IOError: If the file cannot be read or is not a runtime skin
+        """
+        try:
+            data = np.memmap(path, dtype=np.uint8, mode="r") if mmap else np.fromfile(path, dtype=np.uint8)
+        except (OSError, ValueError) as e:
+            raise IOError(f"Failed to read runtime skin {path}: {str(e)}")
+        if data.size < _HEADER.itemsize:
+            raise IOError(f"Not a runtime skin: {path}")
+        header = data[: _HEADER.itemsize].view(_HEADER)[0]
+        if header["signature"] != _SIGNATURE.rstrip(b"\0") or header["version"] != _VERSION:
+            raise IOError(f"Not a runtime skin of version {_VERSION}: {path}")
+        if header["file_size"] != data.size:
+            raise IOError(f"Runtime skin {path} is truncated")
+        if header["index_bits"] not in _UNSIGNED or header["weight_bits"] not in (8, 16, 32):
+            raise IOError(f"Runtime skin {path} has an unknown element type")
+
+        num_vertices = int(header["num_vertices"])
+        num_influences = int(header["num_influences"])
+        weight_type = np.dtype("<f4") if header["weight_bits"] == 32 else _UNSIGNED[int(header["weight_bits"])]
+
+        def section(offset, dtype, shape):
+            count = int(np.prod(shape))
+            return data[int(offset) : int(offset) + count * dtype.itemsize].view(dtype).reshape(shape)
+
+        try:
+            return cls(
+                section(header["rest_offset"], np.dtype("<f4"), (num_vertices, 3)),
+                section(header["index_offset"], _UNSIGNED[int(header["index_bits"])], (num_vertices, num_influences)),
+                section(header["weight_offset"], weight_type, (num_vertices, num_influences)),
+                section(
+                    header["transform_offset"],
+                    np.dtype("<f4"),
+                    (int(header["num_frames"]), int(header["num_bones"]), 3, 4),
+                ),
+            )
+        except (ValueError, ParameterError) as e:
+            raise IOError(f"Runtime skin {path} is corrupt: {str(e)}")
+
+    @property
+    def num_vertices(self) -> int:
+        """Get the number of vertices."""
+        return self.rest_pose.shape[0]
+
+    @property
+    def num_bones(self) -> int:
+        """Get the number of bones."""
+        return self.transformations.shape[1]
+
+    @property
+    def num_frames(self) -> int:
+        """Get the number of frames."""
+        return self.transformations.shape[0]
+
+    @property
+    def num_influences(self) -> int:
+        """Get the number of influence slots per vertex."""
+        return self.indices.shape[1]
+
+    @property
+    def weight_bits(self) -> Optional[int]:
+        """Get the bits of the quantised weights (None for float32 weights)."""
+        return None if self.weights.dtype.kind == "f" else 8 * self.weights.dtype.itemsize
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Write the skin to a file.
+
+        Args:
+            path (str): Path of the file
+
+        Raises:
+            IOError: If the file cannot be written
+        """
+        sections = [self.rest_pose, self.indices, self.weights, self.transformations]
+        offsets = []
+        offset = _HEADER.itemsize
+        for array in sections:
+            offset += -offset % _ALIGNMENT
+            offsets.append(offset)
+            offset += array.nbytes
+        header = np.zeros(1, dtype=_HEADER)
+        header[0] = (
+            _SIGNATURE,
+            _VERSION,
+            self.num_vertices,
+            self.num_bones,
+            self.num_frames,
+            self.num_influences,
+            8 * self.indices.dtype.itemsize,
+            8 * self.weights.dtype.itemsize,
+            0,
+            *offsets,
+            offset,
+        )
+
+        try:
+            with open(path, "wb") as f:
+                f.write(header.tobytes())
+                for array, start in zip(sections, offsets):
+                    f.write(b"\0" * (start - f.tell()))
+                    f.write(np.ascontiguousarray(array).data)
+        except OSError as e:
+            raise IOError(f"Failed to write runtime skin {path}: {str(e)}")
+
+    def evaluate(self, frame_indices=None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Skin the rest pose with the transformations of some frames.
+
+        Every frame blends the [3, 4] bone matrices of each vertex with its weights and
+        applies the blended matrix to the rest position, vectorised over all vertices.
+
+        Args:
+            frame_indices (int or array-like, optional): Frames to evaluate, defaults to
+                all frames
+            out (numpy.ndarray, optional): float32 buffer with shape
+                [len(frame_indices), num_vertices, 3] that receives the poses
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), num_vertices, 3]
+
+        Raises:
+            IndexError: If a frame index is out of range
+        """
+        if frame_indices is None:
+            frame_indices = np.arange(self.num_frames)
+        frame_indices = np.asarray(frame_indices, dtype=np.int64).ravel()
+        if frame_indices.size and (frame_indices.min() < 0 or frame_indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+        if out is None:
+            out = np.empty((frame_indices.size, self.num_vertices, 3), dtype=np.float32)
+
+        weights = self._float_weights()
+        blended = np.empty((self.num_vertices, 3, 4), dtype=np.float32)
+        for n, frame in enumerate(frame_indices):
+            transforms = self.transformations[frame]
+            np.multiply(weights[:, 0, np.newaxis, np.newaxis], transforms[self.indices[:, 0]], out=blended)
+            for slot in range(1, self.num_influences):
+                blended += weights[:, slot, np.newaxis, np.newaxis] * transforms[self.indices[:, slot]]
+            np.matmul(blended[:, :, :3], self.rest_pose[:, :, np.newaxis], out=out[n, :, :, np.newaxis])
+            out[n] += blended[:, :, 3]
+        return out
+
+    def _float_weights(self) -> np.ndarray:
+        """Get the weights as float32, dequantising unorm weights once."""
+        if self.weights.dtype.kind == "f":
+            return self.weights
+        if self._unit_weights is None:
+            self._unit_weights = self.weights.astype(np.float32) / np.iinfo(self.weights.dtype).max
+        return self._unit_weights
+
+
+def _index_type(num_bones: int) -> np.dtype:
+    """Get the smallest unsigned type that holds the bone indices."""
+    if num_bones <= 1 << 8:
+        return _UNSIGNED[8]
+    if num_bones <= 1 << 16:
+        return _UNSIGNED[16]
+    return _UNSIGNED[32]
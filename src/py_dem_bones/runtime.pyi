@@ -0,0 +1,151 @@
+"""
+Compact runtime format for solved skinning decompositions.
+
+Runtimes and review tools only need the rest pose, the strongest influences of every
+vertex and the bone transformations of every frame. This module stores exactly that
+in a single binary file that is loaded by memory-mapping it, so opening a result
+takes milliseconds regardless of its size. The file starts with a fixed header,
+followed by sections aligned to 64 bytes:
+
+- rest pose: [num_vertices, 3] float32
+- influence bone indices: [num_vertices, num_influences] uint8, uint16 or uint32
+- influence weights: [num_vertices, num_influences] float32, or uint8 / uint16 unorm
+  values from DemBonesWrapper.quantize_influences()
+- transformations: [num_frames, num_bones, 3, 4] float32, the upper rows of the bone
+  matrices that map the rest pose to each frame
+
+All values are little-endian. The arrays of a loaded skin are read-only views of the
+mapped file and are evaluated by linear blend skinning without copying them.
+"""
+
+from __future__ import annotations
+import os
+from typing import Optional, Union
+import numpy as np
+from py_dem_bones.exceptions import IOError, ParameterError
+
+__all__ = [
+    "RuntimeSkin",
+    "np",
+]
+
+class RuntimeSkin:
+    """
+    Rest pose, top-k influences and bone transformations of a solved decomposition.
+
+    Attributes:
+        rest_pose (numpy.ndarray): Rest pose with shape [num_vertices, 3]
+        indices (numpy.ndarray): Bone indices with shape [num_vertices, num_influences],
+            unused slots hold bone 0 with weight 0
+        weights (numpy.ndarray): float32 weights, or uint8 / uint16 unorm weights, with
+            shape [num_vertices, num_influences]
+        transformations (numpy.ndarray): Bone transformations with shape
+            [num_frames, num_bones, 3, 4]
+    """
+
+    def __init__(self, rest_pose: np.ndarray, indices: np.ndarray, weights: np.ndarray, transformations: np.ndarray):
+        """
+        Create a skin from its arrays.
+
+        Arrays that already have the storage type are kept as they are, so the arrays
+        of a memory-mapped file are not copied.
+
+        Args:
+            rest_pose (numpy.ndarray): Rest pose with shape [num_vertices, 3]
+            indices (numpy.ndarray): Bone indices with shape [num_vertices, num_influences]
+            weights (numpy.ndarray): Weights with shape [num_vertices, num_influences],
+                floating point or uint8 / uint16 unorm values
+            transformations (numpy.ndarray): Bone transformations with shape
+                [num_frames, num_bones, 3, 4] or [num_frames, num_bones, 4, 4]
+
+        Raises:
+            ParameterError: If the shapes or types are inconsistent
+        """
+    @classmethod
+    def from_wrapper(cls, wrapper, max_influences: int = 4, bits: Optional[int] = None) -> "RuntimeSkin":
+        """
+        Convert the solved state of a wrapper.
+
+        Args:
+            wrapper (DemBonesWrapper): Wrapper holding solved weights and transformations
+            max_influences (int): Maximum number of influences per vertex
+            bits (int, optional): Quantise the weights to 8 or 16 bit unorm values with
+                DemBonesWrapper.quantize_influences(); float32 weights by default
+
+        Returns:
+            RuntimeSkin: The skin of the wrapper
+
+        Raises:
+            ParameterError: If max_influences or bits are invalid
+            ComputationError: If the decomposition has not been solved
+        """
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True) -> "RuntimeSkin":
+        """
+        Load a skin written by save().
+
+        Args:
+            path (str): Path of the file
+            mmap (bool): Memory-map the file and keep the arrays as read-only views of
+                it, instead of reading it into memory
+
+        Returns:
+            RuntimeSkin: The loaded skin
+
+        Raises:
+            IOError: If the file cannot be read or is not a runtime skin
+        """
+    @property
+    def num_vertices(self) -> int:
+        """
+        Get the number of vertices.
+        """
+    @property
+    def num_bones(self) -> int:
+        """
+        Get the number of bones.
+        """
+    @property
+    def num_frames(self) -> int:
+        """
+        Get the number of frames.
+        """
+    @property
+    def num_influences(self) -> int:
+        """
+        Get the number of influence slots per vertex.
+        """
+    @property
+    def weight_bits(self) -> Optional[int]:
+        """
+        Get the bits of the quantised weights (None for float32 weights).
+        """
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Write the skin to a file.
+
+        Args:
+            path (str): Path of the file
+
+        Raises:
+            IOError: If the file cannot be written
+        """
+    def evaluate(self, frame_indices=None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Skin the rest pose with the transformations of some frames.
+
+        Every frame blends the [3, 4] bone matrices of each vertex with its weights and
+        applies the blended matrix to the rest position, vectorised over all vertices.
+
+        Args:
+            frame_indices (int or array-like, optional): Frames to evaluate, defaults to
+                all frames
+            out (numpy.ndarray, optional): float32 buffer with shape
+                [len(frame_indices), num_vertices, 3] that receives the poses
+
+        Returns:
+            numpy.ndarray: Skinned poses with shape [len(frame_indices), num_vertices, 3]
+
+        Raises:
+            IndexError: If a frame index is out of range
+        """
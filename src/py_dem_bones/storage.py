@@ -0,0 +1,318 @@
+"""
+Out-of-core storage for animated frame sequences.
+
+This module provides a read-only frame store that serves frames of a sequence kept
+on disk in fixed-size chunks. Chunks are held in a bounded least-recently-used
+cache and the next chunk is read on a background thread while the current one is
+being processed, so memory use does not grow with the length of the sequence.
+It also memory-maps arrays stored in ``.npy`` files and uncompressed ``.npz``
+archives.
+"""
+
+# Import standard library modules
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os
+import struct
+import threading
+from typing import Iterator, Optional, Tuple, Union
+import zipfile
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+
+# Fixed part of a zip local file header
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+def load_array(path: Union[str, os.PathLike], key: Optional[str] = None, mmap: bool = True) -> np.ndarray:
+    """
+    Load an array from a ``.npy`` file or a ``.npz`` archive.
+
+    With ``mmap`` the array is memory-mapped read-only instead of read into memory.
+    Members of ``.npz`` archives written by ``numpy.savez`` are mapped in place;
+    members of compressed archives cannot be mapped and are read.
+
+    Args:
+        path (str): Path of the ``.npy`` or ``.npz`` file
+        key (str, optional): Name of the array in an archive. Archives holding a
+            single array do not need a key.
+        mmap (bool): Memory-map the array
+
+    Returns:
+        numpy.ndarray: The array, a ``numpy.memmap`` when it is mapped
+
+    Raises:
+        IOError: If the file cannot be read
+        ParameterError: If the archive does not hold the requested array
+    """
+    path = os.fspath(path)
+    try:
+        if not zipfile.is_zipfile(path):
+            return np.load(path, mmap_mode="r" if mmap else None)
+
+        with zipfile.ZipFile(path) as archive:
+            names = [name[:-4] for name in archive.namelist() if name.endswith(".npy")]
+            if key is None or (key not in names and len(names) == 1):
+                if len(names) != 1:
+                    raise ParameterError(f"Archive {path} holds {len(names)} arrays, an array name is required")
+                key = names[0]
+            elif key not in names:
+                raise ParameterError(f"Archive {path} has no array named '{key}'")
+
+            info = archive.getinfo(key + ".npy")
+            if not mmap or info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as f:
+                    return np.lib.format.read_array(f)
+        return _map_archive_member(path, info)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        raise IOError(f"Failed to load array from {path}: {str(e)}")
+
+
+def _map_archive_member(path: str, info: zipfile.ZipInfo) -> np.memmap:
+    """Memory-map an uncompressed ``.npy`` member of a zip archive."""
+    with open(path, "rb") as f:
+        f.seek(info.header_offset)
+        header = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+        if header[0] != b"PK\x03\x04":
+            raise ValueError(f"Corrupt zip entry {info.filename}")
+        f.seek(header[-2] + header[-1], os.SEEK_CUR)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        raise ValueError("Arrays of Python objects cannot be memory-mapped")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape, order="F" if fortran_order else "C")
+
+
+class FrameStore:
+    """
+    Chunked, cached access to a frame sequence that does not fit in memory.
+
+    The source is a ``.npy`` or ``.npz`` file, which is memory-mapped, or any array-like object
+    with shape [num_frames, 3, num_vertices] that supports slicing along the first
+    axis, such as ``numpy.memmap`` or an HDF5 dataset.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, np.ndarray],
+        chunk_frames: int = 64,
+        cache_chunks: int = 4,
+        prefetch: bool = True,
+    ):
+        """
+        Open a frame store.
+
+        Args:
+            source (str or array-like): Path of a ``.npy`` or ``.npz`` file or array-like frame data
+                with shape [num_frames, 3, num_vertices] or [3 * num_frames, num_vertices]
+            chunk_frames (int): Number of frames read at once
+            cache_chunks (int): Maximum number of chunks kept in memory
+            prefetch (bool): Read the next chunk on a background thread
+
+        Raises:
+            IOError: If the file cannot be opened
+            ParameterError: If the data or the parameters are invalid
+        """
+        if not isinstance(chunk_frames, (int, np.integer)) or chunk_frames <= 0:
+            raise ParameterError("Chunk size must be a positive integer")
+        if not isinstance(cache_chunks, (int, np.integer)) or cache_chunks <= 0:
+            raise ParameterError("Cache size must be a positive integer")
+
+        if isinstance(source, (str, os.PathLike)):
+            source = load_array(source)
+
+        if len(source.shape) == 2 and source.shape[0] % 3 == 0:
+            source = source.reshape(source.shape[0] // 3, 3, source.shape[1])
+        if len(source.shape) != 3 or source.shape[1] != 3:
+            raise ParameterError(
+                f"Frames must have shape [num_frames, 3, num_vertices], got {tuple(source.shape)}"
+            )
+
+        self._source = source
+        self.chunk_frames = chunk_frames
+        self.cache_chunks = cache_chunks
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.prefetch = prefetch
+        self._executor = None
+        self.chunks_read = 0
+
+    @property
+    def num_frames(self) -> int:
+        """Get the number of frames."""
+        return self._source.shape[0]
+
+    @property
+    def num_vertices(self) -> int:
+        """Get the number of vertices per frame."""
+        return self._source.shape[2]
+
+    @property
+    def num_chunks(self) -> int:
+        """Get the number of chunks."""
+        return -(-self.num_frames // self.chunk_frames)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Get the data type of the stored frames."""
+        return self._source.dtype
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """
+        Get the frame range of a chunk.
+
+        Args:
+            index (int): Chunk index
+
+        Returns:
+            tuple: (start, stop) frame indices of the chunk
+        """
+        start = index * self.chunk_frames
+        return start, min(start + self.chunk_frames, self.num_frames)
+
+    def get_chunk(self, index: int) -> np.ndarray:
+        """
+        Get the frames of a chunk, reading it if it is not cached.
+
+        Reading a chunk schedules the next chunk to be read in the background.
+
+        Args:
+            index (int): Chunk index
+
+        Returns:
+            numpy.ndarray: Frames with shape [chunk_size, 3, num_vertices]
+
+        Raises:
+            IndexError: If the chunk index is out of range
+        """
+        if not 0 <= index < self.num_chunks:
+            raise IndexError(f"Chunk index {index} out of range (0-{self.num_chunks-1})")
+
+        with self._lock:
+            chunk = self._cache.get(index)
+            if chunk is not None:
+                self._cache.move_to_end(index)
+            future = self._pending.get(index)
+
+        if chunk is None:
+            chunk = future.result() if future is not None else self._read(index)
+            self._store(index, chunk)
+
+        if self.prefetch and index + 1 < self.num_chunks:
+            self._prefetch(index + 1)
+        return chunk
+
+    def get_frames(self, indices) -> np.ndarray:
+        """
+        Gather arbitrary frames through the chunk cache.
+
+        Args:
+            indices (array-like): Frame indices
+
+        Returns:
+            numpy.ndarray: Frames with shape [len(indices), 3, num_vertices]
+        """
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        if indices.size and (indices.min() < 0 or indices.max() >= self.num_frames):
+            raise IndexError(f"Frame index out of range (0-{self.num_frames-1})")
+
+        frames = np.empty((indices.size, 3, self.num_vertices), dtype=self.dtype)
+        chunks = indices // self.chunk_frames
+        for index in np.unique(chunks):
+            selected = np.flatnonzero(chunks == index)
+            frames[selected] = self.get_chunk(int(index))[indices[selected] - index * self.chunk_frames]
+        return frames
+
+    def iter_chunks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Iterate over the sequence chunk by chunk.
+
+        Yields:
+            tuple: (start, frames) with the first frame index of the chunk and its frames
+        """
+        for index in range(self.num_chunks):
+            yield self.chunk_range(index)[0], self.get_chunk(index)
+
+    def stop_prefetch(self):
+        """
+        Stop the prefetch thread.
+
+        Chunks that were being read are waited for and dropped. The thread is started
+        again by the next chunk that is read, so the store stays usable.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            self._pending.clear()
+
+    def close(self):
+        """Stop the prefetch thread and drop the cached chunks."""
+        self.stop_prefetch()
+        with self._lock:
+            self._cache.clear()
+
+    def __enter__(self):
+        """Use the store as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the store."""
+        self.close()
+
+    @staticmethod
+    def create(path: Union[str, os.PathLike], num_frames: int, num_vertices: int, dtype=np.float32) -> np.memmap:
+        """
+        Create a ``.npy`` frame file on disk to be filled frame by frame.
+
+        Args:
+            path (str): Path of the file to create
+            num_frames (int): Number of frames
+            num_vertices (int): Number of vertices per frame
+            dtype: Data type of the stored coordinates
+
+        Returns:
+            numpy.memmap: Writable memory map with shape [num_frames, 3, num_vertices]
+        """
+        return np.lib.format.open_memmap(
+            os.fspath(path), mode="w+", dtype=dtype, shape=(num_frames, 3, num_vertices)
+        )
+
+    def _read(self, index: int) -> np.ndarray:
+        """Read a chunk from the source."""
+        start, stop = self.chunk_range(index)
+        chunk = np.array(self._source[start:stop])
+        with self._lock:
+            self.chunks_read += 1
+        return chunk
+
+    def _store(self, index: int, chunk: np.ndarray):
+        """Insert a chunk into the cache and evict the least recently used ones."""
+        with self._lock:
+            self._pending.pop(index, None)
+            self._cache[index] = chunk
+            self._cache.move_to_end(index)
+            while len(self._cache) > self.cache_chunks:
+                self._cache.popitem(last=False)
+
+    def _prefetch(self, index: int):
+        """Schedule a chunk to be read in the background."""
+        with self._lock:
+            if index in self._cache or index in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._pending[index] = self._executor.submit(self._read, index)
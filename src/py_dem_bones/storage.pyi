@@ -0,0 +1,167 @@
+"""
+Out-of-core storage for animated frame sequences.
+
+This module provides a read-only frame store that serves frames of a sequence kept
+on disk in fixed-size chunks. Chunks are held in a bounded least-recently-used
+cache and the next chunk is read on a background thread while the current one is
+being processed, so memory use does not grow with the length of the sequence.
+It also memory-maps arrays stored in ``.npy`` files and uncompressed ``.npz``
+archives.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import os
+import struct
+import threading
+from typing import Iterator, Optional, Tuple, Union
+import zipfile
+import numpy as np
+from py_dem_bones.exceptions import IndexError, IOError, ParameterError
+
+__all__ = [
+    "FrameStore",
+    "load_array",
+    "np",
+]
+
+class FrameStore:
+    """
+    Chunked, cached access to a frame sequence that does not fit in memory.
+
+    The source is a ``.npy`` or ``.npz`` file, which is memory-mapped, or any array-like object
+    with shape [num_frames, 3, num_vertices] that supports slicing along the first
+    axis, such as ``numpy.memmap`` or an HDF5 dataset.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, os.PathLike, np.ndarray],
+        chunk_frames: int = 64,
+        cache_chunks: int = 4,
+        prefetch: bool = True,
+    ):
+        """
+        Open a frame store.
+
+        Args:
+            source (str or array-like): Path of a ``.npy`` or ``.npz`` file or array-like frame data
+                with shape [num_frames, 3, num_vertices] or [3 * num_frames, num_vertices]
+            chunk_frames (int): Number of frames read at once
+            cache_chunks (int): Maximum number of chunks kept in memory
+            prefetch (bool): Read the next chunk on a background thread
+
+        Raises:
+            IOError: If the file cannot be opened
+            ParameterError: If the data or the parameters are invalid
+        """
+    @property
+    def num_frames(self) -> int:
+        """
+        Get the number of frames.
+        """
+    @property
+    def num_vertices(self) -> int:
+        """
+        Get the number of vertices per frame.
+        """
+    @property
+    def num_chunks(self) -> int:
+        """
+        Get the number of chunks.
+        """
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Get the data type of the stored frames.
+        """
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """
+        Get the frame range of a chunk.
+
+        Args:
+            index (int): Chunk index
+
+        Returns:
+            tuple: (start, stop) frame indices of the chunk
+        """
+    def get_chunk(self, index: int) -> np.ndarray:
+        """
+        Get the frames of a chunk, reading it if it is not cached.
+
+        Reading a chunk schedules the next chunk to be read in the background.
+
+        Args:
+            index (int): Chunk index
+
+        Returns:
+            numpy.ndarray: Frames with shape [chunk_size, 3, num_vertices]
+
+        Raises:
+            IndexError: If the chunk index is out of range
+        """
+    def get_frames(self, indices) -> np.ndarray:
+        """
+        Gather arbitrary frames through the chunk cache.
+
+        Args:
+            indices (array-like): Frame indices
+
+        Returns:
+            numpy.ndarray: Frames with shape [len(indices), 3, num_vertices]
+        """
+    def iter_chunks(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Iterate over the sequence chunk by chunk.
+
+        Yields:
+            tuple: (start, frames) with the first frame index of the chunk and its frames
+        """
+    def stop_prefetch(self):
+        """
+        Stop the prefetch thread.
+
+        Chunks that were being read are waited for and dropped. The thread is started
+        again by the next chunk that is read, so the store stays usable.
+        """
+    def close(self):
+        """
+        Stop the prefetch thread and drop the cached chunks.
+        """
+    @staticmethod
+    def create(path: Union[str, os.PathLike], num_frames: int, num_vertices: int, dtype=np.float32) -> np.memmap:
+        """
+        Create a ``.npy`` frame file on disk to be filled frame by frame.
+
+        Args:
+            path (str): Path of the file to create
+            num_frames (int): Number of frames
+            num_vertices (int): Number of vertices per frame
+            dtype: Data type of the stored coordinates
+
+        Returns:
+            numpy.memmap: Writable memory map with shape [num_frames, 3, num_vertices]
+        """
+
+def load_array(path: Union[str, os.PathLike], key: Optional[str] = None, mmap: bool = True) -> np.ndarray:
+    """
+    Load an array from a ``.npy`` file or a ``.npz`` archive.
+
+    With ``mmap`` the array is memory-mapped read-only instead of read into memory.
+    Members of ``.npz`` archives written by ``numpy.savez`` are mapped in place;
+    members of compressed archives cannot be mapped and are read.
+
+    Args:
+        path (str): Path of the ``.npy`` or ``.npz`` file
+        key (str, optional): Name of the array in an archive. Archives holding a
+            single array do not need a key.
+        mmap (bool): Memory-map the array
+
+    Returns:
+        numpy.ndarray: The array, a ``numpy.memmap`` when it is mapped
+
+    Raises:
+        IOError: If the file cannot be read
+        ParameterError: If the archive does not hold the requested array
+    """
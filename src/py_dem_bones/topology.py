@@ -0,0 +1,394 @@
+"""
+Topology data shared between solves of the same mesh.
+
+The weight smoothing of DemBones is driven by a Laplacian over the mesh edges.
+Finding the unique edges of the faces and measuring them on the rest pose does not
+depend on the animation, so this module computes it once per mesh and keeps it in a
+least-recently-used cache keyed by a hash of the faces and the rest pose. The cache
+can also keep its entries on disk, so that the data is shared between processes and
+sessions.
+
+The Laplacian itself also weighs the edges by the animated poses. The cache keeps the
+assembled Laplacian together with its LU factorization in memory, keyed by the
+topology, the poses and the smoothing parameters, so solving the same clip again, for
+example after changing weight locks or the number of iterations, skips both. The
+wrappers install the smoothing solver of the native instances they solve from
+default_cache(), a single cache that is global to the process and shared by every
+wrapper and thread that does not set its own.
+"""
+
+# Import standard library modules
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple, Union
+
+# Import third-party modules
+import numpy as np
+
+# Import local modules
+from py_dem_bones.exceptions import IOError, ParameterError
+
+
+def _smoothing_key(topology: str, native) -> str:
+    """Key of the smoothing solver of a native instance with the given topology key."""
+    poses = native.v
+    if not poses.flags.c_contiguous:
+        # Eigen matrices are column-major, so their transpose is hashed without a copy
+        poses = np.ascontiguousarray(poses.T)
+    parameters = (type(native).__name__, poses.shape, float(native.weightEps), float(native.weightsSmoothStep))
+    digest = hashlib.blake2b(topology.encode(), digest_size=20)
+    digest.update(repr(parameters).encode())
+    digest.update(np.ascontiguousarray(native.fStart, dtype=np.int64).data)
+    digest.update(poses.data)
+    return digest.hexdigest()
+
+
+def topology_key(offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> str:
+    """
+    Compute the cache key of a mesh.
+
+    Args:
+        offsets (numpy.ndarray): Start of every face in ``indices`` followed by the total
+            number of indices
+        indices (numpy.ndarray): Flat vertex indices of all faces
+        rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+    Returns:
+        str: Hexadecimal digest of the faces and the rest pose
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for array in (
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(indices, dtype=np.int32),
+        np.asarray(rest_pose, dtype=np.float64),
+    ):
+        array = np.ascontiguousarray(array)
+        digest.update(repr(array.shape).encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def vertex_faces(offsets: np.ndarray, indices: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the faces around every vertex in CSR form.
+
+    Args:
+        offsets (numpy.ndarray): Start of every face in ``indices`` followed by the total
+            number of indices
+        indices (numpy.ndarray): Flat vertex indices of all faces
+        num_vertices (int): Number of vertices of the mesh
+
+    Returns:
+        tuple: (offsets, faces) where the faces around vertex ``i`` are
+            ``faces[offsets[i]:offsets[i + 1]]`` in increasing order
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    faces = np.repeat(np.arange(offsets.size - 1, dtype=np.int32), np.diff(offsets))
+    order = np.argsort(indices, kind="stable")
+    counts = np.bincount(indices, minlength=num_vertices)
+    return np.concatenate([[0], np.cumsum(counts)]), faces[order]
+
+
+class MeshTopology:
+    """
+    Unique edges of a mesh and their lengths in the rest pose.
+
+    Attributes:
+        num_vertices (int): Number of vertices of the mesh
+        edges (numpy.ndarray): Unique undirected edges of the faces with shape
+            [num_edges, 2], the smaller vertex index first
+        rest_lengths (numpy.ndarray): Length of every edge in the rest pose of each
+            subject with shape [num_subjects, num_edges]
+        edge_length_sum (float): Summed length of the edges of all faces, where edges
+            shared by several faces are counted once per face
+    """
+
+    def __init__(self, num_vertices: int, edges: np.ndarray, rest_lengths: np.ndarray, edge_length_sum: float):
+        """
+        Create the topology from precomputed data.
+
+        Args:
+            num_vertices (int): Number of vertices of the mesh
+            edges (numpy.ndarray): Unique edges with shape [num_edges, 2]
+            rest_lengths (numpy.ndarray): Rest edge lengths with shape [num_subjects, num_edges]
+            edge_length_sum (float): Summed length of the edges of all faces
+        """
+        self.num_vertices = int(num_vertices)
+        self.edges = np.ascontiguousarray(edges, dtype=np.int32)
+        self.rest_lengths = np.ascontiguousarray(rest_lengths, dtype=np.float64)
+        self.edge_length_sum = float(edge_length_sum)
+
+    @classmethod
+    def from_faces(cls, offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> "MeshTopology":
+        """
+        Compute the topology of faces given in CSR form.
+
+        Args:
+            offsets (numpy.ndarray): Start of every face in ``indices`` followed by the
+                total number of indices
+            indices (numpy.ndarray): Flat vertex indices of all faces
+            rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+        Returns:
+            MeshTopology: The topology of the mesh
+
+        Raises:
+            ParameterError: If the faces or the rest pose are malformed
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int64)
+        rest_pose = np.asarray(rest_pose, dtype=np.float64)
+        if rest_pose.ndim != 2 or rest_pose.shape[0] % 3 != 0:
+            raise ParameterError(f"Rest pose must have shape [3 * num_subjects, num_vertices], got {rest_pose.shape}")
+        if offsets.ndim != 1 or offsets.size < 1 or offsets[0] != 0 or offsets[-1] != indices.size:
+            raise ParameterError("Face offsets must start at 0 and end at the number of indices")
+        num_vertices = rest_pose.shape[1]
+        if indices.size and (indices.min() < 0 or indices.max() >= num_vertices):
+            raise ParameterError(f"Face vertex index out of range (0-{num_vertices-1})")
+
+        # Every corner is joined to the next corner of its face, the last corner to the first
+        following = np.arange(1, indices.size + 1)
+        sizes = np.diff(offsets)
+        following[offsets[1:][sizes > 0] - 1] = offsets[:-1][sizes > 0]
+        first, second = indices, indices[following]
+        edge_length_sum = float(np.linalg.norm(rest_pose[:, first] - rest_pose[:, second], axis=0).sum())
+
+        low, high = np.minimum(first, second), np.maximum(first, second)
+        keys = np.unique(low[low != high] * num_vertices + high[low != high])
+        edges = np.stack([keys // num_vertices, keys % num_vertices], axis=1)
+
+        subjects = rest_pose.reshape(-1, 3, num_vertices)
+        rest_lengths = np.linalg.norm(subjects[:, :, edges[:, 0]] - subjects[:, :, edges[:, 1]], axis=1)
+        return cls(num_vertices, edges, rest_lengths, edge_length_sum)
+
+    @property
+    def num_edges(self) -> int:
+        """Get the number of unique edges."""
+        return self.edges.shape[0]
+
+    def neighbours(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the vertex adjacency in CSR form.
+
+        Returns:
+            tuple: (offsets, indices) where the neighbours of vertex ``i`` are
+                ``indices[offsets[i]:offsets[i + 1]]`` in increasing order
+        """
+        pairs = np.concatenate([self.edges, self.edges[:, ::-1]])
+        pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+        counts = np.bincount(pairs[:, 0], minlength=self.num_vertices)
+        return np.concatenate([[0], np.cumsum(counts)]), pairs[:, 1].copy()
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Save the topology to an ``.npz`` file.
+
+        Args:
+            path (str): Path of the file
+        """
+        np.savez(
+            path,
+            num_vertices=self.num_vertices,
+            edges=self.edges,
+            rest_lengths=self.rest_lengths,
+            edge_length_sum=self.edge_length_sum,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "MeshTopology":
+        """
+        Load a topology saved with save().
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            MeshTopology: The loaded topology
+
+        Raises:
+            IOError: If the file cannot be read
+        """
+        try:
+            with np.load(path) as data:
+                return cls(data["num_vertices"], data["edges"], data["rest_lengths"], data["edge_length_sum"])
+        except (OSError, KeyError, ValueError) as e:
+            raise IOError(f"Failed to load topology from {path}: {str(e)}")
+
+
+class TopologyCache:
+    """
+    Least-recently-used cache of mesh topologies keyed by faces and rest pose.
+
+    Entries are held in memory up to ``max_entries``. With a ``directory`` every
+    computed topology is also written there, and topologies that are not in memory
+    are looked up on disk before they are computed. Up to ``max_entries`` weight
+    smoothing solvers are kept as well, in memory only. The cache is safe to share
+    between threads.
+
+    Attributes:
+        hits (int): Topologies found in memory or on disk
+        misses (int): Topologies that were computed
+        solver_hits (int): Smoothing solvers found in memory
+        solver_misses (int): Smoothing solvers that were built
+    """
+
+    def __init__(self, max_entries: int = 8, directory: Optional[Union[str, os.PathLike]] = None):
+        """
+        Create a topology cache.
+
+        Args:
+            max_entries (int): Maximum number of topologies, and of smoothing solvers, kept in memory
+            directory (str, optional): Directory that keeps the topologies on disk
+
+        Raises:
+            ParameterError: If the cache size is invalid
+        """
+        if not isinstance(max_entries, (int, np.integer)) or max_entries <= 0:
+            raise ParameterError("Cache size must be a positive integer")
+
+        self.max_entries = max_entries
+        self.directory = None if directory is None else os.fspath(directory)
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._solvers = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.solver_hits = 0
+        self.solver_misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of topologies held in memory."""
+        return len(self._entries)
+
+    def get(self, offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> MeshTopology:
+        """
+        Get the topology of a mesh, computing it if it is not cached.
+
+        Args:
+            offsets (numpy.ndarray): Start of every face in ``indices`` followed by the
+                total number of indices
+            indices (numpy.ndarray): Flat vertex indices of all faces
+            rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+        Returns:
+            MeshTopology: The topology of the mesh
+        """
+        return self._get(topology_key(offsets, indices, rest_pose), offsets, indices, rest_pose)
+
+    def get_smoothing_solver(self, native, num_threads: int = 0):
+        """
+        Get the weight smoothing solver of a native instance, building it if it is not cached.
+
+        Solvers are keyed by the topology, the animated poses, the frame layout,
+        weightEps, weightsSmoothStep and the precision of the instance, since the
+        Laplacian weighs every edge by how much its length varies over the poses.
+
+        Args:
+            native: DemBones, DemBonesF, DemBonesExt or DemBonesExtF instance with its
+                faces, rest pose and animated poses set
+            num_threads (int): OpenMP threads used to build the solver, 0 for the default
+
+        Returns:
+            SmoothingSolver or SmoothingSolverF: Solver for native.set_smoothing_solver(),
+                or None if the instance has no faces
+        """
+        offsets, indices = native.get_faces()
+        if indices.size == 0:
+            return None
+        rest_pose = native.get_rest_pose()
+        key = topology_key(offsets, indices, rest_pose)
+        topology = self._get(key, offsets, indices, rest_pose)
+
+        solver_key = _smoothing_key(key, native)
+        with self._lock:
+            solver = self._solvers.get(solver_key)
+            if solver is not None:
+                self._solvers.move_to_end(solver_key)
+                self.solver_hits += 1
+                return solver
+
+        solver = native.build_smoothing_solver(
+            topology.edges, topology.rest_lengths, topology.edge_length_sum, num_threads=num_threads
+        )
+        with self._lock:
+            self.solver_misses += 1
+            self._solvers[solver_key] = solver
+            while len(self._solvers) > self.max_entries:
+                self._solvers.popitem(last=False)
+        return solver
+
+    def clear(self):
+        """Drop the topologies and smoothing solvers held in memory; files on disk are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._solvers.clear()
+
+    def _get(self, key: str, offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> MeshTopology:
+        """Get the topology of a cache key, computing it if it is not cached."""
+        with self._lock:
+            topology = self._entries.get(key)
+            if topology is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return topology
+
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            topology = MeshTopology.load(path)
+            hit = True
+        else:
+            topology = MeshTopology.from_faces(offsets, indices, rest_pose)
+            hit = False
+            if path is not None:
+                self._write(topology, path)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._entries[key] = topology
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return topology
+
+    def _path(self, key: str) -> Optional[str]:
+        """Get the file of a cache key, None without a directory."""
+        return None if self.directory is None else os.path.join(self.directory, key + ".npz")
+
+    def _write(self, topology: MeshTopology, path: str):
+        """Write a topology so that concurrent readers never see a partial file."""
+        handle, temporary = tempfile.mkstemp(suffix=".npz", dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                topology.save(f)
+            os.replace(temporary, path)
+        except OSError as e:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise IOError(f"Failed to write topology to {path}: {str(e)}")
+
+
+# Process-global cache shared by all wrappers that do not set their own
+_DEFAULT_CACHE = TopologyCache()
+
+
+def default_cache() -> TopologyCache:
+    """
+    Get the topology cache shared by all wrappers.
+
+    The cache is global to the process: every wrapper that does not set its own
+    topology_cache, in any thread, reads and fills it, and its smoothing solvers keep
+    their LU factorizations in memory until they are evicted or clear() is called.
+
+    Returns:
+        TopologyCache: The shared cache
+    """
+    return _DEFAULT_CACHE
@@ -0,0 +1,217 @@
+"""
+Topology data shared between solves of the same mesh.
+
+The weight smoothing of DemBones is driven by a Laplacian over the mesh edges.
+Finding the unique edges of the faces and measuring them on the rest pose does not
+depend on the animation, so this module computes it once per mesh and keeps it in a
+least-recently-used cache keyed by a hash of the faces and the rest pose. The cache
+can also keep its entries on disk, so that the data is shared between processes and
+sessions.
+
+The Laplacian itself also weighs the edges by the animated poses. The cache keeps the
+assembled Laplacian together with its LU factorization in memory, keyed by the
+topology, the poses and the smoothing parameters, so solving the same clip again, for
+example after changing weight locks or the number of iterations, skips both. The
+wrappers install the smoothing solver of the native instances they solve from
+default_cache(), a single cache that is global to the process and shared by every
+wrapper and thread that does not set its own.
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple, Union
+import numpy as np
+from py_dem_bones.exceptions import IOError, ParameterError
+
+__all__ = [
+    "MeshTopology",
+    "TopologyCache",
+    "default_cache",
+    "topology_key",
+    "vertex_faces",
+    "np",
+]
+
+class MeshTopology:
+    """
+    Unique edges of a mesh and their lengths in the rest pose.
+
+    Attributes:
+        num_vertices (int): Number of vertices of the mesh
+        edges (numpy.ndarray): Unique undirected edges of the faces with shape
+            [num_edges, 2], the smaller vertex index first
+        rest_lengths (numpy.ndarray): Length of every edge in the rest pose of each
+            subject with shape [num_subjects, num_edges]
+        edge_length_sum (float): Summed length of the edges of all faces, where edges
+            shared by several faces are counted once per face
+    """
+
+    def __init__(self, num_vertices: int, edges: np.ndarray, rest_lengths: np.ndarray, edge_length_sum: float):
+        """
+        Create the topology from precomputed data.
+
+        Args:
+            num_vertices (int): Number of vertices of the mesh
+            edges (numpy.ndarray): Unique edges with shape [num_edges, 2]
+            rest_lengths (numpy.ndarray): Rest edge lengths with shape [num_subjects, num_edges]
+            edge_length_sum (float): Summed length of the edges of all faces
+        """
+    @classmethod
+    def from_faces(cls, offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> "MeshTopology":
+        """
+        Compute the topology of faces given in CSR form.
+
+        Args:
+            offsets (numpy.ndarray): Start of every face in ``indices`` followed by the
+                total number of indices
+            indices (numpy.ndarray): Flat vertex indices of all faces
+            rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+        Returns:
+            MeshTopology: The topology of the mesh
+
+        Raises:
+            ParameterError: If the faces or the rest pose are malformed
+        """
+    @property
+    def num_edges(self) -> int:
+        """
+        Get the number of unique edges.
+        """
+    def neighbours(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the vertex adjacency in CSR form.
+
+        Returns:
+            tuple: (offsets, indices) where the neighbours of vertex ``i`` are
+                ``indices[offsets[i]:offsets[i + 1]]`` in increasing order
+        """
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Save the topology to an ``.npz`` file.
+
+        Args:
+            path (str): Path of the file
+        """
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "MeshTopology":
+        """
+        Load a topology saved with save().
+
+        Args:
+            path (str): Path of the file
+
+        Returns:
+            MeshTopology: The loaded topology
+
+        Raises:
+            IOError: If the file cannot be read
+        """
+
+class TopologyCache:
+    """
+    Least-recently-used cache of mesh topologies keyed by faces and rest pose.
+
+    Entries are held in memory up to ``max_entries``. With a ``directory`` every
+    computed topology is also written there, and topologies that are not in memory
+    are looked up on disk before they are computed. Up to ``max_entries`` weight
+    smoothing solvers are kept as well, in memory only. The cache is safe to share
+    between threads.
+
+    Attributes:
+        hits (int): Topologies found in memory or on disk
+        misses (int): Topologies that were computed
+        solver_hits (int): Smoothing solvers found in memory
+        solver_misses (int): Smoothing solvers that were built
+    """
+
+    def __init__(self, max_entries: int = 8, directory: Optional[Union[str, os.PathLike]] = None):
+        """
+        Create a topology cache.
+
+        Args:
+            max_entries (int): Maximum number of topologies, and of smoothing solvers, kept in memory
+            directory (str, optional): Directory that keeps the topologies on disk
+
+        Raises:
+            ParameterError: If the cache size is invalid
+        """
+    def get(self, offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> MeshTopology:
+        """
+        Get the topology of a mesh, computing it if it is not cached.
+
+        Args:
+            offsets (numpy.ndarray): Start of every face in ``indices`` followed by the
+                total number of indices
+            indices (numpy.ndarray): Flat vertex indices of all faces
+            rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+        Returns:
+            MeshTopology: The topology of the mesh
+        """
+    def get_smoothing_solver(self, native, num_threads: int = 0):
+        """
+        Get the weight smoothing solver of a native instance, building it if it is not cached.
+
+        Solvers are keyed by the topology, the animated poses, the frame layout,
+        weightEps, weightsSmoothStep and the precision of the instance, since the
+        Laplacian weighs every edge by how much its length varies over the poses.
+
+        Args:
+            native: DemBones, DemBonesF, DemBonesExt or DemBonesExtF instance with its
+                faces, rest pose and animated poses set
+            num_threads (int): OpenMP threads used to build the solver, 0 for the default
+
+        Returns:
+            SmoothingSolver or SmoothingSolverF: Solver for native.set_smoothing_solver(),
+                or None if the instance has no faces
+        """
+    def clear(self):
+        """
+        Drop the topologies and smoothing solvers held in memory; files on disk are kept.
+        """
+
+def default_cache() -> TopologyCache:
+    """
+    Get the topology cache shared by all wrappers.
+
+    The cache is global to the process: every wrapper that does not set its own
+    topology_cache, in any thread, reads and fills it, and its smoothing solvers keep
+    their LU factorizations in memory until they are evicted or clear() is called.
+
+    Returns:
+        TopologyCache: The shared cache
+    """
+
+def topology_key(offsets: np.ndarray, indices: np.ndarray, rest_pose: np.ndarray) -> str:
+    """
+    Compute the cache key of a mesh.
+
+    Args:
+        offsets (numpy.ndarray): Start of every face in ``indices`` followed by the total
+            number of indices
+        indices (numpy.ndarray): Flat vertex indices of all faces
+        rest_pose (numpy.ndarray): Rest pose with shape [3 * num_subjects, num_vertices]
+
+    Returns:
+        str: Hexadecimal digest of the faces and the rest pose
+    """
+
+def vertex_faces(offsets: np.ndarray, indices: np.ndarray, num_vertices: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the faces around every vertex in CSR form.
+
+    Args:
+        offsets (numpy.ndarray): Start of every face in ``indices`` followed by the total
+            number of indices
+        indices (numpy.ndarray): Flat vertex indices of all faces
+        num_vertices (int): Number of vertices of the mesh
+
+    Returns:
+        tuple: (offsets, faces) where the faces around vertex ``i`` are
+            ``faces[offsets[i]:offsets[i + 1]]`` in increasing order
+    """
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the py_dem_bones tests.
+"""
+
+import numpy as np
+import pytest
+
+
+def _bending_strip(nx=40, ny=6, num_frames=10, motion="hinge", angle=0.08, bulge=0.0, curl=0.0):
+    """
+    Create an animated quad strip over [0, 2] x [0, 0.4].
+
+    Args:
+        nx (int): Number of vertices along the strip
+        ny (int): Number of vertices across the strip
+        num_frames (int): Number of animated frames
+        motion (str): "hinge" rotates the right half of the strip around x = 1 by
+            ``angle * k`` in frame k, "bend" rolls the strip up smoothly around the z
+            axis by ``angle * k`` per unit of length
+        angle (float): Rotation per frame in radians
+        bulge (float): Amplitude of an out-of-plane bulge that changes with every frame
+            and that linear blend skinning cannot follow
+        curl (float): Rate at which the end of the strip beyond x = 1.5 curls out of plane
+
+    Returns:
+        tuple: (rest [3, nx * ny], frames [num_frames, 3, nx * ny], faces [num_faces, 4])
+    """
+    xs, ys = np.meshgrid(np.linspace(0, 2, nx), np.linspace(0, 0.4, ny), indexing="ij")
+    rest = np.vstack([xs.ravel(), ys.ravel(), np.zeros(nx * ny)])
+    faces = np.array(
+        [
+            [i * ny + j, (i + 1) * ny + j, (i + 1) * ny + j + 1, i * ny + j + 1]
+            for i in range(nx - 1)
+            for j in range(ny - 1)
+        ]
+    ).reshape(-1, 4)
+
+    right = rest[0] > 1
+    tip = rest[0] > 1.5
+    frames = np.repeat(rest[np.newaxis], num_frames, axis=0)
+    for k in range(num_frames):
+        if motion == "hinge":
+            c, s = np.cos(angle * k), np.sin(angle * k)
+            rotation = np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+            frames[k][:, right] = rotation @ (rest[:, right] - [[1], [0], [0]]) + [[1], [0], [0]]
+        elif motion == "bend":
+            turn = angle * k * rest[0]
+            frames[k] = [rest[0] * np.cos(turn), rest[0] * np.sin(turn) + rest[1], rest[2]]
+        else:
+            raise ValueError(f"Unknown motion {motion!r}")
+        frames[k][2] += bulge * np.sin(0.3 * k) * np.sin(np.pi * rest[0]) * rest[1]
+        frames[k][2, tip] += curl * k * (rest[0, tip] - 1.5) ** 2
+    return rest, frames, faces
+
+
+@pytest.fixture
+def bending_strip():
+    """Factory of animated quad strips, see _bending_strip() for its arguments."""
+    return _bending_strip
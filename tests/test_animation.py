@@ -0,0 +1,82 @@
+"""
+Tests for keyframe reduction in py_dem_bones.animation.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ComputationError, ParameterError
+from py_dem_bones.animation import reduce_keyframes
+from py_dem_bones.base import DemBonesExtWrapper
+
+
+def skin(transformations, rest_pose, weights):
+    """Skin a [3, num_vertices] rest pose with [num_frames, num_bones, 4, 4] transformations."""
+    homogeneous = np.vstack([rest_pose, np.ones(rest_pose.shape[1])])
+    return np.einsum("bv,fbij,jv->fiv", weights, transformations[:, :, :3], homogeneous)
+
+
+def evaluate(curves, times):
+    """Evaluate the curves of all bones as [num_frames, num_bones, 4, 4] transformations."""
+    return np.stack([bone.evaluate(times) for bone in curves], axis=1)
+
+
+def test_reduce_keyframes():
+    """Test that linear motion keeps its end keys and curved motion stays within the tolerance."""
+    times = np.cumsum(np.linspace(0.5, 1.5, 30))
+    rest = np.vstack([np.linspace(0, 2, 20), np.zeros(20), np.zeros(20)])
+    weights = np.vstack([np.linspace(1, 0, 20), np.linspace(0, 1, 20)])
+
+    # Bone 0 turns at a constant rate around z, bone 1 moves along a line, then a parabola
+    transformations = np.tile(np.eye(4), (30, 2, 1, 1))
+    angles = np.radians(90) * (times - times[0]) / (times[-1] - times[0])
+    transformations[:, 0, 0, 0] = transformations[:, 0, 1, 1] = np.cos(angles)
+    transformations[:, 0, 1, 0] = np.sin(angles)
+    transformations[:, 0, 0, 1] = -np.sin(angles)
+    transformations[:, 1, 0, 3] = 0.1 * times
+    curves = reduce_keyframes(transformations, rest, weights, 1e-4, times=times, workers=2)
+    assert [bone.num_keys for bone in curves] == [6, 6]
+    assert np.array_equal(curves[0].rotation_times, times[[0, -1]])
+    assert np.allclose(evaluate(curves, times), transformations)
+
+    transformations[:, 1, 1, 3] = 0.002 * times**2
+    counts = []
+    for tolerance in (3e-2, 1e-2):
+        curves = reduce_keyframes(transformations, rest, weights, tolerance, times=times)
+        reduced = skin(evaluate(curves, times), rest, weights)
+        errors = np.linalg.norm(reduced - skin(transformations, rest, weights), axis=1)
+        assert errors.max() <= tolerance
+        counts.append(curves[1].translation_times.size)
+    assert 2 < counts[0] < counts[1] < 30
+
+    with pytest.raises(ParameterError):
+        reduce_keyframes(transformations, rest, weights, 0)
+    with pytest.raises(ParameterError):
+        reduce_keyframes(transformations, rest, weights, 1e-3, times=times[::-1])
+    with pytest.raises(ParameterError):
+        reduce_keyframes(transformations, rest, weights[:1], 1e-3)
+
+
+def test_wrapper_reduce_keyframes(bending_strip):
+    """Test reducing solved transformations with the frame times of the native solver."""
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=12, motion="bend", angle=0.075)
+    wrapper = DemBonesExtWrapper()
+    with pytest.raises(ComputationError):
+        wrapper.reduce_keyframes(1e-3)
+
+    wrapper.num_bones = 3
+    wrapper.num_iterations = 10
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    wrapper.compute()
+    times = np.arange(12) / 24.0
+    wrapper._dem_bones.fTime = times
+
+    curves = wrapper.reduce_keyframes(5e-3)
+    assert len(curves) == wrapper.num_bones
+    assert all(np.isin(bone.rotation_times, times).all() for bone in curves)
+    assert sum(bone.num_keys for bone in curves) < 3 * 12 * wrapper.num_bones
+    reduced = skin(evaluate(curves, times), rest, wrapper.get_weights())
+    errors = np.linalg.norm(reduced - wrapper.get_skinned_poses(), axis=1)
+    assert errors.max() <= 5e-3
@@ -61,3 +61,13 @@ def test_numpy_conversion():
     dem_bones.set_rest_pose(vertices)
     
     assert dem_bones.num_vertices == 4
+
+
+def test_build_info():
+    """Test that the build features of the native module are reported."""
+    info = pdb.build_info()
+    assert isinstance(info["openmp"], bool)
+    assert info["max_threads"] >= 1
+    assert isinstance(info["simd"], str)
+    assert info["eigen_version"].count(".") == 2
+    assert info["blas"] in ("eigen", "blas", "mkl")
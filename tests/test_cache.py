@@ -0,0 +1,103 @@
+"""
+Tests for the result cache in py_dem_bones.cache.
+"""
+
+import os
+
+import numpy as np
+import pytest
+from py_dem_bones import ParameterError
+from py_dem_bones.base import DemBonesWrapper
+from py_dem_bones.cache import ResultCache, ResultHasher
+
+
+def create_wrapper(bending_strip, cache, num_frames=8):
+    """Create a wrapper for a quad strip whose right half rotates around x = 1."""
+    rest, frames, faces = bending_strip(num_frames=num_frames)
+
+    wrapper = DemBonesWrapper()
+    wrapper.num_bones = 2
+    wrapper.num_iterations = 5
+    wrapper.result_cache = cache
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    return wrapper
+
+
+def test_result_hasher(tmp_path):
+    """Test that the hash depends on the content, shape and type of the inputs only."""
+    data = np.random.default_rng(0).random((600, 7))
+    np.save(tmp_path / "data.npy", data)
+    mapped = np.load(tmp_path / "data.npy", mmap_mode="r")
+
+    key = ResultHasher().update_array("v", data).update_value("nB", 2).hexdigest()
+    assert ResultHasher().update_array("v", mapped).update_value("nB", 2).hexdigest() == key
+    assert ResultHasher().update_array("v", np.asfortranarray(data)).update_value("nB", 2).hexdigest() == key
+    assert ResultHasher().update_array("v", data).update_value("nB", 3).hexdigest() != key
+    assert ResultHasher().update_array("v", data.reshape(300, 14)).update_value("nB", 2).hexdigest() != key
+    assert ResultHasher().update_array("v", data.astype(np.float32)).update_value("nB", 2).hexdigest() != key
+
+
+def test_result_cache(tmp_path):
+    """Test storing, loading and least-recently-used eviction of results."""
+    weights = np.array([[1.0, 0.25, 0.0], [0.0, 0.75, 1.0]])
+    transformations = np.tile(np.eye(4), (2, 2))
+    cache = ResultCache(tmp_path)
+    assert cache.load("a") is None
+
+    cache.store("a", weights, transformations, {"rmse": 0.5})
+    result = cache.load("a")
+    assert result["num_bones"] == 2
+    assert np.array_equal(result["weights"], weights)
+    assert np.array_equal(result["transformations"], transformations)
+    assert result["report"] == {"rmse": 0.5}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Reading "a" makes "b" the least recently used entry
+    cache.store("b", weights, transformations)
+    for key, age in (("a", 200), ("b", 100)):
+        os.utime(tmp_path / f"{key}.npz", (1e9 + age, 1e9 + age))
+    cache.load("a")
+    cache.max_bytes = cache.size
+    cache.store("c", weights, transformations)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.npz", "c.npz"]
+
+    cache.clear()
+    assert cache.size == 0
+
+    with pytest.raises(ParameterError):
+        ResultCache(tmp_path, max_bytes=0)
+
+
+def test_cached_compute(tmp_path, bending_strip):
+    """Test that identical solves are loaded from the cache and changed solves are not."""
+    cache = ResultCache(tmp_path / "results")
+    solved = create_wrapper(bending_strip, cache)
+    solved.compute()
+    assert solved.solve_report["cache_hit"] is False
+
+    loaded = create_wrapper(bending_strip, cache)
+    loaded.compute()
+    assert loaded.solve_report["cache_hit"] is True
+    assert np.allclose(loaded.get_weights(), solved.get_weights())
+    assert np.allclose(loaded.get_transformations(), solved.get_transformations())
+
+    changed = create_wrapper(bending_strip, cache)
+    changed.num_iterations = 6
+    changed.compute()
+    assert changed.solve_report["cache_hit"] is False
+
+    appended = create_wrapper(bending_strip, cache, num_frames=9)
+    appended.compute()
+    assert appended.solve_report["cache_hit"] is False
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # Incremental updates bypass the cache
+    appended.replace_frames([8], appended._dem_bones.get_animated_poses()[-3:].reshape(1, 3, -1) * 1.01)
+    appended.compute()
+    assert "cache_hit" not in appended.solve_report
+
+    with pytest.raises(ParameterError):
+        appended.result_cache = str(tmp_path)
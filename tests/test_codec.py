@@ -0,0 +1,78 @@
+"""
+Tests for mesh sequence compression in py_dem_bones.codec.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import IndexError, IOError, ParameterError
+from py_dem_bones.codec import _neighbour_faces, decode, describe, encode
+
+
+def rms_error(decoded, frames):
+    """Root mean square vertex distance of two [num_frames, 3, num_vertices] sequences."""
+    return np.sqrt(np.mean(np.sum(np.square(decoded - frames), axis=1)))
+
+
+def test_encode_decode(bending_strip):
+    """Test that encodings reach the target error and decode frames at random."""
+    _, frames, faces = bending_strip(nx=30, ny=5, num_frames=60, motion="bend", angle=0.02, bulge=0.05)
+    blob = encode(frames, target_error=2e-3, max_bones=4, faces=faces, num_iterations=10)
+    info = describe(blob)
+    assert info["num_frames"] == 60 and info["num_vertices"] == 150
+    assert info["residual_rank"] > 0
+    assert info["compression_ratio"] == pytest.approx(frames.astype(np.float32).nbytes / len(blob))
+
+    decoded = decode(blob)
+    assert decoded.dtype == np.float32 and decoded.shape == frames.shape
+    assert rms_error(decoded, frames) == pytest.approx(info["rms_error"], rel=1e-4)
+    assert info["rms_error"] <= 2e-3
+    assert np.array_equal(decode(blob, slice(10, 20)), decoded[10:20])
+    assert np.array_equal(decode(blob, [42, 3]), decoded[[42, 3]])
+    assert np.array_equal(decode(bytearray(blob), 7), decoded[[7]])
+
+    # A looser target is reached by skinning alone, without faces
+    coarse = encode(frames, target_error=5e-2, max_bones=4, residual_rank=0, num_iterations=10)
+    assert describe(coarse)["residual_rank"] == 0
+    assert len(coarse) < len(blob)
+    assert rms_error(decode(coarse), frames) <= 5e-2
+
+
+def test_neighbour_faces():
+    """Test that vertices without faces are joined to their nearest neighbours, also in sparse regions."""
+    points = np.random.default_rng(4).random((3, 400))
+    points[:, :20] *= 10
+
+    triangles = _neighbour_faces(points, 4)
+
+    assert triangles.dtype == np.int32 and triangles.shape == (400 * 3, 3)
+    distances = np.sum(np.square(points.T[:, None] - points.T[None]), axis=2)
+    np.fill_diagonal(distances, np.inf)
+    nearest = np.sort(np.argsort(distances, axis=1)[:, :4], axis=1)
+    fans = triangles.reshape(400, 3, 3)
+    neighbours = np.sort(np.hstack([fans[:, 0, 1:], fans[:, 1:, 2]]), axis=1)
+    assert np.array_equal(triangles[:, 0], np.repeat(np.arange(400), 3))
+    assert np.mean(np.all(neighbours == nearest, axis=1)) > 0.9
+    assert _neighbour_faces(points[:, :2], 4).shape == (0, 3)
+
+
+def test_codec_errors(bending_strip):
+    """Test that invalid sequences, settings and blobs are rejected."""
+    _, frames, faces = bending_strip(nx=30, ny=5, num_frames=4, motion="bend", angle=0.02, bulge=0.05)
+    with pytest.raises(ParameterError):
+        encode(frames[:, :2])
+    with pytest.raises(ParameterError):
+        encode(frames, target_error=0)
+    with pytest.raises(ParameterError):
+        encode(frames, max_bones=0)
+    with pytest.raises(ParameterError):
+        encode(frames, rest_pose=frames[0, :, :10])
+
+    blob = encode(frames, target_error=1e-2, max_bones=2, faces=faces, num_iterations=5)
+    with pytest.raises(IndexError):
+        decode(blob, [4])
+    with pytest.raises(IOError):
+        decode(b"DBSKIN" + blob[6:])
+    with pytest.raises(IOError):
+        decode(blob[: len(blob) // 2])
+    with pytest.raises(IOError):
+        describe(b"")
@@ -0,0 +1,77 @@
+"""
+Tests for corrective shape extraction in py_dem_bones.corrective.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ComputationError, IndexError, ParameterError
+from py_dem_bones.base import DemBonesWrapper
+from py_dem_bones.corrective import CorrectiveShapes, extract_correctives
+
+
+def rms_error(poses, targets):
+    """Root mean square vertex distance of two [num_frames, 3, num_vertices] sequences."""
+    return np.sqrt(np.mean(np.sum(np.square(poses - targets), axis=1)))
+
+
+def test_extract_correctives():
+    """Test that a low-rank residual is recovered exactly from streamed chunks."""
+    rng = np.random.default_rng(3)
+    shapes = rng.standard_normal((3, 3, 40))
+    coefficients = rng.standard_normal((25, 3)) * [4.0, 2.0, 1.0]
+    residual = np.einsum("fk,kiv->fiv", coefficients, shapes)
+
+    def chunks():
+        for start in range(0, 25, 7):
+            yield start, residual[start : start + 7]
+
+    correctives = extract_correctives(chunks, 25, num_shapes=5)
+    assert correctives.num_shapes == 5 and correctives.num_frames == 25 and correctives.num_vertices == 40
+    assert np.allclose(correctives.evaluate(), residual, atol=1e-4)
+    assert correctives.rms_error < 1e-4
+    assert np.allclose(correctives.evaluate([4, 20]), residual[[4, 20]], atol=1e-4)
+
+    # The target error stops at the rank of the residual
+    correctives = extract_correctives(chunks, 25, num_shapes=5, target_error=1e-3)
+    assert correctives.num_shapes == 3
+    fewer = extract_correctives(chunks, 25, num_shapes=2)
+    assert fewer.rms_error == pytest.approx(rms_error(fewer.evaluate(), residual), rel=1e-3)
+
+    with pytest.raises(IndexError):
+        correctives.evaluate([25])
+    with pytest.raises(ParameterError):
+        extract_correctives(chunks, 30)
+    with pytest.raises(ParameterError):
+        extract_correctives(chunks, 25, num_shapes=0)
+    with pytest.raises(ParameterError):
+        CorrectiveShapes(shapes, coefficients[:, :2])
+
+
+def test_wrapper_correctives(bending_strip):
+    """Test that a few correctives on a coarse decomposition follow a non-rigid bulge."""
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=40, motion="bend", angle=0.02, bulge=0.05)
+
+    wrapper = DemBonesWrapper()
+    with pytest.raises(ComputationError):
+        wrapper.extract_correctives()
+    wrapper.num_bones = 2
+    wrapper.num_iterations = 10
+    wrapper.set_rest_pose(rest)
+    wrapper.set_animated_poses(frames)
+    wrapper.set_faces(faces)
+    wrapper.compute()
+
+    correctives = wrapper.extract_correctives(num_shapes=6, chunk_frames=16)
+    skinning_error = rms_error(wrapper.get_skinned_poses(), frames)
+    corrected = wrapper.get_corrected_poses(correctives)
+    assert corrected.shape == frames.shape
+    assert rms_error(corrected, frames) == pytest.approx(correctives.rms_error, rel=1e-3)
+    assert correctives.rms_error < 0.1 * skinning_error
+    assert np.allclose(wrapper.get_corrected_poses(correctives, [3, 30]), corrected[[3, 30]])
+
+    target = wrapper.extract_correctives(num_shapes=6, target_error=0.5 * skinning_error)
+    assert 0 < target.num_shapes < 6 and target.rms_error <= 0.5 * skinning_error
+    with pytest.raises(ParameterError):
+        wrapper.get_corrected_poses(CorrectiveShapes(correctives.shapes, correctives.coefficients[:10]))
+    with pytest.raises(ParameterError):
+        wrapper.extract_correctives(chunk_frames=0)
@@ -143,11 +143,83 @@ class TestBaseDCCInterface:
         assert dcc.dem_bones.num_vertices == 10
         assert dcc.dem_bones.bone_names == bone_names
 
+        # Test import with faces
+        faces = np.array([[0, 1, 2], [2, 3, 4]])
+        assert dcc.from_dcc_data(rest_pose, target_poses, faces=faces) is True
+        assert dcc.dem_bones._dem_bones.fv == faces.tolist()
+
+        # Test import with polygons of mixed size
+        indices = np.array([0, 1, 2, 2, 3, 4, 5])
+        assert dcc.from_dcc_data(rest_pose, target_poses, faces=indices, face_offsets=np.array([0, 3, 7])) is True
+        assert dcc.dem_bones._dem_bones.fv == [[0, 1, 2], [2, 3, 4, 5]]
+
         # Test with None dem_bones
         dcc._dem_bones = None
         result = dcc.from_dcc_data(rest_pose, target_poses)
         assert result is False
 
+    def test_from_dcc_pose_tensor(self, tmp_path):
+        """Test importing target poses from a memory-mapped [num_frames, num_vertices, 3] tensor."""
+        dcc = BaseDCCInterface()
+        rest_pose = np.random.default_rng(2).random((10, 3))
+        frames = rest_pose + np.arange(6)[:, np.newaxis, np.newaxis] * [0.0, 0.1, 0.0]
+        np.save(tmp_path / "frames.npy", frames)
+        mapped = np.load(tmp_path / "frames.npy", mmap_mode="r")
+
+        # A Z-up DCC, converted to the Y-up DemBones system
+        z_up_to_y_up = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, -1, 0, 0], [0, 0, 0, 1]])
+        dcc.set_coordinate_system(z_up_to_y_up)
+        assert dcc.from_dcc_data(rest_pose, mapped) is True
+        assert dcc.dem_bones.num_frames == 6
+        poses = dcc.dem_bones._dem_bones.get_animated_poses().reshape(6, 3, 10)
+        expected = dcc.apply_coordinate_system_transform(frames)
+        assert np.allclose(poses, expected.transpose(0, 2, 1))
+        assert np.allclose(dcc.dem_bones._dem_bones.get_rest_pose(), dcc.apply_coordinate_system_transform(rest_pose).T)
+        assert np.array_equal(mapped, frames)
+
+    def test_fill_target_poses(self):
+        """Test that subclasses can fill a preallocated pose buffer."""
+
+        class SampledDCCInterface(BaseDCCInterface):
+            def fill_target_poses(self, out, offset=0.0, **kwargs):
+                for frame in range(out.shape[0]):
+                    out[frame] = frame + offset
+
+        dcc = SampledDCCInterface()
+        assert dcc.from_dcc_data(np.zeros((4, 3)), num_frames=3, offset=0.5) is True
+        poses = dcc.dem_bones._dem_bones.get_animated_poses()
+        assert poses.shape == (9, 4)
+        assert np.allclose(poses[6:], 2.5)
+
+        # Without target poses, the number of frames is required
+        assert dcc.from_dcc_data(np.zeros((4, 3))) is False
+        # The base class has no scene to sample
+        assert BaseDCCInterface().from_dcc_data(np.zeros((4, 3)), num_frames=2) is False
+
+    def test_from_dcc_data_two_argument_transform(self):
+        """Test importing with a coordinate transform override without an out argument."""
+
+        class ZUpDCCInterface(BaseDCCInterface):
+            def apply_coordinate_system_transform(self, data, from_dcc=True):
+                return np.asarray(data)[..., [0, 2, 1]] * [1, 1, -1]
+
+        dcc = ZUpDCCInterface()
+        rest_pose = np.random.default_rng(4).random((5, 3))
+        target_poses = [rest_pose + 0.1, rest_pose + 0.2]
+        assert dcc.from_dcc_data(rest_pose, target_poses) is True
+        poses = dcc.dem_bones._dem_bones.get_animated_poses().reshape(2, 3, 5)
+        expected = dcc.apply_coordinate_system_transform(np.array(target_poses))
+        assert np.allclose(poses, expected.transpose(0, 2, 1))
+
+        class SampledZUpDCCInterface(ZUpDCCInterface):
+            def fill_target_poses(self, out, **kwargs):
+                out[:] = rest_pose
+
+        dcc = SampledZUpDCCInterface()
+        assert dcc.from_dcc_data(rest_pose, num_frames=2) is True
+        poses = dcc.dem_bones._dem_bones.get_animated_poses().reshape(2, 3, 5)
+        assert np.allclose(poses[1], dcc.apply_coordinate_system_transform(rest_pose).T)
+
     def test_to_dcc_data(self):
         """Test the to_dcc_data method."""
         dcc = BaseDCCInterface()
@@ -166,6 +238,16 @@ class TestBaseDCCInterface:
         assert "bone_names" in result
         assert result["bone_names"] == ["bone1", "bone2"]
 
+        # Test export of influence tables
+        weights = np.zeros((2, 10))
+        weights[0, :4] = 1.0
+        weights[1, 4:] = 1.0
+        dcc.dem_bones.set_weights(weights)
+        result = dcc.to_dcc_data(max_influences=1)
+        assert result["influence_indices"].shape == (10, 1)
+        assert result["influence_indices"][:, 0].tolist() == [0] * 4 + [1] * 6
+        assert np.allclose(result["influence_weights"], 1.0)
+
         # Test with None dem_bones
         dcc._dem_bones = None
         result = dcc.to_dcc_data()
@@ -215,3 +297,48 @@ class TestBaseDCCInterface:
 
         with pytest.raises(ValueError):
             dcc.set_coordinate_system("not a matrix")
+
+    def test_convert_matrix_stacks(self):
+        """Test batched conversion of matrix stacks with a Z-up to Y-up transform."""
+        dcc = BaseDCCInterface()
+        z_up_to_y_up = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [0, -1, 0, 0], [0, 0, 0, 1]])
+        dcc.set_coordinate_system(z_up_to_y_up)
+        assert np.allclose(dcc._coord_inverse, np.linalg.inv(z_up_to_y_up))
+
+        rng = np.random.default_rng(0)
+        matrices = np.tile(np.eye(4), (5, 3, 1, 1))
+        matrices[..., :3, :] = rng.random((5, 3, 3, 4))
+        result = dcc.convert_matrices(matrices)
+        assert result.shape == (5, 3, 4, 4)
+        expected = z_up_to_y_up @ matrices[2, 1] @ np.linalg.inv(z_up_to_y_up)
+        assert np.allclose(result[2, 1], expected)
+        assert np.allclose(dcc.convert_matrices(result, from_dcc=False), matrices)
+
+        # Convert in place
+        converted = matrices.copy()
+        assert dcc.convert_matrices(converted, out=converted) is converted
+        assert np.allclose(converted, result)
+
+        # Single precision input stays single precision
+        assert dcc.convert_matrices(matrices.astype(np.float32)).dtype == np.float32
+
+    def test_apply_coordinate_system_transform(self):
+        """Test batched transformation of vertex stacks."""
+        dcc = BaseDCCInterface()
+        points = np.random.default_rng(1).random((4, 10, 3))
+        assert np.array_equal(dcc.apply_coordinate_system_transform(points), points)
+
+        transform = np.array([[1, 0, 0, 1], [0, 0, 1, 2], [0, -1, 0, 3], [0, 0, 0, 1]])
+        dcc.set_coordinate_system(transform)
+        result = dcc.apply_coordinate_system_transform(points)
+        assert result.shape == (4, 10, 3)
+        assert np.allclose(result[3, 7], (transform @ np.append(points[3, 7], 1))[:3])
+        assert np.allclose(dcc.apply_coordinate_system_transform(result, from_dcc=False), points)
+
+        buffer = np.empty_like(points)
+        assert dcc.apply_coordinate_system_transform(points, out=buffer) is buffer
+        assert np.allclose(buffer, result)
+
+        # Data without 3 coordinates per point is returned unchanged
+        odd_shape = np.ones((10, 2))
+        assert dcc.apply_coordinate_system_transform(odd_shape) is odd_shape
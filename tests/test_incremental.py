@@ -0,0 +1,115 @@
+"""
+Tests for incremental recomputation after frame edits.
+
+This module tests the frame dirty tracking of DemBonesWrapper and the incremental
+update performed by compute().
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import IndexError, ParameterError
+from py_dem_bones.base import DemBonesWrapper
+
+
+def bend_strip(rest, angle):
+    """Rotate the right half of a strip around x = 1."""
+    rotation = np.array([
+        [np.cos(angle), -np.sin(angle), 0],
+        [np.sin(angle), np.cos(angle), 0],
+        [0, 0, 1],
+    ])
+    pose = rest.copy()
+    right = rest[0] > 1
+    pose[:, right] = rotation @ (rest[:, right] - [[1], [0], [0]]) + [[1], [0], [0]]
+    return pose
+
+
+def create_solved_wrapper(bending_strip, num_frames=10):
+    """Create a wrapper holding a solved two-bone decomposition of a bending strip."""
+    rest, frames, faces = bending_strip(num_frames=num_frames)
+
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        dem_bones.set_target_vertices(k, frame)
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.compute()
+    return dem_bones, rest
+
+
+def test_dirty_frames_tracking(bending_strip):
+    """Test that edited frames are tracked until the next solve."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    assert dem_bones.dirty_frames == []
+
+    dem_bones.set_target_vertices(4, bend_strip(rest, 0.5))
+    dem_bones.replace_frames([7, 2], np.stack([bend_strip(rest, 0.1), bend_strip(rest, 0.2)]))
+    assert dem_bones.dirty_frames == [2, 4, 7]
+
+    dem_bones.compute()
+    assert dem_bones.dirty_frames == []
+
+
+def test_replace_frames_updates_only_changed_transforms(bending_strip):
+    """Test that untouched frames keep their transformations."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    transforms = dem_bones._dem_bones.m.copy()
+
+    dem_bones.replace_frames([3], bend_strip(rest, -0.3)[np.newaxis])
+    assert np.allclose(dem_bones._dem_bones.get_animated_poses()[9:12], bend_strip(rest, -0.3))
+
+    dem_bones.compute()
+
+    new_transforms = dem_bones._dem_bones.m
+    untouched = np.ones(transforms.shape[0], dtype=bool)
+    untouched[12:16] = False
+    assert np.allclose(new_transforms[untouched], transforms[untouched])
+    assert not np.allclose(new_transforms[12:16], transforms[12:16])
+    assert dem_bones._dem_bones.rmse() < 1e-3
+
+
+def test_appended_frames_are_solved_incrementally(bending_strip):
+    """Test that frames added after a solve receive transformations."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    transforms = dem_bones._dem_bones.m.copy()
+
+    dem_bones.set_target_vertices(10, bend_strip(rest, 0.85))
+    dem_bones.set_target_vertices(11, bend_strip(rest, 0.9))
+    dem_bones.compute()
+
+    assert dem_bones._dem_bones.m.shape == (48, 8)
+    assert np.allclose(dem_bones._dem_bones.m[:40], transforms)
+    assert dem_bones._dem_bones.rmse() < 1e-3
+
+
+def test_incremental_update_invalidation(bending_strip):
+    """Test the conditions that force a full solve."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    assert not dem_bones._can_update_incrementally()
+
+    dem_bones.mark_frames_dirty([1])
+    assert dem_bones._can_update_incrementally()
+
+    dem_bones.mark_frames_dirty()
+    assert not dem_bones._can_update_incrementally()
+
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    dem_bones.mark_frames_dirty([1])
+    dem_bones.set_rest_pose(rest)
+    assert not dem_bones._can_update_incrementally()
+
+
+def test_replace_frames_errors(bending_strip):
+    """Test error handling of replace_frames and mark_frames_dirty."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+
+    with pytest.raises(ParameterError):
+        dem_bones.replace_frames([0], rest)
+
+    with pytest.raises(IndexError):
+        dem_bones.replace_frames([10], rest[np.newaxis])
+
+    with pytest.raises(IndexError):
+        dem_bones.mark_frames_dirty([-1])
@@ -0,0 +1,283 @@
+"""
+Tests for the mesh sequence readers and writers in py_dem_bones.io.
+"""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+from py_dem_bones import IndexError, IOError, ParameterError
+from py_dem_bones.base import DemBonesExtWrapper, DemBonesWrapper
+from py_dem_bones.io import (
+    decompose_transformations,
+    export_gltf,
+    read_obj,
+    read_obj_sequence,
+    read_point_cache,
+    write_point_cache,
+)
+from py_dem_bones.storage import FrameStore
+
+
+def write_obj(path, vertices, faces):
+    """Write a mesh with vertices of shape [3, num_vertices] as an OBJ file with texture references."""
+    lines = ["# test mesh", "o mesh"]
+    lines += [f"v {x:.9g} {y:.9g} {z:.9g}" for x, y, z in vertices.T]
+    lines += ["vt 0 0"]
+    lines += ["f " + " ".join(f"{i + 1}/1" for i in face) for face in faces]
+    path.write_text("\r\n".join(lines) + "\n")
+
+
+def create_sequence(tmp_path, num_frames=12):
+    """Write a wave travelling over a grid of triangles and quads as numbered OBJ files."""
+    xs, ys = np.meshgrid(np.linspace(0, 1, 6), np.linspace(0, 1, 5), indexing="ij")
+    rest = np.vstack([xs.ravel(), ys.ravel(), np.zeros(30)])
+    faces = [[0, 5, 6], [0, 6, 1]] + [[i * 5 + j, (i + 1) * 5 + j, (i + 1) * 5 + j + 1, i * 5 + j + 1]
+                                      for i in range(5) for j in range(1, 4)]
+    frames = np.repeat(rest[np.newaxis], num_frames, axis=0)
+    frames[:, 2] = np.sin(rest[0] * 4 + np.arange(num_frames)[:, np.newaxis] * 0.5)
+    for k in range(num_frames):
+        write_obj(tmp_path / f"frame_{k}.obj", frames[k], faces)
+    return frames, faces
+
+
+def read_glb(path):
+    """Read the JSON document and the binary buffer of a .glb file."""
+    data = path.read_bytes()
+    magic, version, length = struct.unpack_from("<III", data)
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    json_length, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == 0x4E4F534A
+    document = json.loads(data[20 : 20 + json_length])
+    bin_length, bin_type = struct.unpack_from("<II", data, 20 + json_length)
+    assert bin_type == 0x004E4942
+    return document, data[28 + json_length : 28 + json_length + bin_length]
+
+
+def read_accessor(document, blob, index):
+    """Read an accessor of a glTF document as a [count, components] array."""
+    accessor = document["accessors"][index]
+    view = document["bufferViews"][accessor["bufferView"]]
+    dtype = {5121: np.uint8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[accessor["componentType"]]
+    components = {"SCALAR": 1, "VEC3": 3, "VEC4": 4, "MAT4": 16}[accessor["type"]]
+    offset = view["byteOffset"] + accessor.get("byteOffset", 0)
+    count = accessor["count"]
+    return np.frombuffer(blob, dtype, count * components, offset).reshape(count, components)
+
+
+def trs_matrices(translation, rotation, scale):
+    """Compose [n, 4, 4] matrices from glTF translations, (x, y, z, w) rotations and scales."""
+    x, y, z, w = np.asarray(rotation, dtype=np.float64).T
+    matrices = np.tile(np.eye(4), (len(x), 1, 1))
+    matrices[:, :3, :3] = np.stack([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ]).transpose(2, 0, 1) * np.asarray(scale)[:, np.newaxis, :]
+    matrices[:, :3, 3] = translation
+    return matrices
+
+
+def test_read_obj(tmp_path):
+    """Test reading a single OBJ file."""
+    frames, faces = create_sequence(tmp_path, num_frames=1)
+
+    vertices, obj_faces = read_obj(tmp_path / "frame_0.obj")
+    assert vertices.shape == (3, 30)
+    assert np.allclose(vertices, frames[0])
+    assert obj_faces == faces
+
+
+def test_read_obj_sequence(tmp_path):
+    """Test that frames are read in numeric order into one buffer."""
+    frames, faces = create_sequence(tmp_path)
+
+    result, obj_faces = read_obj_sequence(str(tmp_path / "frame_*.obj"), workers=4)
+    assert result.shape == (12, 3, 30)
+    assert np.allclose(result, frames)
+    assert obj_faces == faces
+
+    target = FrameStore.create(tmp_path / "frames.npy", 12, 30)
+    result, _ = read_obj_sequence(str(tmp_path / "frame_*.obj"), out=target)
+    assert np.shares_memory(result, target)
+    assert np.allclose(target, frames, atol=1e-6)
+
+    buffer = np.zeros((36, 30))
+    read_obj_sequence([tmp_path / f"frame_{k}.obj" for k in range(12)], workers=1, out=buffer)
+    assert np.allclose(buffer, frames.reshape(36, 30))
+
+
+def test_read_obj_sequence_errors(tmp_path):
+    """Test error handling of the sequence reader."""
+    frames, faces = create_sequence(tmp_path, num_frames=3)
+
+    with pytest.raises(IOError):
+        read_obj_sequence(str(tmp_path / "missing_*.obj"))
+
+    with pytest.raises(ParameterError):
+        read_obj_sequence(str(tmp_path / "frame_*.obj"), out=np.zeros((2, 3, 30)))
+
+    write_obj(tmp_path / "frame_3.obj", frames[0], faces[1:])
+    with pytest.raises(ParameterError):
+        read_obj_sequence(str(tmp_path / "frame_*.obj"))
+
+    (tmp_path / "broken.obj").write_text("v 0 0 0\nv 1 0\nf 1 2 3\n")
+    with pytest.raises(IOError):
+        read_obj(tmp_path / "broken.obj")
+
+    (tmp_path / "range.obj").write_text("v 0 0 0\nv 1 0 0\nf 1 2 3\n")
+    with pytest.raises(IOError):
+        read_obj(tmp_path / "range.obj")
+
+
+@pytest.mark.parametrize("extension, byte_order", [(".pc2", "<"), (".mdd", ">")])
+def test_point_cache(tmp_path, extension, byte_order):
+    """Test writing and memory-mapped reading of point caches with frame ranges."""
+    frames = np.random.default_rng(0).normal(size=(6, 3, 20)).astype(np.float32)
+    path = tmp_path / f"cache{extension}"
+    write_point_cache(path, frames, times=np.arange(6) * 0.5 + 10)
+
+    poses, times = read_point_cache(path)
+    assert isinstance(poses, np.memmap)
+    assert poses.dtype == np.dtype(byte_order + "f4")
+    assert poses.shape == (6, 3, 20)
+    assert np.array_equal(poses, frames)
+    assert np.allclose(times, np.arange(6) * 0.5 + 10)
+
+    poses, times = read_point_cache(path, frame_range=(2, 5), mmap=False)
+    assert not isinstance(poses, np.memmap)
+    assert np.array_equal(poses, frames[2:5])
+    assert np.allclose(times, [11, 11.5, 12])
+
+    with pytest.raises(IndexError):
+        read_point_cache(path, frame_range=(4, 7))
+
+
+def test_point_cache_errors(tmp_path):
+    """Test error handling of the point cache readers and writers."""
+    with pytest.raises(ParameterError):
+        write_point_cache(tmp_path / "cache.abc", np.zeros((2, 3, 4)))
+
+    with pytest.raises(ParameterError):
+        write_point_cache(tmp_path / "cache.pc2", np.zeros((3, 3, 4)), times=[0, 1, 3])
+
+    (tmp_path / "broken.pc2").write_bytes(b"POINTCACHE1" + bytes(21))
+    with pytest.raises(IOError):
+        read_point_cache(tmp_path / "broken.pc2")
+
+    write_point_cache(tmp_path / "cache.mdd", np.zeros((3, 3, 4)))
+    data = (tmp_path / "cache.mdd").read_bytes()
+    (tmp_path / "cache.mdd").write_bytes(data[:-4])
+    with pytest.raises(IOError):
+        read_point_cache(tmp_path / "cache.mdd")
+
+
+def test_point_cache_solve(tmp_path, bending_strip):
+    """Test solving from a big-endian point cache and baking the reconstruction."""
+    rest, frames, faces = bending_strip(num_frames=8)
+    write_point_cache(tmp_path / "source.mdd", frames)
+
+    dem_bones = DemBonesWrapper.from_files(rest, tmp_path / "source.mdd")
+    assert isinstance(dem_bones._dem_bones, DemBonesWrapper._NATIVE_CLASSES[np.dtype(np.float32)])
+    assert np.allclose(dem_bones._dem_bones.get_animated_poses(), frames.reshape(24, -1), atol=1e-6)
+
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.compute()
+
+    skinned = dem_bones.get_skinned_poses([5, 2])
+    assert skinned.shape == (2, 3, 240)
+    assert np.allclose(skinned, frames[[5, 2]], atol=1e-3)
+
+    dem_bones.export_point_cache(tmp_path / "skinned.pc2", chunk_frames=3)
+    baked, times = read_point_cache(tmp_path / "skinned.pc2")
+    assert np.allclose(baked, frames, atol=1e-3)
+    assert np.array_equal(times, np.arange(8))
+
+    with pytest.raises(IndexError):
+        dem_bones.get_skinned_poses([8])
+
+
+def test_export_gltf(tmp_path, bending_strip):
+    """Test that the skinned glTF export reproduces the skinned reconstruction."""
+    # A strip that bends smoothly along its length, so that it needs several bones
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=6, motion="bend", angle=0.075)
+    dem_bones = DemBonesExtWrapper()
+    dem_bones.num_bones = 3
+    dem_bones.num_iterations = 10
+    dem_bones.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        dem_bones.set_target_vertices(k, frame)
+    dem_bones.set_faces(faces)
+    dem_bones.compute()
+    dem_bones.set_bone_names("root", "middle", "tip")
+    dem_bones.set_parent_bone("middle", "root")
+    dem_bones.set_parent_bone("tip", "middle")
+    bind = np.eye(4)
+    bind[:3, 3] = [1.0, 0.2, 0.0]
+    dem_bones.set_bind_matrix("tip", bind)
+
+    export_gltf(tmp_path / "skin.glb", dem_bones, faces, max_influences=6, fps=30.0)
+    document, blob = read_glb(tmp_path / "skin.glb")
+
+    primitive = document["meshes"][0]["primitives"][0]
+    assert np.allclose(read_accessor(document, blob, primitive["attributes"]["POSITION"]), rest.T)
+    triangles = read_accessor(document, blob, primitive["indices"]).reshape(-1, 3)
+    assert triangles.shape == (2 * len(faces), 3)
+    assert triangles[:2].tolist() == [faces[0, :3].tolist(), faces[0, [0, 2, 3]].tolist()]
+    joints = np.hstack([read_accessor(document, blob, primitive["attributes"][f"JOINTS_{n}"]) for n in range(2)])
+    weights = np.hstack([read_accessor(document, blob, primitive["attributes"][f"WEIGHTS_{n}"]) for n in range(2)])
+    assert np.allclose(weights.sum(axis=1), 1)
+
+    nodes = document["nodes"]
+    skin = document["skins"][0]
+    assert [nodes[j]["name"] for j in skin["joints"]] == ["root", "middle", "tip"]
+    inverse_bind = read_accessor(document, blob, skin["inverseBindMatrices"]).reshape(3, 4, 4).transpose(0, 2, 1)
+    assert np.allclose(inverse_bind[2], np.linalg.inv(bind))
+
+    # Evaluate the animation at its keyframes through the joint hierarchy
+    animation = document["animations"][0]
+    times = read_accessor(document, blob, animation["samplers"][0]["input"]).ravel()
+    assert np.allclose(times, np.arange(6) / 30.0)
+    tracks = {}
+    for channel in animation["channels"]:
+        sampler = animation["samplers"][channel["sampler"]]
+        tracks[channel["target"]["node"], channel["target"]["path"]] = read_accessor(document, blob, sampler["output"])
+    parents = {child: node for node in range(len(nodes)) for child in nodes[node].get("children", [])}
+    global_pose = {}
+    for node in skin["joints"]:
+        local = trs_matrices(tracks[node, "translation"], tracks[node, "rotation"], tracks[node, "scale"])
+        parent = parents[node]
+        global_pose[node] = global_pose[parent] @ local if parent in global_pose else local
+    joint_matrices = np.stack([global_pose[node] for node in skin["joints"]], axis=1) @ inverse_bind
+
+    homogeneous = np.vstack([rest, np.ones(rest.shape[1])])
+    vertex_matrices = np.einsum("vk,fvkij->fvij", weights, joint_matrices[:, joints])
+    skinned = np.einsum("fvij,jv->fiv", vertex_matrices, homogeneous)[:, :3]
+    assert np.allclose(skinned, dem_bones.get_skinned_poses(), atol=1e-4)
+
+    with pytest.raises(IndexError):
+        export_gltf(tmp_path / "bad.glb", dem_bones, [[0, 1, rest.shape[1]]])
+
+    with pytest.raises(ParameterError):
+        export_gltf(tmp_path / "bad.glb", dem_bones, faces, times=np.zeros(6))
+
+
+def test_decompose_transformations():
+    """Test splitting matrices into translations, continuous quaternions and scales."""
+    angles = np.linspace(0, 3 * np.pi, 7)
+    matrices = np.tile(np.eye(4), (7, 1, 1))
+    matrices[:, 0, 0] = matrices[:, 1, 1] = np.cos(angles)
+    matrices[:, 1, 0] = np.sin(angles)
+    matrices[:, 0, 1] = -np.sin(angles)
+    matrices[:, :3, :3] *= [2.0, 0.5, 1.0]
+    matrices[:, :3, 3] = np.arange(21).reshape(7, 3)
+
+    translations, rotations, scales = decompose_transformations(matrices[np.newaxis])
+    assert np.allclose(translations[0], matrices[:, :3, 3])
+    assert np.allclose(scales[0], [2.0, 0.5, 1.0])
+    assert np.allclose(np.abs(rotations[0, :, 3]), np.abs(np.cos(angles / 2)))
+    # Neighbouring quaternions stay in the same hemisphere
+    assert np.all(np.sum(rotations[0, 1:] * rotations[0, :-1], axis=-1) > 0)
@@ -0,0 +1,119 @@
+"""
+Tests for decimated proxy meshes and the coarse-to-fine solve.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ComputationError, ParameterError
+from py_dem_bones.base import DemBonesWrapper
+from py_dem_bones.multires import ProxyMesh
+
+
+def test_proxy_mesh_budget_and_averaging(bending_strip):
+    """Test that the proxy respects the vertex budget and sits at the cluster centroids."""
+    rest, _, faces = bending_strip(num_frames=0)
+
+    proxy = ProxyMesh(rest, 60, faces)
+
+    assert 0 < proxy.num_vertices <= 60
+    assert proxy.labels.shape == (rest.shape[1],)
+    assert proxy.rest_pose.shape == (3, proxy.num_vertices)
+    for label in range(proxy.num_vertices):
+        assert np.allclose(proxy.rest_pose[:, label], rest[:, proxy.labels == label].mean(axis=1))
+    assert len(proxy.faces) > 0
+    for face in proxy.faces:
+        assert len(set(face)) == len(face) >= 3
+        assert max(face) < proxy.num_vertices
+
+
+def test_proxy_mesh_full_budget_keeps_vertices(bending_strip):
+    """Test that a budget of all vertices keeps the mesh as it is."""
+    rest, _, faces = bending_strip(nx=5, ny=3, num_frames=0)
+
+    proxy = ProxyMesh(rest, rest.shape[1], faces)
+
+    assert proxy.num_vertices == rest.shape[1]
+    assert len(proxy.faces) == len(faces)
+
+
+def test_proxy_mesh_csr_faces(bending_strip):
+    """Test that CSR faces collapse like lists and that collapsed and repeated faces are dropped."""
+    rest, _, faces = bending_strip(num_frames=0)
+    faces = faces.tolist()
+    faces = faces + [faces[0][::-1], [0, 1, 1], [0, 2, 7, 7, 2]]
+    offsets = np.concatenate([[0], np.cumsum([len(face) for face in faces])])
+
+    proxy = ProxyMesh(rest, 60, np.concatenate(faces), offsets)
+
+    assert proxy.faces == ProxyMesh(rest, 60, faces).faces
+    assert proxy.num_faces == len(proxy.faces) == len(proxy.face_offsets) - 1
+    assert len({tuple(sorted(face)) for face in proxy.faces}) == proxy.num_faces
+
+    full = ProxyMesh(rest, rest.shape[1], np.concatenate(faces), offsets)
+    assert full.faces == faces[:-3] + [[0, 2, 7]]
+    assert ProxyMesh(rest, 60).faces == []
+
+
+def test_proxy_mesh_interpolation(bending_strip):
+    """Test that interpolation reproduces smooth data and is a partition of unity."""
+    rest, _, faces = bending_strip(num_frames=0)
+    proxy = ProxyMesh(rest, 60, faces)
+
+    values = np.vstack([np.ones(proxy.num_vertices), proxy.rest_pose[0]])
+    interpolated = proxy.interpolate(values, rest)
+
+    assert interpolated.shape == (2, rest.shape[1])
+    assert np.allclose(interpolated[0], 1.0)
+    assert np.max(np.abs(interpolated[1] - rest[0])) < 2 * proxy.cell_size
+
+    far = proxy.interpolate(values, np.array([[100.0], [0.0], [0.0]]))
+    assert np.allclose(far[1], proxy.rest_pose[0].max())
+
+
+def test_proxy_mesh_errors(bending_strip):
+    """Test error handling of the proxy construction."""
+    rest, _, _ = bending_strip(num_frames=0)
+
+    with pytest.raises(ParameterError):
+        ProxyMesh(rest, 0)
+
+    with pytest.raises(ParameterError):
+        ProxyMesh(rest.T, 10)
+
+    with pytest.raises(ParameterError):
+        ProxyMesh(rest, 10).average(np.zeros((3, 5)))
+
+
+def test_compute_multiresolution(bending_strip):
+    """Test that the coarse-to-fine solve matches a direct solve on a bending strip."""
+    rest, frames, faces = bending_strip()
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k, pose in enumerate(frames):
+        dem_bones.set_target_vertices(k, pose)
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+
+    report = dem_bones.compute_multiresolution(120, compare_direct=True)
+
+    assert report["proxy_vertices"] <= 120
+    assert report["rmse"] <= report["interpolated_rmse"]
+    assert report["rmse"] < 1e-4
+    assert report["direct_rmse"] < 1e-6
+    assert dem_bones.solve_report == report
+    weights = dem_bones.get_weights()
+    assert weights.shape == (2, rest.shape[1])
+    assert np.allclose(weights.sum(axis=0), 1.0)
+    assert dem_bones.dirty_frames == []
+
+
+def test_compute_multiresolution_errors():
+    """Test error handling of the coarse-to-fine solve."""
+    dem_bones = DemBonesWrapper()
+
+    with pytest.raises(ParameterError):
+        dem_bones.compute_multiresolution(0)
+
+    with pytest.raises(ComputationError):
+        dem_bones.compute_multiresolution(10)
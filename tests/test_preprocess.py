@@ -0,0 +1,263 @@
+"""
+Tests for the problem reduction passes in py_dem_bones.preprocess.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ParameterError
+from py_dem_bones.base import DemBonesWrapper
+from py_dem_bones.preprocess import (
+    find_duplicate_frames,
+    find_rigid_clusters,
+    find_static_vertices,
+    fit_rigid_transforms,
+    rigid_residuals,
+    select_keyframes,
+    select_streamed_keyframes,
+)
+
+
+def rotation_z(angle):
+    """Create a rotation matrix around the z axis."""
+    return np.array([
+        [np.cos(angle), -np.sin(angle), 0],
+        [np.sin(angle), np.cos(angle), 0],
+        [0, 0, 1],
+    ])
+
+
+def create_strip(bending_strip, num_frames=10, curl=0.0):
+    """Create a bending strip with its frames stacked into a [3 * num_frames, num_vertices] array."""
+    rest, frames, faces = bending_strip(num_frames=num_frames, curl=curl)
+    return rest, frames.reshape(-1, rest.shape[1]), faces.tolist()
+
+
+def test_fit_rigid_transforms():
+    """Test that a known rigid motion is recovered in every frame."""
+    rng = np.random.default_rng(0)
+    rest = rng.normal(size=(3, 50))
+    transforms = np.zeros((4, 4, 4))
+    transforms[:, 3, 3] = 1
+    for k in range(4):
+        transforms[k, :3, :3] = rotation_z(0.3 * k)
+        transforms[k, :3, 3] = [k, -k, 0.5 * k]
+    poses = np.vstack([t[:3, :3] @ rest + t[:3, 3:] for t in transforms])
+
+    fitted = fit_rigid_transforms(rest, poses)
+
+    assert np.allclose(fitted, transforms)
+    assert np.allclose(rigid_residuals(rest, poses, fitted), 0)
+
+
+def test_find_static_vertices(bending_strip):
+    """Test that only vertices that never move are static."""
+    rest, poses, _ = create_strip(bending_strip)
+
+    static = find_static_vertices(rest, poses, 1e-6)
+
+    assert np.array_equal(static, rest[0] <= 1)
+
+
+def test_find_rigid_clusters(bending_strip):
+    """Test that the static and rotating halves form two clusters."""
+    rest, poses, _ = create_strip(bending_strip, curl=0.1)
+
+    labels, transforms = find_rigid_clusters(rest, poses, 1e-4, max_clusters=4, min_size=10)
+
+    assert transforms.shape == (2, 10, 4, 4)
+    assert np.all(labels[rest[0] <= 1] == 0)
+    assert np.allclose(transforms[0], np.eye(4))
+    assert np.all(labels[(rest[0] > 1) & (rest[0] <= 1.5)] == 1)
+    assert np.all(labels[rest[0] > 1.55] == -1)
+
+
+def test_find_rigid_clusters_errors(bending_strip):
+    """Test error handling of the rigid cluster search."""
+    rest, poses, _ = create_strip(bending_strip)
+
+    with pytest.raises(ParameterError):
+        find_rigid_clusters(rest, poses, -1.0, max_clusters=2)
+
+    with pytest.raises(ParameterError):
+        find_rigid_clusters(rest, poses[:, :10], 1e-4, max_clusters=2)
+
+
+def test_compute_with_rigid_prepass(bending_strip):
+    """Test that rigid vertices are bound to single bones and the rest is solved."""
+    rest, poses, faces = create_strip(bending_strip, curl=0.1)
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k in range(10):
+        dem_bones.set_target_vertices(k, poses[3 * k : 3 * k + 3])
+    dem_bones._dem_bones.fv = faces
+    dem_bones.num_bones = 3
+    dem_bones.num_iterations = 10
+    dem_bones.rigid_tolerance = 1e-4
+
+    dem_bones.compute()
+
+    report = dem_bones.solve_report
+    assert report["rigid_clusters"] == 2
+    assert report["rigid_vertices"] + report["solved_vertices"] == rest.shape[1]
+    weights = dem_bones.get_weights()
+    assert np.allclose(weights.sum(axis=0), 1.0)
+    assert np.all(np.count_nonzero(weights[:, rest[0] <= 1], axis=0) == 1)
+    assert dem_bones._dem_bones.rmse() < 0.01
+
+    with pytest.raises(ParameterError):
+        dem_bones.rigid_tolerance = -1
+
+
+def test_compute_all_rigid():
+    """Test that a mesh without free vertices only keeps the bones of its rigid clusters."""
+    rest = np.random.default_rng(2).random((3, 50))
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k in range(4):
+        dem_bones.set_target_vertices(k, rest + [[0.1 * k], [0], [0]])
+    dem_bones.num_bones = 3
+    dem_bones.rigid_tolerance = 1e-6
+
+    dem_bones.compute()
+
+    assert dem_bones.num_bones == 1
+    assert np.allclose(dem_bones.get_weights(), 1.0)
+    transforms = dem_bones.get_transformations()
+    assert np.allclose(transforms[:, 3], [0, 0, 0, 1])
+    assert np.allclose(transforms[:, :3, :3], np.eye(3))
+    assert np.allclose(transforms[:, 0, 3], 0.1 * np.arange(4))
+
+
+def test_find_duplicate_frames(bending_strip):
+    """Test that holds and repeated frames map to their first occurrence."""
+    rest, poses, _ = create_strip(bending_strip, num_frames=4)
+    frames = poses.reshape(4, 3, -1)
+    sequence = frames[[0, 1, 1, 2, 1, 3, 3, 0]].copy()
+    sequence[2] += 1e-5
+
+    representatives, inverse = find_duplicate_frames(sequence.reshape(-1, rest.shape[1]), 1e-3)
+
+    assert np.array_equal(representatives, [0, 1, 3, 5])
+    assert np.array_equal(inverse, [0, 1, 1, 2, 1, 3, 3, 0])
+
+    representatives, inverse = find_duplicate_frames(sequence)
+    assert np.array_equal(representatives, [0, 1, 2, 3, 5])
+
+
+def test_find_distant_duplicate_frames():
+    """Test that near-duplicates are found however far apart they are in the sequence."""
+    rng = np.random.default_rng(5)
+    first, second = rng.random((2, 3, 500))
+    sequence = np.stack([first, second, first + 0.003, second + 0.003, first])
+
+    representatives, inverse = find_duplicate_frames(sequence, 0.01)
+
+    assert np.array_equal(representatives, [0, 1])
+    assert np.array_equal(inverse, [0, 1, 0, 1, 0])
+
+    # Every frame matches a representative exactly when one lies within the tolerance
+    sequence = rng.random((6, 3, 200))[rng.integers(0, 6, 60)] + rng.normal(0, 0.002, (60, 3, 200))
+    representatives, inverse = find_duplicate_frames(sequence, 0.02)
+    distances = np.sqrt(np.sum((sequence[:, None] - sequence[representatives][None]) ** 2, axis=2)).max(axis=2)
+    assert len(representatives) == 6
+    assert np.all(distances[np.arange(60), inverse] <= 0.02)
+
+
+def test_compute_with_duplicate_frames(bending_strip):
+    """Test that duplicate frames are solved once and expanded to the full timeline."""
+    rest, poses, faces = create_strip(bending_strip, num_frames=6)
+    order = [0, 1, 1, 1, 2, 3, 3, 4, 5, 5, 5, 2]
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k, frame in enumerate(order):
+        dem_bones.set_target_vertices(k, poses[3 * frame : 3 * frame + 3])
+    dem_bones._dem_bones.fv = faces
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.frame_tolerance = 1e-6
+
+    dem_bones.compute()
+
+    report = dem_bones.solve_report
+    assert report["unique_frames"] == 6
+    assert report["duplicate_frames"] == 6
+    transforms = dem_bones._dem_bones.m.reshape(len(order), 4, -1)
+    assert transforms.shape[2] == 8
+    assert np.allclose(transforms[1], transforms[3])
+    assert np.allclose(transforms[4], transforms[11])
+    assert dem_bones._dem_bones.rmse() < 1e-6
+
+    with pytest.raises(ParameterError):
+        dem_bones.frame_tolerance = -1
+
+
+def test_select_keyframes(bending_strip):
+    """Test that keyframes spread over the pose space and map every frame to the closest one."""
+    rest, poses, _ = create_strip(bending_strip, num_frames=20)
+
+    keyframes, nearest = select_keyframes(poses, 3)
+
+    assert keyframes.size == 3
+    assert np.all(np.diff(keyframes) > 0)
+    assert 0 in keyframes and 19 in keyframes
+    assert np.array_equal(nearest[keyframes], np.arange(3))
+    frames = poses.reshape(20, 3, -1)
+    for k in range(20):
+        distances = [np.sum((frames[k] - frames[key]) ** 2) for key in keyframes]
+        assert np.isclose(distances[nearest[k]], min(distances))
+
+    with pytest.raises(ParameterError):
+        select_keyframes(poses, 0)
+
+
+def test_select_streamed_keyframes(bending_strip):
+    """Test that streamed keyframes match farthest point sampling and cover frames from a bounded pool."""
+    rest, poses, _ = create_strip(bending_strip, num_frames=40)
+    frames = poses.reshape(40, 3, -1)
+
+    def chunks():
+        for start in range(0, 40, 7):
+            yield start, frames[start : start + 7]
+
+    # A pool that holds every frame leaves the choice to farthest point sampling
+    keyframes, features = select_streamed_keyframes(chunks(), 4, pool_size=40)
+    assert np.array_equal(keyframes, select_keyframes(poses, 4)[0])
+    assert np.array_equal(features, frames[keyframes].reshape(4, -1))
+
+    keyframes, features = select_streamed_keyframes(chunks(), 4)
+    assert keyframes.size == 4 and np.all(np.diff(keyframes) > 0)
+    assert features.shape == (4, frames[0].size)
+
+    def coverage(keyframes):
+        distances = np.sum((frames[:, None] - frames[keyframes]) ** 2, axis=(2, 3))
+        return np.sqrt(distances.min(axis=1).max())
+
+    # The bounded pool covers the sequence about as well as sampling all frames
+    assert coverage(keyframes) <= 2.0 * coverage(select_keyframes(poses, 4)[0])
+
+    with pytest.raises(ParameterError):
+        select_streamed_keyframes(chunks(), 4, pool_size=3)
+    with pytest.raises(ParameterError):
+        select_streamed_keyframes(iter(()), 4)
+
+
+def test_compute_with_keyframes(bending_strip):
+    """Test that the full timeline is recovered from a keyframe solve."""
+    rest, poses, faces = create_strip(bending_strip, num_frames=16)
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k in range(16):
+        dem_bones.set_target_vertices(k, poses[3 * k : 3 * k + 3])
+    dem_bones._dem_bones.fv = faces
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.max_keyframes = 6
+
+    dem_bones.compute()
+
+    assert dem_bones.solve_report["keyframes"] == 6
+    assert dem_bones._dem_bones.m.shape == (64, 8)
+    assert dem_bones._dem_bones.rmse() < 1e-6
+
+    with pytest.raises(ParameterError):
+        dem_bones.max_keyframes = 0
@@ -0,0 +1,122 @@
+"""
+Tests for partial weight re-solves of vertex regions.
+
+This module tests DemBonesWrapper.resolve_region and the weight lock accessors.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ComputationError, IndexError, ParameterError
+from py_dem_bones.base import DemBonesWrapper
+
+
+def create_solved_wrapper(bending_strip):
+    """Create a wrapper holding a solved two-bone decomposition of the strip."""
+    rest, frames, faces = bending_strip()
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    for k, pose in enumerate(frames):
+        dem_bones.set_target_vertices(k, pose)
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.compute()
+    return dem_bones, rest
+
+
+def test_compute_uses_frame_layout(bending_strip):
+    """Test that targets are solved as the frames of a single subject."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+
+    assert dem_bones.num_frames == 10
+    assert dem_bones._dem_bones.get_animated_poses().shape == (30, rest.shape[1])
+    assert dem_bones._dem_bones.rmse() < 1e-6
+
+
+def test_resolve_region_repairs_weights(bending_strip):
+    """Test that a damaged region is repaired while other vertices stay fixed."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    region = np.where(np.abs(rest[0] - 1) < 0.15)[0]
+    outside = np.setdiff1d(np.arange(rest.shape[1]), region)
+
+    weights = dem_bones.get_weights().copy()
+    weights[:, region] = 0.5
+    dem_bones._dem_bones.set_weights(weights)
+    damaged_error = dem_bones._dem_bones.rmse()
+
+    report = dem_bones.resolve_region(region, rings=2)
+
+    assert report["region_vertices"] == len(region)
+    assert report["neighbour_vertices"] > 0
+    assert dem_bones._dem_bones.rmse() < damaged_error
+    new_weights = dem_bones.get_weights()
+    assert np.allclose(new_weights[:, outside], weights[:, outside])
+    assert np.allclose(new_weights.sum(axis=0), 1.0)
+
+
+def test_resolve_region_locks_bones_reaching_outside(bending_strip):
+    """Test that bones influencing vertices outside the region are not re-solved."""
+    dem_bones, rest = create_solved_wrapper(bending_strip)
+    transforms = dem_bones._dem_bones.m.copy()
+
+    report = dem_bones.resolve_region([0, 1, 2], rings=1)
+
+    assert report["free_bones"] == 0
+    assert np.allclose(dem_bones._dem_bones.m, transforms)
+
+
+def test_resolve_region_in_place(bending_strip):
+    """Test that repeated region solves match solves that build the vertex faces natively."""
+    cached, rest = create_solved_wrapper(bending_strip)
+    native, _ = create_solved_wrapper(bending_strip)
+    for region in (np.where(np.abs(rest[0] - 1) < 0.15)[0], np.arange(30, 60), np.arange(100, 103)):
+        weights = cached.get_weights().copy()
+        weights[:, region] = 0.5
+        cached._dem_bones.set_weights(weights)
+        native._dem_bones.set_weights(weights)
+
+        report = cached.resolve_region(region, rings=2)
+        expected = native._dem_bones.resolve_region(region.tolist(), 2, 10)
+
+        assert report["neighbour_vertices"] == expected["neighbour_vertices"]
+        assert np.allclose(cached.get_weights(), native._dem_bones.get_weights())
+        assert np.allclose(cached._dem_bones.m, native._dem_bones.m)
+        assert np.allclose(cached.get_weights().sum(axis=0), 1.0)
+
+    with pytest.raises(ValueError):
+        native._dem_bones.resolve_region([0], 1, 1, np.zeros(3, dtype=np.int64), np.zeros(0, dtype=np.int32))
+
+
+def test_resolve_region_errors():
+    """Test error handling of resolve_region."""
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(np.zeros((3, 4)))
+
+    with pytest.raises(ComputationError):
+        dem_bones.resolve_region([0, 1])
+
+    with pytest.raises(ParameterError):
+        dem_bones.resolve_region([])
+
+    with pytest.raises(IndexError):
+        dem_bones.resolve_region([10])
+
+    with pytest.raises(ParameterError):
+        dem_bones.resolve_region([0], rings=-1)
+
+
+def test_weight_locks():
+    """Test the weight lock accessors."""
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(np.zeros((3, 4)))
+
+    assert np.array_equal(dem_bones.get_weight_locks(), np.zeros(4))
+
+    dem_bones.set_weight_locks([0.0, 1.0, 0.5, 0.0])
+    assert np.allclose(dem_bones.get_weight_locks(), [0.0, 1.0, 0.5, 0.0])
+
+    with pytest.raises(ParameterError):
+        dem_bones.set_weight_locks([0.0, 1.0])
+
+    with pytest.raises(ParameterError):
+        dem_bones.set_weight_locks([0.0, 2.0, 0.0, 0.0])
@@ -0,0 +1,84 @@
+"""
+Tests for the compact runtime skin format in py_dem_bones.runtime.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import IOError, ParameterError
+from py_dem_bones.base import DemBonesWrapper
+from py_dem_bones.runtime import RuntimeSkin
+
+
+def create_wrapper(bending_strip, num_frames=6):
+    """Create a solved wrapper for a quad strip that bends smoothly around the z axis."""
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=num_frames, motion="bend", angle=0.075)
+
+    wrapper = DemBonesWrapper()
+    wrapper.num_bones = 3
+    wrapper.num_iterations = 10
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    wrapper.compute()
+    return wrapper
+
+
+def test_runtime_skin_round_trip(tmp_path, bending_strip):
+    """Test converting, saving, memory-mapping and evaluating a skin."""
+    wrapper = create_wrapper(bending_strip)
+    expected = wrapper.get_skinned_poses().transpose(0, 2, 1)
+    skin = RuntimeSkin.from_wrapper(wrapper, max_influences=3)
+    assert (skin.num_vertices, skin.num_bones, skin.num_frames, skin.num_influences) == (150, 3, 6, 3)
+    assert skin.indices.dtype == np.uint8 and skin.weight_bits is None
+    assert np.allclose(skin.evaluate(), expected, atol=1e-4)
+
+    skin.save(tmp_path / "skin.bin")
+    data = np.fromfile(tmp_path / "skin.bin", dtype=np.uint8)
+    header = data[:80].view(np.uint64)
+    assert np.all(header[5:9] % 64 == 0) and header[9] == data.size
+
+    loaded = RuntimeSkin.load(tmp_path / "skin.bin")
+    for name in ("rest_pose", "indices", "weights", "transformations"):
+        array = getattr(loaded, name)
+        assert isinstance(array.base, np.memmap) or isinstance(array.base.base, np.memmap)
+        assert not array.flags.writeable
+        assert np.array_equal(array, getattr(skin, name))
+
+    out = np.empty((2, 150, 3), dtype=np.float32)
+    assert loaded.evaluate([5, 1], out=out) is out
+    assert np.allclose(out, expected[[5, 1]], atol=1e-4)
+    with pytest.raises(IndexError):
+        loaded.evaluate([6])
+
+
+def test_runtime_skin_quantized(tmp_path, bending_strip):
+    """Test skins with quantised weights."""
+    wrapper = create_wrapper(bending_strip)
+    expected = wrapper.get_skinned_poses().transpose(0, 2, 1)
+    for bits, atol in ((8, 1e-2), (16, 1e-4)):
+        skin = RuntimeSkin.from_wrapper(wrapper, max_influences=3, bits=bits)
+        assert skin.weight_bits == bits
+        skin.save(tmp_path / f"skin{bits}.bin")
+        loaded = RuntimeSkin.load(tmp_path / f"skin{bits}.bin", mmap=False)
+        assert loaded.weights.dtype == np.dtype(f"u{bits // 8}")
+        assert np.allclose(loaded.evaluate(), expected, atol=atol)
+
+
+def test_runtime_skin_errors(tmp_path):
+    """Test that invalid arrays and files are rejected."""
+    rest = np.zeros((4, 3))
+    transforms = np.tile(np.eye(4), (2, 2, 1, 1))
+    with pytest.raises(ParameterError):
+        RuntimeSkin(rest, np.full((4, 1), 2), np.ones((4, 1)), transforms)
+    with pytest.raises(ParameterError):
+        RuntimeSkin(rest, np.zeros((3, 1), dtype=int), np.ones((3, 1)), transforms)
+
+    skin = RuntimeSkin(rest, np.zeros((4, 1), dtype=int), np.ones((4, 1)), transforms)
+    skin.save(tmp_path / "skin.bin")
+    data = (tmp_path / "skin.bin").read_bytes()
+    (tmp_path / "truncated.bin").write_bytes(data[:-4])
+    (tmp_path / "other.bin").write_bytes(b"PC2" + data[3:])
+    for name in ("truncated.bin", "other.bin", "missing.bin"):
+        with pytest.raises(IOError):
+            RuntimeSkin.load(tmp_path / name)
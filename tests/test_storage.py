@@ -0,0 +1,172 @@
+"""
+Tests for out-of-core frame storage and the out-of-core solve.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import ComputationError, IndexError, IOError, ParameterError
+from py_dem_bones.base import DemBonesExtWrapper, DemBonesWrapper
+from py_dem_bones.storage import FrameStore, load_array
+
+
+def test_frame_store_chunks(tmp_path):
+    """Test chunked reads, the bounded cache and gathering of frames from a .npy file."""
+    frames = np.arange(10 * 3 * 4, dtype=np.float32).reshape(10, 3, 4)
+    path = tmp_path / "frames.npy"
+    target = FrameStore.create(path, 10, 4)
+    target[:] = frames
+    target.flush()
+    del target
+
+    with FrameStore(path, chunk_frames=3, cache_chunks=2) as store:
+        assert (store.num_frames, store.num_vertices, store.num_chunks) == (10, 4, 4)
+        assert store.dtype == np.float32
+        assert store.chunk_range(3) == (9, 10)
+
+        starts = []
+        for start, chunk in store.iter_chunks():
+            assert np.array_equal(chunk, frames[start : start + chunk.shape[0]])
+            starts.append(start)
+        assert starts == [0, 3, 6, 9]
+        assert len(store._cache) <= 2
+
+        assert np.array_equal(store.get_frames([9, 0, 4]), frames[[9, 0, 4]])
+
+        with pytest.raises(IndexError):
+            store.get_chunk(4)
+
+        with pytest.raises(IndexError):
+            store.get_frames([10])
+
+
+def test_frame_store_prefetch():
+    """Test that the next chunk is read in the background."""
+    frames = np.zeros((8, 3, 5))
+    store = FrameStore(frames, chunk_frames=2)
+
+    store.get_chunk(0)
+    store._pending[1].result()
+    assert store.chunks_read == 2
+
+    store.get_chunk(1)
+    assert store.chunks_read == 2
+    store.close()
+
+
+def test_frame_store_errors(tmp_path):
+    """Test error handling of the frame store."""
+    with pytest.raises(IOError):
+        FrameStore(tmp_path / "missing.npy")
+
+    with pytest.raises(ParameterError):
+        FrameStore(np.zeros((4, 5)))
+
+    with pytest.raises(ParameterError):
+        FrameStore(np.zeros((2, 3, 5)), chunk_frames=0)
+
+    # Sizes may be numpy integers
+    assert FrameStore(np.zeros((4, 3, 5)), chunk_frames=np.int64(2), cache_chunks=np.int64(1)).num_chunks == 2
+
+
+def test_compute_out_of_core(tmp_path, bending_strip):
+    """Test that an out-of-core solve recovers the whole sequence."""
+    rest, frames, faces = bending_strip(num_frames=16)
+    path = tmp_path / "frames.npy"
+    np.save(path, frames)
+
+    dem_bones = DemBonesWrapper()
+    dem_bones.set_rest_pose(rest)
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.max_keyframes = 6
+    store = FrameStore(path, chunk_frames=5, cache_chunks=1)
+    dem_bones.set_frame_store(store)
+
+    dem_bones.compute()
+    assert store._executor is None
+    store.close()
+
+    report = dem_bones.solve_report
+    assert report["keyframes"] == 6
+    assert report["chunks"] == 4
+    assert report["rmse"] < 1e-6
+    assert dem_bones.num_frames == 16
+    assert dem_bones._dem_bones.m.shape == (64, 8)
+    assert np.allclose(dem_bones.get_weights().sum(axis=0), 1.0)
+
+    with pytest.raises(ParameterError):
+        dem_bones.set_frame_store(FrameStore(np.zeros((2, 3, 5))))
+
+    # The tolerance passes need the whole sequence in memory
+    dem_bones.frame_tolerance = 1e-6
+    with pytest.raises(ComputationError):
+        dem_bones.compute()
+
+
+def test_load_array(tmp_path):
+    """Test memory-mapping of .npy files and of stored and compressed .npz members."""
+    rest = np.arange(12.0).reshape(3, 4)
+    frames = np.arange(24, dtype=np.float32).reshape(2, 3, 4)
+    np.save(tmp_path / "rest.npy", rest)
+    np.savez(tmp_path / "mesh.npz", rest=rest, frames=np.asfortranarray(frames))
+    np.savez_compressed(tmp_path / "packed.npz", frames=frames)
+
+    loaded = load_array(tmp_path / "rest.npy")
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, rest)
+
+    loaded = load_array(tmp_path / "mesh.npz", "frames")
+    assert isinstance(loaded, np.memmap)
+    assert loaded.dtype == np.float32
+    assert np.array_equal(loaded, frames)
+
+    loaded = load_array(tmp_path / "packed.npz", "rest")
+    assert not isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, frames)
+
+    with pytest.raises(ParameterError):
+        load_array(tmp_path / "mesh.npz")
+
+    with pytest.raises(ParameterError):
+        load_array(tmp_path / "mesh.npz", "poses")
+
+    with pytest.raises(IOError):
+        load_array(tmp_path / "missing.npy")
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_from_files(tmp_path, dtype, bending_strip):
+    """Test that a wrapper loaded from memory-mapped files solves like one built in memory."""
+    rest, frames, faces = bending_strip(num_frames=8)
+    np.save(tmp_path / "rest.npy", rest.astype(dtype))
+    np.save(tmp_path / "frames.npy", frames.astype(dtype))
+
+    dem_bones = DemBonesWrapper.from_files(tmp_path / "rest.npy", tmp_path / "frames.npy")
+    assert isinstance(dem_bones._dem_bones, DemBonesWrapper._NATIVE_CLASSES[np.dtype(dtype)])
+    assert (dem_bones.num_vertices, dem_bones.num_frames) == (240, 8)
+    assert np.allclose(dem_bones._dem_bones.get_animated_poses(), frames.reshape(24, 240), atol=1e-6)
+
+    dem_bones._dem_bones.fv = faces.tolist()
+    dem_bones.num_bones = 2
+    dem_bones.num_iterations = 10
+    dem_bones.compute()
+    assert dem_bones._dem_bones.rmse() < 1e-3
+    assert np.allclose(dem_bones.get_weights().sum(axis=0), 1.0, atol=1e-5)
+
+
+def test_from_files_archive(tmp_path, bending_strip):
+    """Test loading both inputs from one archive and the input checks."""
+    rest, frames, _ = bending_strip(num_frames=4)
+    np.savez(tmp_path / "mesh.npz", rest=rest, frames=frames.reshape(12, -1))
+
+    dem_bones = DemBonesExtWrapper.from_files(tmp_path / "mesh.npz", tmp_path / "mesh.npz", dtype=np.float32)
+    assert dem_bones._dem_bones.get_rest_pose().dtype == np.float32
+    assert dem_bones.num_frames == 4
+    assert np.allclose(dem_bones._dem_bones.get_rest_pose(), rest)
+
+    with pytest.raises(ParameterError):
+        DemBonesWrapper.from_files(rest, frames[:, :, :10])
+
+    with pytest.raises(ParameterError):
+        DemBonesWrapper.from_files(rest, frames, dtype=np.int32)
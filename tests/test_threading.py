@@ -0,0 +1,87 @@
+"""
+Tests for running solves concurrently from several threads.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import numpy as np
+from py_dem_bones.base import DemBonesExtWrapper, DemBonesWrapper
+
+
+def create_wrapper(bending_strip, wrapper_class, angle, num_frames=8):
+    """Create a wrapper for a quad strip whose right half rotates by angle per frame."""
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=num_frames, angle=angle)
+
+    wrapper = wrapper_class()
+    wrapper.num_bones = 2
+    wrapper.num_iterations = 5
+    wrapper.num_threads = 1
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    return wrapper
+
+
+def solve(bending_strip, wrapper_class, angle):
+    """Solve one problem and return its weights and transformations."""
+    wrapper = create_wrapper(bending_strip, wrapper_class, angle)
+    wrapper.compute()
+    return wrapper.get_weights(), wrapper.get_transformations()
+
+
+def test_concurrent_solves(bending_strip):
+    """Test that independent solves on many threads match the same solves run serially."""
+    num_threads = 8
+    problems = [(DemBonesWrapper if k % 2 else DemBonesExtWrapper, 0.04 + 0.01 * k) for k in range(2 * num_threads)]
+    expected = [solve(bending_strip, *problem) for problem in problems]
+
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = list(executor.map(lambda problem: solve(bending_strip, *problem), problems))
+        for (weights, transformations), (expected_weights, expected_transformations) in zip(results, expected):
+            assert np.array_equal(weights, expected_weights)
+            assert np.array_equal(transformations, expected_transformations)
+
+
+def test_shared_wrapper(bending_strip):
+    """Test that threads sharing one wrapper are serialized instead of corrupting it."""
+    wrapper = create_wrapper(bending_strip, DemBonesWrapper, 0.08)
+    frames = wrapper._dem_bones.get_animated_poses().reshape(8, 3, -1)
+
+    def work(index):
+        if index % 3 == 0:
+            wrapper.compute(incremental=False)
+        elif index % 3 == 1:
+            wrapper.set_target_vertices(index % 8, frames[index % 8])
+        return wrapper.get_weights().shape
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        shapes = list(executor.map(work, range(24)))
+
+    assert all(shape in ((2, 150), (0, 0)) for shape in shapes)
+    wrapper.compute(incremental=False)
+    weights = wrapper.get_weights()
+    assert weights.shape == (2, 150)
+    assert np.allclose(weights.sum(axis=0), 1)
+    assert np.allclose(wrapper.get_skinned_poses(), frames, atol=1e-2)
+
+
+def test_settings_wait_for_solve(bending_strip):
+    """Test that settings and name changes wait for a running native call of the wrapper."""
+    wrapper = create_wrapper(bending_strip, DemBonesWrapper, 0.08)
+    changes = [
+        lambda: setattr(wrapper, "rigid_tolerance", 1e-3),
+        lambda: setattr(wrapper, "result_cache", None),
+        lambda: wrapper.set_target_name("pose", 0),
+    ]
+    with ThreadPoolExecutor(max_workers=len(changes)) as executor:
+        with wrapper._lock:
+            futures = [executor.submit(change) for change in changes]
+            time.sleep(0.2)
+            assert not any(future.done() for future in futures)
+        for future in futures:
+            future.result(timeout=10)
+    assert wrapper.rigid_tolerance == 1e-3
+    assert wrapper.get_target_index("pose") == 0
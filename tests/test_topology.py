@@ -0,0 +1,110 @@
+"""
+Tests for the mesh topology cache in py_dem_bones.topology.
+"""
+
+import numpy as np
+import pytest
+from py_dem_bones import IOError, ParameterError
+from py_dem_bones.base import DemBonesExtWrapper, DemBonesWrapper
+from py_dem_bones.topology import MeshTopology, TopologyCache, default_cache, topology_key, vertex_faces
+
+
+def create_wrapper(wrapper_class, rest, frames, faces, cache):
+    """Create a wrapper for the bending strip with a topology cache."""
+    wrapper = wrapper_class()
+    wrapper.num_bones = 2
+    wrapper.num_iterations = 5
+    wrapper.topology_cache = cache
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    return wrapper
+
+
+def test_mesh_topology():
+    """Test the edges, rest lengths and adjacency of a triangle next to a quad."""
+    rest = np.array([[0.0, 1.0, 1.0, 0.0, 2.0], [0.0, 0.0, 1.0, 1.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0]])
+    offsets = np.array([0, 4, 7])
+    indices = np.array([0, 1, 2, 3, 1, 4, 2])
+
+    topology = MeshTopology.from_faces(offsets, indices, rest)
+    assert topology.num_edges == 6
+    assert topology.edges.tolist() == [[0, 1], [0, 3], [1, 2], [1, 4], [2, 3], [2, 4]]
+    assert np.allclose(topology.rest_lengths, [[1, 1, 1, 1, 1, np.sqrt(2)]])
+    # The shared edge (1, 2) is counted once per face
+    assert topology.edge_length_sum == pytest.approx(6 + np.sqrt(2))
+
+    neighbour_offsets, neighbours = topology.neighbours()
+    assert neighbour_offsets.tolist() == [0, 2, 5, 8, 10, 12]
+    assert neighbours[2:5].tolist() == [0, 2, 4]
+
+    face_offsets, faces = vertex_faces(offsets, indices, 5)
+    assert face_offsets.tolist() == [0, 1, 3, 5, 6, 7]
+    assert faces.tolist() == [0, 0, 1, 0, 1, 0, 1]
+
+    with pytest.raises(ParameterError):
+        MeshTopology.from_faces(offsets, np.array([0, 1, 2, 3, 1, 4, 5]), rest)
+
+
+def test_topology_cache(tmp_path, bending_strip):
+    """Test least-recently-used eviction and reuse of topologies kept on disk."""
+    rest, _, faces = bending_strip(num_frames=1)
+    offsets = np.arange(len(faces) + 1) * 4
+    indices = np.ravel(faces)
+    moved = rest + 1.0
+    assert topology_key(offsets, indices, rest) != topology_key(offsets, indices, moved)
+
+    cache = TopologyCache(max_entries=1, directory=tmp_path)
+    first = cache.get(offsets, indices, rest)
+    assert cache.get(offsets, indices, rest) is first
+    cache.get(offsets, indices, moved)
+    assert len(cache) == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+    # A new cache finds the topology on disk
+    reloaded = TopologyCache(directory=tmp_path).get(offsets, indices, rest)
+    assert np.array_equal(reloaded.edges, first.edges)
+    assert np.array_equal(reloaded.rest_lengths, first.rest_lengths)
+
+    with pytest.raises(ParameterError):
+        TopologyCache(max_entries=0)
+
+    (tmp_path / "broken.npz").write_bytes(b"broken")
+    with pytest.raises(IOError):
+        MeshTopology.load(tmp_path / "broken.npz")
+
+
+@pytest.mark.parametrize("wrapper_class", [DemBonesWrapper, DemBonesExtWrapper])
+def test_cached_smoothing(wrapper_class, bending_strip):
+    """Test that the cached smoothing solver matches the native one and is shared between solves."""
+    rest, frames, faces = bending_strip(num_frames=8)
+    cache = TopologyCache()
+
+    native = create_wrapper(wrapper_class, rest, frames, faces, None)
+    native.compute()
+
+    for _ in range(2):
+        cached = create_wrapper(wrapper_class, rest, frames, faces, cache)
+        cached.compute()
+        assert np.allclose(cached.get_weights(), native.get_weights(), atol=1e-9)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert (cache.solver_hits, cache.solver_misses) == (1, 1)
+
+    # Other poses keep the topology but need a solver of their own
+    moved = create_wrapper(wrapper_class, rest, frames[::-1][:6], faces, cache)
+    moved.compute()
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert (cache.solver_hits, cache.solver_misses) == (1, 2)
+    cache.clear()
+    assert len(cache) == 0
+
+    solver = cache.get_smoothing_solver(native._dem_bones)
+    assert solver.num_vertices == rest.shape[1]
+    with pytest.raises(ValueError):
+        type(native._dem_bones)().set_smoothing_solver(solver)
+
+    assert DemBonesWrapper().topology_cache is default_cache()
+    with pytest.raises(ParameterError):
+        native.topology_cache = {}
@@ -9,6 +9,7 @@ from unittest.mock import patch
 import numpy as np
 import pytest
 from py_dem_bones import ParameterError, NameError, ComputationError, IndexError
+from py_dem_bones import build_info
 from py_dem_bones.base import DemBonesWrapper, DemBonesExtWrapper
 
 
@@ -311,6 +312,222 @@ def test_vertex_management():
         wrapper.set_rest_pose(np.ones((4, 3)))
 
 
+def test_set_animated_poses():
+    """Test loading a whole sequence at once from [num_frames, num_vertices, 3] views."""
+    wrapper = DemBonesWrapper()
+    wrapper.set_rest_pose(np.zeros((3, 5)))
+    frames = np.random.default_rng(0).random((4, 5, 3)).astype(np.float32)
+
+    wrapper.set_animated_poses(frames.transpose(0, 2, 1))
+    assert wrapper.num_frames == 4
+    poses = wrapper._dem_bones.get_animated_poses()
+    assert poses.shape == (12, 5)
+    assert np.allclose(poses.reshape(4, 3, 5), frames.transpose(0, 2, 1))
+
+    wrapper.set_animated_poses(np.ones((6, 5)))
+    assert wrapper.num_frames == 2
+
+    with pytest.raises(ParameterError):
+        wrapper.set_animated_poses(np.ones((4, 5)))
+
+    with pytest.raises(ParameterError):
+        # Vertex count differs from the rest pose
+        wrapper.set_animated_poses(np.ones((2, 3, 6)))
+
+
+def test_get_influences():
+    """Test exporting sorted, renormalised top-k influence tables."""
+    wrapper = DemBonesWrapper()
+    wrapper.set_rest_pose(np.zeros((3, 3)))
+    with pytest.raises(ComputationError):
+        wrapper.get_influences(2)
+
+    wrapper.set_weights(np.array([
+        [0.1, 0.0, 0.0],
+        [0.5, 1.0, 0.0],
+        [0.0, 0.0, 0.0],
+        [0.4, 0.0, 0.0],
+    ]))
+    indices, weights = wrapper.get_influences(2)
+    assert indices.tolist() == [[1, 3], [1, 0], [0, 0]]
+    assert np.allclose(weights, [[5 / 9, 4 / 9], [1, 0], [0, 0]])
+
+    offsets, csr_indices, csr_weights = wrapper.get_influences(4, csr=True)
+    assert offsets.tolist() == [0, 3, 4, 4]
+    assert csr_indices.tolist() == [1, 3, 0, 1]
+    assert np.allclose(csr_weights, [0.5, 0.4, 0.1, 1])
+
+    with pytest.raises(ParameterError):
+        wrapper.get_influences(0)
+
+
+def test_quantize_influences(bending_strip):
+    """Test fixed-point influence export with exact sums and its position error report."""
+    wrapper = DemBonesWrapper()
+    wrapper.set_rest_pose(np.zeros((3, 2)))
+    wrapper.set_weights(np.array([[0.5, 0.0], [0.3, 0.0], [0.2, 0.0]]))
+
+    # 127.5, 76.5 and 51 round down to 254; the tie of the remainders goes to the first slot
+    indices, weights, errors = wrapper.quantize_influences(3, bits=8, frame_indices=[])
+    assert weights.dtype == np.uint8
+    assert indices.tolist() == [[0, 1, 2], [0, 0, 0]]
+    assert weights.tolist() == [[128, 76, 51], [0, 0, 0]]
+    assert errors is None
+
+    with pytest.raises(ParameterError):
+        wrapper.quantize_influences(3, bits=12)
+
+    # A strip that bends smoothly along its length, so most vertices blend several bones
+    rest, frames, faces = bending_strip(nx=30, ny=5, num_frames=8, motion="bend", angle=0.075)
+    wrapper = DemBonesWrapper()
+    wrapper.num_bones = 3
+    wrapper.max_influences = 3
+    wrapper.num_iterations = 10
+    wrapper.set_rest_pose(rest)
+    for k, frame in enumerate(frames):
+        wrapper.set_target_vertices(k, frame)
+    wrapper.set_faces(faces)
+    wrapper.compute()
+
+    _, weights8, errors8 = wrapper.quantize_influences(bits=8)
+    _, weights16, errors16 = wrapper.quantize_influences(bits=16)
+    assert weights16.dtype == np.uint16
+    assert np.all(weights8.astype(int).sum(axis=1) == 255)
+    assert np.all(weights16.astype(int).sum(axis=1) == 65535)
+    assert errors8.shape == (150,)
+    assert errors16.max() < errors8.max() < 1e-2
+
+    # The error of a single influence matches a reconstruction in numpy
+    indices, weights, errors = wrapper.quantize_influences(1, frame_indices=[7])
+    quantized = np.zeros((3, 150))
+    quantized[indices[:, 0], np.arange(150)] = weights[:, 0] / 255
+    transforms = wrapper._dem_bones.m.reshape(8, 4, 3, 4)[7].transpose(1, 0, 2)
+    homogeneous = np.vstack([rest, np.ones(150)])
+    skinned = np.einsum("bv,bij,jv->iv", quantized, transforms, homogeneous)[:3]
+    expected = np.linalg.norm(skinned - wrapper.get_skinned_poses([7])[0], axis=0)
+    assert np.allclose(errors, expected)
+
+    with pytest.raises(IndexError):
+        wrapper.quantize_influences(frame_indices=[8])
+
+
+def test_dual_quaternion_skinning(bending_strip):
+    """Test dual quaternion reconstruction and its comparison with linear blend skinning."""
+    # Two bones rotate by +170 and -170 degrees around z; the second also moves along z
+    transforms = []
+    for angle, offset in ((170, 0.0), (-170, 2.0)):
+        c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+        transforms.append([[c, -s, 0, 0], [s, c, 0, 0], [0, 0, 1, offset], [0, 0, 0, 1]])
+    wrapper = DemBonesWrapper()
+    wrapper.set_rest_pose(np.array([[1.0, 0.0], [0.0, 0.0], [0.0, 1.0]]))
+    wrapper.set_weights(np.array([[0.5, 0.0], [0.5, 1.0]]))
+    wrapper.set_target_vertices(0, np.zeros((3, 2)))
+    wrapper._dem_bones.m = np.hstack(transforms)
+
+    # Blending the shortest arcs turns the half-weighted vertex by 180 degrees without shrinking it
+    poses = wrapper.get_dual_quaternion_poses()
+    assert poses.shape == (1, 3, 2)
+    assert np.allclose(poses[0, :, 0], [-1, 0, 1])
+    assert np.allclose(poses[0, :, 1], [0, 0, 3])
+    assert np.allclose(wrapper.get_skinned_poses()[0, :, 0], [np.cos(np.radians(170)), 0, 1])
+    # With one influence the tie between the weights goes to the first bone
+    single = wrapper.get_dual_quaternion_poses(max_influences=np.int64(1))[0, :, 0]
+    assert np.allclose(single, [np.cos(np.radians(170)), np.sin(np.radians(170)), 0])
+
+    with pytest.raises(ParameterError):
+        wrapper.get_dual_quaternion_poses(max_influences=0)
+    with pytest.raises(IndexError):
+        wrapper.get_dual_quaternion_poses([1])
+
+    # On a smoothly bending strip both methods follow the animation closely
+    rest, targets, faces = bending_strip(nx=30, ny=5, num_frames=8, motion="bend", angle=0.075)
+    wrapper = DemBonesWrapper()
+    wrapper.num_bones = 3
+    wrapper.num_iterations = 10
+    wrapper.set_rest_pose(rest)
+    for k, target in enumerate(targets):
+        wrapper.set_target_vertices(k, target)
+    wrapper.set_faces(faces)
+    wrapper.compute()
+
+    report = wrapper.compare_skinning(chunk_frames=3)
+    distances = np.linalg.norm(wrapper.get_skinned_poses() - targets, axis=1)
+    assert np.allclose(report["lbs_rmse"], np.sqrt(np.mean(distances**2, axis=0)))
+    assert np.allclose(report["lbs_max"], distances.max(axis=0))
+    assert np.isclose(report["lbs_total_rmse"], np.sqrt(np.mean(distances**2)))
+    assert report["dqs_rmse"].shape == report["dqs_better"].shape == (150,)
+    assert report["dqs_total_rmse"] < 0.05
+
+    dqs = wrapper.get_dual_quaternion_poses([7])[0]
+    assert np.allclose(np.linalg.norm(dqs - targets[7], axis=0), wrapper.compare_skinning([7])["dqs_max"])
+
+
+def test_face_management():
+    """Test setting faces from index arrays, CSR arrays and lists."""
+    wrapper = DemBonesWrapper()
+    wrapper.set_rest_pose(np.zeros((3, 6)))
+
+    wrapper.set_faces(np.array([[0, 1, 2, 3], [2, 3, 4, 5]]))
+    assert wrapper._dem_bones.fv == [[0, 1, 2, 3], [2, 3, 4, 5]]
+
+    wrapper.set_faces(np.array([0, 1, 2, 2, 3, 4, 5]), offsets=np.array([0, 3, 7]))
+    assert wrapper._dem_bones.fv == [[0, 1, 2], [2, 3, 4, 5]]
+
+    wrapper.set_faces([[0, 1, 2], [3, 4, 5, 0]])
+    offsets, indices = wrapper._dem_bones.get_faces()
+    assert offsets.tolist() == [0, 3, 7]
+    assert indices.tolist() == [0, 1, 2, 3, 4, 5, 0]
+
+    wrapper.set_faces([[0, 1, 2], [3, 4, 5]])
+    assert wrapper._dem_bones.fv == [[0, 1, 2], [3, 4, 5]]
+
+    with pytest.raises(IndexError):
+        wrapper.set_faces(np.array([[0, 1, 6]]))
+
+    with pytest.raises(ParameterError):
+        wrapper.set_faces(np.array([[0, 1]]))
+
+    with pytest.raises(ParameterError):
+        wrapper.set_faces(np.array([0, 1, 2, 3]), offsets=np.array([0, 2, 4]))
+
+    # Topology can be set before the rest pose
+    wrapper = DemBonesWrapper()
+    wrapper.set_faces(np.array([[0, 1, 2], [2, 3, 4]]))
+    wrapper.set_rest_pose(np.zeros((3, 5)))
+    assert wrapper._dem_bones.fv == [[0, 1, 2], [2, 3, 4]]
+    with pytest.raises(IndexError):
+        wrapper.set_faces(np.array([[0, -1, 2]]))
+
+
+def test_num_threads(bending_strip):
+    """Test that limiting the threads of a solve keeps the result and restores the default."""
+    rest, _, _ = bending_strip(nx=20, ny=4, num_frames=0)
+    right = rest[0] > 1
+
+    default_threads = build_info()["max_threads"]
+    results = []
+    for num_threads in (None, 1, 2):
+        wrapper = DemBonesWrapper()
+        wrapper.num_bones = 2
+        wrapper.num_iterations = 5
+        wrapper.num_threads = num_threads
+        assert wrapper.num_threads == num_threads
+        wrapper.set_rest_pose(rest)
+        for k in range(6):
+            frame = rest.copy()
+            frame[1, right] += 0.05 * k * (rest[0, right] - 1)
+            wrapper.set_target_vertices(k, frame)
+        wrapper.compute()
+        results.append(wrapper.get_weights())
+
+    assert np.allclose(results[1], results[0])
+    assert np.allclose(results[2], results[0])
+    assert build_info()["max_threads"] == default_threads
+
+    with pytest.raises(ParameterError):
+        wrapper.num_threads = 0
+
+
 def test_compute():
     """Test the compute method."""
     # Mock the C++ compute method to avoid actual computation